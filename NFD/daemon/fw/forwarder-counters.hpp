@@ -35,6 +35,32 @@ namespace nfd {
 class ForwarderCounters : public NetworkLayerCounters
 {
 public:
+  /// satisfied PIT entries (ndnSIM extension)
+  const PacketCounter&
+  getNSatisfiedInterests() const
+  {
+    return m_nSatisfiedInterests;
+  }
+
+  PacketCounter&
+  getNSatisfiedInterests()
+  {
+    return m_nSatisfiedInterests;
+  }
+
+  /// expired PIT entries (ndnSIM extension)
+  const PacketCounter&
+  getNUnsatisfiedInterests() const
+  {
+    return m_nUnsatisfiedInterests;
+  }
+
+  PacketCounter&
+  getNUnsatisfiedInterests()
+  {
+    return m_nUnsatisfiedInterests;
+  }
+
   /** \brief copy current obseverations to a struct
    *  \param recipient an object with set methods for counters
    */
@@ -44,6 +70,10 @@ public:
   {
     this->NetworkLayerCounters::copyTo(recipient);
   }
+
+private:
+  PacketCounter m_nSatisfiedInterests;
+  PacketCounter m_nUnsatisfiedInterests;
 };
 
 } // namespace nfd
@@ -111,6 +111,7 @@ Forwarder::onIncomingInterest(Face& inFace, const Interest& interest)
       // XXX should we lookup PIT for other Interests that also match csMatch?
 
       // invoke PIT satisfy callback
+      ++m_counters.getNSatisfiedInterests();
       beforeSatisfyInterest(*pitEntry, *m_csFace, *csMatch);
       this->dispatchToStrategy(pitEntry, bind(&Strategy::beforeSatisfyInterest, _1,
                                               pitEntry, cref(*m_csFace), cref(*csMatch)));
@@ -236,6 +237,7 @@ Forwarder::onInterestUnsatisfied(shared_ptr<pit::Entry> pitEntry)
   NFD_LOG_DEBUG("onInterestUnsatisfied interest=" << pitEntry->getName());
 
   // invoke PIT unsatisfied callback
+  ++m_counters.getNUnsatisfiedInterests();
   beforeExpirePendingInterest(*pitEntry);
   this->dispatchToStrategy(pitEntry, bind(&Strategy::beforeExpirePendingInterest, _1,
                                           pitEntry));
@@ -318,6 +320,7 @@ Forwarder::onIncomingData(Face& inFace, const Data& data)
     }
 
     // invoke PIT satisfy callback
+    ++m_counters.getNSatisfiedInterests();
     beforeSatisfyInterest(*pitEntry, inFace, data);
     this->dispatchToStrategy(pitEntry, bind(&Strategy::beforeSatisfyInterest, _1,
                                             pitEntry, cref(inFace), cref(data)));
@@ -26,6 +26,10 @@
 
 #include <math.h>
 
+#include <algorithm>
+#include <map>
+#include <tuple>
+
 NS_LOG_COMPONENT_DEFINE("ndn.ConsumerZipfMandelbrot");
 
 namespace ns3 {
@@ -73,24 +77,56 @@ ConsumerZipfMandelbrot::~ConsumerZipfMandelbrot()
 {
 }
 
-void
-ConsumerZipfMandelbrot::SetNumberOfContents(uint32_t numOfContents)
+shared_ptr<const std::vector<double>>
+ConsumerZipfMandelbrot::GetCumulativeProbabilities(uint32_t N, double q, double s)
 {
-  m_N = numOfContents;
+  // tables are shared by all consumers with the same parameters and are released together
+  // with the last of them
+  static std::map<std::tuple<uint32_t, double, double>, std::weak_ptr<const std::vector<double>>>
+    tables;
+
+  auto key = std::make_tuple(N, q, s);
+  auto entry = tables.find(key);
+  if (entry != tables.end()) {
+    shared_ptr<const std::vector<double>> table = entry->second.lock();
+    if (table != nullptr) {
+      return table;
+    }
+  }
 
-  NS_LOG_DEBUG(m_q << " and " << m_s << " and " << m_N);
+  // forget tables that are no longer used by any consumer
+  for (auto i = tables.begin(); i != tables.end();) {
+    if (i->second.expired()) {
+      i = tables.erase(i);
+    }
+    else {
+      ++i;
+    }
+  }
 
-  m_Pcum = std::vector<double>(m_N + 1);
+  NS_LOG_DEBUG(q << " and " << s << " and " << N);
 
-  m_Pcum[0] = 0.0;
-  for (uint32_t i = 1; i <= m_N; i++) {
-    m_Pcum[i] = m_Pcum[i - 1] + 1.0 / std::pow(i + m_q, m_s);
+  auto Pcum = make_shared<std::vector<double>>(N + 1);
+
+  (*Pcum)[0] = 0.0;
+  for (uint32_t i = 1; i <= N; i++) {
+    (*Pcum)[i] = (*Pcum)[i - 1] + 1.0 / std::pow(i + q, s);
   }
 
-  for (uint32_t i = 1; i <= m_N; i++) {
-    m_Pcum[i] = m_Pcum[i] / m_Pcum[m_N];
-    NS_LOG_LOGIC("Cumulative probability [" << i << "]=" << m_Pcum[i]);
+  for (uint32_t i = 1; i <= N; i++) {
+    (*Pcum)[i] = (*Pcum)[i] / (*Pcum)[N];
+    NS_LOG_LOGIC("Cumulative probability [" << i << "]=" << (*Pcum)[i]);
   }
+
+  tables[key] = Pcum;
+  return Pcum;
+}
+
+void
+ConsumerZipfMandelbrot::SetNumberOfContents(uint32_t numOfContents)
+{
+  m_N = numOfContents;
+  m_Pcum.reset(); // the table is (re)created on the first use
 }
 
 uint32_t
@@ -103,7 +139,7 @@ void
 ConsumerZipfMandelbrot::SetQ(double q)
 {
   m_q = q;
-  SetNumberOfContents(m_N);
+  m_Pcum.reset();
 }
 
 double
@@ -116,7 +152,7 @@ void
 ConsumerZipfMandelbrot::SetS(double s)
 {
   m_s = s;
-  SetNumberOfContents(m_N);
+  m_Pcum.reset();
 }
 
 double
@@ -201,8 +237,11 @@ ConsumerZipfMandelbrot::SendPacket()
 uint32_t
 ConsumerZipfMandelbrot::GetNextSeq()
 {
+  if (m_Pcum == nullptr) {
+    m_Pcum = GetCumulativeProbabilities(m_N, m_q, m_s);
+  }
+
   uint32_t content_index = 1; //[1, m_N]
-  double p_sum = 0;
 
   double p_random = m_SeqRng.GetValue();
   while (p_random == 0) {
@@ -210,15 +249,13 @@ ConsumerZipfMandelbrot::GetNextSeq()
   }
   // if (p_random == 0)
   NS_LOG_LOGIC("p_random=" << p_random);
-  for (uint32_t i = 1; i <= m_N; i++) {
-    p_sum = m_Pcum[i]; // m_Pcum[i] = m_Pcum[i-1] + p[i], p[0] = 0;   e.g.: p_cum[1] = p[1],
-                       // p_cum[2] = p[1] + p[2]
-    if (p_random <= p_sum) {
-      content_index = i;
-      break;
-    } // if
-  }   // for
-  // content_index = 1;
+
+  // the first i, such that p_random <= m_Pcum[i], where m_Pcum[i] = m_Pcum[i-1] + p[i], p[0] = 0
+  auto p_sum = std::lower_bound(m_Pcum->begin() + 1, m_Pcum->end(), p_random);
+  if (p_sum != m_Pcum->end()) {
+    content_index = p_sum - m_Pcum->begin();
+  }
+
   NS_LOG_DEBUG("RandomNumber=" << content_index);
   return content_index;
 }
@@ -66,6 +66,15 @@ public:
   uint32_t
   GetNextSeq();
 
+  /**
+   * \brief Get cumulative probabilities of Zipf-Mandelbrot distribution with parameters N, q, s
+   *
+   * The table is created only once and is shared (immutable) by all consumers with the same
+   * parameters.
+   */
+  static shared_ptr<const std::vector<double>>
+  GetCumulativeProbabilities(uint32_t N, double q, double s);
+
 protected:
   virtual void
   ScheduleNextPacket();
@@ -93,7 +102,7 @@ private:
   uint32_t m_N;               // number of the contents
   double m_q;                 // q in (k+q)^s
   double m_s;                 // s in (k+q)^s
-  std::vector<double> m_Pcum; // cumulative probability
+  shared_ptr<const std::vector<double>> m_Pcum; // cumulative probability
 
   UniformVariable m_SeqRng; // RNG
 };
@@ -21,6 +21,7 @@
 #include "ns3/log.h"
 #include "ns3/string.h"
 #include "ns3/uinteger.h"
+#include "ns3/boolean.h"
 #include "ns3/packet.h"
 #include "ns3/simulator.h"
 
@@ -28,6 +29,9 @@
 #include "model/ndn-ns3.hpp"
 #include "model/ndn-l3-protocol.hpp"
 #include "helper/ndn-fib-helper.hpp"
+#include "utils/ndn-virtual-payload-tag.hpp"
+
+#include <ndn-cxx/encoding/encoding-buffer.hpp>
 
 #include <memory>
 
@@ -55,6 +59,11 @@ Producer::GetTypeId(void)
       .AddAttribute("PayloadSize", "Virtual payload size for Content packets", UintegerValue(1024),
                     MakeUintegerAccessor(&Producer::m_virtualPayloadSize),
                     MakeUintegerChecker<uint32_t>())
+      .AddAttribute("VirtualPayload",
+                    "If true, Data content is represented only by its size and carried as "
+                    "zero-filled bytes of ns-3 packets, without being allocated and encoded",
+                    BooleanValue(false), MakeBooleanAccessor(&Producer::m_isVirtualPayload),
+                    MakeBooleanChecker())
       .AddAttribute("Freshness", "Freshness of data packets, if 0, then unlimited freshness",
                     TimeValue(Seconds(0)), MakeTimeAccessor(&Producer::m_freshness),
                     MakeTimeChecker())
@@ -65,7 +74,12 @@ Producer::GetTypeId(void)
          MakeUintegerChecker<uint32_t>())
       .AddAttribute("KeyLocator",
                     "Name to be used for key locator.  If root, then key locator is not used",
-                    NameValue(), MakeNameAccessor(&Producer::m_keyLocator), MakeNameChecker());
+                    NameValue(), MakeNameAccessor(&Producer::m_keyLocator), MakeNameChecker())
+      .AddAttribute("DataCacheSize",
+                    "Maximum number of encoded Data packets kept for recently requested names, "
+                    "if 0, then Data packets are not cached",
+                    UintegerValue(0), MakeUintegerAccessor(&Producer::m_dataCacheSize),
+                    MakeUintegerChecker<uint32_t>());
   return tid;
 }
 
@@ -82,6 +96,10 @@ Producer::StartApplication()
   App::StartApplication();
 
   FibHelper::AddRoute(GetNode(), m_prefix, m_face, 0);
+
+  m_dataTemplate = encodeDataTemplate();
+  m_recentData.clear();
+  m_recentDataIndex.clear();
 }
 
 void
@@ -102,15 +120,23 @@ Producer::OnInterest(shared_ptr<const Interest> interest)
   if (!m_active)
     return;
 
-  Name dataName(interest->getName());
-  // dataName.append(m_postfix);
-  // dataName.appendVersion();
+  shared_ptr<Data> data = getData(interest->getName());
 
-  auto data = make_shared<Data>();
-  data->setName(dataName);
-  data->setFreshnessPeriod(::ndn::time::milliseconds(m_freshness.GetMilliSeconds()));
+  NS_LOG_INFO("node(" << GetNode()->GetId() << ") responding with Data: " << data->getName());
 
-  data->setContent(make_shared< ::ndn::Buffer>(m_virtualPayloadSize));
+  m_transmittedDatas(data, this, m_face);
+  m_face->onReceiveData(*data);
+}
+
+shared_ptr<const ::ndn::Buffer>
+Producer::encodeDataTemplate() const
+{
+  Data data;
+  data.setFreshnessPeriod(::ndn::time::milliseconds(m_freshness.GetMilliSeconds()));
+
+  if (!m_isVirtualPayload) {
+    data.setContent(make_shared< ::ndn::Buffer>(m_virtualPayloadSize));
+  }
 
   Signature signature;
   SignatureInfo signatureInfo(static_cast< ::ndn::tlv::SignatureTypeValue>(255));
@@ -122,15 +148,48 @@ Producer::OnInterest(shared_ptr<const Interest> interest)
   signature.setInfo(signatureInfo);
   signature.setValue(::ndn::nonNegativeIntegerBlock(::ndn::tlv::SignatureValue, m_signature));
 
-  data->setSignature(signature);
+  data.setSignature(signature);
 
-  NS_LOG_INFO("node(" << GetNode()->GetId() << ") responding with Data: " << data->getName());
+  // everything that follows the Name is the same for all Data packets
+  const Block& wire = data.wireEncode();
+  wire.parse();
+  return make_shared< ::ndn::Buffer>(wire.get(::ndn::tlv::Name).end(), wire.value_end());
+}
+
+shared_ptr<Data>
+Producer::getData(const Name& name)
+{
+  auto recent = m_recentDataIndex.find(name);
+  if (recent != m_recentDataIndex.end()) {
+    m_recentData.splice(m_recentData.begin(), m_recentData, recent->second);
+    return *recent->second;
+  }
 
-  // to create real wire encoding
-  data->wireEncode();
+  // splice the name into the pre-encoded Data
+  const Block& nameBlock = name.wireEncode();
+  size_t length = nameBlock.size() + m_dataTemplate->size();
 
-  m_transmittedDatas(data, this, m_face);
-  m_face->onReceiveData(*data);
+  ::ndn::EncodingBuffer encoder(length + 2 * 9, 0); // TLV-TYPE and TLV-LENGTH take at most 9 bytes
+  encoder.prependByteArray(m_dataTemplate->get(), m_dataTemplate->size());
+  encoder.prependByteArray(nameBlock.wire(), nameBlock.size());
+  encoder.prependVarNumber(length);
+  encoder.prependVarNumber(::ndn::tlv::Data);
+
+  auto data = make_shared<Data>(encoder.block());
+  if (m_isVirtualPayload) {
+    data->setTag(make_shared<VirtualPayloadTag>(m_virtualPayloadSize));
+  }
+
+  if (m_dataCacheSize > 0) {
+    m_recentData.push_front(data);
+    m_recentDataIndex.insert(std::make_pair(name, m_recentData.begin()));
+    if (m_recentData.size() > m_dataCacheSize) {
+      m_recentDataIndex.erase(m_recentData.back()->getName());
+      m_recentData.pop_back();
+    }
+  }
+
+  return data;
 }
 
 } // namespace ndn
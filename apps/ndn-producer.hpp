@@ -28,6 +28,9 @@
 #include "ns3/nstime.h"
 #include "ns3/ptr.h"
 
+#include <list>
+#include <map>
+
 namespace ns3 {
 namespace ndn {
 
@@ -59,14 +62,39 @@ protected:
   virtual void
   StopApplication(); // Called at time specified by Stop
 
+private:
+  /**
+   * @brief Encode the part of Data packets that follows the Name
+   *
+   * Freshness, content, and signature of all Data packets produced by the application are the
+   * same, so they are encoded only once, when the application starts.
+   */
+  shared_ptr<const ::ndn::Buffer>
+  encodeDataTemplate() const;
+
+  /**
+   * @brief Get Data packet with the specified name
+   *
+   * The name is spliced into the pre-encoded template.  If DataCacheSize is non-zero, up to
+   * DataCacheSize of the most recently requested Data packets are reused without encoding.
+   */
+  shared_ptr<Data>
+  getData(const Name& name);
+
 private:
   Name m_prefix;
   Name m_postfix;
   uint32_t m_virtualPayloadSize;
+  bool m_isVirtualPayload;
   Time m_freshness;
 
   uint32_t m_signature;
   Name m_keyLocator;
+
+  uint32_t m_dataCacheSize;
+  shared_ptr<const ::ndn::Buffer> m_dataTemplate;
+  std::list<shared_ptr<Data>> m_recentData; ///< @brief most recently requested Data first
+  std::map<Name, std::list<shared_ptr<Data>>::iterator> m_recentDataIndex;
 };
 
 } // namespace ndn
@@ -7,72 +7,128 @@ from ns3_ptr import Ns3PtrMemoryPolicy
 import pybindgen.settings
 import warnings
 
+import os
 import sys
 
+## The bindings are generated as three separately loadable extensions:
+##
+##  - core (ns._ndnSIM): names, packets, and faces; does not depend on other ns-3 modules
+##  - helpers (ns._ndnSIM_helpers): ndn::StackHelper, ndn::FibHelper, and other helpers
+##  - nfd (ns._ndnSIM_nfd): ndn::L3Protocol and introspection of NFD tables (ndn.nfd.Fib/Pit/Cs)
+##
+## The part is selected using NDNSIM_BINDINGS_PART environment variable (core by default) or the
+## first command-line argument.  The ns.ndnSIM frontend (bindings/ndnSIM.py) imports the core part
+## and loads the other parts on the first access to their classes.  The helpers and nfd parts
+## import the core classes from ns.ndnSIM.ndn, registered in sys.modules by the frontend.
+
+PARTS = ['core', 'helpers', 'nfd']
+
+def get_part():
+    part = os.environ.get('NDNSIM_BINDINGS_PART', 'core')
+    if part not in PARTS:
+        raise ValueError("Unknown part of ndnSIM bindings: %s (expected one of %s)" % (part, ', '.join(PARTS)))
+    return part
+
 def module_init():
-    root_module = Module('ns.ndnSIM', cpp_namespace='::ns3')
+    part = get_part()
+    if part == 'core':
+        root_module = Module('ns._ndnSIM', cpp_namespace='::ns3')
+    else:
+        root_module = Module('ns._ndnSIM_%s' % part, cpp_namespace='::ns3')
     return root_module
 
 def register_types(module):
-    module.add_class('ObjectBase', allow_subclassing=True, import_from_module='ns.core')
-    module.add_class('SimpleRefCount', automatic_type_narrowing=True, import_from_module='ns.core',
-                     template_parameters=['ns3::Object', 'ns3::ObjectBase', 'ns3::ObjectDeleter'],
-                     parent=module['ns3::ObjectBase'],
-                     memory_policy=cppclass.ReferenceCountingMethodsPolicy(incref_method='Ref', decref_method='Unref', peekref_method='GetReferenceCount'))
-    module.add_class('Object', import_from_module='ns.core', parent=module['ns3::SimpleRefCount< ns3::Object, ns3::ObjectBase, ns3::ObjectDeleter >'])
-
-    module.add_class('TypeId', import_from_module='ns.core')
-    module.add_class('AttributeValue', import_from_module='ns.core')
-
-    module.add_class('NodeContainer', import_from_module='ns.network')
-    module.add_class('Node', import_from_module='ns.network', parent=module['ns3::Object'])
-    module.add_class('ApplicationContainer', import_from_module='ns.network')
+    part = get_part()
+    if part != 'core':
+        module.add_class('ObjectBase', allow_subclassing=True, import_from_module='ns.core')
+        module.add_class('SimpleRefCount', automatic_type_narrowing=True, import_from_module='ns.core',
+                         template_parameters=['ns3::Object', 'ns3::ObjectBase', 'ns3::ObjectDeleter'],
+                         parent=module['ns3::ObjectBase'],
+                         memory_policy=cppclass.ReferenceCountingMethodsPolicy(incref_method='Ref', decref_method='Unref', peekref_method='GetReferenceCount'))
+        module.add_class('Object', import_from_module='ns.core', parent=module['ns3::SimpleRefCount< ns3::Object, ns3::ObjectBase, ns3::ObjectDeleter >'])
+
+    if part == 'helpers':
+        module.add_class('TypeId', import_from_module='ns.core')
+        module.add_class('AttributeValue', import_from_module='ns.core')
+        module.add_class('Time', import_from_module='ns.core')
+
+        module.add_class('NodeContainer', import_from_module='ns.network')
+        module.add_class('Node', import_from_module='ns.network', parent=module['ns3::Object'])
+        module.add_class('ApplicationContainer', import_from_module='ns.network')
 
     def reg_ndn(module):
-        module.add_class('StackHelper')
-        module.add_class('FibHelper')
-        module.add_class('StrategyChoiceHelper')
-        module.add_class('AppHelper')
-        module.add_class('GlobalRoutingHelper')
-
-        module.add_class('L3Protocol', parent=module.get_root()['ns3::Object'])
-
-        module.add_class('Name')
-        module.add_class('Interest')
-        module.add_class('Data')
-        module.add_class('Face', memory_policy=StdSharedPtr('ns3::ndn::Face'))
-        module.add_class('FaceContainer', memory_policy=Ns3PtrMemoryPolicy('::ns3::ndn::FaceContainer'))
-
-        def reg_name(module):
-            module.add_class('Component')
-        reg_name(module.add_cpp_namespace('name'))
-
-        def reg_nfd(module):
-            module.add_class('Forwarder', memory_policy=StdSharedPtr('::ns3::ndn::nfd::Forwarder'), is_singleton=True)
-            module.add_class('Fib')
-            module.add_class('Pit')
-            module.add_class('Cs')
-
-            def reg_fib(module):
-                module.add_class('Entry')#, memory_policy=StdSharedPtr('ns3::ndn::nfd::fib::Entry'))
-                module.add_class('NextHop')
-                module.add_class('NextHopList')
-            reg_fib(module.add_cpp_namespace('fib'))
-
-            def reg_pit(module):
-                module.add_class('Entry')#, memory_policy=StdSharedPtr('ns3::ndn::nfd::pit::Entry'))
-            reg_pit(module.add_cpp_namespace('pit'))
-
-            def reg_cs(module):
-                module.add_class('Entry')#, memory_policy=StdSharedPtr('ns3::ndn::nfd::cs::Entry'))
-            reg_cs(module.add_cpp_namespace('cs'))
-
-        reg_nfd(module.add_cpp_namespace('nfd'))
+        if part == 'core':
+            reg_ndn_core_types(module, import_from_module=None)
+        else:
+            reg_ndn_core_types(module, import_from_module='ns.ndnSIM.ndn')
+
+        if part == 'helpers':
+            module.add_class('StackHelper')
+            fibHelper = module.add_class('FibHelper')
+            module.add_class('RouteInfo', outer_class=fibHelper)
+            fibLookup = module.add_class('FibLookup')
+            module.add_class('Result', outer_class=fibLookup)
+            module.add_container('std::vector< ns3::ndn::FibHelper::RouteInfo >', 'ns3::ndn::FibHelper::RouteInfo', 'vector')
+            module.add_class('StrategyChoiceHelper')
+            module.add_class('AppHelper')
+            module.add_class('GlobalRoutingHelper')
+            module.add_class('TablesSnapshot')
+            module.add_class('TraceBatcher')
+
+        if part == 'nfd':
+            module.add_class('L3Protocol', parent=module.get_root()['ns3::Object'])
+
+            def reg_nfd(module):
+                module.add_class('Forwarder', memory_policy=StdSharedPtr('::ns3::ndn::nfd::Forwarder'), is_singleton=True)
+                module.add_class('Fib')
+                module.add_class('Pit')
+                module.add_class('Cs')
+
+                def reg_fib(module):
+                    module.add_class('Entry')#, memory_policy=StdSharedPtr('ns3::ndn::nfd::fib::Entry'))
+                    module.add_class('NextHop')
+                    module.add_class('NextHopList')
+                reg_fib(module.add_cpp_namespace('fib'))
+
+                def reg_pit(module):
+                    module.add_class('Entry')#, memory_policy=StdSharedPtr('ns3::ndn::nfd::pit::Entry'))
+                reg_pit(module.add_cpp_namespace('pit'))
+
+                def reg_cs(module):
+                    module.add_class('Entry')#, memory_policy=StdSharedPtr('ns3::ndn::nfd::cs::Entry'))
+                reg_cs(module.add_cpp_namespace('cs'))
+
+            reg_nfd(module.add_cpp_namespace('nfd'))
     reg_ndn(module.add_cpp_namespace('ndn'))
 
-def register_methods(root_module):
-    reg_other_modules(root_module)
+def reg_ndn_core_types(module, import_from_module):
+    module.add_class('Name', import_from_module=import_from_module)
+    module.add_class('Interest', import_from_module=import_from_module)
+    module.add_class('Data', import_from_module=import_from_module)
+    module.add_class('Face', memory_policy=StdSharedPtr('ns3::ndn::Face'), import_from_module=import_from_module)
+    module.add_class('FaceContainer', memory_policy=Ns3PtrMemoryPolicy('::ns3::ndn::FaceContainer'),
+                     import_from_module=import_from_module)
+
+    def reg_name(module):
+        module.add_class('Component', import_from_module=import_from_module and import_from_module + '.name')
+    reg_name(module.add_cpp_namespace('name'))
+
+    if import_from_module is not None:
+        # the helpers and nfd parts return (references to) these classes, which are copied
+        for name in ['Name', 'Interest']:
+            module['ns3::ndn::%s' % name].add_copy_constructor()
 
+def register_methods(root_module):
+    part = get_part()
+    if part == 'core':
+        reg_core_methods(root_module)
+    elif part == 'helpers':
+        reg_other_modules(root_module)
+        reg_helpers_methods(root_module)
+    elif part == 'nfd':
+        reg_nfd_methods(root_module)
+
+def reg_helpers_methods(root_module):
     def reg_stackhelper(cls):
         cls.add_constructor([])
 
@@ -82,6 +138,7 @@ def register_methods(root_module):
         cls.add_method('InstallAll', 'ns3::Ptr<ns3::ndn::FaceContainer>', [], is_const=True)
 
         cls.add_method('SetDefaultRoutes', retval('void'), [param('bool', 'isEnabled', default_value='true')], is_const=True)
+        cls.add_method('SetLeanStack', retval('void'), [param('bool', 'isLean', default_value='true')])
         cls.add_method('SetStackAttributes',
                        retval('void'),
                        [param('const std::string&', 'attr1', default_value='""'), param('const std::string&', 'value1', default_value='""'),
@@ -123,8 +180,44 @@ def register_methods(root_module):
             param('const std::string&', 'otherNodeName'),
             param('int32_t', 'metric'),
             ], is_const=True, is_static=True)
+        cls.add_method('AddRoutes', retval('size_t'), [
+            param('const std::vector<ns3::ndn::FibHelper::RouteInfo>&', 'routes'),
+            ], is_const=True, is_static=True)
+        cls.add_method('RemoveRoutes', retval('size_t'), [
+            param('const std::vector<ns3::ndn::FibHelper::RouteInfo>&', 'routes'),
+            ], is_const=True, is_static=True)
     reg_fibhelper(root_module['ns3::ndn::FibHelper'])
 
+    def reg_fibhelper_routeinfo(cls):
+        cls.add_constructor([])
+        cls.add_copy_constructor()
+        cls.add_instance_attribute('node', 'ns3::Ptr<ns3::Node>')
+        cls.add_instance_attribute('prefix', 'ns3::ndn::Name')
+        cls.add_instance_attribute('faceId', 'uint32_t')
+        cls.add_instance_attribute('metric', 'int32_t')
+    reg_fibhelper_routeinfo(root_module['ns3::ndn::FibHelper::RouteInfo'])
+
+    def reg_FibLookup(cls):
+        cls.add_constructor([param('ns3::Ptr<ns3::Node>', 'node')])
+        cls.add_method('findLongestPrefixMatch', 'ns3::ndn::FibLookup::Result',
+                       [param('const ns3::ndn::Name&', 'name')], is_const=True)
+        cls.add_method('findExactMatch', 'ns3::ndn::FibLookup::Result',
+                       [param('const ns3::ndn::Name&', 'prefix')], is_const=True)
+        cls.add_method('lookupUris', 'size_t', [param('const std::string&', 'uris'),
+                                                param('bool', 'isExactMatch', default_value='false')])
+        cls.add_method('getResultsAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('getNResults', 'size_t', [], is_const=True)
+    reg_FibLookup(root_module['ns3::ndn::FibLookup'])
+
+    def reg_FibLookupResult(cls):
+        cls.add_constructor([])
+        cls.add_copy_constructor()
+        cls.add_instance_attribute('faceId', 'int64_t')
+        cls.add_instance_attribute('cost', 'uint64_t')
+        cls.add_instance_attribute('nNextHops', 'uint32_t')
+        cls.add_instance_attribute('prefixLength', 'int32_t')
+    reg_FibLookupResult(root_module['ns3::ndn::FibLookup::Result'])
+
     def reg_strategychoicehelper(cls):
         cls.add_method('Install', retval('void'), [param('ns3::Ptr<ns3::Node>', 'node'),
                                                    param('const const std::string&', 'name'),
@@ -155,9 +248,54 @@ def register_methods(root_module):
         cls.add_method('AddOrigins', 'void', [param('const std::string&', 'prefix'), param('const ns3::NodeContainer&', 'nodes')])
         cls.add_method('AddOriginsForAll', 'void', [])
         cls.add_method('CalculateRoutes', 'void', [])
+        cls.add_method('CalculateRoutesParallel', 'void', [param('uint32_t', 'nThreads')])
+        cls.add_method('CalculateRoutesWithCache', 'bool', [
+            param('const std::string&', 'cacheFile'),
+            param('uint32_t', 'nThreads', default_value='1'),
+            ])
         cls.add_method('CalculateAllPossibleRoutes', 'void', [])
+        cls.add_method('CalculateAllPossibleRoutesReverseSpf', 'void', [])
+        cls.add_method('CalculateMultipathRoutes', 'void',
+                       [param('uint32_t', 'maxNextHops', default_value='0')])
+        cls.add_method('EnableIncrementalRouting', 'void', [])
+        cls.add_method('DisableIncrementalRouting', 'void', [])
     reg_GlobalRoutingHelper(root_module['ns3::ndn::GlobalRoutingHelper'])
 
+    def reg_TablesSnapshot(cls):
+        cls.add_constructor([param('bool', 'includeNames', default_value='true')])
+        cls.add_constructor([param('const ns3::NodeContainer&', 'nodes'),
+                             param('bool', 'includeNames', default_value='true')])
+        cls.add_method('getFibAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('getNFibRecords', 'size_t', [], is_const=True)
+        cls.add_method('getPitAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('getNPitRecords', 'size_t', [], is_const=True)
+        cls.add_method('getCsAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('getNCsRecords', 'size_t', [], is_const=True)
+        cls.add_method('getSizesAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('getNSizesRecords', 'size_t', [], is_const=True)
+        cls.add_method('getStringDataAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('getStringDataSize', 'size_t', [], is_const=True)
+    reg_TablesSnapshot(root_module['ns3::ndn::TablesSnapshot'])
+
+    def reg_TraceBatcher(cls):
+        cls.add_constructor([param('size_t', 'batchSize'), param('ns3::Time', 'interval'),
+                             param('uint32_t', 'sources')])
+        cls.add_constructor([param('const ns3::NodeContainer&', 'nodes'), param('size_t', 'batchSize'),
+                             param('ns3::Time', 'interval'), param('uint32_t', 'sources')])
+        cls.add_method('SetNameDepth', 'void', [param('size_t', 'depth')])
+        cls.add_method('SetPauseOnBatch', 'void', [param('bool', 'shouldPause')])
+        cls.add_method('Flush', 'void', [])
+        cls.add_method('RunUntilBatch', 'bool', [])
+        cls.add_method('GetNBatches', 'size_t', [], is_const=True)
+        cls.add_method('PopBatch', 'void', [])
+        cls.add_method('GetBatchAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('GetBatchSize', 'size_t', [], is_const=True)
+        cls.add_method('GetNameDataAddress', 'uint64_t', [], is_const=True)
+        cls.add_method('GetNameDataSize', 'size_t', [], is_const=True)
+    reg_TraceBatcher(root_module['ns3::ndn::TraceBatcher'])
+
+
+def reg_core_methods(root_module):
     def reg_Name(root_module, cls):
         cls.implicitly_converts_to(root_module['ns3::ndn::Interest'])
         cls.add_output_stream_operator()
@@ -202,10 +340,11 @@ def register_methods(root_module):
         cls.add_constructor([])
     reg_Data(root_module['ns3::ndn::Data'])
 
-    #########################################################################################
-    ## Interface to NFD
-    #########################################################################################
+#########################################################################################
+## Interface to NFD
+#########################################################################################
 
+def reg_nfd_methods(root_module):
     def register_L3Protocol(cls):
         cls.add_method('getL3Protocol', 'ns3::Ptr<ns3::ndn::L3Protocol>', [param('ns3::Ptr<ns3::Object>', 'node')], is_static=True)
         cls.add_method('getForwarder', 'std::shared_ptr<ns3::ndn::nfd::Forwarder>', [])
@@ -229,7 +368,7 @@ def register_methods(root_module):
         cls.add_container_traits(retval('const ns3::ndn::nfd::fib::Entry&', caller_manages_return=False),
                                  begin_method='begin', end_method='end', iterator_type='const_iterator')
 
-        # The following is not supported
+        # The following is not supported (use ns3::ndn::FibLookup instead)
         # cls.add_method('findLongestPrefixMatch', retval('std::shared_ptr<ns3::ndn::nfd::fib::Entry>'),
         #                [param('const ns3::ndn::Name&', 'prefix')], is_const=True)
         # cls.add_method('findExactMatch', retval('std::shared_ptr<ns3::ndn::nfd::fib::Entry>'),
@@ -306,6 +445,8 @@ def register_functions(root_module):
     return
 
 def main():
+    if len(sys.argv) > 1:
+        os.environ['NDNSIM_BINDINGS_PART'] = sys.argv[1]
     out = FileCodeSink(sys.stdout)
     root_module = module_init()
     register_types(root_module)
@@ -0,0 +1,91 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Frontend of ndnSIM Python bindings (ns.ndnSIM)
+
+The bindings are split into separately loadable extensions (see bindings/modulegen__*.py):
+
+ - ns._ndnSIM: names, packets, and faces, imported right away
+ - ns._ndnSIM_helpers: ndn.StackHelper, ndn.FibHelper, ndn.AppHelper, and other helpers
+ - ns._ndnSIM_nfd: ndn.L3Protocol and introspection of NFD tables (ndn.nfd.Fib/Pit/Cs)
+
+The helpers and nfd extensions, together with the ns-3 modules they depend on, are imported on
+the first access to any of their classes, e.g., ``ndn.StackHelper()``.  The code using ns.ndnSIM
+does not need any changes.
+"""
+
+# modules are imported under private names, so that ``from ns.ndnSIM import *`` in scenarios
+# exports only the bindings
+import importlib as _importlib
+import sys as _sys
+import types as _types
+
+from ns._ndnSIM import *
+import ns._ndnSIM as _ndnSIM_core
+
+# classes of the ns3::ndn namespace provided by each of the lazily loaded extensions
+# (keep in sync with register_types in bindings/modulegen__*.py)
+_LAZY_PARTS = {
+    'ns._ndnSIM_helpers': ['StackHelper', 'FibHelper', 'FibLookup', 'StrategyChoiceHelper',
+                           'AppHelper', 'GlobalRoutingHelper', 'TablesSnapshot', 'TraceBatcher'],
+    'ns._ndnSIM_nfd': ['L3Protocol', 'nfd'],
+}
+
+
+class _LazyNamespace(_types.ModuleType):
+    """ns3::ndn namespace that imports the extension providing a class on the first access"""
+
+    def __init__(self, name, namespace, parts):
+        super(_LazyNamespace, self).__init__(name, namespace.__doc__)
+        self.__dict__.update((key, value) for key, value in vars(namespace).items()
+                             if not key.startswith('__'))
+        self._parts = dict((attr, part) for part, attrs in parts.items() for attr in attrs)
+
+    def __getattr__(self, attr):
+        part = self._parts.get(attr)
+        if part is not None:
+            self.load(part)
+        if attr not in self.__dict__:
+            raise AttributeError("module '%s' has no attribute '%s'" % (self.__name__, attr))
+        return self.__dict__[attr]
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._parts))
+
+    def load(self, part):
+        """Import the extension and merge its ns3::ndn namespace"""
+        namespace = _importlib.import_module(part).ndn
+        for key, value in vars(namespace).items():
+            if not key.startswith('__'):
+                self.__dict__.setdefault(key, value)
+        for attr in [attr for attr, attrPart in self._parts.items() if attrPart == part]:
+            del self._parts[attr]
+
+    def loadAll(self):
+        """Import all extensions, e.g., before forking simulation replicas"""
+        for part in set(self._parts.values()):
+            self.load(part)
+
+
+ndn = _LazyNamespace(__name__ + '.ndn', _ndnSIM_core.ndn, _LAZY_PARTS)
+
+# the helpers and nfd extensions import the core classes from these modules
+_sys.modules[ndn.__name__] = ndn
+_sys.modules[ndn.__name__ + '.name'] = ndn.name
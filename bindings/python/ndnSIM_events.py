@@ -0,0 +1,163 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Batched delivery of NDN trace source events (L3Protocol ``InInterests``, ``OutData``,
+``SatisfiedInterests``, ``TimedOutInterests``, and application ``FirstInterestDataDelay``)
+into Python, e.g.::
+
+    from ns.ndnSIM_events import Subscription
+
+    events = Subscription(batchSize=10000, interval=Seconds(1.0))
+
+    def analyze(batch):                     # structured NumPy array, one row per event
+        inInterests = batch[batch["type"] == events.IN_INTERESTS]
+        print batch["time"][-1], len(inInterests), events.decode(inInterests["name"][:5])
+
+    Simulator.Stop(Seconds(20.0))
+    events.run(analyze)                     # instead of Simulator.Run()
+
+or, using a pull iterator, which runs the simulation as the batches are consumed::
+
+    for batch in events.batches():
+        ...
+
+The events are collected in C++ by ndn::TraceBatcher.  The simulation is paused after each
+batch is completed (when it has ``batchSize`` events or every ``interval`` of simulation time),
+so Python code is called once per batch, not once per event.  When NumPy is not available, the
+batches are ctypes arrays of Record structures.
+"""
+
+import ctypes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ns.core import Time
+from ns.ndnSIM import ndn
+
+
+class Record(ctypes.Structure):
+    """Trace source event (see ndn::TraceBatcher::Record)"""
+    _fields_ = [("time", ctypes.c_double),
+                ("node", ctypes.c_uint32),
+                ("type", ctypes.c_uint32),
+                ("faceId", ctypes.c_int64),
+                ("name", ctypes.c_uint32),
+                ("appId", ctypes.c_uint32),
+                ("seqNo", ctypes.c_uint32),
+                ("retxCount", ctypes.c_uint32),
+                ("delay", ctypes.c_double),
+                ("hopCount", ctypes.c_int32),
+                ("padding", ctypes.c_uint32)]
+
+
+class Subscription(object):
+    """Subscription to NDN trace source events of all (or the selected) nodes
+
+    Applications need to be installed before the subscription is created.
+    """
+
+    IN_INTERESTS = 0
+    OUT_DATA = 1
+    SATISFIED_INTERESTS = 2
+    TIMED_OUT_INTERESTS = 3
+    FIRST_INTEREST_DATA_DELAY = 4
+
+    TYPES = ["InInterests", "OutData", "SatisfiedInterests", "TimedOutInterests",
+             "FirstInterestDataDelay"]
+
+    # name index of events without a name
+    NO_NAME = 0xffffffff
+
+    def __init__(self, nodes=None, batchSize=4096, interval=None, types=None, nameDepth=None):
+        """
+        :param nodes: NodeContainer with the nodes to trace (default, all nodes)
+        :param batchSize: maximum number of events in a batch
+        :param interval: ns.core.Time, how often the current batch is completed even if it is not
+                         full (default, only full batches are completed)
+        :param types: list of event types to collect (default, all types)
+        :param nameDepth: number of name components to record (default, full names)
+        """
+        if interval is None:
+            interval = Time(0)
+        sources = 0
+        for type in (types if types is not None else range(len(self.TYPES))):
+            sources |= 1 << type
+
+        if nodes is None:
+            self._batcher = ndn.TraceBatcher(batchSize, interval, sources)
+        else:
+            self._batcher = ndn.TraceBatcher(nodes, batchSize, interval, sources)
+        if nameDepth is not None:
+            self._batcher.SetNameDepth(nameDepth)
+        self._batcher.SetPauseOnBatch(True)
+
+        self.names = []
+        self._nameDataSize = 0
+
+    def batches(self):
+        """Run the simulation, yielding batches of events as they are completed
+
+        The last batch (with the events since the last completed batch) is yielded after the
+        simulation ends.
+        """
+        while True:
+            isPaused = self._batcher.RunUntilBatch()
+            if not isPaused:
+                self._batcher.Flush()
+            while self._batcher.GetNBatches() > 0:
+                yield self._pop()
+            if not isPaused:
+                return
+
+    def run(self, callback):
+        """Run the simulation, calling ``callback(batch)`` for each completed batch"""
+        for batch in self.batches():
+            callback(batch)
+
+    def decode(self, indexes):
+        """Get names for the name indexes (e.g., ``batch["name"]``)"""
+        self._updateNames()
+        names = self.names + [None]
+        if numpy is None:
+            return [names[min(i, len(self.names))] for i in indexes]
+        indexes = numpy.minimum(numpy.asarray(indexes, dtype=numpy.int64), len(self.names))
+        return numpy.asarray(names, dtype=object)[indexes]
+
+    def _pop(self):
+        nRecords = self._batcher.GetBatchSize()
+        batch = (Record * nRecords)()
+        ctypes.memmove(batch, self._batcher.GetBatchAddress(), ctypes.sizeof(batch))
+        self._batcher.PopBatch()
+        if numpy is None:
+            return batch
+        return numpy.ctypeslib.as_array(batch)
+
+    def _updateNames(self):
+        size = self._batcher.GetNameDataSize()
+        if size == self._nameDataSize:
+            return
+        # names are only appended, read only the new ones
+        data = ctypes.string_at(self._batcher.GetNameDataAddress() + self._nameDataSize,
+                                size - self._nameDataSize)
+        self.names.extend(name.decode("utf-8") for name in data.split(b"\0")[:-1])
+        self._nameDataSize = size
@@ -0,0 +1,82 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Vectorized FIB queries, e.g.::
+
+    from ns.ndnSIM_fib import lookup
+
+    names = ["/prefix/%d" % i for i in range(1000000)]    # or ndn.Name objects, or NumPy array
+    results = lookup(node, names)                          # longest prefix match
+    unrouted = numpy.asarray(names)[results["faceId"] == -1]
+
+    results = lookup(node, ["/prefix"], exactMatch=True)   # exact match
+
+Each row of the result contains FaceId and cost of the best (lowest cost) next hop of the
+matched FIB entry, number of next hops of the entry, and number of components in the matched
+prefix (see ndn::FibLookup::Result).  faceId is -1 when no entry matches or the entry has no
+next hops; prefixLength is -1 when no entry matches or the name is not a valid URI.
+
+The results are structured NumPy arrays, or ctypes arrays of Result structures when NumPy is
+not available.  Individual names can also be queried using ``ndn.FibLookup(node)``
+``findLongestPrefixMatch(name)`` and ``findExactMatch(prefix)`` methods.
+"""
+
+import ctypes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ns.ndnSIM import ndn
+
+
+class Result(ctypes.Structure):
+    """Result of a FIB query (see ndn::FibLookup::Result)"""
+    _fields_ = [("faceId", ctypes.c_int64),
+                ("cost", ctypes.c_uint64),
+                ("nNextHops", ctypes.c_uint32),
+                ("prefixLength", ctypes.c_int32)]
+
+
+def lookup(node, names, exactMatch=False):
+    """Look up FIB of the node for each of the names
+
+    :param node: ns.network.Node with NDN stack installed (or ndn.FibLookup created for the
+                 node, to reuse it for several queries)
+    :param names: iterable of URI strings or ndn.Name objects
+    :param exactMatch: whether to perform exact match instead of longest prefix match
+    :returns: results in the same order as the names
+    """
+    fibLookup = node if isinstance(node, ndn.FibLookup) else ndn.FibLookup(node)
+
+    names = list(names)
+    if len(names) == 0:
+        nResults = 0
+    else:
+        # names are separated by newlines, which are always escaped in URIs
+        nResults = fibLookup.lookupUris("\n".join(str(name) for name in names), exactMatch)
+
+    results = (Result * nResults)()
+    if nResults > 0:
+        ctypes.memmove(results, fibLookup.getResultsAddress(), ctypes.sizeof(results))
+    if numpy is None:
+        return results
+    return numpy.ctypeslib.as_array(results)
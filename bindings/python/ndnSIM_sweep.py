@@ -0,0 +1,291 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Parallel parameter sweeps of Python simulation scenarios, e.g.::
+
+    from ns.ndnSIM_sweep import grid, run, writeTable
+
+    def scenario(params):
+        # build the topology according to params["frequency"], params["csSize"], ...
+        Simulator.Stop(Seconds(20.0))
+        Simulator.Run()
+        return {"satisfied": ...}              # summary of the run
+
+    if __name__ == "__main__":
+        results = run(scenario, grid(frequency=[10, 100], csSize=[100, 1000]), runs=5,
+                      processes=4, outputDir="sweep-results")
+        writeTable(results, "sweep-results/summary.txt")
+
+As ns-3 Simulator is a process-wide singleton, each simulation run is executed in a separate
+worker process (at most ``processes`` at a time).  The worker:
+
+- creates a separate output directory for the run and makes it the current directory, so trace
+  files written using relative paths do not clash,
+- seeds the ns-3 random number generators deterministically: all runs use the same seed, and
+  the run number (``RngSeedManager.SetRun``) is the index of the replica, so the same replica of
+  different parameter points uses the same random streams,
+- calls ``scenario(params)`` and destroys the simulator.
+
+The result table has one row (dict) per run, in the order of the parameter grid and replicas,
+with the parameters, ``run``, ``seed``, ``outputDir``, ``wallTime``, ``error`` (traceback of
+a failed run, or None), and the values of the dict returned by the scenario.
+
+Workers are started by forking the main process, so no simulation should be set up there before
+calling ``run``.
+
+When the set up (topology, NDN stacks, routes) takes longer than the simulation itself,
+``ensemble`` runs replicas of an already set up simulation instead (see
+ndn::EnsembleHelper for the C++ equivalent)::
+
+    # set up the simulation, as for Simulator.Run()
+    results = ensemble(runs=10, summary=lambda replica: {"nData": ...}, outputDir="replicas")
+
+Each replica is a copy-on-write child process, forked just before the simulation is run, which
+gets its own run number (``firstRun`` plus the replica index) and output directory.
+"""
+
+import itertools
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+import traceback
+
+from ns.core import RngSeedManager, Simulator
+
+
+def grid(**parameters):
+    """Get all combinations of the parameter values (cartesian product), as a list of dicts
+
+    The parameters are varied in the order of their names, the last one changes fastest, e.g.,
+    ``grid(a=[1, 2], b=["x", "y"])`` is ``[{"a": 1, "b": "x"}, {"a": 1, "b": "y"}, ...]``.
+    """
+    names = sorted(parameters.keys())
+    return [dict(zip(names, values))
+            for values in itertools.product(*[parameters[name] for name in names])]
+
+
+def _pointName(index, params):
+    name = "-".join("%s=%s" % (key, params[key]) for key in sorted(params.keys()))
+    name = "".join(c if c.isalnum() or c in "=-_." else "_" for c in name)
+    return "%04d-%s" % (index, name) if name else "%04d" % index
+
+
+def _runOne(task):
+    scenario, params, replica, seed, outputDir = task
+
+    result = dict(params)
+    result.update({"run": replica, "seed": seed, "outputDir": outputDir, "wallTime": 0.0,
+                   "error": None})
+
+    startTime = time.time()
+    try:
+        if not os.path.isdir(outputDir):
+            os.makedirs(outputDir)
+        os.chdir(outputDir)
+
+        RngSeedManager.SetSeed(seed)
+        RngSeedManager.SetRun(replica)
+
+        summary = scenario(dict(params))
+        if summary is not None:
+            result.update(summary)
+    except Exception:
+        result["error"] = traceback.format_exc()
+    finally:
+        Simulator.Destroy()
+    result["wallTime"] = time.time() - startTime
+    return result
+
+
+def run(scenario, points, runs=1, processes=None, outputDir="sweep", seed=1, firstRun=1,
+        progress=None):
+    """Run the scenario for each parameter point and replica in a pool of worker processes
+
+    :param scenario: module-level function, which accepts dict of parameters, runs the
+                     simulation, and returns dict with the summary of the run (or None)
+    :param points: list of parameter dicts (e.g., result of ``grid()``)
+    :param runs: number of replicas of each parameter point
+    :param processes: maximum number of simultaneously running simulations (default, number of
+                      CPUs)
+    :param outputDir: directory, under which each run gets a separate output directory
+    :param seed: seed of the random number generators, same for all runs
+    :param firstRun: run number of the first replica
+    :param progress: optional function, called with each result as soon as the run completes
+    :returns: list of results, one dict per run
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    outputDir = os.path.abspath(outputDir)
+
+    tasks = []
+    for index, params in enumerate(points):
+        pointDir = os.path.join(outputDir, _pointName(index, params))
+        for replica in range(firstRun, firstRun + runs):
+            tasks.append((scenario, params, replica, seed,
+                          os.path.join(pointDir, "run%d" % replica)))
+
+    # each simulation gets a fresh process, as simulator and tracer state is global
+    pool = multiprocessing.Pool(processes=max(1, min(processes, len(tasks))), maxtasksperchild=1)
+    try:
+        results = []
+        for result in pool.imap(_runOne, tasks):
+            if progress is not None:
+                progress(result)
+            results.append(result)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return results
+
+
+def _runReplica(replica, run, outputDir, replicaSetup, summary, resultFile):
+    result = {"run": run, "seed": RngSeedManager.GetSeed(), "outputDir": outputDir,
+              "wallTime": 0.0, "error": None}
+    startTime = time.time()
+    try:
+        if outputDir is not None:
+            if not os.path.isdir(outputDir):
+                os.makedirs(outputDir)
+            os.chdir(outputDir)
+
+        RngSeedManager.SetRun(run)
+        if replicaSetup is not None:
+            replicaSetup(replica)
+
+        Simulator.Run()
+        if summary is not None:
+            values = summary(replica)
+            if values is not None:
+                result.update(values)
+        Simulator.Destroy()
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["wallTime"] = time.time() - startTime
+
+    try:
+        pickle.dump(result, resultFile, pickle.HIGHEST_PROTOCOL)
+        resultFile.flush()
+    except Exception:
+        os._exit(2)
+    os._exit(1 if result["error"] is not None else 0)
+
+
+def ensemble(runs, replicaSetup=None, summary=None, processes=None, firstRun=None,
+             outputDir=None):
+    """Run replicas of the already set up simulation in forked child processes
+
+    Call ``ensemble`` instead of ``Simulator.Run()``.  Random variables first used during the
+    simulation (e.g., in ndnSIM applications) get the replica's run number, while random
+    variable streams created during the set up keep their state, unless they are reassigned by
+    ``replicaSetup``.
+
+    :param runs: number of replicas
+    :param replicaSetup: optional function, called with the replica index in the child process
+                         before the simulation is run (e.g., to create trace event subscriptions)
+    :param summary: optional function, called with the replica index in the child process after
+                    the simulation is run, which returns dict with the summary of the replica
+    :param processes: maximum number of simultaneously running replicas (default, number of
+                      CPUs)
+    :param firstRun: run number of the first replica (default, the current run number)
+    :param outputDir: directory, under which each replica gets a separate output directory
+                      (default, the replicas run in the current directory)
+    :returns: list of results, one dict per replica (same columns as the results of ``run``)
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if firstRun is None:
+        firstRun = RngSeedManager.GetRun()
+    if outputDir is not None:
+        outputDir = os.path.abspath(outputDir)
+
+    results = [None] * runs
+    running = {}
+
+    def waitForReplica():
+        pid, status = os.wait()
+        if pid not in running:
+            return
+        replica, resultFile = running.pop(pid)
+        resultFile.seek(0)
+        try:
+            results[replica] = pickle.load(resultFile)
+        except Exception:
+            results[replica] = {"run": firstRun + replica, "seed": RngSeedManager.GetSeed(),
+                                "outputDir": None, "wallTime": 0.0,
+                                "error": "Replica exited with status %d" % status}
+        resultFile.close()
+
+    for replica in range(runs):
+        while len(running) >= max(1, processes):
+            waitForReplica()
+
+        replicaDir = None
+        if outputDir is not None:
+            replicaDir = os.path.join(outputDir, "run%d" % (firstRun + replica))
+        resultFile = tempfile.TemporaryFile()
+
+        # otherwise, the buffered output would be written by both processes
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _runReplica(replica, firstRun + replica, replicaDir, replicaSetup, summary,
+                            resultFile)
+            finally:
+                os._exit(3)
+        running[pid] = (replica, resultFile)
+
+    while running:
+        waitForReplica()
+    return results
+
+
+def columns(results):
+    """Get names of all columns of the result table (run information columns are last)"""
+    names = []
+    for result in results:
+        for name in sorted(result.keys()):
+            if name not in names:
+                names.append(name)
+    fixed = ["run", "seed", "wallTime", "error", "outputDir"]
+    return [name for name in names if name not in fixed] + fixed
+
+
+def writeTable(results, path):
+    """Write the result table as a tab-separated file (errors are reduced to the last line)"""
+    names = columns(results)
+    with open(path, "w") as f:
+        f.write("\t".join(names) + "\n")
+        for result in results:
+            values = []
+            for name in names:
+                value = result.get(name)
+                if name == "error" and value is not None:
+                    value = value.strip().splitlines()[-1]
+                values.append("" if value is None else str(value).replace("\t", " "))
+            f.write("\t".join(values) + "\n")
@@ -0,0 +1,118 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Bulk export of FIB, PIT, and CS contents of all (or selected) nodes, e.g.::
+
+    from ns.ndnSIM_tables import snapshot
+
+    tables = snapshot()                     # or snapshot(nodes) for a NodeContainer
+    fib = tables.fib                        # one row per next hop: node, prefix, faceId, cost
+    prefixes = tables.decode(fib["prefix"])
+    sizes = tables.sizes                    # one row per node: node, nFibEntries, ...
+
+The tables are copied from the simulator in one call per table into structured NumPy arrays.
+When NumPy is not available, the tables are ctypes arrays of structures, which support the
+buffer protocol (e.g., ``memoryview(tables.fib)``).  Names are stored as indexes in
+``tables.strings``, shared by all tables.
+"""
+
+import ctypes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ns.ndnSIM import ndn
+
+
+class FibRecord(ctypes.Structure):
+    """Next hop of a FIB entry (faceId is -1 for entries without next hops)"""
+    _fields_ = [("node", ctypes.c_uint32),
+                ("prefix", ctypes.c_uint32),
+                ("faceId", ctypes.c_int64),
+                ("cost", ctypes.c_uint64)]
+
+
+class NameRecord(ctypes.Structure):
+    """Name of a PIT or CS entry"""
+    _fields_ = [("node", ctypes.c_uint32),
+                ("name", ctypes.c_uint32)]
+
+
+class SizesRecord(ctypes.Structure):
+    """Number of FIB, PIT, and CS entries on a node"""
+    _fields_ = [("node", ctypes.c_uint32),
+                ("padding", ctypes.c_uint32),
+                ("nFibEntries", ctypes.c_uint64),
+                ("nPitEntries", ctypes.c_uint64),
+                ("nCsEntries", ctypes.c_uint64)]
+
+
+def _copy(recordType, address, nRecords):
+    records = (recordType * nRecords)()
+    if nRecords > 0:
+        ctypes.memmove(records, address, ctypes.sizeof(records))
+    if numpy is None:
+        return records
+    return numpy.ctypeslib.as_array(records)
+
+
+class TablesSnapshot(object):
+    """Contents of FIB, PIT, and CS of the simulated nodes
+
+    :ivar fib: FIB next hops (see FibRecord)
+    :ivar pit: names of PIT entries (see NameRecord), empty if names were not requested
+    :ivar cs: names of CS entries (see NameRecord), empty if names were not requested
+    :ivar sizes: number of entries in each table of each node (see SizesRecord)
+    :ivar strings: interned names, indexed by FibRecord.prefix and NameRecord.name
+    """
+
+    def __init__(self, nodes=None, includeNames=True):
+        if nodes is None:
+            tables = ndn.TablesSnapshot(includeNames)
+        else:
+            tables = ndn.TablesSnapshot(nodes, includeNames)
+
+        self.fib = _copy(FibRecord, tables.getFibAddress(), tables.getNFibRecords())
+        self.pit = _copy(NameRecord, tables.getPitAddress(), tables.getNPitRecords())
+        self.cs = _copy(NameRecord, tables.getCsAddress(), tables.getNCsRecords())
+        self.sizes = _copy(SizesRecord, tables.getSizesAddress(), tables.getNSizesRecords())
+
+        stringData = ctypes.string_at(tables.getStringDataAddress(), tables.getStringDataSize())
+        self.strings = [s.decode("utf-8") for s in stringData.split(b"\0")[:-1]]
+
+    def decode(self, indexes):
+        """Get names for the string table indexes (e.g., ``tables.fib["prefix"]``)"""
+        if numpy is None:
+            return [self.strings[i] for i in indexes]
+        return numpy.asarray(self.strings, dtype=object)[indexes]
+
+    def find(self, name):
+        """Get string table index of the name (or -1, if the name is not in any table)"""
+        try:
+            return self.strings.index(name)
+        except ValueError:
+            return -1
+
+
+def snapshot(nodes=None, includeNames=True):
+    """Take snapshot of FIB, PIT, and CS of all nodes (or nodes of the NodeContainer)"""
+    return TablesSnapshot(nodes, includeNames)
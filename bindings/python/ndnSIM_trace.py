@@ -0,0 +1,151 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Reader of the trace files written by ndnSIM trace helpers in binary format, e.g.::
+
+    L3RateTracer::InstallAll("rate-trace.bin", Seconds(1.0), TraceFormat::BINARY);
+
+The records are memory-mapped into a NumPy record array without any parsing (gzip-compressed
+traces, e.g., "rate-trace.bin.gz", are decompressed into memory instead)::
+
+    from ns.ndnSIM_trace import load
+
+    trace = load("rate-trace.bin")
+    rates = trace.records                  # numpy.recarray, one row per record
+    outData = rates[trace.select("Type", "OutData")]
+    nodes = trace.decode("Node")           # string columns as an array of str objects
+"""
+
+import gzip
+import io
+import os
+import struct
+
+import numpy
+
+MAGIC = b"NDNTRACE"
+_GZIP_MAGIC = b"\x1f\x8b"
+VERSION = 1
+
+_HEADER = struct.Struct("=8sIIII")
+_COLUMN = struct.Struct("=I4sI")
+_TRAILER = struct.Struct("=QQ8s")
+
+# "str" columns contain uint32 indexes in the string table
+_FORMATS = {"f8": "f8", "i4": "i4", "u4": "u4", "u8": "u8", "str": "u4"}
+
+
+class TraceFile(object):
+    """Binary trace file, memory-mapped into a NumPy record array
+
+    :ivar records: numpy.recarray with one field per trace column
+    :ivar strings: string table, indexed by values of the string columns
+    :ivar columns: list of (name, type) tuples in the order of the trace columns
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            isCompressed = f.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+
+        if isCompressed:
+            # compressed traces cannot be memory-mapped
+            with gzip.open(path, "rb") as f:
+                data = f.read()
+            headerSize, nRecords = self._readHeaderAndStrings(io.BytesIO(data), len(data))
+            records = numpy.frombuffer(data, dtype=self.dtype, count=nRecords, offset=headerSize)
+        else:
+            with open(path, "rb") as f:
+                headerSize, nRecords = self._readHeaderAndStrings(f, os.path.getsize(path))
+            if nRecords > 0:
+                records = numpy.memmap(path, dtype=self.dtype, mode="r", offset=headerSize,
+                                       shape=(nRecords,))
+            else:
+                records = numpy.zeros(0, dtype=self.dtype)
+
+        self.records = records.view(numpy.recarray)
+
+    def _readHeaderAndStrings(self, f, fileSize):
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Incomplete binary ndnSIM trace")
+        magic, version, headerSize, recordSize, nColumns = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Not a binary ndnSIM trace")
+        if version != VERSION:
+            raise ValueError("Unsupported version %d of the binary trace" % version)
+
+        self.columns = []
+        names, formats, offsets = [], [], []
+        for i in range(nColumns):
+            offset, type, nameSize = _COLUMN.unpack(f.read(_COLUMN.size))
+            type = type.rstrip(b"\0").decode("ascii")
+            name = f.read(nameSize).decode("utf-8")
+            self.columns.append((name, type))
+            names.append(name)
+            formats.append(_FORMATS[type])
+            offsets.append(offset)
+
+        self.dtype = numpy.dtype({"names": names, "formats": formats, "offsets": offsets,
+                                  "itemsize": recordSize})
+
+        self.strings = []
+        if fileSize >= headerSize + _TRAILER.size:
+            f.seek(fileSize - _TRAILER.size)
+            stringTableOffset, nRecords, endMagic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if endMagic == MAGIC:
+                f.seek(stringTableOffset)
+                self.strings = _readStrings(f)
+                return headerSize, nRecords
+
+        # the trace is still being written (or writing was interrupted):
+        # map all complete records, string columns cannot be decoded
+        return headerSize, max(fileSize - headerSize, 0) // recordSize
+
+    def __len__(self):
+        return len(self.records)
+
+    def decode(self, column):
+        """Get values of the string column as an array of str objects"""
+        return numpy.asarray(self.strings, dtype=object)[self.records[column]]
+
+    def select(self, column, value):
+        """Get boolean mask of records with the given value of the string column
+
+        The comparison is done on the string table indexes, without decoding the column.
+        """
+        try:
+            index = self.strings.index(value)
+        except ValueError:
+            return numpy.zeros(len(self.records), dtype=bool)
+        return self.records[column] == index
+
+
+def _readStrings(f):
+    (nStrings,) = struct.unpack("=I", f.read(4))
+    strings = []
+    for i in range(nStrings):
+        (size,) = struct.unpack("=I", f.read(4))
+        strings.append(f.read(size).decode("utf-8"))
+    return strings
+
+
+def load(path):
+    """Open binary trace file written by ndnSIM trace helpers"""
+    return TraceFile(path)
@@ -118,6 +118,14 @@ Simulator.Run()
 # for i in cs:
 #     print " - %s" % i.getName()
 
+# # Or export FIB, PIT, and CS of all nodes at once into NumPy arrays
+
+# from ns.ndnSIM_tables import snapshot
+# tables = snapshot()
+# for node, prefix, faceId, cost in tables.fib:
+#     print "node %d: %s -> face %d (cost: %d)" % (node, tables.strings[prefix], faceId, cost)
+# print "Total PIT size: %d" % tables.sizes["nPitEntries"].sum()
+
 Simulator.Destroy()
 
 # # or run using the visualizer
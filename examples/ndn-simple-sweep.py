@@ -0,0 +1,88 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+
+# ndn-simple-sweep.py
+
+from ns.core import *
+from ns.network import *
+from ns.point_to_point import *
+from ns.ndnSIM import *
+
+from ns.ndnSIM_events import Subscription
+from ns.ndnSIM_sweep import grid, run, writeTable
+
+#
+# This scenario runs the topology of ndn-simple.py for several consumer frequencies and
+# content store sizes, with 3 replicas of each combination, in parallel worker processes:
+#
+#      +----------+     1Mbps      +--------+     1Mbps      +----------+
+#      | consumer | <------------> | router | <------------> | producer |
+#      +----------+         10ms   +--------+          10ms  +----------+
+#
+# Summary of each run (number of retrieved Data packets and their mean delay) is collected
+# from batched trace events and written into ndn-simple-sweep/summary.txt.
+#
+# To run scenario, use the following command:
+#
+#     ./waf --pyrun=src/ndnSIM/examples/ndn-simple-sweep.py
+#
+
+def scenario(params):
+    Config.SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("1Mbps"))
+    Config.SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"))
+    Config.SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"))
+
+    nodes = NodeContainer()
+    nodes.Create(3)
+
+    p2p = PointToPointHelper()
+    p2p.Install(nodes.Get(0), nodes.Get(1))
+    p2p.Install(nodes.Get(1), nodes.Get(2))
+
+    ndnHelper = ndn.StackHelper()
+    ndnHelper.SetDefaultRoutes(True)
+    ndnHelper.setCsSize(params["csSize"])
+    ndnHelper.InstallAll()
+
+    ndn.StrategyChoiceHelper.InstallAll("/prefix", "/localhost/nfd/strategy/best-route")
+
+    consumerHelper = ndn.AppHelper("ns3::ndn::ConsumerZipfMandelbrot")
+    consumerHelper.SetPrefix("/prefix")
+    consumerHelper.SetAttribute("Frequency", StringValue(str(params["frequency"])))
+    consumerHelper.SetAttribute("NumberOfContents", StringValue("1000"))
+    consumerHelper.Install(nodes.Get(0))
+
+    producerHelper = ndn.AppHelper("ns3::ndn::Producer")
+    producerHelper.SetPrefix("/prefix")
+    producerHelper.SetAttribute("PayloadSize", StringValue("1024"))
+    producerHelper.Install(nodes.Get(2))
+
+    events = Subscription(nodes, batchSize=100000, types=[Subscription.FIRST_INTEREST_DATA_DELAY])
+
+    Simulator.Stop(Seconds(20.0))
+    nData, totalDelay = 0, 0.0
+    for batch in events.batches():
+        nData += len(batch)
+        totalDelay += sum(record["delay"] for record in batch)
+
+    return {"nData": nData, "meanDelay": totalDelay / nData if nData > 0 else 0.0}
+
+if __name__ == "__main__":
+    results = run(scenario, grid(frequency=[10, 50, 100], csSize=[10, 100]), runs=3,
+                  outputDir="ndn-simple-sweep")
+    writeTable(results, "ndn-simple-sweep/summary.txt")
@@ -0,0 +1,234 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-ensemble-helper.hpp"
+
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-stream.hpp"
+
+#include "ns3/simulator.h"
+#include "ns3/rng-seed-manager.h"
+#include "ns3/log.h"
+
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include <cstdlib>
+#include <fstream>
+#include <iostream>
+#include <map>
+#include <thread>
+
+NS_LOG_COMPONENT_DEFINE("ndn.EnsembleHelper");
+
+namespace ns3 {
+namespace ndn {
+
+EnsembleHelper::EnsembleHelper(uint32_t nReplicas, uint32_t maxParallel/* = 0*/)
+  : m_nReplicas(nReplicas)
+  , m_maxParallel(maxParallel)
+  , m_firstRun(RngSeedManager::GetRun())
+{
+  if (m_maxParallel == 0) {
+    m_maxParallel = std::max(std::thread::hardware_concurrency(), 1u);
+  }
+}
+
+void
+EnsembleHelper::SetFirstRun(uint32_t run)
+{
+  m_firstRun = run;
+}
+
+void
+EnsembleHelper::SetReplicaSetup(const ReplicaSetup& setup)
+{
+  m_setup = setup;
+}
+
+void
+EnsembleHelper::SetSummary(const SummaryCallback& summary)
+{
+  m_summary = summary;
+}
+
+std::vector<EnsembleHelper::Result>
+EnsembleHelper::Run()
+{
+  NS_ABORT_MSG_IF(AsyncTraceBuffer::isWriterThreadRunning(),
+                  "Trace files cannot be open when replicas are forked, "
+                  "install tracers in the replica set up callback");
+
+  std::vector<Result> results(m_nReplicas);
+  std::vector<std::FILE*> summaryFiles(m_nReplicas, nullptr);
+  std::map<pid_t, uint32_t> running;
+
+  auto waitForReplica = [&] {
+    int status = 0;
+    pid_t pid = waitpid(-1, &status, 0);
+    if (pid < 0) {
+      NS_FATAL_ERROR("waitpid failed while waiting for " << running.size() << " replicas");
+    }
+
+    auto child = running.find(pid);
+    if (child == running.end()) {
+      return; // not a replica
+    }
+    uint32_t replica = child->second;
+    running.erase(child);
+
+    results[replica].status = WIFEXITED(status) ? WEXITSTATUS(status) : -1;
+
+    std::FILE* file = summaryFiles[replica];
+    std::rewind(file);
+    char buffer[4096];
+    size_t size = 0;
+    while ((size = std::fread(buffer, 1, sizeof(buffer), file)) > 0) {
+      results[replica].summary.append(buffer, size);
+    }
+    std::fclose(file);
+    summaryFiles[replica] = nullptr;
+
+    NS_LOG_DEBUG("Replica " << replica << " finished with status " << results[replica].status);
+  };
+
+  for (uint32_t replica = 0; replica < m_nReplicas; replica++) {
+    while (running.size() >= m_maxParallel) {
+      waitForReplica();
+    }
+
+    results[replica].replica = replica;
+    results[replica].run = m_firstRun + replica;
+    results[replica].status = -1;
+
+    summaryFiles[replica] = std::tmpfile();
+    NS_ABORT_MSG_IF(summaryFiles[replica] == nullptr, "Cannot create temporary file");
+
+    // otherwise, the buffered output would be written by both processes
+    std::cout.flush();
+    std::cerr.flush();
+    std::fflush(nullptr);
+
+    pid_t pid = fork();
+    NS_ABORT_MSG_IF(pid < 0, "Cannot fork replica " << replica);
+    if (pid == 0) {
+      RunReplica(replica, summaryFiles[replica]);
+    }
+    running[pid] = replica;
+  }
+
+  while (!running.empty()) {
+    waitForReplica();
+  }
+  return results;
+}
+
+void
+EnsembleHelper::RunReplica(uint32_t replica, std::FILE* summaryFile)
+{
+  int status = 0;
+  try {
+    RngSeedManager::SetRun(m_firstRun + replica);
+
+    if (m_setup != nullptr) {
+      m_setup(replica);
+    }
+
+    Simulator::Run();
+
+    if (m_summary != nullptr) {
+      std::string summary = m_summary(replica);
+      std::fwrite(summary.data(), 1, summary.size(), summaryFile);
+    }
+    std::fflush(summaryFile);
+
+    Simulator::Destroy();
+  }
+  catch (const std::exception& e) {
+    std::cerr << "Replica " << replica << " failed: " << e.what() << std::endl;
+    status = 1;
+  }
+
+  // destructors of the static objects (e.g., installed tracers) flush the trace files
+  std::exit(status);
+}
+
+std::string
+EnsembleHelper::GetReplicaFileName(const std::string& file, uint32_t replica)
+{
+  if (file == "-") {
+    return file;
+  }
+
+  std::string name = file;
+  std::string suffix;
+  if (name.size() > 3 && name.compare(name.size() - 3, 3, ".gz") == 0) {
+    suffix = ".gz";
+    name.resize(name.size() - 3);
+  }
+
+  size_t dot = name.rfind('.');
+  size_t slash = name.rfind('/');
+  if (dot != std::string::npos && dot != 0 && (slash == std::string::npos || dot > slash + 1)) {
+    suffix = name.substr(dot) + suffix;
+    name.resize(dot);
+  }
+
+  return name + "-" + std::to_string(replica) + suffix;
+}
+
+uint32_t
+EnsembleHelper::MergeTraceFiles(const std::string& file, uint32_t nReplicas)
+{
+  std::ofstream os(file.c_str(), std::ios_base::out | std::ios_base::trunc);
+  if (!os.is_open()) {
+    NS_LOG_ERROR("File " << file << " cannot be opened for writing");
+    return 0;
+  }
+
+  uint32_t nMerged = 0;
+  bool hasHeader = false;
+  for (uint32_t replica = 0; replica < nReplicas; replica++) {
+    std::ifstream is(GetReplicaFileName(file, replica).c_str());
+    if (!is.is_open()) {
+      NS_LOG_WARN("Trace file of replica " << replica << " cannot be opened");
+      continue;
+    }
+    nMerged++;
+
+    std::string line;
+    bool isFirstLine = true;
+    while (std::getline(is, line)) {
+      if (isFirstLine) {
+        isFirstLine = false;
+        if (!hasHeader) {
+          os << "Replica\t" << line << "\n";
+          hasHeader = true;
+        }
+        continue;
+      }
+      os << replica << "\t" << line << "\n";
+    }
+  }
+  return nMerged;
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,148 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_ENSEMBLE_HELPER_HPP
+#define NDN_ENSEMBLE_HELPER_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+
+#include <boost/noncopyable.hpp>
+
+#include <cstdio>
+#include <functional>
+#include <string>
+#include <vector>
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @ingroup ndn-helpers
+ * @brief Helper to run several replicas of a simulation, which share the same set up network
+ *
+ * The topology, NDN stacks, routes, and applications are created once, and Run() (which
+ * replaces Simulator::Run()) forks a copy-on-write child process for each replica.  Each child:
+ *
+ * - sets the run number of the random number generators to the first run number plus the
+ *   replica index (random variables that are first used during the simulation, e.g., in
+ *   ndnSIM applications, use the replica's run; random variable streams created during the set
+ *   up keep their state, unless streams are reassigned in the replica set up callback),
+ * - calls the replica set up callback, which should install the tracers with the replica's
+ *   output files (e.g., named using GetReplicaFileName()),
+ * - runs the simulation, calls the summary callback, and sends the summary to the parent.
+ *
+ * At most @p maxParallel children run at the same time.  Trace files must not be open in the
+ * parent process when Run() is called, as the background thread writing them does not survive
+ * fork().
+ *
+ *     ndn::EnsembleHelper ensemble(10);
+ *     ensemble.SetReplicaSetup([] (uint32_t replica) {
+ *         ndn::L3RateTracer::InstallAll(ndn::EnsembleHelper::GetReplicaFileName("rate-trace.txt",
+ *                                                                               replica),
+ *                                       Seconds(1.0));
+ *       });
+ *     ensemble.Run();
+ *     ndn::EnsembleHelper::MergeTraceFiles("rate-trace.txt", 10);
+ */
+class EnsembleHelper : boost::noncopyable {
+public:
+  typedef std::function<void(uint32_t replica)> ReplicaSetup;
+  typedef std::function<std::string(uint32_t replica)> SummaryCallback;
+
+  /**
+   * @brief Outcome of a replica
+   */
+  struct Result
+  {
+    uint32_t replica;
+    uint32_t run;    ///< @brief run number of the random number generators
+    int status;      ///< @brief exit status of the child process (-1 if killed by a signal)
+    std::string summary;
+  };
+
+public:
+  /**
+   * @param nReplicas   Number of replicas
+   * @param maxParallel Maximum number of simultaneously running replicas (default, number of
+   *                    CPUs)
+   */
+  explicit
+  EnsembleHelper(uint32_t nReplicas, uint32_t maxParallel = 0);
+
+  /**
+   * @brief Set run number of the first replica (default, the current run number)
+   */
+  void
+  SetFirstRun(uint32_t run);
+
+  /**
+   * @brief Set callback, called in each child process before the simulation is run
+   */
+  void
+  SetReplicaSetup(const ReplicaSetup& setup);
+
+  /**
+   * @brief Set callback, called in each child process after the simulation is run, which
+   *        returns the summary of the replica
+   */
+  void
+  SetSummary(const SummaryCallback& summary);
+
+  /**
+   * @brief Run all replicas and wait for them to finish
+   * @return results of the replicas, in the order of the replicas
+   */
+  std::vector<Result>
+  Run();
+
+  /**
+   * @brief Get name of the replica's output file, e.g., "rate-trace-3.txt" (or
+   *        "rate-trace-3.txt.gz") for "rate-trace.txt" (or "rate-trace.txt.gz") and replica 3
+   */
+  static std::string
+  GetReplicaFileName(const std::string& file, uint32_t replica);
+
+  /**
+   * @brief Merge text trace files of the replicas into @p file
+   *
+   * The files of the replicas (named by GetReplicaFileName()) are concatenated, with the
+   * header written only once, and with replica index prepended as the first column.
+   *
+   * @return number of merged files
+   */
+  static uint32_t
+  MergeTraceFiles(const std::string& file, uint32_t nReplicas);
+
+private:
+  void
+  RunReplica(uint32_t replica, std::FILE* summaryFile);
+
+private:
+  uint32_t m_nReplicas;
+  uint32_t m_maxParallel;
+  uint32_t m_firstRun;
+  ReplicaSetup m_setup;
+  SummaryCallback m_summary;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_ENSEMBLE_HELPER_HPP
@@ -39,6 +39,9 @@
 #include "ns3/data-rate.h"
 
 #include "daemon/mgmt/fib-manager.hpp"
+#include "daemon/fw/forwarder.hpp"
+#include "daemon/table/fib.hpp"
+#include "daemon/table/fib-entry.hpp"
 #include "ns3/ndnSIM/model/ndn-l3-protocol.hpp"
 #include "ns3/ndnSIM/helper/ndn-stack-helper.hpp"
 
@@ -51,6 +54,23 @@ NS_LOG_COMPONENT_DEFINE("ndn.FibHelper");
 void
 FibHelper::AddNextHop(const ControlParameters& parameters, Ptr<Node> node)
 {
+  Ptr<L3Protocol> l3protocol = node->GetObject<L3Protocol>();
+  shared_ptr<nfd::FibManager> fibManager = l3protocol->getFibManager();
+
+  if (fibManager == nullptr) {
+    // lean stack without NFD management, update FIB directly
+    shared_ptr<nfd::Forwarder> forwarder = l3protocol->getForwarder();
+    shared_ptr<Face> face = forwarder->getFace(parameters.getFaceId());
+    if (face == nullptr) {
+      NS_LOG_DEBUG("Face " << parameters.getFaceId() << " not found");
+      return;
+    }
+
+    shared_ptr<nfd::fib::Entry> entry = forwarder->getFib().insert(parameters.getName()).first;
+    entry->addNextHop(face, parameters.getCost());
+    return;
+  }
+
   NS_LOG_DEBUG("Add Next Hop command was initialized");
   Block encodedParameters(parameters.wireEncode());
 
@@ -61,14 +81,31 @@ FibHelper::AddNextHop(const ControlParameters& parameters, Ptr<Node> node)
   shared_ptr<Interest> command(make_shared<Interest>(commandName));
   StackHelper::getKeyChain().sign(*command);
 
-  Ptr<L3Protocol> l3protocol = node->GetObject<L3Protocol>();
-  shared_ptr<nfd::FibManager> fibManager = l3protocol->getFibManager();
   fibManager->onFibRequest(*command);
 }
 
 void
 FibHelper::RemoveNextHop(const ControlParameters& parameters, Ptr<Node> node)
 {
+  Ptr<L3Protocol> L3protocol = node->GetObject<L3Protocol>();
+  shared_ptr<nfd::FibManager> fibManager = L3protocol->getFibManager();
+
+  if (fibManager == nullptr) {
+    // lean stack without NFD management, update FIB directly
+    shared_ptr<nfd::Forwarder> forwarder = L3protocol->getForwarder();
+    shared_ptr<Face> face = forwarder->getFace(parameters.getFaceId());
+    shared_ptr<nfd::fib::Entry> entry = forwarder->getFib().findExactMatch(parameters.getName());
+    if (face == nullptr || entry == nullptr) {
+      return;
+    }
+
+    entry->removeNextHop(face);
+    if (!entry->hasNextHops()) {
+      forwarder->getFib().erase(*entry);
+    }
+    return;
+  }
+
   NS_LOG_DEBUG("Remove Next Hop command was initialized");
   Block encodedParameters(parameters.wireEncode());
 
@@ -79,8 +116,6 @@ FibHelper::RemoveNextHop(const ControlParameters& parameters, Ptr<Node> node)
   shared_ptr<Interest> command(make_shared<Interest>(commandName));
   StackHelper::getKeyChain().sign(*command);
 
-  Ptr<L3Protocol> L3protocol = node->GetObject<L3Protocol>();
-  shared_ptr<nfd::FibManager> fibManager = L3protocol->getFibManager();
   // fibManager->addInterestRule(commandName.toUri(), key, *keyChain.getPublicKey (key));
   fibManager->onFibRequest(*command);
 }
@@ -178,6 +213,41 @@ FibHelper::AddRoute(const std::string& nodeName, const Name& prefix,
   AddRoute(node, prefix, otherNode, metric);
 }
 
+size_t
+FibHelper::AddRoutes(const std::vector<RouteInfo>& routes)
+{
+  NS_LOG_DEBUG("Adding " << routes.size() << " routes directly to FIB");
+
+  size_t nInstalled = 0;
+  Ptr<Node> node;
+  shared_ptr<nfd::Forwarder> forwarder;
+  for (const auto& route : routes) {
+    // routes are usually grouped by node, so avoid repeated GetObject lookups
+    if (route.node != node) {
+      node = route.node;
+      Ptr<L3Protocol> ndn = node->GetObject<L3Protocol>();
+      NS_ASSERT_MSG(ndn != 0, "Ndn stack should be installed on the node");
+      forwarder = ndn->getForwarder();
+    }
+
+    shared_ptr<Face> face = forwarder->getFaceTable().get(route.faceId);
+    if (face == nullptr) {
+      NS_LOG_DEBUG("[" << node->GetId() << "]$ route add " << route.prefix << " via face "
+                   << route.faceId << " failed: face not found");
+      continue;
+    }
+
+    NS_LOG_LOGIC("[" << node->GetId() << "]$ route add " << route.prefix << " via "
+                     << face->getLocalUri() << " metric " << route.metric);
+
+    shared_ptr<nfd::fib::Entry> entry = forwarder->getFib().insert(route.prefix).first;
+    entry->addNextHop(face, static_cast<uint64_t>(route.metric));
+    ++nInstalled;
+  }
+
+  return nInstalled;
+}
+
 void
 FibHelper::RemoveRoute(Ptr<Node> node, const Name& prefix, shared_ptr<Face> face)
 {
@@ -260,6 +330,40 @@ FibHelper::RemoveRoute(const std::string& nodeName, const Name& prefix,
   RemoveRoute(node, prefix, otherNode);
 }
 
+size_t
+FibHelper::RemoveRoutes(const std::vector<RouteInfo>& routes)
+{
+  NS_LOG_DEBUG("Removing " << routes.size() << " routes directly from FIB");
+
+  size_t nRemoved = 0;
+  Ptr<Node> node;
+  shared_ptr<nfd::Forwarder> forwarder;
+  for (const auto& route : routes) {
+    if (route.node != node) {
+      node = route.node;
+      Ptr<L3Protocol> ndn = node->GetObject<L3Protocol>();
+      NS_ASSERT_MSG(ndn != 0, "Ndn stack should be installed on the node");
+      forwarder = ndn->getForwarder();
+    }
+
+    shared_ptr<Face> face = forwarder->getFaceTable().get(route.faceId);
+    shared_ptr<nfd::fib::Entry> entry = forwarder->getFib().findExactMatch(route.prefix);
+    if (face == nullptr || entry == nullptr || !entry->hasNextHop(face))
+      continue;
+
+    NS_LOG_LOGIC("[" << node->GetId() << "]$ route del " << route.prefix << " via "
+                     << face->getLocalUri());
+
+    entry->removeNextHop(face);
+    if (!entry->hasNextHops()) {
+      forwarder->getFib().erase(*entry);
+    }
+    ++nRemoved;
+  }
+
+  return nRemoved;
+}
+
 } // namespace ndn
 
 } // namespace ns
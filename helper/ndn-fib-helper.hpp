@@ -29,6 +29,8 @@
 
 #include <ndn-cxx/management/nfd-control-parameters.hpp>
 
+#include <vector>
+
 namespace ns3 {
 namespace ndn {
 
@@ -44,6 +46,17 @@ using ::ndn::nfd::ControlParameters;
  */
 class FibHelper {
 public:
+  /**
+   * @brief Route information for AddRoutes method
+   */
+  struct RouteInfo
+  {
+    Ptr<Node> node;
+    Name prefix;
+    uint32_t faceId;
+    int32_t metric;
+  };
+
   /**
    * \brief Add forwarding entry to FIB
    *
@@ -101,6 +114,20 @@ public:
   AddRoute(const std::string& nodeName, const Name& prefix, const std::string& otherNodeName,
            int32_t metric);
 
+  /**
+   * @brief Add a batch of forwarding entries directly to FIBs of the nodes
+   *
+   * Unlike AddRoute, this method does not encode, sign, and dispatch an add-nexthop
+   * command for each route, but inserts next hops straight into nfd::Fib of the node.
+   * The resulting FIB state is the same as if each route were added using AddRoute.
+   *
+   * \param routes List of routes to install
+   * \returns number of installed routes (routes via non-existing faces are skipped, exactly
+   *          as the FIB manager rejects add-nexthop commands for unknown faces)
+   */
+  static size_t
+  AddRoutes(const std::vector<RouteInfo>& routes);
+
   /**
    * \brief remove forwarding entry in FIB
    *
@@ -151,6 +178,19 @@ public:
   static void
   RemoveRoute(const std::string& nodeName, const Name& prefix, const std::string& otherNodeName);
 
+  /**
+   * @brief Remove a batch of forwarding entries directly from FIBs of the nodes
+   *
+   * Counterpart of AddRoutes: next hops are removed straight from nfd::Fib of the node
+   * (metric field of the routes is ignored), and FIB entries left without next hops are
+   * erased, exactly as the FIB manager does for remove-nexthop commands.
+   *
+   * \param routes List of routes to remove
+   * \returns number of removed routes
+   */
+  static size_t
+  RemoveRoutes(const std::vector<RouteInfo>& routes);
+
 private:
   static void
   GenerateCommand(Interest& interest);
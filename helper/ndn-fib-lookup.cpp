@@ -0,0 +1,129 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-fib-lookup.hpp"
+
+#include "ns3/log.h"
+
+#include "daemon/fw/forwarder.hpp"
+#include "daemon/table/fib.hpp"
+#include "daemon/table/fib-entry.hpp"
+#include "ns3/ndnSIM/model/ndn-l3-protocol.hpp"
+
+NS_LOG_COMPONENT_DEFINE("ndn.FibLookup");
+
+namespace ns3 {
+namespace ndn {
+
+// the results are exported to Python as packed structures
+static_assert(sizeof(FibLookup::Result) == 24, "unexpected Result layout");
+
+FibLookup::FibLookup(Ptr<Node> node)
+{
+  Ptr<L3Protocol> l3 = node->GetObject<L3Protocol>();
+  NS_ASSERT_MSG(l3 != 0, "NDN stack should be installed on the node " << node->GetId());
+
+  m_forwarder = l3->getForwarder();
+  m_fib = &m_forwarder->getFib();
+}
+
+FibLookup::Result
+FibLookup::makeResult(const shared_ptr<nfd::fib::Entry>& entry) const
+{
+  Result result{-1, 0, 0, -1};
+  if (entry == nullptr) {
+    return result;
+  }
+
+  result.prefixLength = entry->getPrefix().size();
+  result.nNextHops = entry->getNextHops().size();
+  if (entry->hasNextHops()) {
+    // next hops are ordered by cost
+    const nfd::fib::NextHop& best = entry->getNextHops().front();
+    result.faceId = best.getFace()->getId();
+    result.cost = best.getCost();
+  }
+  return result;
+}
+
+FibLookup::Result
+FibLookup::findLongestPrefixMatch(const Name& name) const
+{
+  shared_ptr<nfd::fib::Entry> entry = m_fib->findLongestPrefixMatch(name);
+  if (!entry->hasNextHops() && entry->getPrefix().empty()
+      && m_fib->findExactMatch(entry->getPrefix()) == nullptr) {
+    // NFD returns a placeholder entry when nothing matches
+    return makeResult(nullptr);
+  }
+  return makeResult(entry);
+}
+
+FibLookup::Result
+FibLookup::findExactMatch(const Name& prefix) const
+{
+  return makeResult(m_fib->findExactMatch(prefix));
+}
+
+const std::vector<FibLookup::Result>&
+FibLookup::lookup(const std::vector<Name>& names, bool isExactMatch/* = false*/)
+{
+  m_results.clear();
+  m_results.reserve(names.size());
+  for (const Name& name : names) {
+    m_results.push_back(isExactMatch ? findExactMatch(name) : findLongestPrefixMatch(name));
+  }
+  return m_results;
+}
+
+size_t
+FibLookup::lookupUris(const std::string& uris, bool isExactMatch/* = false*/)
+{
+  m_results.clear();
+
+  size_t begin = 0;
+  while (true) {
+    size_t end = uris.find('\n', begin);
+    std::string uri = uris.substr(begin, end == std::string::npos ? end : end - begin);
+
+    try {
+      Name name(uri);
+      m_results.push_back(isExactMatch ? findExactMatch(name) : findLongestPrefixMatch(name));
+    }
+    catch (const Name::Error& error) {
+      NS_LOG_DEBUG("Invalid name " << uri << ": " << error.what());
+      m_results.push_back(makeResult(nullptr));
+    }
+
+    if (end == std::string::npos) {
+      break;
+    }
+    begin = end + 1;
+  }
+  return m_results.size();
+}
+
+uint64_t
+FibLookup::getResultsAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_results.data());
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,140 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_FIB_LOOKUP_HPP
+#define NDN_FIB_LOOKUP_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+
+#include "ns3/ptr.h"
+#include "ns3/node.h"
+
+#include <boost/noncopyable.hpp>
+
+#include <string>
+#include <vector>
+
+namespace nfd {
+class Forwarder;
+class Fib;
+namespace fib {
+class Entry;
+} // namespace fib
+} // namespace nfd
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @ingroup ndn-helpers
+ * @brief Longest prefix match and exact match queries to FIB of a node
+ *
+ * Each query returns the best (lowest cost) next hop of the matched FIB entry.  Besides
+ * queries for individual names, FibLookup performs lookups of many names in one call, e.g.,
+ * to validate forwarding tables from Python scripts (see `ns.ndnSIM_fib` module).
+ */
+class FibLookup : boost::noncopyable {
+public:
+  /**
+   * @brief Result of a FIB query
+   */
+  struct Result
+  {
+    /// FaceId of the best next hop, or -1 if there is no matched entry or it has no next hops
+    int64_t faceId;
+    /// cost of the best next hop
+    uint64_t cost;
+    /// number of next hops of the matched entry
+    uint32_t nNextHops;
+    /// number of components in the prefix of the matched entry, or -1 if there is no match
+    int32_t prefixLength;
+  };
+
+public:
+  /**
+   * @brief Create lookup for FIB of the node (NDN stack must be installed on the node)
+   */
+  explicit
+  FibLookup(Ptr<Node> node);
+
+  /**
+   * @brief Find FIB entry with the longest prefix of @p name
+   */
+  Result
+  findLongestPrefixMatch(const Name& name) const;
+
+  /**
+   * @brief Find FIB entry for exactly @p prefix
+   */
+  Result
+  findExactMatch(const Name& prefix) const;
+
+  /**
+   * @brief Perform lookup for each of the names
+   * @param names Names to look up
+   * @param isExactMatch Whether to perform exact match instead of longest prefix match
+   * @return results, in the same order as the names
+   */
+  const std::vector<Result>&
+  lookup(const std::vector<Name>& names, bool isExactMatch = false);
+
+  /**
+   * @brief Perform lookup for each of the names
+   * @param uris Newline-separated URIs of the names, i.e., N-1 newlines for N names
+   *        (prefixLength of the results for invalid URIs is -1)
+   * @param isExactMatch Whether to perform exact match instead of longest prefix match
+   * @return number of results
+   */
+  size_t
+  lookupUris(const std::string& uris, bool isExactMatch = false);
+
+  /**
+   * @brief Get results of the last lookup
+   */
+  const std::vector<Result>&
+  getResults() const
+  {
+    return m_results;
+  }
+
+public: // raw access to the results (for the Python bindings)
+  uint64_t
+  getResultsAddress() const;
+
+  size_t
+  getNResults() const
+  {
+    return m_results.size();
+  }
+
+private:
+  Result
+  makeResult(const shared_ptr<nfd::fib::Entry>& entry) const;
+
+private:
+  shared_ptr<nfd::Forwarder> m_forwarder;
+  const nfd::Fib* m_fib;
+  std::vector<Result> m_results;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_FIB_LOOKUP_HPP
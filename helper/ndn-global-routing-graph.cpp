@@ -0,0 +1,496 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-global-routing-graph.hpp"
+
+#include "ns3/node.h"
+#include "ns3/node-list.h"
+#include "ns3/channel.h"
+#include "ns3/channel-list.h"
+#include "ns3/assert.h"
+
+#include <algorithm>
+#include <functional>
+#include <queue>
+#include <string>
+
+namespace ns3 {
+namespace ndn {
+
+namespace {
+
+/**
+ * @brief 64-bit FNV-1a hash
+ */
+class Fnv1aHash {
+public:
+  void
+  add(const void* data, size_t size)
+  {
+    const uint8_t* bytes = reinterpret_cast<const uint8_t*>(data);
+    for (size_t i = 0; i < size; i++) {
+      m_value = (m_value ^ bytes[i]) * 1099511628211ULL;
+    }
+  }
+
+  template<typename T>
+  void
+  add(const T& value)
+  {
+    add(&value, sizeof(value));
+  }
+
+  uint64_t
+  getValue() const
+  {
+    return m_value;
+  }
+
+private:
+  uint64_t m_value = 14695981039346656037ULL;
+};
+
+typedef std::pair<GlobalRoutingGraph::Distance, GlobalRoutingGraph::VertexId> QueueItem;
+typedef std::priority_queue<QueueItem, std::vector<QueueItem>, std::greater<QueueItem>>
+  PriorityQueue;
+
+} // namespace
+
+const GlobalRoutingGraph::Distance GlobalRoutingGraph::DISTANCE_INF;
+const GlobalRoutingGraph::VertexId GlobalRoutingGraph::INVALID_VERTEX;
+const GlobalRoutingGraph::EdgeId GlobalRoutingGraph::INVALID_EDGE;
+
+GlobalRoutingGraph::GlobalRoutingGraph()
+{
+  for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
+    Ptr<GlobalRouter> gr = (*node)->GetObject<GlobalRouter>();
+    if (gr != 0) {
+      m_routers.push_back(gr);
+      m_nodes.push_back(*node);
+    }
+  }
+
+  for (ChannelList::Iterator channel = ChannelList::Begin(); channel != ChannelList::End();
+       channel++) {
+    Ptr<GlobalRouter> gr = (*channel)->GetObject<GlobalRouter>();
+    if (gr != 0) {
+      m_routers.push_back(gr);
+      m_nodes.push_back(Ptr<Node>());
+    }
+  }
+
+  for (VertexId vertex = 0; vertex < m_routers.size(); vertex++) {
+    m_vertexIds[m_routers[vertex]->GetId()] = vertex;
+  }
+
+  m_isNode.resize(m_routers.size());
+  m_isOrigin.resize(m_routers.size());
+  m_edgeOffsets.reserve(m_routers.size() + 1);
+  for (VertexId vertex = 0; vertex < m_routers.size(); vertex++) {
+    m_isNode[vertex] = (m_nodes[vertex] != 0);
+    m_isOrigin[vertex] = !m_routers[vertex]->GetLocalPrefixes().empty();
+
+    m_edgeOffsets.push_back(m_edgeTargets.size());
+    for (const auto& incidency : m_routers[vertex]->GetIncidencies()) {
+      auto target = m_vertexIds.find(std::get<2>(incidency)->GetId());
+      NS_ASSERT(target != m_vertexIds.end());
+
+      m_edgeSources.push_back(vertex);
+      m_edgeTargets.push_back(target->second);
+
+      const shared_ptr<Face>& face = std::get<1>(incidency);
+      if (face == nullptr) {
+        m_edgeFaceIds.push_back(nfd::INVALID_FACEID);
+        m_edgeMetrics.push_back(0);
+      }
+      else {
+        m_edgeFaceIds.push_back(face->getId());
+        m_edgeMetrics.push_back(static_cast<uint16_t>(face->getMetric()));
+      }
+    }
+  }
+  m_edgeOffsets.push_back(m_edgeTargets.size());
+
+  // counting sort of edge IDs by the target vertex
+  m_inEdgeOffsets.assign(m_routers.size() + 1, 0);
+  for (VertexId target : m_edgeTargets) {
+    m_inEdgeOffsets[target + 1]++;
+  }
+  for (VertexId vertex = 0; vertex < m_routers.size(); vertex++) {
+    m_inEdgeOffsets[vertex + 1] += m_inEdgeOffsets[vertex];
+  }
+
+  m_inEdges.resize(m_edgeTargets.size());
+  std::vector<size_t> positions(m_inEdgeOffsets.begin(), m_inEdgeOffsets.end() - 1);
+  for (EdgeId edge = 0; edge < m_edgeTargets.size(); edge++) {
+    m_inEdges[positions[m_edgeTargets[edge]]++] = edge;
+  }
+}
+
+uint64_t
+GlobalRoutingGraph::calculateFingerprint() const
+{
+  Fnv1aHash hash;
+  hash.add(static_cast<uint32_t>(size()));
+  hash.add(static_cast<uint32_t>(getNEdges()));
+
+  for (VertexId vertex = 0; vertex < size(); vertex++) {
+    hash.add(m_isNode[vertex] ? m_nodes[vertex]->GetId() : std::numeric_limits<uint32_t>::max());
+
+    const auto& prefixes = m_routers[vertex]->GetLocalPrefixes();
+    hash.add(static_cast<uint32_t>(prefixes.size()));
+    for (const auto& prefix : prefixes) {
+      std::string uri = prefix->toUri();
+      hash.add(static_cast<uint32_t>(uri.size()));
+      hash.add(uri.data(), uri.size());
+    }
+
+    hash.add(m_edgeOffsets[vertex + 1]);
+  }
+
+  for (EdgeId edge = 0; edge < getNEdges(); edge++) {
+    hash.add(m_edgeTargets[edge]);
+    hash.add(static_cast<int32_t>(m_edgeFaceIds[edge]));
+    hash.add(m_edgeMetrics[edge]);
+  }
+
+  return hash.getValue();
+}
+
+GlobalRoutingGraph::VertexId
+GlobalRoutingGraph::findVertex(Ptr<GlobalRouter> router) const
+{
+  if (router == 0)
+    return INVALID_VERTEX;
+
+  auto vertex = m_vertexIds.find(router->GetId());
+  if (vertex == m_vertexIds.end() || m_routers[vertex->second] != router)
+    return INVALID_VERTEX;
+  return vertex->second;
+}
+
+void
+GlobalRoutingGraph::calculateShortestPaths(VertexId source, std::vector<PathInfo>& paths) const
+{
+  paths.assign(size(), PathInfo{DISTANCE_INF, nfd::INVALID_FACEID});
+  paths[source].distance = 0;
+
+  PriorityQueue queue;
+  queue.push(QueueItem(0, source));
+
+  while (!queue.empty()) {
+    QueueItem item = queue.top();
+    queue.pop();
+
+    VertexId vertex = item.second;
+    if (item.first != paths[vertex].distance)
+      continue; // stale queue item
+
+    for (EdgeId edge = edgesBegin(vertex); edge != edgesEnd(vertex); edge++) {
+      VertexId target = m_edgeTargets[edge];
+      Distance distance = item.first + m_edgeMetrics[edge];
+      if (distance < paths[target].distance) {
+        paths[target].distance = distance;
+        // the first hop is inherited from the parent, unless the parent is the source itself
+        paths[target].firstHop = (vertex == source) ? m_edgeFaceIds[edge] : paths[vertex].firstHop;
+        queue.push(QueueItem(distance, target));
+      }
+    }
+  }
+}
+
+void
+GlobalRoutingGraph::calculateReverseShortestPaths(VertexId destination,
+                                                  std::vector<Distance>& distances,
+                                                  std::vector<EdgeId>& predecessors) const
+{
+  calculateReverseShortestPaths(std::vector<VertexId>{destination}, distances, predecessors);
+}
+
+void
+GlobalRoutingGraph::calculateReverseShortestPaths(const std::vector<VertexId>& destinations,
+                                                  std::vector<Distance>& distances,
+                                                  std::vector<EdgeId>& predecessors) const
+{
+  distances.assign(size(), DISTANCE_INF);
+  predecessors.assign(size(), INVALID_EDGE);
+
+  PriorityQueue queue;
+  for (VertexId destination : destinations) {
+    distances[destination] = 0;
+    queue.push(QueueItem(0, destination));
+  }
+
+  while (!queue.empty()) {
+    QueueItem item = queue.top();
+    queue.pop();
+
+    VertexId vertex = item.second;
+    if (item.first != distances[vertex])
+      continue; // stale queue item
+
+    for (size_t i = inEdgesBegin(vertex); i != inEdgesEnd(vertex); i++) {
+      EdgeId edge = m_inEdges[i];
+      VertexId source = m_edgeSources[edge];
+      Distance distance = item.first + m_edgeMetrics[edge];
+      if (distance < distances[source]) {
+        distances[source] = distance;
+        predecessors[source] = edge;
+        queue.push(QueueItem(distance, source));
+      }
+    }
+  }
+}
+
+void
+GlobalRoutingGraph::calculateEdgeCosts(VertexId destination, std::vector<Distance>& costs) const
+{
+  std::vector<Distance> distances;
+  std::vector<EdgeId> predecessors;
+  calculateReverseShortestPaths(destination, distances, predecessors);
+
+  // Number vertices of the shortest path tree in DFS preorder, so the subtree of a vertex
+  // occupies range [enter[vertex], leave[vertex]) of the order.  Children of a vertex are
+  // the sources of its in-edges that are tree edges.
+  std::vector<VertexId> order;
+  std::vector<size_t> enter(size(), 0);
+  std::vector<size_t> leave(size(), 0);
+  std::vector<std::pair<VertexId, size_t>> stack{{destination, inEdgesBegin(destination)}};
+  enter[destination] = order.size();
+  order.push_back(destination);
+  while (!stack.empty()) {
+    auto& top = stack.back();
+    if (top.second != inEdgesEnd(top.first)) {
+      EdgeId edge = m_inEdges[top.second++];
+      VertexId child = m_edgeSources[edge];
+      if (predecessors[child] != edge)
+        continue;
+
+      enter[child] = order.size();
+      order.push_back(child);
+      stack.push_back({child, inEdgesBegin(child)});
+    }
+    else {
+      leave[top.first] = order.size();
+      stack.pop_back();
+    }
+  }
+
+  auto isInSubtree = [&] (VertexId root, VertexId vertex) {
+    return distances[vertex] < DISTANCE_INF && enter[root] < enter[vertex]
+           && enter[vertex] < leave[root];
+  };
+
+  // distances to destination avoiding a specific vertex (valid only for its subtree)
+  std::vector<Distance> avoiding(size(), DISTANCE_INF);
+
+  costs.assign(getNEdges(), DISTANCE_INF);
+  for (VertexId vertex = 0; vertex < size(); vertex++) {
+    if (vertex == destination || !m_isNode[vertex])
+      continue;
+
+    bool hasDependentNeighbors = false;
+    for (EdgeId edge = edgesBegin(vertex); edge != edgesEnd(vertex); edge++) {
+      hasDependentNeighbors = hasDependentNeighbors || isInSubtree(vertex, m_edgeTargets[edge]);
+    }
+
+    if (hasDependentNeighbors) {
+      // Shortest paths of the subtree vertices pass through the vertex.  Without the vertex,
+      // such paths have to leave the subtree through an edge to a vertex outside of it, whose
+      // shortest path is not affected.
+      PriorityQueue queue;
+      for (size_t i = enter[vertex] + 1; i < leave[vertex]; i++) {
+        VertexId member = order[i];
+        avoiding[member] = DISTANCE_INF;
+        for (EdgeId edge = edgesBegin(member); edge != edgesEnd(member); edge++) {
+          VertexId target = m_edgeTargets[edge];
+          if (target == vertex || isInSubtree(vertex, target))
+            continue;
+          avoiding[member] = std::min(avoiding[member], distances[target] + m_edgeMetrics[edge]);
+        }
+        if (avoiding[member] < DISTANCE_INF)
+          queue.push(QueueItem(avoiding[member], member));
+      }
+
+      while (!queue.empty()) {
+        QueueItem item = queue.top();
+        queue.pop();
+
+        VertexId member = item.second;
+        if (item.first != avoiding[member])
+          continue; // stale queue item
+
+        for (size_t i = inEdgesBegin(member); i != inEdgesEnd(member); i++) {
+          EdgeId edge = m_inEdges[i];
+          VertexId source = m_edgeSources[edge];
+          if (!isInSubtree(vertex, source))
+            continue;
+
+          Distance distance = item.first + m_edgeMetrics[edge];
+          if (distance < avoiding[source]) {
+            avoiding[source] = distance;
+            queue.push(QueueItem(distance, source));
+          }
+        }
+      }
+    }
+
+    for (EdgeId edge = edgesBegin(vertex); edge != edgesEnd(vertex); edge++) {
+      VertexId target = m_edgeTargets[edge];
+      Distance distance = isInSubtree(vertex, target) ? avoiding[target] : distances[target];
+      costs[edge] = std::min(distance + m_edgeMetrics[edge], DISTANCE_INF);
+    }
+  }
+}
+
+ReverseShortestPathTree::ReverseShortestPathTree(const GlobalRoutingGraph& graph,
+                                                 VertexId destination)
+  : m_graph(graph)
+  , m_destination(destination)
+{
+  graph.calculateReverseShortestPaths(destination, m_distances, m_predecessors);
+}
+
+void
+ReverseShortestPathTree::update(EdgeId edge, uint16_t oldMetric, std::vector<VertexId>& changed)
+{
+  VertexId source = m_graph.getSource(edge);
+  uint16_t metric = m_graph.getMetric(edge);
+  if (metric > oldMetric) {
+    // only vertices whose shortest path goes through the edge can be affected
+    if (m_predecessors[source] == edge)
+      recalculateSubtree(source, changed);
+  }
+  else if (metric < oldMetric) {
+    Distance distance = m_distances[m_graph.getTarget(edge)] + metric;
+    if (distance < m_distances[source]) {
+      m_distances[source] = distance;
+      m_predecessors[source] = edge;
+      changed.push_back(source);
+      propagateImprovement(source, changed);
+    }
+  }
+}
+
+void
+ReverseShortestPathTree::recalculateSubtree(VertexId root, std::vector<VertexId>& changed)
+{
+  // collect the subtree: vertices whose tree edge points into the subtree
+  std::vector<VertexId> subtree{root};
+  std::vector<bool> inSubtree(m_graph.size(), false);
+  inSubtree[root] = true;
+  for (size_t i = 0; i < subtree.size(); i++) {
+    VertexId vertex = subtree[i];
+    for (size_t j = m_graph.inEdgesBegin(vertex); j != m_graph.inEdgesEnd(vertex); j++) {
+      EdgeId edge = m_graph.getInEdge(j);
+      VertexId source = m_graph.getSource(edge);
+      if (!inSubtree[source] && m_predecessors[source] == edge) {
+        inSubtree[source] = true;
+        subtree.push_back(source);
+      }
+    }
+  }
+
+  std::vector<std::pair<Distance, EdgeId>> previous;
+  previous.reserve(subtree.size());
+
+  // paths of the subtree vertices now have to leave the subtree through an edge to a vertex
+  // outside of it, whose shortest path is not affected
+  PriorityQueue queue;
+  for (VertexId vertex : subtree) {
+    previous.push_back({m_distances[vertex], m_predecessors[vertex]});
+    m_distances[vertex] = GlobalRoutingGraph::DISTANCE_INF;
+    m_predecessors[vertex] = GlobalRoutingGraph::INVALID_EDGE;
+
+    for (EdgeId edge = m_graph.edgesBegin(vertex); edge != m_graph.edgesEnd(vertex); edge++) {
+      VertexId target = m_graph.getTarget(edge);
+      if (inSubtree[target])
+        continue;
+
+      Distance distance = m_distances[target] + m_graph.getMetric(edge);
+      if (distance < m_distances[vertex]) {
+        m_distances[vertex] = distance;
+        m_predecessors[vertex] = edge;
+      }
+    }
+    if (m_distances[vertex] < GlobalRoutingGraph::DISTANCE_INF)
+      queue.push(QueueItem(m_distances[vertex], vertex));
+  }
+
+  while (!queue.empty()) {
+    QueueItem item = queue.top();
+    queue.pop();
+
+    VertexId vertex = item.second;
+    if (item.first != m_distances[vertex])
+      continue; // stale queue item
+
+    for (size_t j = m_graph.inEdgesBegin(vertex); j != m_graph.inEdgesEnd(vertex); j++) {
+      EdgeId edge = m_graph.getInEdge(j);
+      VertexId source = m_graph.getSource(edge);
+      if (!inSubtree[source])
+        continue;
+
+      Distance distance = item.first + m_graph.getMetric(edge);
+      if (distance < m_distances[source]) {
+        m_distances[source] = distance;
+        m_predecessors[source] = edge;
+        queue.push(QueueItem(distance, source));
+      }
+    }
+  }
+
+  for (size_t i = 0; i < subtree.size(); i++) {
+    VertexId vertex = subtree[i];
+    if (previous[i].first != m_distances[vertex] || previous[i].second != m_predecessors[vertex])
+      changed.push_back(vertex);
+  }
+}
+
+void
+ReverseShortestPathTree::propagateImprovement(VertexId vertex, std::vector<VertexId>& changed)
+{
+  PriorityQueue queue;
+  queue.push(QueueItem(m_distances[vertex], vertex));
+
+  while (!queue.empty()) {
+    QueueItem item = queue.top();
+    queue.pop();
+
+    VertexId head = item.second;
+    if (item.first != m_distances[head])
+      continue; // stale queue item
+
+    for (size_t j = m_graph.inEdgesBegin(head); j != m_graph.inEdgesEnd(head); j++) {
+      EdgeId edge = m_graph.getInEdge(j);
+      VertexId source = m_graph.getSource(edge);
+      Distance distance = item.first + m_graph.getMetric(edge);
+      if (distance < m_distances[source]) {
+        m_distances[source] = distance;
+        m_predecessors[source] = edge;
+        changed.push_back(source);
+        queue.push(QueueItem(distance, source));
+      }
+    }
+  }
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,400 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_GLOBAL_ROUTING_GRAPH_H
+#define NDN_GLOBAL_ROUTING_GRAPH_H
+
+/// @cond include_hidden
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/model/ndn-face.hpp"
+#include "ns3/ndnSIM/model/ndn-global-router.hpp"
+
+#include "ns3/ptr.h"
+
+#include <limits>
+#include <unordered_map>
+#include <vector>
+
+namespace ns3 {
+
+class Node;
+
+namespace ndn {
+
+/**
+ * @ingroup ndn-helpers
+ * @brief Snapshot of the global routing graph in compressed sparse row (CSR) form
+ *
+ * The snapshot replaces GlobalRouter pointers with integer vertex IDs and face pointers with
+ * face IDs and metrics (captured at the time the snapshot is taken).  Edges of all vertices
+ * are stored in contiguous arrays: edges of a vertex occupy the range
+ * [edgesBegin(vertex), edgesEnd(vertex)) of edge IDs, and source, target, face ID, and metric
+ * of each edge are kept in separate arrays indexed by edge ID.  A second index lists IDs of
+ * the edges pointing to each vertex, so shortest paths towards a vertex can be calculated
+ * without a copy of the graph.
+ *
+ * Unlike GlobalRouter objects, whose Ptr<> reference counting is not thread-safe, const methods
+ * of the snapshot can be safely used from several threads at the same time.
+ *
+ * Vertices are numbered in the same order as NdnGlobalRouterGraph enumerates them: GlobalRouters
+ * of nodes (in NodeList order) followed by GlobalRouters of channels (in ChannelList order).
+ * Edges from a channel to the attached nodes have INVALID_FACEID face and zero metric.
+ */
+class GlobalRoutingGraph : boost::noncopyable {
+public:
+  typedef uint32_t VertexId;
+  typedef uint32_t EdgeId;
+  typedef uint32_t Distance;
+
+  /**
+   * @brief Shortest path information for a vertex
+   */
+  struct PathInfo
+  {
+    Distance distance;
+    nfd::FaceId firstHop; ///< @brief face of the source vertex, INVALID_FACEID if unreachable
+  };
+
+  /**
+   * @brief Distance assigned to unreachable vertices
+   *
+   * The value matches WeightInf of NdnGlobalRouterGraph, so paths with cost greater than or
+   * equal to this value are considered non-existent.
+   */
+  static const Distance DISTANCE_INF = std::numeric_limits<uint16_t>::max();
+
+  /**
+   * @brief Vertex ID used to indicate absence of a vertex
+   */
+  static const VertexId INVALID_VERTEX = std::numeric_limits<VertexId>::max();
+
+  /**
+   * @brief Edge ID used to indicate absence of an edge
+   */
+  static const EdgeId INVALID_EDGE = std::numeric_limits<EdgeId>::max();
+
+public:
+  /**
+   * @brief Take a snapshot of all GlobalRouter objects installed on nodes and channels
+   */
+  GlobalRoutingGraph();
+
+  size_t
+  size() const
+  {
+    return m_routers.size();
+  }
+
+  size_t
+  getNEdges() const
+  {
+    return m_edgeTargets.size();
+  }
+
+  /**
+   * @brief Get GlobalRouter object of the vertex (not thread-safe)
+   */
+  Ptr<GlobalRouter>
+  getRouter(VertexId vertex) const
+  {
+    return m_routers[vertex];
+  }
+
+  /**
+   * @brief Get node of the vertex (not thread-safe)
+   * @return node or nullptr if vertex represents a channel
+   */
+  Ptr<Node>
+  getNode(VertexId vertex) const
+  {
+    return m_nodes[vertex];
+  }
+
+  /**
+   * @brief Check whether vertex represents a node (and not a channel)
+   */
+  bool
+  isNode(VertexId vertex) const
+  {
+    return m_isNode[vertex];
+  }
+
+  /**
+   * @brief Check whether vertex has any locally exported prefixes
+   */
+  bool
+  isOrigin(VertexId vertex) const
+  {
+    return m_isOrigin[vertex];
+  }
+
+  /**
+   * @brief Calculate fingerprint of everything route calculation depends on (not thread-safe)
+   *
+   * The fingerprint is a 64-bit FNV-1a hash of node IDs of the vertices, edges with their face
+   * IDs and metrics, and prefixes exported by the vertices.  It stays the same across runs of a
+   * scenario as long as the topology, metrics, and origins are the same.
+   */
+  uint64_t
+  calculateFingerprint() const;
+
+  /**
+   * @brief Find vertex of the GlobalRouter object
+   * @return vertex ID or INVALID_VERTEX if the object is not part of the snapshot
+   */
+  VertexId
+  findVertex(Ptr<GlobalRouter> router) const;
+
+  /**
+   * @brief Get ID of the first edge of the vertex
+   */
+  EdgeId
+  edgesBegin(VertexId vertex) const
+  {
+    return m_edgeOffsets[vertex];
+  }
+
+  /**
+   * @brief Get ID following the last edge of the vertex
+   */
+  EdgeId
+  edgesEnd(VertexId vertex) const
+  {
+    return m_edgeOffsets[vertex + 1];
+  }
+
+  /**
+   * @brief Get position of the first edge pointing to the vertex in the in-edge index
+   */
+  size_t
+  inEdgesBegin(VertexId vertex) const
+  {
+    return m_inEdgeOffsets[vertex];
+  }
+
+  /**
+   * @brief Get position following the last edge pointing to the vertex in the in-edge index
+   */
+  size_t
+  inEdgesEnd(VertexId vertex) const
+  {
+    return m_inEdgeOffsets[vertex + 1];
+  }
+
+  /**
+   * @brief Get ID of the edge at @p position of the in-edge index
+   */
+  EdgeId
+  getInEdge(size_t position) const
+  {
+    return m_inEdges[position];
+  }
+
+  VertexId
+  getSource(EdgeId edge) const
+  {
+    return m_edgeSources[edge];
+  }
+
+  VertexId
+  getTarget(EdgeId edge) const
+  {
+    return m_edgeTargets[edge];
+  }
+
+  nfd::FaceId
+  getFaceId(EdgeId edge) const
+  {
+    return m_edgeFaceIds[edge];
+  }
+
+  uint16_t
+  getMetric(EdgeId edge) const
+  {
+    return m_edgeMetrics[edge];
+  }
+
+  /**
+   * @brief Change metric of an edge in the snapshot (not thread-safe)
+   *
+   * Metric DISTANCE_INF effectively disables the edge, as any path through it is considered
+   * non-existent.
+   */
+  void
+  setMetric(EdgeId edge, uint16_t metric)
+  {
+    m_edgeMetrics[edge] = metric;
+  }
+
+  /**
+   * @brief Calculate shortest paths from @p source to all vertices of the graph
+   *
+   * Path cost is a sum of face metrics along the path; the first face of the path is recorded
+   * as the next hop.  The method is thread-safe.
+   *
+   * @param source source vertex
+   * @param[out] paths vector of size size(), indexed by vertex ID
+   */
+  void
+  calculateShortestPaths(VertexId source, std::vector<PathInfo>& paths) const;
+
+  /**
+   * @brief Calculate shortest paths from all vertices of the graph to @p destination
+   *
+   * The method is thread-safe.
+   *
+   * @param destination destination vertex
+   * @param[out] distances vector of size size(), distance from each vertex to @p destination
+   * @param[out] predecessors vector of size size(), the first edge on the shortest path towards
+   *             @p destination (INVALID_EDGE for @p destination itself and unreachable vertices)
+   */
+  void
+  calculateReverseShortestPaths(VertexId destination, std::vector<Distance>& distances,
+                                std::vector<EdgeId>& predecessors) const;
+
+  /**
+   * @brief Calculate shortest paths from all vertices of the graph to the nearest of
+   *        @p destinations
+   *
+   * The method is thread-safe.
+   *
+   * @param destinations destination vertices
+   * @param[out] distances vector of size size(), distance from each vertex to the nearest
+   *             destination
+   * @param[out] predecessors vector of size size(), the first edge on the shortest path towards
+   *             the nearest destination (INVALID_EDGE for destinations and unreachable vertices)
+   */
+  void
+  calculateReverseShortestPaths(const std::vector<VertexId>& destinations,
+                                std::vector<Distance>& distances,
+                                std::vector<EdgeId>& predecessors) const;
+
+  /**
+   * @brief Calculate for every edge of every node the cost of reaching @p destination through
+   *        the edge, without passing through the node again
+   *
+   * The result is equivalent to running, for each edge of each node, a separate shortest path
+   * calculation in which all other edges of the node are disabled.  Instead, only one reverse
+   * shortest path tree is built towards @p destination; costs through a neighbor whose shortest
+   * path does not pass the node are taken directly from the tree, and only the subtree of the
+   * node is recalculated otherwise.  The method is thread-safe.
+   *
+   * @param destination destination vertex
+   * @param[out] costs vector of size getNEdges(), indexed by edge ID; cost of the path through
+   *             the edge or DISTANCE_INF if there is no such path (also for edges of
+   *             @p destination and channel vertices)
+   */
+  void
+  calculateEdgeCosts(VertexId destination, std::vector<Distance>& costs) const;
+
+private:
+  std::vector<Ptr<GlobalRouter>> m_routers;
+  std::vector<Ptr<Node>> m_nodes;
+  std::vector<bool> m_isNode;
+  std::vector<bool> m_isOrigin;
+  std::unordered_map<uint32_t, VertexId> m_vertexIds; ///< @brief GlobalRouter ID to vertex ID
+
+  std::vector<EdgeId> m_edgeOffsets; ///< @brief size() + 1 offsets into the edge arrays
+  std::vector<VertexId> m_edgeSources;
+  std::vector<VertexId> m_edgeTargets;
+  std::vector<nfd::FaceId> m_edgeFaceIds;
+  std::vector<uint16_t> m_edgeMetrics;
+
+  std::vector<size_t> m_inEdgeOffsets; ///< @brief size() + 1 offsets into m_inEdges
+  std::vector<EdgeId> m_inEdges;       ///< @brief IDs of edges, grouped by the target vertex
+};
+
+/**
+ * @ingroup ndn-helpers
+ * @brief Shortest path tree towards a destination, maintained under edge metric changes
+ *
+ * After a metric of an edge has been changed in the graph, the tree is updated incrementally:
+ * when the metric increases, only the subtree hanging off the edge is recalculated (and
+ * only if the edge is part of the tree); when the metric decreases, improvements are
+ * propagated from the source vertex of the edge.
+ *
+ * The tree keeps a reference to the graph, which must outlive the tree.
+ */
+class ReverseShortestPathTree {
+public:
+  typedef GlobalRoutingGraph::VertexId VertexId;
+  typedef GlobalRoutingGraph::EdgeId EdgeId;
+  typedef GlobalRoutingGraph::Distance Distance;
+
+  ReverseShortestPathTree(const GlobalRoutingGraph& graph, VertexId destination);
+
+  VertexId
+  getDestination() const
+  {
+    return m_destination;
+  }
+
+  /**
+   * @brief Get distance from the vertex to the destination (DISTANCE_INF if unreachable)
+   */
+  Distance
+  getDistance(VertexId vertex) const
+  {
+    return m_distances[vertex];
+  }
+
+  /**
+   * @brief Get face of the first edge on the shortest path from the vertex to the destination
+   * @return face ID or INVALID_FACEID for the destination and unreachable vertices
+   */
+  nfd::FaceId
+  getFirstHop(VertexId vertex) const
+  {
+    if (m_predecessors[vertex] == GlobalRoutingGraph::INVALID_EDGE)
+      return nfd::INVALID_FACEID;
+    return m_graph.getFaceId(m_predecessors[vertex]);
+  }
+
+  /**
+   * @brief Update the tree after metric of an edge has been changed in the graph
+   *
+   * @param edge the changed edge
+   * @param oldMetric metric of the edge before the change
+   * @param[out] changed vertices whose distance or first hop has changed are appended
+   */
+  void
+  update(EdgeId edge, uint16_t oldMetric, std::vector<VertexId>& changed);
+
+private:
+  void
+  recalculateSubtree(VertexId root, std::vector<VertexId>& changed);
+
+  void
+  propagateImprovement(VertexId vertex, std::vector<VertexId>& changed);
+
+private:
+  const GlobalRoutingGraph& m_graph;
+  VertexId m_destination;
+  std::vector<Distance> m_distances;
+  std::vector<EdgeId> m_predecessors; ///< @brief the first edge on the path to the destination
+};
+
+} // namespace ndn
+} // namespace ns3
+
+/// @endcond
+
+#endif // NDN_GLOBAL_ROUTING_GRAPH_H
@@ -29,6 +29,8 @@
 #include "helper/ndn-fib-helper.hpp"
 #include "model/ndn-net-device-face.hpp"
 #include "model/ndn-global-router.hpp"
+#include "helper/ndn-global-routing-graph.hpp"
+#include "helper/ndn-link-control-helper.hpp"
 
 #include "daemon/table/fib.hpp"
 #include "daemon/fw/forwarder.hpp"
@@ -46,17 +48,23 @@
 #include "ns3/node-list.h"
 #include "ns3/channel-list.h"
 #include "ns3/object-factory.h"
+#include "ns3/simulator.h"
 
 #include <boost/lexical_cast.hpp>
 #include <boost/foreach.hpp>
-#include <boost/concept/assert.hpp>
-#include <boost/graph/dijkstra_shortest_paths.hpp>
 
 #include <unordered_map>
-
-#include "boost-graph-ndn-global-routing-helper.hpp"
+#include <algorithm>
+#include <atomic>
+#include <cstdio>
+#include <fstream>
+#include <map>
+#include <memory>
+#include <set>
+#include <thread>
 
 #include <math.h>
+#include <unistd.h>
 
 NS_LOG_COMPONENT_DEFINE("ndn.GlobalRoutingHelper");
 
@@ -217,173 +225,694 @@ GlobalRoutingHelper::AddOriginsForAll()
 void
 GlobalRoutingHelper::CalculateRoutes()
 {
-  /**
-   * Implementation of route calculation is heavily based on Boost Graph Library
-   * See http://www.boost.org/doc/libs/1_49_0/libs/graph/doc/table_of_contents.html for more details
-   */
+  CalculateRoutesParallel(1);
+}
 
-  BOOST_CONCEPT_ASSERT((boost::VertexListGraphConcept<boost::NdnGlobalRouterGraph>));
-  BOOST_CONCEPT_ASSERT((boost::IncidenceGraphConcept<boost::NdnGlobalRouterGraph>));
+namespace {
 
-  boost::NdnGlobalRouterGraph graph;
-  // typedef graph_traits < NdnGlobalRouterGraph >::vertex_descriptor vertex_descriptor;
+/**
+ * @brief Calculate shortest path routes from all nodes to all origins using several threads
+ * @param[out] fibRoutes routes, grouped by node in the order of nodes in NodeList
+ */
+void
+calculateRoutes(const GlobalRoutingGraph& graph, uint32_t nThreads,
+                std::vector<FibHelper::RouteInfo>& fibRoutes)
+{
+  if (nThreads == 0) {
+    nThreads = std::max(std::thread::hardware_concurrency(), 1u);
+  }
 
-  // For now we doing Dijkstra for every node.  Can be replaced with Bellman-Ford or Floyd-Warshall.
-  // Other algorithms should be faster, but they need additional EdgeListGraph concept provided by
-  // the graph, which
-  // is not obviously how implement in an efficient manner
-  for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
-    Ptr<GlobalRouter> source = (*node)->GetObject<GlobalRouter>();
-    if (source == 0) {
-      NS_LOG_DEBUG("Node " << (*node)->GetId() << " does not export GlobalRouter interface");
-      continue;
+  std::vector<GlobalRoutingGraph::VertexId> sources;
+  for (GlobalRoutingGraph::VertexId vertex = 0; vertex < graph.size(); vertex++) {
+    if (graph.getNode(vertex) != 0) {
+      sources.push_back(vertex);
     }
+  }
 
-    boost::DistancesMap distances;
+  struct Route
+  {
+    GlobalRoutingGraph::VertexId origin;
+    nfd::FaceId faceId;
+    GlobalRoutingGraph::Distance distance;
+  };
+  std::vector<std::vector<Route>> routes(sources.size());
+
+  // Worker threads must not touch any ns-3 objects, only the graph snapshot
+  std::atomic<size_t> nextSource(0);
+  auto worker = [&] {
+    std::vector<GlobalRoutingGraph::PathInfo> paths;
+    for (size_t i = nextSource++; i < sources.size(); i = nextSource++) {
+      graph.calculateShortestPaths(sources[i], paths);
+
+      for (GlobalRoutingGraph::VertexId vertex = 0; vertex < graph.size(); vertex++) {
+        if (vertex == sources[i] || !graph.isOrigin(vertex)
+            || paths[vertex].firstHop == nfd::INVALID_FACEID)
+          continue;
 
-    dijkstra_shortest_paths(graph, source,
-                            // predecessor_map (boost::ref(predecessors))
-                            // .
-                            distance_map(boost::ref(distances))
-                              .distance_inf(boost::WeightInf)
-                              .distance_zero(boost::WeightZero)
-                              .distance_compare(boost::WeightCompare())
-                              .distance_combine(boost::WeightCombine()));
+        routes[i].push_back({vertex, paths[vertex].firstHop, paths[vertex].distance});
+      }
+    }
+  };
 
-    // NS_LOG_DEBUG (predecessors.size () << ", " << distances.size ());
+  NS_LOG_DEBUG("Calculating routes for " << sources.size() << " nodes using " << nThreads
+                                         << " threads");
 
-    Ptr<L3Protocol> L3protocol = (*node)->GetObject<L3Protocol>();
-    shared_ptr<nfd::Forwarder> forwarder = L3protocol->getForwarder();
+  std::vector<std::thread> threads;
+  for (uint32_t i = 1; i < nThreads && i < sources.size(); i++) {
+    threads.push_back(std::thread(worker));
+  }
+  worker();
+  for (auto& thread : threads) {
+    thread.join();
+  }
 
-    NS_LOG_DEBUG("Reachability from Node: " << source->GetObject<Node>()->GetId());
-    for (const auto& dist : distances) {
-      if (dist.first == source)
-        continue;
-      else {
-        // cout << "  Node " << dist.first->GetObject<Node> ()->GetId ();
-        if (std::get<0>(dist.second) == 0) {
-          // cout << " is unreachable" << endl;
-        }
-        else {
-          for (const auto& prefix : dist.first->GetLocalPrefixes()) {
-            NS_LOG_DEBUG(" prefix " << prefix << " reachable via face " << *std::get<0>(dist.second)
-                         << " with distance " << std::get<1>(dist.second) << " with delay "
-                         << std::get<2>(dist.second));
-
-            FibHelper::AddRoute(*node, *prefix, std::get<0>(dist.second),
-                                std::get<1>(dist.second));
-          }
-        }
+  for (size_t i = 0; i < sources.size(); i++) {
+    Ptr<Node> node = graph.getNode(sources[i]);
+    for (const auto& route : routes[i]) {
+      for (const auto& prefix : graph.getRouter(route.origin)->GetLocalPrefixes()) {
+        NS_LOG_DEBUG("Node " << node->GetId() << ": prefix " << *prefix << " reachable via face "
+                             << route.faceId << " with distance " << route.distance);
+
+        fibRoutes.push_back({node, *prefix, static_cast<uint32_t>(route.faceId),
+                             static_cast<int32_t>(route.distance)});
       }
     }
   }
 }
 
+/**
+ * @brief Keep only the cheapest route for each prefix and face and, unless @p maxNextHops is 0,
+ *        at most @p maxNextHops cheapest routes for each prefix
+ *
+ * Routes are reordered (grouped by prefix).
+ */
 void
-GlobalRoutingHelper::CalculateAllPossibleRoutes()
+selectCheapestRoutes(std::vector<FibHelper::RouteInfo>& routes, size_t maxNextHops)
 {
-  /**
-   * Implementation of route calculation is heavily based on Boost Graph Library
-   * See http://www.boost.org/doc/libs/1_49_0/libs/graph/doc/table_of_contents.html for more details
-   */
+  std::sort(routes.begin(), routes.end(),
+            [] (const FibHelper::RouteInfo& a, const FibHelper::RouteInfo& b) {
+              return std::tie(a.prefix, a.faceId, a.metric)
+                     < std::tie(b.prefix, b.faceId, b.metric);
+            });
+  routes.erase(std::unique(routes.begin(), routes.end(),
+                           [] (const FibHelper::RouteInfo& a, const FibHelper::RouteInfo& b) {
+                             return a.prefix == b.prefix && a.faceId == b.faceId;
+                           }),
+               routes.end());
+
+  if (maxNextHops == 0)
+    return;
+
+  std::stable_sort(routes.begin(), routes.end(),
+                   [] (const FibHelper::RouteInfo& a, const FibHelper::RouteInfo& b) {
+                     return std::tie(a.prefix, a.metric) < std::tie(b.prefix, b.metric);
+                   });
+
+  std::vector<FibHelper::RouteInfo> selected;
+  size_t nNextHops = 0;
+  for (size_t i = 0; i < routes.size(); i++) {
+    nNextHops = (i > 0 && routes[i].prefix == routes[i - 1].prefix) ? nNextHops + 1 : 1;
+    if (nNextHops <= maxNextHops)
+      selected.push_back(routes[i]);
+  }
+  routes.swap(selected);
+}
+
+/**
+ * Route cache file format (all values in host byte order):
+ *
+ *     magic      "ndnSIMrc" (8 bytes)
+ *     version    uint32
+ *     fingerprint uint64
+ *     nPrefixes  uint32, followed by nPrefixes of (uint32 length, URI of the prefix)
+ *     nRoutes    uint64, followed by nRoutes of (uint32 node ID, uint32 prefix index,
+ *                uint32 face ID, int32 metric)
+ */
+const char ROUTE_CACHE_MAGIC[8] = {'n', 'd', 'n', 'S', 'I', 'M', 'r', 'c'};
+const uint32_t ROUTE_CACHE_VERSION = 1;
+
+template<typename T>
+void
+writeValue(std::ostream& os, const T& value)
+{
+  os.write(reinterpret_cast<const char*>(&value), sizeof(value));
+}
 
-  BOOST_CONCEPT_ASSERT((boost::VertexListGraphConcept<boost::NdnGlobalRouterGraph>));
-  BOOST_CONCEPT_ASSERT((boost::IncidenceGraphConcept<boost::NdnGlobalRouterGraph>));
+template<typename T>
+bool
+readValue(std::istream& is, T& value)
+{
+  return static_cast<bool>(is.read(reinterpret_cast<char*>(&value), sizeof(value)));
+}
 
-  boost::NdnGlobalRouterGraph graph;
-  // typedef graph_traits < NdnGlobalRouterGraph >::vertex_descriptor vertex_descriptor;
+bool
+loadRouteCache(const std::string& cacheFile, uint64_t fingerprint,
+               std::vector<FibHelper::RouteInfo>& routes)
+{
+  std::ifstream is(cacheFile, std::ios::binary);
+  if (!is)
+    return false;
+
+  char magic[sizeof(ROUTE_CACHE_MAGIC)];
+  uint32_t version = 0;
+  uint64_t savedFingerprint = 0;
+  if (!is.read(magic, sizeof(magic)) || !std::equal(magic, magic + sizeof(magic), ROUTE_CACHE_MAGIC)
+      || !readValue(is, version) || version != ROUTE_CACHE_VERSION
+      || !readValue(is, savedFingerprint)) {
+    NS_LOG_DEBUG("Route cache " << cacheFile << " has unknown format");
+    return false;
+  }
 
-  // For now we doing Dijkstra for every node.  Can be replaced with Bellman-Ford or Floyd-Warshall.
-  // Other algorithms should be faster, but they need additional EdgeListGraph concept provided by
-  // the graph, which
-  // is not obviously how implement in an efficient manner
-  for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
-    Ptr<GlobalRouter> source = (*node)->GetObject<GlobalRouter>();
-    if (source == 0) {
-      NS_LOG_DEBUG("Node " << (*node)->GetId() << " does not export GlobalRouter interface");
+  if (savedFingerprint != fingerprint) {
+    NS_LOG_DEBUG("Route cache " << cacheFile << " was saved for a different topology");
+    return false;
+  }
+
+  uint32_t nPrefixes = 0;
+  if (!readValue(is, nPrefixes))
+    return false;
+
+  std::vector<Name> prefixes;
+  prefixes.reserve(nPrefixes);
+  for (uint32_t i = 0; i < nPrefixes; i++) {
+    uint32_t length = 0;
+    if (!readValue(is, length))
+      return false;
+
+    std::string uri(length, '\0');
+    if (!is.read(&uri[0], length))
+      return false;
+    prefixes.push_back(Name(uri));
+  }
+
+  uint64_t nRoutes = 0;
+  if (!readValue(is, nRoutes))
+    return false;
+
+  routes.clear();
+  routes.reserve(nRoutes);
+  for (uint64_t i = 0; i < nRoutes; i++) {
+    uint32_t nodeId = 0;
+    uint32_t prefix = 0;
+    uint32_t faceId = 0;
+    int32_t metric = 0;
+    if (!readValue(is, nodeId) || !readValue(is, prefix) || !readValue(is, faceId)
+        || !readValue(is, metric) || nodeId >= NodeList::GetNNodes() || prefix >= nPrefixes) {
+      NS_LOG_DEBUG("Route cache " << cacheFile << " is corrupted");
+      routes.clear();
+      return false;
+    }
+
+    routes.push_back({NodeList::GetNode(nodeId), prefixes[prefix], faceId, metric});
+  }
+
+  return true;
+}
+
+void
+saveRouteCache(const std::string& cacheFile, uint64_t fingerprint,
+               const std::vector<FibHelper::RouteInfo>& routes)
+{
+  std::vector<Name> prefixes;
+  std::map<Name, uint32_t> prefixIndices;
+  for (const auto& route : routes) {
+    if (prefixIndices.insert({route.prefix, prefixes.size()}).second)
+      prefixes.push_back(route.prefix);
+  }
+
+  // write into a temporary file first, so concurrent runs never see a partially written cache
+  std::string tmpFile = cacheFile + ".tmp" + std::to_string(::getpid());
+  std::ofstream os(tmpFile, std::ios::binary | std::ios::trunc);
+
+  os.write(ROUTE_CACHE_MAGIC, sizeof(ROUTE_CACHE_MAGIC));
+  writeValue(os, ROUTE_CACHE_VERSION);
+  writeValue(os, fingerprint);
+
+  writeValue(os, static_cast<uint32_t>(prefixes.size()));
+  for (const auto& prefix : prefixes) {
+    std::string uri = prefix.toUri();
+    writeValue(os, static_cast<uint32_t>(uri.size()));
+    os.write(uri.data(), uri.size());
+  }
+
+  writeValue(os, static_cast<uint64_t>(routes.size()));
+  for (const auto& route : routes) {
+    writeValue(os, route.node->GetId());
+    writeValue(os, prefixIndices[route.prefix]);
+    writeValue(os, route.faceId);
+    writeValue(os, route.metric);
+  }
+
+  os.close();
+  if (!os || std::rename(tmpFile.c_str(), cacheFile.c_str()) != 0) {
+    NS_LOG_WARN("Failed to save route cache " << cacheFile);
+    std::remove(tmpFile.c_str());
+  }
+}
+
+} // namespace
+
+void
+GlobalRoutingHelper::CalculateRoutesParallel(uint32_t nThreads)
+{
+  GlobalRoutingGraph graph;
+
+  std::vector<FibHelper::RouteInfo> routes;
+  calculateRoutes(graph, nThreads, routes);
+  FibHelper::AddRoutes(routes);
+}
+
+bool
+GlobalRoutingHelper::CalculateRoutesWithCache(const std::string& cacheFile, uint32_t nThreads)
+{
+  GlobalRoutingGraph graph;
+  uint64_t fingerprint = graph.calculateFingerprint();
+
+  std::vector<FibHelper::RouteInfo> routes;
+  bool isLoaded = loadRouteCache(cacheFile, fingerprint, routes);
+  if (isLoaded) {
+    NS_LOG_DEBUG("Loaded " << routes.size() << " routes from " << cacheFile);
+  }
+  else {
+    calculateRoutes(graph, nThreads, routes);
+    saveRouteCache(cacheFile, fingerprint, routes);
+  }
+
+  FibHelper::AddRoutes(routes);
+  return isLoaded;
+}
+
+void
+GlobalRoutingHelper::CalculateAllPossibleRoutes()
+{
+  // value std::numeric_limits<uint16_t>::max() MUST NOT be used (reserved)
+  const uint16_t disabledMetric = std::numeric_limits<uint16_t>::max() - 1;
+
+  GlobalRoutingGraph graph;
+  std::vector<GlobalRoutingGraph::PathInfo> paths;
+
+  for (GlobalRoutingGraph::VertexId source = 0; source < graph.size(); source++) {
+    if (!graph.isNode(source))
       continue;
+
+    Ptr<Node> node = graph.getNode(source);
+    NS_LOG_DEBUG("Reachability from Node: " << node->GetId() << " (" << Names::FindName(node)
+                                            << ")");
+
+    // remember metrics of the source edges and disable all of them
+    GlobalRoutingGraph::EdgeId begin = graph.edgesBegin(source);
+    std::vector<uint16_t> originalMetrics;
+    for (auto edge = begin; edge != graph.edgesEnd(source); edge++) {
+      originalMetrics.push_back(graph.getMetric(edge));
+      graph.setMetric(edge, disabledMetric);
     }
 
-    Ptr<L3Protocol> L3protocol = (*node)->GetObject<L3Protocol>();
-    shared_ptr<nfd::Forwarder> forwarder = L3protocol->getForwarder();
+    std::vector<FibHelper::RouteInfo> routes;
+
+    for (auto edge = begin; edge != graph.edgesEnd(source); edge++) {
+      // enabling only the edge
+      graph.setMetric(edge, originalMetrics[edge - begin]);
+
+      NS_LOG_DEBUG("-----------");
+
+      graph.calculateShortestPaths(source, paths);
+
+      for (GlobalRoutingGraph::VertexId vertex = 0; vertex < graph.size(); vertex++) {
+        // skip unreachable origins and paths through disabled edges
+        if (vertex == source || !graph.isOrigin(vertex)
+            || paths[vertex].firstHop != graph.getFaceId(edge)
+            || graph.getMetric(edge) == disabledMetric)
+          continue;
 
-    NS_LOG_DEBUG("Reachability from Node: " << source->GetObject<Node>()->GetId() << " ("
-                                            << Names::FindName(source->GetObject<Node>()) << ")");
+        for (const auto& prefix : graph.getRouter(vertex)->GetLocalPrefixes()) {
+          NS_LOG_DEBUG(" prefix " << *prefix << " reachable via face " << paths[vertex].firstHop
+                       << " with distance " << paths[vertex].distance);
 
-    Ptr<L3Protocol> l3 = source->GetObject<L3Protocol>();
-    NS_ASSERT(l3 != 0);
+          routes.push_back({node, *prefix, static_cast<uint32_t>(paths[vertex].firstHop),
+                            static_cast<int32_t>(paths[vertex].distance)});
+        }
+      }
 
-    // remember interface statuses
-    std::list<nfd::FaceId> faceIds;
-    std::unordered_map<nfd::FaceId, uint16_t> originalMetrics;
-    for (auto& i : l3->getForwarder()->getFaceTable()) {
-      shared_ptr<Face> nfdFace = std::dynamic_pointer_cast<Face>(i);
-      faceIds.push_back(nfdFace->getId());
-      originalMetrics[nfdFace->getId()] = nfdFace->getMetric();
-      nfdFace->setMetric(std::numeric_limits<uint16_t>::max() - 1);
-      // value std::numeric_limits<uint16_t>::max () MUST NOT be used (reserved)
+      // disabling the edge again
+      graph.setMetric(edge, disabledMetric);
     }
 
-    for (auto& faceId : faceIds) {
-      shared_ptr<Face> k = l3->getForwarder()->getFaceTable().get(faceId);
-      shared_ptr<NetDeviceFace> face = std::dynamic_pointer_cast<NetDeviceFace>(k);
-      if (face == 0) {
-        NS_LOG_DEBUG("Skipping non-netdevice face");
+    // recover original metrics
+    for (auto edge = begin; edge != graph.edgesEnd(source); edge++) {
+      graph.setMetric(edge, originalMetrics[edge - begin]);
+    }
+
+    FibHelper::AddRoutes(routes);
+  }
+}
+
+void
+GlobalRoutingHelper::CalculateAllPossibleRoutesReverseSpf()
+{
+  GlobalRoutingGraph graph;
+  std::vector<std::vector<FibHelper::RouteInfo>> routes(graph.size());
+
+  std::vector<GlobalRoutingGraph::Distance> costs;
+  for (GlobalRoutingGraph::VertexId origin = 0; origin < graph.size(); origin++) {
+    if (!graph.isOrigin(origin))
+      continue;
+
+    NS_LOG_DEBUG("Reachability of Node: " << graph.getNode(origin)->GetId() << " ("
+                                          << Names::FindName(graph.getNode(origin)) << ")");
+
+    graph.calculateEdgeCosts(origin, costs);
+
+    for (GlobalRoutingGraph::EdgeId edge = 0; edge < graph.getNEdges(); edge++) {
+      // Paths that are not cheaper than a disabled face are not installed by
+      // CalculateAllPossibleRoutes either
+      if (costs[edge] >= std::numeric_limits<uint16_t>::max() - 1)
         continue;
+
+      GlobalRoutingGraph::VertexId vertex = graph.getSource(edge);
+      for (const auto& prefix : graph.getRouter(origin)->GetLocalPrefixes()) {
+        NS_LOG_DEBUG(" prefix " << *prefix << " reachable from node "
+                     << graph.getNode(vertex)->GetId() << " via face " << graph.getFaceId(edge)
+                     << " with distance " << costs[edge]);
+
+        routes[vertex].push_back({graph.getNode(vertex), *prefix,
+                                  static_cast<uint32_t>(graph.getFaceId(edge)),
+                                  static_cast<int32_t>(costs[edge])});
       }
+    }
+  }
+
+  for (auto& nodeRoutes : routes) {
+    selectCheapestRoutes(nodeRoutes, 0);
+    FibHelper::AddRoutes(nodeRoutes);
+  }
+}
+
+void
+GlobalRoutingHelper::CalculateMultipathRoutes(uint32_t maxNextHops)
+{
+  GlobalRoutingGraph graph;
+  std::vector<std::vector<FibHelper::RouteInfo>> routes(graph.size());
+
+  // The downstream condition must hold for the distance to the nearest origin of the prefix,
+  // otherwise next hops towards different origins can point at each other.  Prefixes exported
+  // by the same set of origins share one reverse shortest path tree.
+  std::map<Name, std::vector<GlobalRoutingGraph::VertexId>> prefixOrigins;
+  for (GlobalRoutingGraph::VertexId origin = 0; origin < graph.size(); origin++) {
+    if (!graph.isOrigin(origin))
+      continue;
+
+    for (const auto& prefix : graph.getRouter(origin)->GetLocalPrefixes()) {
+      std::vector<GlobalRoutingGraph::VertexId>& origins = prefixOrigins[*prefix];
+      if (origins.empty() || origins.back() != origin)
+        origins.push_back(origin);
+    }
+  }
 
-      // enabling only faceId
-      face->setMetric(originalMetrics[faceId]);
+  std::map<std::vector<GlobalRoutingGraph::VertexId>, std::vector<Name>> originPrefixes;
+  for (const auto& item : prefixOrigins) {
+    originPrefixes[item.second].push_back(item.first);
+  }
 
-      boost::DistancesMap distances;
+  std::vector<GlobalRoutingGraph::Distance> distances;
+  std::vector<GlobalRoutingGraph::EdgeId> predecessors;
+  std::vector<std::pair<GlobalRoutingGraph::Distance, GlobalRoutingGraph::EdgeId>> nextHops;
+  for (const auto& item : originPrefixes) {
+    const std::vector<GlobalRoutingGraph::VertexId>& origins = item.first;
+    const std::vector<Name>& prefixes = item.second;
 
-      NS_LOG_DEBUG("-----------");
+    NS_LOG_DEBUG("Reachability of " << origins.size() << " origin(s) of prefix "
+                                    << prefixes.front());
 
-      dijkstra_shortest_paths(graph, source,
-                              // predecessor_map (boost::ref(predecessors))
-                              // .
-                              distance_map(boost::ref(distances))
-                                .distance_inf(boost::WeightInf)
-                                .distance_zero(boost::WeightZero)
-                                .distance_compare(boost::WeightCompare())
-                                .distance_combine(boost::WeightCombine()));
+    graph.calculateReverseShortestPaths(origins, distances, predecessors);
 
-      // NS_LOG_DEBUG (predecessors.size () << ", " << distances.size ());
+    for (GlobalRoutingGraph::VertexId vertex = 0; vertex < graph.size(); vertex++) {
+      if (distances[vertex] == 0 || !graph.isNode(vertex)
+          || distances[vertex] >= GlobalRoutingGraph::DISTANCE_INF)
+        continue;
+
+      nextHops.clear();
+      for (auto edge = graph.edgesBegin(vertex); edge != graph.edgesEnd(vertex); edge++) {
+        // forwarding is loop-free only through neighbors that are strictly closer to an origin
+        GlobalRoutingGraph::VertexId neighbor = graph.getTarget(edge);
+        if (distances[neighbor] >= distances[vertex])
+          continue;
 
-      for (const auto& dist : distances) {
-        if (dist.first == source)
+        GlobalRoutingGraph::Distance cost = distances[neighbor] + graph.getMetric(edge);
+        if (cost >= GlobalRoutingGraph::DISTANCE_INF
+            || (maxNextHops == 0 && cost != distances[vertex]))
           continue;
-        else {
-          // cout << "  Node " << dist.first->GetObject<Node> ()->GetId ();
-          if (std::get<0>(dist.second) == 0) {
-            // cout << " is unreachable" << endl;
-          }
-          else {
-            for (const auto& prefix : dist.first->GetLocalPrefixes()) {
-              NS_LOG_DEBUG(" prefix " << *prefix << " reachable via face "
-                           << *std::get<0>(dist.second)
-                           << " with distance " << std::get<1>(dist.second)
-                           << " with delay " << std::get<2>(dist.second));
-
-              if (std::get<0>(dist.second)->getMetric() == std::numeric_limits<uint16_t>::max() - 1)
-                continue;
-
-              FibHelper::AddRoute(*node, *prefix, std::get<0>(dist.second),
-                                  std::get<1>(dist.second));
-            }
-          }
+
+        nextHops.push_back({cost, edge});
+      }
+
+      for (const auto& nextHop : nextHops) {
+        for (const Name& prefix : prefixes) {
+          NS_LOG_DEBUG(" prefix " << prefix << " reachable from node "
+                       << graph.getNode(vertex)->GetId() << " via face "
+                       << graph.getFaceId(nextHop.second) << " with distance " << nextHop.first);
+
+          routes[vertex].push_back({graph.getNode(vertex), prefix,
+                                    static_cast<uint32_t>(graph.getFaceId(nextHop.second)),
+                                    static_cast<int32_t>(nextHop.first)});
         }
       }
+    }
+  }
+
+  for (auto& nodeRoutes : routes) {
+    selectCheapestRoutes(nodeRoutes, maxNextHops);
+    FibHelper::AddRoutes(nodeRoutes);
+  }
+}
+
+namespace {
+
+/**
+ * @brief State of incremental routing: graph snapshot, reverse shortest path tree of each
+ *        origin, and next hops installed into FIBs
+ */
+class IncrementalRouting : boost::noncopyable {
+public:
+  typedef GlobalRoutingGraph::VertexId VertexId;
+  typedef GlobalRoutingGraph::EdgeId EdgeId;
+
+  IncrementalRouting();
+
+  void
+  onLinkStateChange(Ptr<Channel> channel, bool isUp);
+
+private:
+  typedef std::map<nfd::FaceId, uint64_t> NextHops;
+
+  /**
+   * @brief Change metric of the edge and update trees, recording vertices and prefixes whose
+   *        next hops may have changed
+   */
+  void
+  changeEdgeMetric(EdgeId edge, uint16_t metric, std::set<std::pair<VertexId, Name>>& affected);
+
+  /**
+   * @brief Calculate next hops of the vertex for the prefix from trees of all its origins
+   */
+  NextHops
+  calculateNextHops(VertexId vertex, const Name& prefix) const;
+
+private:
+  GlobalRoutingGraph m_graph;
+  std::vector<ReverseShortestPathTree> m_trees;
+  std::map<Name, std::vector<size_t>> m_prefixTrees; ///< @brief prefix to trees of its origins
+  std::vector<std::map<Name, NextHops>> m_nextHops;  ///< @brief installed next hops of vertices
+  std::map<EdgeId, uint16_t> m_disabledEdges; ///< @brief original metrics of disabled edges
+};
+
+std::unique_ptr<IncrementalRouting> g_incrementalRouting;
+
+void
+onLinkStateChange(Ptr<Channel> channel, bool isUp)
+{
+  if (g_incrementalRouting != nullptr)
+    g_incrementalRouting->onLinkStateChange(channel, isUp);
+}
+
+IncrementalRouting::IncrementalRouting()
+  : m_nextHops(m_graph.size())
+{
+  for (VertexId origin = 0; origin < m_graph.size(); origin++) {
+    if (!m_graph.isOrigin(origin))
+      continue;
+
+    m_trees.push_back(ReverseShortestPathTree(m_graph, origin));
+    for (const auto& prefix : m_graph.getRouter(origin)->GetLocalPrefixes()) {
+      m_prefixTrees[*prefix].push_back(m_trees.size() - 1);
+    }
+  }
+
+  for (VertexId vertex = 0; vertex < m_graph.size(); vertex++) {
+    if (!m_graph.isNode(vertex))
+      continue;
+
+    std::vector<FibHelper::RouteInfo> routes;
+    for (const auto& prefixTrees : m_prefixTrees) {
+      NextHops nextHops = calculateNextHops(vertex, prefixTrees.first);
+      for (const auto& nextHop : nextHops) {
+        routes.push_back({m_graph.getNode(vertex), prefixTrees.first,
+                          static_cast<uint32_t>(nextHop.first),
+                          static_cast<int32_t>(nextHop.second)});
+      }
+      if (!nextHops.empty())
+        m_nextHops[vertex][prefixTrees.first] = std::move(nextHops);
+    }
+
+    FibHelper::AddRoutes(routes);
+  }
+}
+
+IncrementalRouting::NextHops
+IncrementalRouting::calculateNextHops(VertexId vertex, const Name& prefix) const
+{
+  NextHops nextHops;
+
+  auto prefixTrees = m_prefixTrees.find(prefix);
+  if (prefixTrees == m_prefixTrees.end())
+    return nextHops;
+
+  for (size_t tree : prefixTrees->second) {
+    nfd::FaceId faceId = m_trees[tree].getFirstHop(vertex);
+    if (faceId == nfd::INVALID_FACEID)
+      continue;
+
+    uint64_t cost = m_trees[tree].getDistance(vertex);
+    auto nextHop = nextHops.insert({faceId, cost}).first;
+    nextHop->second = std::min(nextHop->second, cost);
+  }
+  return nextHops;
+}
+
+void
+IncrementalRouting::changeEdgeMetric(EdgeId edge, uint16_t metric,
+                                     std::set<std::pair<VertexId, Name>>& affected)
+{
+  uint16_t oldMetric = m_graph.getMetric(edge);
+  m_graph.setMetric(edge, metric);
+
+  std::vector<VertexId> changed;
+  for (auto& tree : m_trees) {
+    changed.clear();
+    tree.update(edge, oldMetric, changed);
+
+    if (changed.empty())
+      continue;
+
+    NS_LOG_DEBUG("Shortest path tree of node "
+                 << m_graph.getNode(tree.getDestination())->GetId() << " changed for "
+                 << changed.size() << " vertices");
+
+    for (VertexId changedVertex : changed) {
+      if (!m_graph.isNode(changedVertex))
+        continue;
+      for (const auto& prefix : m_graph.getRouter(tree.getDestination())->GetLocalPrefixes()) {
+        affected.insert({changedVertex, *prefix});
+      }
+    }
+  }
+}
+
+void
+IncrementalRouting::onLinkStateChange(Ptr<Channel> channel, bool isUp)
+{
+  NS_LOG_FUNCTION(channel << isUp);
+
+  std::set<std::pair<VertexId, Name>> affected;
+  for (uint32_t deviceId = 0; deviceId < channel->GetNDevices(); deviceId++) {
+    Ptr<NetDevice> device = channel->GetDevice(deviceId);
+    Ptr<Node> node = device->GetNode();
 
-      // disabling the face again
-      face->setMetric(std::numeric_limits<uint16_t>::max() - 1);
+    VertexId vertex = m_graph.findVertex(node->GetObject<GlobalRouter>());
+    Ptr<L3Protocol> ndn = node->GetObject<L3Protocol>();
+    if (vertex == GlobalRoutingGraph::INVALID_VERTEX || ndn == 0)
+      continue;
+
+    shared_ptr<Face> face = ndn->getFaceByNetDevice(device);
+    if (face == nullptr)
+      continue;
+
+    for (EdgeId edge = m_graph.edgesBegin(vertex); edge != m_graph.edgesEnd(vertex); edge++) {
+      if (m_graph.getFaceId(edge) != face->getId())
+        continue;
+
+      auto disabled = m_disabledEdges.find(edge);
+      if (!isUp && disabled == m_disabledEdges.end()) {
+        m_disabledEdges[edge] = m_graph.getMetric(edge);
+        changeEdgeMetric(edge, GlobalRoutingGraph::DISTANCE_INF, affected);
+      }
+      else if (isUp && disabled != m_disabledEdges.end()) {
+        uint16_t metric = disabled->second;
+        m_disabledEdges.erase(disabled);
+        changeEdgeMetric(edge, metric, affected);
+      }
     }
+  }
 
-    // recover original interface statuses
-    for (auto& i : originalMetrics) {
-      l3->getForwarder()->getFaceTable().get(i.first)->setMetric(i.second);
+  std::vector<FibHelper::RouteInfo> addedRoutes;
+  std::vector<FibHelper::RouteInfo> removedRoutes;
+  for (const auto& vertexPrefix : affected) {
+    VertexId vertex = vertexPrefix.first;
+    const Name& prefix = vertexPrefix.second;
+    Ptr<Node> node = m_graph.getNode(vertex);
+
+    NextHops nextHops = calculateNextHops(vertex, prefix);
+    NextHops& installed = m_nextHops[vertex][prefix];
+
+    for (const auto& nextHop : nextHops) {
+      auto old = installed.find(nextHop.first);
+      if (old == installed.end() || old->second != nextHop.second) {
+        addedRoutes.push_back({node, prefix, static_cast<uint32_t>(nextHop.first),
+                               static_cast<int32_t>(nextHop.second)});
+      }
     }
+    for (const auto& old : installed) {
+      if (nextHops.find(old.first) == nextHops.end()) {
+        removedRoutes.push_back({node, prefix, static_cast<uint32_t>(old.first), 0});
+      }
+    }
+
+    if (nextHops.empty())
+      m_nextHops[vertex].erase(prefix);
+    else
+      installed = std::move(nextHops);
   }
+
+  NS_LOG_DEBUG("Link " << (isUp ? "up" : "down") << ": " << addedRoutes.size()
+                       << " next hops added or updated, " << removedRoutes.size()
+                       << " next hops removed");
+
+  // new next hops are added before the old ones are removed, so FIB entries that only change
+  // their next hops are not erased in between
+  FibHelper::AddRoutes(addedRoutes);
+  FibHelper::RemoveRoutes(removedRoutes);
+}
+
+} // namespace
+
+void
+GlobalRoutingHelper::EnableIncrementalRouting()
+{
+  DisableIncrementalRouting();
+
+  g_incrementalRouting.reset(new IncrementalRouting);
+  LinkControlHelper::GetLinkStateTrace().ConnectWithoutContext(MakeCallback(&onLinkStateChange));
+  Simulator::ScheduleDestroy(&GlobalRoutingHelper::DisableIncrementalRouting);
+}
+
+void
+GlobalRoutingHelper::DisableIncrementalRouting()
+{
+  if (g_incrementalRouting == nullptr)
+    return;
+
+  LinkControlHelper::GetLinkStateTrace().DisconnectWithoutContext(
+    MakeCallback(&onLinkStateChange));
+  g_incrementalRouting.reset();
 }
 
 } // namespace ndn
@@ -100,6 +100,36 @@ public:
   static void
   CalculateRoutes();
 
+  /**
+   * @brief Calculate for every node shortest path trees and install routes to all prefix origins,
+   *        using several threads
+   *
+   * Shortest paths from different sources are calculated in parallel on a read-only snapshot of
+   * the routing graph and then installed into FIBs in a single pass (in the order of nodes in
+   * NodeList), so the result does not depend on the number of threads.
+   *
+   * @param nThreads number of worker threads (0 to use one thread per hardware core)
+   */
+  static void
+  CalculateRoutesParallel(uint32_t nThreads);
+
+  /**
+   * @brief Calculate routes like CalculateRoutes, reusing routes saved in a cache file by
+   *        previous runs of the same scenario
+   *
+   * The routing graph (nodes, links, face IDs and metrics, and prefix origins) is hashed into a
+   * fingerprint.  If @p cacheFile has been saved for a graph with the same fingerprint, the saved
+   * FIB entries are installed directly, without any shortest path calculation.  Otherwise,
+   * routes are calculated and saved into @p cacheFile (replacing its content) for later runs.
+   *
+   * @param cacheFile name of the cache file
+   * @param nThreads number of threads to calculate routes on a cache miss (0 to use one thread
+   *        per hardware core)
+   * @returns true if routes have been loaded from the cache file
+   */
+  static bool
+  CalculateRoutesWithCache(const std::string& cacheFile, uint32_t nThreads = 1);
+
   /**
    * @brief Calculate all possible next-hop independent alternative routes
    *
@@ -111,6 +141,64 @@ public:
   static void
   CalculateAllPossibleRoutes();
 
+  /**
+   * @brief Calculate all possible next-hop independent alternative routes using one reverse
+   *        shortest path tree per prefix origin
+   *
+   * Produces the same set of routes as CalculateAllPossibleRoutes: for every face of every node,
+   * the cost of reaching a prefix origin through the face without coming back through the node.
+   * Instead of running a shortest path calculation for each face of each node (with all other
+   * faces temporarily disabled), costs are derived from the distances of the neighbors in the
+   * reverse shortest path tree of each origin.  Face metrics are not modified.
+   *
+   * If a prefix is exported by several origins, the route through a face has the lowest cost
+   * among the origins.
+   */
+  static void
+  CalculateAllPossibleRoutesReverseSpf();
+
+  /**
+   * @brief Calculate routes with a bounded set of next hops per prefix for multipath forwarding
+   *
+   * With @p maxNextHops equal to 0, all equal-cost shortest path next hops are installed (ECMP).
+   * Otherwise, up to @p maxNextHops loop-free next hops with the lowest costs are installed,
+   * the shortest path next hop being the first of them.  A next hop is loop-free if the
+   * neighbor is strictly closer to the nearest origin of the prefix than the node itself, so no
+   * combination of installed next hops can forward an Interest in a loop.
+   *
+   * All next hops of a prefix are derived from one reverse shortest path tree towards all
+   * origins of the prefix.  Origins of the prefix do not get routes for it.
+   *
+   * @param maxNextHops maximum number of next hops per prefix (0 for equal-cost next hops only)
+   */
+  static void
+  CalculateMultipathRoutes(uint32_t maxNextHops = 0);
+
+  /**
+   * @brief Calculate routes to all prefix origins and keep them up to date when links fail or
+   *        recover
+   *
+   * Installs the same routes as CalculateRoutes and subscribes to
+   * LinkControlHelper::GetLinkStateTrace.  The helper maintains one reverse shortest path tree
+   * per prefix origin; when a link changes its state, only the trees affected by the link are
+   * updated (and only in the part that depends on the link), and only the changed next hops
+   * are added to or removed from FIBs.
+   *
+   * Incremental routing stays enabled until DisableIncrementalRouting is called or the
+   * simulator is destroyed.  Topology, origins, and face metrics should not be changed in
+   * between, except through LinkControlHelper.
+   */
+  static void
+  EnableIncrementalRouting();
+
+  /**
+   * @brief Stop keeping routes up to date on link state changes
+   *
+   * Routes that have been installed remain in FIBs.
+   */
+  static void
+  DisableIncrementalRouting();
+
 private:
   void
   Install(Ptr<Channel> channel);
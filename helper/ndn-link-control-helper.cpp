@@ -84,12 +84,21 @@ LinkControlHelper::setErrorRate(Ptr<Node> node1, Ptr<Node> node2, double errorRa
 
       nd1->SetAttribute("ReceiveErrorModel", PointerValue(errorFactory.Create<ErrorModel>()));
       nd2->SetAttribute("ReceiveErrorModel", PointerValue(errorFactory.Create<ErrorModel>()));
+
+      GetLinkStateTrace()(channel, errorRate <= 0);
       return;
     }
   }
   NS_FATAL_ERROR("There is no link to fail between the requested nodes");
 }
 
+LinkControlHelper::LinkStateTracedCallback&
+LinkControlHelper::GetLinkStateTrace()
+{
+  static LinkStateTracedCallback trace;
+  return trace;
+}
+
 void
 LinkControlHelper::FailLink(Ptr<Node> node1, Ptr<Node> node2)
 {
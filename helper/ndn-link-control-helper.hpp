@@ -24,6 +24,8 @@
 
 #include "ns3/ptr.h"
 #include "ns3/node.h"
+#include "ns3/channel.h"
+#include "ns3/traced-callback.h"
 
 namespace ns3 {
 namespace ndn {
@@ -35,6 +37,8 @@ namespace ndn {
  */
 class LinkControlHelper {
 public:
+  typedef TracedCallback<Ptr<Channel>, bool> LinkStateTracedCallback;
+
   /**
    * @brief Fail NDN link between two nodes
    *
@@ -95,6 +99,19 @@ public:
   static void
   UpLinkByName(const std::string& node1, const std::string& node2);
 
+  /**
+   * @brief Get trace of link state changes
+   *
+   * The trace is fired every time FailLink or UpLink changes state of a link.  Parameters of
+   * the trace are the channel of the link and its new state (true if the link is up).
+   *
+   * Example:
+   *
+   *     LinkControlHelper::GetLinkStateTrace().ConnectWithoutContext(MakeCallback(&onChange));
+   */
+  static LinkStateTracedCallback&
+  GetLinkStateTrace();
+
 private:
   static void
   setErrorRate(Ptr<Node> node1, Ptr<Node> node2, double errorRate);
@@ -41,6 +41,7 @@ namespace ndn {
 
 StackHelper::StackHelper()
   : m_needSetDefaultRoutes(false)
+  , m_isLeanStack(false)
   , m_maxCsSize(100)
 {
   setCustomNdnCxxClocks();
@@ -79,6 +80,13 @@ StackHelper::SetDefaultRoutes(bool needSet)
   m_needSetDefaultRoutes = needSet;
 }
 
+void
+StackHelper::SetLeanStack(bool isLean)
+{
+  NS_LOG_FUNCTION(this << isLean);
+  m_isLeanStack = isLean;
+}
+
 void
 StackHelper::SetStackAttributes(const std::string& attr1, const std::string& value1,
                                 const std::string& attr2, const std::string& value2,
@@ -153,7 +161,7 @@ StackHelper::Install(Ptr<Node> node) const
   ndn->getConfig().put("tables.cs_max_packets", (m_maxCsSize == 0) ? 1 : m_maxCsSize);
 
   // NFD initialization
-  ndn->initialize();
+  ndn->initialize(!m_isLeanStack);
 
   // Create and aggregate content store if NFD's contest store has been disabled
   if (m_maxCsSize == 0) {
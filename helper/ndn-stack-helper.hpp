@@ -179,6 +179,18 @@ public:
   void
   SetDefaultRoutes(bool needSet);
 
+  /**
+   * \brief Set flag indicating necessity to install lean NDN stack, without NFD management
+   *
+   * Lean stack does not create InternalFace, FibManager, FaceManager, StrategyChoiceManager,
+   * and StatusServer, and does not add /localhost/nfd FIB entry, which noticeably reduces
+   * install time and memory footprint on large topologies.  FibHelper, StrategyChoiceHelper,
+   * and GlobalRoutingHelper update FIB and strategy choice tables directly on such nodes, but
+   * NFD management commands (Interests for /localhost/nfd) are not processed.
+   */
+  void
+  SetLeanStack(bool isLean);
+
   static KeyChain&
   getKeyChain();
 
@@ -231,6 +243,7 @@ private:
   ObjectFactory m_contentStoreFactory;
 
   bool m_needSetDefaultRoutes;
+  bool m_isLeanStack;
   size_t m_maxCsSize;
 
   typedef std::list<std::pair<TypeId, NetDeviceFaceCreateCallback>> NetDeviceCallbackList;
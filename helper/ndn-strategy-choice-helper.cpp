@@ -31,6 +31,21 @@ NS_LOG_COMPONENT_DEFINE("ndn.StrategyChoiceHelper");
 void
 StrategyChoiceHelper::sendCommand(const ControlParameters& parameters, Ptr<Node> node)
 {
+  Ptr<L3Protocol> L3protocol = node->GetObject<L3Protocol>();
+  auto strategyChoiceManager = L3protocol->getStrategyChoiceManager();
+
+  if (strategyChoiceManager == nullptr) {
+    // lean stack without NFD management, update strategy choice table directly
+    nfd::StrategyChoice& strategyChoice = L3protocol->getForwarder()->getStrategyChoice();
+    if (!strategyChoice.insert(parameters.getName(), parameters.getStrategy())) {
+      NS_LOG_DEBUG("Strategy " << parameters.getStrategy() << " is not installed on node "
+                   << node->GetId());
+      return;
+    }
+    NS_LOG_DEBUG("Forwarding strategy installed in node " << node->GetId());
+    return;
+  }
+
   NS_LOG_DEBUG("Strategy choice command was initialized");
   Block encodedParameters(parameters.wireEncode());
 
@@ -40,8 +55,6 @@ StrategyChoiceHelper::sendCommand(const ControlParameters& parameters, Ptr<Node>
 
   shared_ptr<Interest> command(make_shared<Interest>(commandName));
   StackHelper::getKeyChain().sign(*command);
-  Ptr<L3Protocol> L3protocol = node->GetObject<L3Protocol>();
-  auto strategyChoiceManager = L3protocol->getStrategyChoiceManager();
   strategyChoiceManager->onStrategyChoiceRequest(*command);
   NS_LOG_DEBUG("Forwarding strategy installed in node " << node->GetId());
 }
@@ -0,0 +1,156 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-tables-snapshot.hpp"
+
+#include "ns3/node-list.h"
+
+#include "daemon/fw/forwarder.hpp"
+#include "daemon/table/fib.hpp"
+#include "daemon/table/pit.hpp"
+#include "daemon/table/cs.hpp"
+#include "ns3/ndnSIM/model/ndn-l3-protocol.hpp"
+#include "ns3/ndnSIM/model/cs/ndn-content-store.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+// the records are exported to Python as packed structures
+static_assert(sizeof(TablesSnapshot::FibRecord) == 24, "unexpected FibRecord layout");
+static_assert(sizeof(TablesSnapshot::NameRecord) == 8, "unexpected NameRecord layout");
+static_assert(sizeof(TablesSnapshot::SizesRecord) == 32, "unexpected SizesRecord layout");
+
+TablesSnapshot::TablesSnapshot(bool includeNames/* = true*/)
+{
+  for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
+    add(*node, includeNames);
+  }
+}
+
+TablesSnapshot::TablesSnapshot(const NodeContainer& nodes, bool includeNames/* = true*/)
+{
+  for (NodeContainer::Iterator node = nodes.Begin(); node != nodes.End(); node++) {
+    add(*node, includeNames);
+  }
+}
+
+void
+TablesSnapshot::add(Ptr<Node> node, bool includeNames)
+{
+  Ptr<L3Protocol> l3 = node->GetObject<L3Protocol>();
+  if (l3 == 0) {
+    return;
+  }
+  shared_ptr<nfd::Forwarder> forwarder = l3->getForwarder();
+  uint32_t nodeId = node->GetId();
+
+  const nfd::Fib& fib = forwarder->getFib();
+  for (const nfd::fib::Entry& entry : fib) {
+    uint32_t prefix = intern(entry.getPrefix());
+    if (!entry.hasNextHops()) {
+      m_fib.push_back(FibRecord{nodeId, prefix, -1, 0});
+    }
+    for (const nfd::fib::NextHop& nextHop : entry.getNextHops()) {
+      m_fib.push_back(FibRecord{nodeId, prefix, nextHop.getFace()->getId(), nextHop.getCost()});
+    }
+  }
+
+  const nfd::Pit& pit = forwarder->getPit();
+  if (includeNames) {
+    for (const nfd::pit::Entry& entry : pit) {
+      m_pit.push_back(NameRecord{nodeId, intern(entry.getName())});
+    }
+  }
+
+  // the old-style content store replaces NFD's CS, if configured
+  Ptr<ContentStore> oldCs = node->GetObject<ContentStore>();
+  const nfd::Cs& cs = forwarder->getCs();
+  if (includeNames) {
+    if (oldCs != 0) {
+      for (Ptr<cs::Entry> entry = oldCs->Begin(); entry != oldCs->End();
+           entry = oldCs->Next(entry)) {
+        m_cs.push_back(NameRecord{nodeId, intern(entry->GetName())});
+      }
+    }
+    else {
+      for (const nfd::cs::Entry& entry : cs) {
+        m_cs.push_back(NameRecord{nodeId, intern(entry.getName())});
+      }
+    }
+  }
+
+  SizesRecord sizes = SizesRecord();
+  sizes.node = nodeId;
+  sizes.nFibEntries = fib.size();
+  sizes.nPitEntries = pit.size();
+  sizes.nCsEntries = oldCs != 0 ? oldCs->GetSize() : cs.size();
+  m_sizes.push_back(sizes);
+}
+
+uint32_t
+TablesSnapshot::intern(const Name& name)
+{
+  std::string uri = name.toUri();
+
+  auto item = m_stringIds.find(uri);
+  if (item != m_stringIds.end()) {
+    return item->second;
+  }
+
+  uint32_t id = m_strings.size();
+  m_stringData.append(uri);
+  m_stringData.push_back('\0');
+  m_strings.push_back(std::move(uri));
+  m_stringIds.insert(std::make_pair(m_strings.back(), id));
+  return id;
+}
+
+uint64_t
+TablesSnapshot::getFibAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_fib.data());
+}
+
+uint64_t
+TablesSnapshot::getPitAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_pit.data());
+}
+
+uint64_t
+TablesSnapshot::getCsAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_cs.data());
+}
+
+uint64_t
+TablesSnapshot::getSizesAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_sizes.data());
+}
+
+uint64_t
+TablesSnapshot::getStringDataAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_stringData.data());
+}
+
+} // namespace ndn
+} // namespace ns3
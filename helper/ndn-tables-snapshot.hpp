@@ -0,0 +1,197 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_TABLES_SNAPSHOT_HPP
+#define NDN_TABLES_SNAPSHOT_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+
+#include "ns3/ptr.h"
+#include "ns3/node.h"
+#include "ns3/node-container.h"
+
+#include <boost/noncopyable.hpp>
+
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @ingroup ndn-helpers
+ * @brief Snapshot of FIB, PIT, and CS of many nodes, stored in contiguous arrays of fixed-width
+ *        records
+ *
+ * The snapshot is intended for bulk export of the forwarding tables (e.g., into NumPy arrays
+ * by `ns.ndnSIM_tables` Python module), without accessing the tables entry by entry.
+ * Names are stored as indexes in a table of interned strings, which is shared by all nodes.
+ */
+class TablesSnapshot : boost::noncopyable {
+public:
+  /**
+   * @brief Next hop of a FIB entry (FaceId -1 for FIB entries without next hops)
+   */
+  struct FibRecord
+  {
+    uint32_t node;
+    uint32_t prefix;
+    int64_t faceId;
+    uint64_t cost;
+  };
+
+  /**
+   * @brief Name of a PIT or CS entry
+   */
+  struct NameRecord
+  {
+    uint32_t node;
+    uint32_t name;
+  };
+
+  /**
+   * @brief Number of entries in FIB, PIT, and CS of a node
+   */
+  struct SizesRecord
+  {
+    uint32_t node;
+    uint32_t padding;
+    uint64_t nFibEntries;
+    uint64_t nPitEntries;
+    uint64_t nCsEntries;
+  };
+
+public:
+  /**
+   * @brief Take snapshot of the tables of all nodes
+   * @param includeNames whether names of PIT and CS entries should be included
+   */
+  explicit
+  TablesSnapshot(bool includeNames = true);
+
+  /**
+   * @brief Take snapshot of the tables of the selected nodes
+   * @param includeNames whether names of PIT and CS entries should be included
+   */
+  explicit
+  TablesSnapshot(const NodeContainer& nodes, bool includeNames = true);
+
+  const std::vector<FibRecord>&
+  getFib() const
+  {
+    return m_fib;
+  }
+
+  const std::vector<NameRecord>&
+  getPit() const
+  {
+    return m_pit;
+  }
+
+  const std::vector<NameRecord>&
+  getCs() const
+  {
+    return m_cs;
+  }
+
+  const std::vector<SizesRecord>&
+  getSizes() const
+  {
+    return m_sizes;
+  }
+
+  const std::vector<std::string>&
+  getStrings() const
+  {
+    return m_strings;
+  }
+
+public: // raw access to the records (for the Python bindings)
+  uint64_t
+  getFibAddress() const;
+
+  size_t
+  getNFibRecords() const
+  {
+    return m_fib.size();
+  }
+
+  uint64_t
+  getPitAddress() const;
+
+  size_t
+  getNPitRecords() const
+  {
+    return m_pit.size();
+  }
+
+  uint64_t
+  getCsAddress() const;
+
+  size_t
+  getNCsRecords() const
+  {
+    return m_cs.size();
+  }
+
+  uint64_t
+  getSizesAddress() const;
+
+  size_t
+  getNSizesRecords() const
+  {
+    return m_sizes.size();
+  }
+
+  /**
+   * @brief Get all interned strings, each terminated by NUL character
+   */
+  uint64_t
+  getStringDataAddress() const;
+
+  size_t
+  getStringDataSize() const
+  {
+    return m_stringData.size();
+  }
+
+private:
+  void
+  add(Ptr<Node> node, bool includeNames);
+
+  uint32_t
+  intern(const Name& name);
+
+private:
+  std::vector<FibRecord> m_fib;
+  std::vector<NameRecord> m_pit;
+  std::vector<NameRecord> m_cs;
+  std::vector<SizesRecord> m_sizes;
+
+  std::unordered_map<std::string, uint32_t> m_stringIds;
+  std::vector<std::string> m_strings;
+  std::string m_stringData;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_TABLES_SNAPSHOT_HPP
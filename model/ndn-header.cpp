@@ -19,15 +19,49 @@
 
 #include "ndn-header.hpp"
 
-#include <iosfwd>
-#include <boost/iostreams/concepts.hpp>
-#include <boost/iostreams/stream.hpp>
+#include <ndn-cxx/encoding/tlv.hpp>
+#include <ndn-cxx/encoding/buffer.hpp>
 
-namespace io = boost::iostreams;
+#include <algorithm>
 
 namespace ns3 {
 namespace ndn {
 
+namespace {
+
+// TLV-TYPE and TLV-LENGTH are at most 9 bytes each
+const uint32_t MAX_TYPE_AND_LENGTH_SIZE = 18;
+
+/**
+ * @brief Get size of the TLV block, given its first @p nRead bytes and the number of bytes
+ *        available in the ns-3 buffer
+ */
+uint32_t
+getTlvSize(const uint8_t* typeAndLength, uint32_t nRead, uint32_t nAvailable)
+{
+  const uint8_t* begin = typeAndLength;
+  const uint8_t* end = typeAndLength + nRead;
+  ::ndn::tlv::readType(begin, end);
+  uint64_t length = ::ndn::tlv::readVarNumber(begin, end);
+  uint64_t size = static_cast<uint64_t>(begin - typeAndLength) + length;
+  if (size > nAvailable) {
+    throw ::ndn::tlv::Error("Not enough data in the buffer to decode TLV");
+  }
+  return static_cast<uint32_t>(size);
+}
+
+template<class Pkt>
+shared_ptr<const Pkt>
+decodePacket(shared_ptr< ::ndn::Buffer> buffer)
+{
+  // the block is decoded in place, without copying the buffer once more
+  auto packet = make_shared<Pkt>();
+  packet->wireDecode(Block(buffer));
+  return packet;
+}
+
+} // namespace
+
 template<>
 ns3::TypeId
 PacketHeader<Interest>::GetTypeId()
@@ -87,41 +121,38 @@ PacketHeader<Pkt>::Serialize(ns3::Buffer::Iterator start) const
   start.Write(m_packet->wireEncode().wire(), m_packet->wireEncode().size());
 }
 
-class Ns3BufferIteratorSource : public io::source {
-public:
-  Ns3BufferIteratorSource(ns3::Buffer::Iterator& is)
-    : m_is(is)
-  {
-  }
-
-  std::streamsize
-  read(char* buf, std::streamsize nMaxRead)
-  {
-    std::streamsize i = 0;
-    for (; i < nMaxRead && !m_is.IsEnd(); ++i) {
-      buf[i] = m_is.ReadU8();
-    }
-    if (i == 0) {
-      return -1;
-    }
-    else {
-      return i;
-    }
-  }
-
-private:
-  ns3::Buffer::Iterator& m_is;
-};
-
 template<class Pkt>
 uint32_t
 PacketHeader<Pkt>::Deserialize(ns3::Buffer::Iterator start)
 {
-  auto packet = make_shared<Pkt>();
-  io::stream<Ns3BufferIteratorSource> is(start);
-  packet->wireDecode(::ndn::Block::fromStream(is));
-  m_packet = packet;
-  return packet->wireEncode().size();
+  uint8_t typeAndLength[MAX_TYPE_AND_LENGTH_SIZE];
+  ns3::Buffer::Iterator i = start;
+  uint32_t nRead = std::min(MAX_TYPE_AND_LENGTH_SIZE, i.GetRemainingSize());
+  i.Read(typeAndLength, nRead);
+  uint32_t size = getTlvSize(typeAndLength, nRead, start.GetRemainingSize());
+
+  // Buffer::Iterator has no bulk read; DeserializeFrom is used on the receive path instead
+  auto buffer = make_shared< ::ndn::Buffer>(size);
+  start.Read(buffer->get(), size);
+
+  m_packet = decodePacket<Pkt>(buffer);
+  return size;
+}
+
+template<class Pkt>
+uint32_t
+PacketHeader<Pkt>::DeserializeFrom(Ptr<const ns3::Packet> packet)
+{
+  uint8_t typeAndLength[MAX_TYPE_AND_LENGTH_SIZE];
+  uint32_t nRead = packet->CopyData(typeAndLength, sizeof(typeAndLength));
+  uint32_t size = getTlvSize(typeAndLength, nRead, packet->GetSize());
+
+  // memcpy of each segment of the ns-3 buffer
+  auto buffer = make_shared< ::ndn::Buffer>(size);
+  packet->CopyData(buffer->get(), size);
+
+  m_packet = decodePacket<Pkt>(buffer);
+  return size;
 }
 
 template<>
@@ -21,6 +21,7 @@
 #define NDNSIM_NDN_HEADER_HPP
 
 #include "ns3/header.h"
+#include "ns3/packet.h"
 
 #include "ndn-common.hpp"
 
@@ -49,6 +50,18 @@ public:
   virtual uint32_t
   Deserialize(ns3::Buffer::Iterator start);
 
+  /**
+   * @brief Decode NDN packet from the start of the ns-3 packet
+   *
+   * Unlike Deserialize, which can only read the ns-3 buffer byte by byte, the TLV block is copied
+   * with a single Packet::CopyData call.  The ns-3 packet is not modified.
+   *
+   * @returns number of bytes of the decoded packet, to be removed from the start of the ns-3
+   *          packet
+   */
+  uint32_t
+  DeserializeFrom(Ptr<const ns3::Packet> packet);
+
   virtual void
   Print(std::ostream& os) const;
 
@@ -34,10 +34,13 @@
 
 #include "ndn-net-device-face.hpp"
 #include "../helper/ndn-stack-helper.hpp"
+#include "../utils/ndn-virtual-payload-tag.hpp"
 #include "cs/ndn-content-store.hpp"
 
 #include <boost/property_tree/info_parser.hpp>
 
+#include <map>
+
 #include "ns3/ndnSIM/NFD/daemon/fw/forwarder.hpp"
 #include "ns3/ndnSIM/NFD/daemon/mgmt/internal-face.hpp"
 #include "ns3/ndnSIM/NFD/daemon/mgmt/fib-manager.hpp"
@@ -92,6 +95,23 @@ L3Protocol::GetTypeId(void)
 class L3Protocol::Impl {
 private:
   Impl()
+    : m_config(getInitialConfig())
+    , m_areByteCountersEnabled(false)
+  {
+  }
+
+  /**
+   * @brief Get initial NFD config, parsed only once and copied for each node
+   */
+  static const nfd::ConfigSection&
+  getInitialConfig()
+  {
+    static const nfd::ConfigSection config = parseInitialConfig();
+    return config;
+  }
+
+  static nfd::ConfigSection
+  parseInitialConfig()
   {
     // Do not modify initial config file. Use helpers to set specific NFD parameters
     std::string initialConfig =
@@ -143,7 +163,9 @@ private:
       "\n";
 
     std::istringstream input(initialConfig);
-    boost::property_tree::read_info(input, m_config);
+    nfd::ConfigSection config;
+    boost::property_tree::read_info(input, config);
+    return config;
   }
 
   friend class L3Protocol;
@@ -159,8 +181,24 @@ private:
   nfd::ConfigSection m_config;
 
   Ptr<ContentStore> m_csFromNdnSim;
+
+  bool m_areByteCountersEnabled;
+  std::map<nfd::FaceId, shared_ptr<ByteCounters>> m_byteCounters;
 };
 
+namespace {
+
+template<class T>
+void
+countBytes(uint64_t& counter, const T& pkt)
+{
+  if (pkt.hasWire()) {
+    counter += pkt.wireEncode().size() + getVirtualPayloadSize(pkt);
+  }
+}
+
+} // namespace
+
 L3Protocol::L3Protocol()
   : m_impl(new Impl())
 {
@@ -173,11 +211,16 @@ L3Protocol::~L3Protocol()
 }
 
 void
-L3Protocol::initialize()
+L3Protocol::initialize(bool isManagementEnabled)
 {
   m_impl->m_forwarder = make_shared<nfd::Forwarder>();
 
-  initializeManagement();
+  if (isManagementEnabled) {
+    initializeManagement();
+  }
+  else {
+    initializeTables();
+  }
 
   m_impl->m_forwarder->getFaceTable().addReserved(make_shared<nfd::NullFace>(), nfd::FACEID_NULL);
 
@@ -257,6 +300,27 @@ L3Protocol::initializeManagement()
   entry->addNextHop(m_impl->m_internalFace, 0);
 }
 
+void
+L3Protocol::initializeTables()
+{
+  auto& forwarder = m_impl->m_forwarder;
+  using namespace nfd;
+
+  // without management, only the tables section of the config is applied
+  ConfigFile config((IgnoreSections({"general", "log", "rib", "authorizations"})));
+
+  TablesConfigSection tablesConfig(forwarder->getCs(),
+                                   forwarder->getPit(),
+                                   forwarder->getFib(),
+                                   forwarder->getStrategyChoice(),
+                                   forwarder->getMeasurements());
+  tablesConfig.setConfigFile(config);
+
+  config.parse(m_impl->m_config, false, "ndnSIM.conf");
+
+  tablesConfig.ensureTablesAreConfigured();
+}
+
 shared_ptr<nfd::Forwarder>
 L3Protocol::getForwarder()
 {
@@ -319,16 +383,37 @@ L3Protocol::addFace(shared_ptr<Face> face)
 
   m_impl->m_forwarder->addFace(face);
 
+  auto counters = make_shared<ByteCounters>();
+  m_impl->m_byteCounters[face->getId()] = counters;
+
   // Connect Signals to TraceSource
-  face->onReceiveInterest +=
-    [this, face](const Interest& interest) { this->m_inInterests(interest, *face); };
+  face->onReceiveInterest += [this, face, counters](const Interest& interest) {
+    this->m_inInterests(interest, *face);
+    if (m_impl->m_areByteCountersEnabled) {
+      countBytes(counters->nInInterestBytes, interest);
+    }
+  };
 
-  face->onSendInterest +=
-    [this, face](const Interest& interest) { this->m_outInterests(interest, *face); };
+  face->onSendInterest += [this, face, counters](const Interest& interest) {
+    this->m_outInterests(interest, *face);
+    if (m_impl->m_areByteCountersEnabled) {
+      countBytes(counters->nOutInterestBytes, interest);
+    }
+  };
 
-  face->onReceiveData += [this, face](const Data& data) { this->m_inData(data, *face); };
+  face->onReceiveData += [this, face, counters](const Data& data) {
+    this->m_inData(data, *face);
+    if (m_impl->m_areByteCountersEnabled) {
+      countBytes(counters->nInDataBytes, data);
+    }
+  };
 
-  face->onSendData += [this, face](const Data& data) { this->m_outData(data, *face); };
+  face->onSendData += [this, face, counters](const Data& data) {
+    this->m_outData(data, *face);
+    if (m_impl->m_areByteCountersEnabled) {
+      countBytes(counters->nOutDataBytes, data);
+    }
+  };
 
   return face->getId();
 }
@@ -339,6 +424,22 @@ L3Protocol::addFace(shared_ptr<Face> face)
 //   NS_LOG_FUNCTION(this << std::cref(*face));
 // }
 
+void
+L3Protocol::enableByteCounters()
+{
+  m_impl->m_areByteCountersEnabled = true;
+}
+
+L3Protocol::ByteCounters
+L3Protocol::getByteCounters(nfd::FaceId face) const
+{
+  auto counters = m_impl->m_byteCounters.find(face);
+  if (counters == m_impl->m_byteCounters.end()) {
+    return ByteCounters();
+  }
+  return *counters->second;
+}
+
 shared_ptr<Face>
 L3Protocol::getFaceById(nfd::FaceId id) const
 {
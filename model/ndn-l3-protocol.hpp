@@ -94,9 +94,14 @@ public:
 
   /**
    * \brief Initialize NFD instance
+   *
+   * \param isManagementEnabled whether to create NFD management (InternalFace, FibManager,
+   *        FaceManager, StrategyChoiceManager, StatusServer, and /localhost/nfd FIB entry).
+   *        Without management, FIB and strategy choice can be configured only through the
+   *        tables, which is what FibHelper and StrategyChoiceHelper do in this case.
    */
   void
-  initialize();
+  initialize(bool isManagementEnabled = true);
 
   /**
    * \brief Get smart pointer to nfd::Forwarder installed on the node
@@ -106,12 +111,16 @@ public:
 
   /**
    * \brief Get smart pointer to nfd::FibManager, used by node's NFD
+   *
+   * Returns nullptr if the stack was initialized without NFD management
    */
   shared_ptr<nfd::FibManager>
   getFibManager();
 
   /**
    * \brief Get smart pointer to nfd::StrategyChoiceManager, used by node's NFD
+   *
+   * Returns nullptr if the stack was initialized without NFD management
    */
   shared_ptr<nfd::StrategyChoiceManager>
   getStrategyChoiceManager();
@@ -128,6 +137,41 @@ public:
   nfd::FaceId
   addFace(shared_ptr<Face> face);
 
+  /**
+   * \brief Sizes of Interests and Data received and sent through a face, including their
+   *        virtual payload
+   */
+  struct ByteCounters
+  {
+    ByteCounters()
+      : nInInterestBytes(0)
+      , nOutInterestBytes(0)
+      , nInDataBytes(0)
+      , nOutDataBytes(0)
+    {
+    }
+
+    uint64_t nInInterestBytes;
+    uint64_t nOutInterestBytes;
+    uint64_t nInDataBytes;
+    uint64_t nOutDataBytes;
+  };
+
+  /**
+   * \brief Start counting sizes of Interests and Data on all faces of the node
+   *
+   * Byte counters are not updated by default, so that packets are not inspected unless the
+   * counters are used (e.g., by L3RateTracer in FACE_COUNTERS mode).
+   */
+  void
+  enableByteCounters();
+
+  /**
+   * \brief Get byte counters of the face (all zeros, unless enableByteCounters was called)
+   */
+  ByteCounters
+  getByteCounters(nfd::FaceId face) const;
+
   /**
    * \brief Get face by face ID
    * \param face The face ID number
@@ -175,6 +219,9 @@ private:
   void
   initializeManagement();
 
+  void
+  initializeTables();
+
 private:
   class Impl;
   std::unique_ptr<Impl> m_impl;
@@ -33,12 +33,110 @@
 #include "ns3/channel.h"
 
 #include "../utils/ndn-fw-hop-count-tag.hpp"
+#include "../utils/ndn-ns3-packet-tag.hpp"
+#include "../utils/ndn-virtual-payload-tag.hpp"
 
 NS_LOG_COMPONENT_DEFINE("ndn.NetDeviceFace");
 
 namespace ns3 {
 namespace ndn {
 
+namespace {
+
+inline uint32_t
+getMutableNonce(const Interest& interest)
+{
+  // Interest::setNonce overwrites the Nonce in place, without re-encoding the Interest
+  return interest.getNonce();
+}
+
+inline uint32_t
+getMutableNonce(const Data&)
+{
+  return 0;
+}
+
+/**
+ * \brief ns-3 packet prepared for transmission of Interest or Data
+ *
+ * Strategies send the same Interest or Data out of several faces one after another (e.g.,
+ * broadcast strategy or Data satisfying several downstreams), so the packet is serialized once
+ * and each face transmits a copy-on-write copy of it.  The tag is stored on the Interest or Data
+ * itself and is used only while the packet is unchanged since the tag was created.
+ */
+class OutgoingPacketTag : public ::ndn::Tag {
+public:
+  static size_t
+  getTypeId()
+  {
+    return 0x41a1ac2a; // md5("OutgoingPacketTag")[0:8]
+  }
+
+  template<class T>
+  OutgoingPacketTag(const T& pkt, Ptr<const Packet> packet)
+    : m_wire(pkt.wireEncode())
+    , m_ns3PacketTag(pkt.template getTag<Ns3PacketTag>())
+    , m_virtualPayloadSize(getVirtualPayloadSize(pkt))
+    , m_nonce(getMutableNonce(pkt))
+    , m_packet(packet)
+  {
+  }
+
+  /**
+   * \brief Check whether the tag was created for the current state of Interest or Data
+   *
+   * Copies of Interest or Data carry the tag of the original, and a copy may get a new Nonce
+   * that is written into the wire buffer shared with the original.
+   */
+  template<class T>
+  bool
+  isPreparedFor(const T& pkt) const
+  {
+    const Block& wire = pkt.wireEncode();
+    // m_wire keeps the buffer alive, so the same address means the same buffer
+    return m_wire.wire() == wire.wire() && m_wire.size() == wire.size()
+           && m_ns3PacketTag == pkt.template getTag<Ns3PacketTag>()
+           && m_virtualPayloadSize == getVirtualPayloadSize(pkt)
+           && m_nonce == getMutableNonce(pkt);
+  }
+
+  Ptr<const Packet>
+  getPacket() const
+  {
+    return m_packet;
+  }
+
+private:
+  Block m_wire;
+  shared_ptr<const Ns3PacketTag> m_ns3PacketTag;
+  size_t m_virtualPayloadSize;
+  uint32_t m_nonce;
+  Ptr<const Packet> m_packet;
+};
+
+template<class T>
+Ptr<Packet>
+prepareOutgoingPacket(const T& pkt)
+{
+  shared_ptr<OutgoingPacketTag> tag = pkt.template getTag<OutgoingPacketTag>();
+  if (tag == nullptr || !tag->isPreparedFor(pkt)) {
+    Ptr<Packet> packet = Convert::ToPacket(pkt);
+
+    // all faces of the forwarding decision send the packet with the same hop count
+    FwHopCountTag hopCount;
+    packet->RemovePacketTag(hopCount);
+    hopCount.Increment();
+    packet->AddPacketTag(hopCount);
+
+    tag = make_shared<OutgoingPacketTag>(pkt, packet);
+    pkt.setTag(tag);
+  }
+
+  return tag->getPacket()->Copy();
+}
+
+} // namespace
+
 NetDeviceFace::NetDeviceFace(Ptr<Node> node, const Ptr<NetDevice>& netDevice)
   : Face(FaceUri("netDeviceFace://"), FaceUri("netDeviceFace://"))
   , m_node(node)
@@ -81,11 +179,6 @@ NetDeviceFace::send(Ptr<Packet> packet)
                 "Packet size " << packet->GetSize() << " exceeds device MTU "
                                << m_netDevice->GetMtu());
 
-  FwHopCountTag tag;
-  packet->RemovePacketTag(tag);
-  tag.Increment();
-  packet->AddPacketTag(tag);
-
   m_netDevice->Send(packet, m_netDevice->GetBroadcast(), L3Protocol::ETHERNET_FRAME_TYPE);
 }
 
@@ -96,7 +189,7 @@ NetDeviceFace::sendInterest(const Interest& interest)
 
   this->onSendInterest(interest);
 
-  Ptr<Packet> packet = Convert::ToPacket(interest);
+  Ptr<Packet> packet = prepareOutgoingPacket(interest);
   send(packet);
 }
 
@@ -107,7 +200,7 @@ NetDeviceFace::sendData(const Data& data)
 
   this->onSendData(data);
 
-  Ptr<Packet> packet = Convert::ToPacket(data);
+  Ptr<Packet> packet = prepareOutgoingPacket(data);
   send(packet);
 }
 
@@ -25,6 +25,8 @@
 
 #include "ndn-header.hpp"
 #include "../utils/ndn-ns3-packet-tag.hpp"
+#include "../utils/ndn-virtual-payload-tag.hpp"
+#include "../utils/ndn-virtual-payload-packet-tag.hpp"
 
 namespace ns3 {
 namespace ndn {
@@ -34,9 +36,17 @@ std::shared_ptr<const T>
 Convert::FromPacket(Ptr<Packet> packet)
 {
   PacketHeader<T> header;
-  packet->RemoveHeader(header);
+  packet->RemoveAtStart(header.DeserializeFrom(packet));
 
   auto pkt = header.getPacket();
+
+  VirtualPayloadPacketTag virtualPayload;
+  if (packet->RemovePacketTag(virtualPayload)) {
+    pkt->setTag(make_shared<VirtualPayloadTag>(virtualPayload.Get()));
+  }
+
+  // drop the virtual payload and anything else following the NDN packet (e.g., frame padding)
+  packet->RemoveAtEnd(packet->GetSize());
   pkt->setTag(make_shared<Ns3PacketTag>(packet));
 
   return pkt;
@@ -64,6 +74,13 @@ Convert::ToPacket(const T& pkt)
     packet = Create<Packet>();
   }
 
+  size_t virtualPayloadSize = getVirtualPayloadSize(pkt);
+  if (virtualPayloadSize > 0) {
+    // zero-filled bytes of Create<Packet>(size) are not allocated in memory
+    packet->AddAtEnd(Create<Packet>(virtualPayloadSize));
+    packet->AddPacketTag(VirtualPayloadPacketTag(virtualPayloadSize));
+  }
+
   packet->AddHeader(header);
   return packet;
 }
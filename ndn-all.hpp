@@ -23,6 +23,9 @@
 #include "ns3/ndnSIM/helper/ndn-stack-helper.hpp"
 #include "ns3/ndnSIM/helper/ndn-app-helper.hpp"
 #include "ns3/ndnSIM/helper/ndn-global-routing-helper.hpp"
+#include "ns3/ndnSIM/helper/ndn-ensemble-helper.hpp"
+#include "ns3/ndnSIM/helper/ndn-fib-lookup.hpp"
+#include "ns3/ndnSIM/helper/ndn-tables-snapshot.hpp"
 // #include "ns3/ndnSIM/helper/ndn-ip-faces-helper.hpp"
 // #include "ns3/ndnSIM/helper/ndn-link-control-helper.hpp"
 
@@ -31,8 +34,14 @@
 #include "ns3/ndnSIM/utils/topology/rocketfuel-weights-reader.hpp"
 #include "ns3/ndnSIM/utils/tracers/l2-rate-tracer.hpp"
 #include "ns3/ndnSIM/utils/tracers/ndn-app-delay-tracer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-binary-trace-writer.hpp"
 #include "ns3/ndnSIM/utils/tracers/ndn-cs-tracer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-delay-histogram.hpp"
 #include "ns3/ndnSIM/utils/tracers/ndn-l3-rate-tracer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-prefix-rate-tracer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-batcher.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-filter.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-stream.hpp"
 
 // #include "ns3/ndnSIM/model/ndn-app-face.hpp"
 #include "ns3/ndnSIM/model/ndn-l3-protocol.hpp"
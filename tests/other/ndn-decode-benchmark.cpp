@@ -0,0 +1,206 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+// ndn-decode-benchmark.cpp
+
+#include "ns3/core-module.h"
+#include "ns3/network-module.h"
+#include "ns3/ndnSIM-module.h"
+#include "ns3/ndnSIM/model/ndn-header.hpp"
+
+#include <boost/iostreams/concepts.hpp>
+#include <boost/iostreams/stream.hpp>
+
+#include <chrono>
+#include <iomanip>
+
+namespace ns3 {
+
+/**
+ * Microbenchmark of decoding NDN packets received by NetDeviceFace from ns-3 packets.
+ *
+ * Interest and Data packets are decoded using ndn::Convert::FromPacket, which copies the TLV
+ * block with Packet::CopyData, and compared against Packet::RemoveHeader with
+ * ndn::PacketHeader, which can read the buffer only byte by byte, and against the previous
+ * implementation, which read the buffer byte by byte through an iostream:
+ *
+ *     ./waf --run "ndn-decode-benchmark --iterations=100000 --payload=1024"
+ */
+
+namespace io = boost::iostreams;
+
+class ByteByByteSource : public io::source {
+public:
+  ByteByByteSource(Buffer::Iterator& is)
+    : m_is(is)
+  {
+  }
+
+  std::streamsize
+  read(char* buf, std::streamsize nMaxRead)
+  {
+    std::streamsize i = 0;
+    for (; i < nMaxRead && !m_is.IsEnd(); ++i) {
+      buf[i] = m_is.ReadU8();
+    }
+    return i == 0 ? -1 : i;
+  }
+
+private:
+  Buffer::Iterator& m_is;
+};
+
+class StreamHeader : public Header {
+public:
+  static TypeId
+  GetTypeId()
+  {
+    static TypeId tid = TypeId("ns3::ndn::StreamHeader").SetParent<Header>();
+    return tid;
+  }
+
+  virtual TypeId
+  GetInstanceTypeId() const
+  {
+    return GetTypeId();
+  }
+
+  virtual uint32_t
+  GetSerializedSize() const
+  {
+    return 0;
+  }
+
+  virtual void
+  Serialize(Buffer::Iterator start) const
+  {
+  }
+
+  virtual uint32_t
+  Deserialize(Buffer::Iterator start)
+  {
+    io::stream<ByteByByteSource> is(start);
+    m_block = ::ndn::Block::fromStream(is);
+    return m_block.size();
+  }
+
+  virtual void
+  Print(std::ostream& os) const
+  {
+  }
+
+  const ::ndn::Block&
+  getBlock() const
+  {
+    return m_block;
+  }
+
+private:
+  ::ndn::Block m_block;
+};
+
+template<class T>
+std::shared_ptr<const T>
+streamFromPacket(Ptr<Packet> packet)
+{
+  StreamHeader header;
+  packet->RemoveHeader(header);
+  return std::make_shared<T>(header.getBlock());
+}
+
+template<class T>
+std::shared_ptr<const T>
+headerFromPacket(Ptr<Packet> packet)
+{
+  ndn::PacketHeader<T> header;
+  packet->RemoveHeader(header);
+  return header.getPacket();
+}
+
+template<class T>
+double
+measure(Ptr<const Packet> original, std::shared_ptr<const T> (*decode)(Ptr<Packet>),
+        uint32_t nIterations)
+{
+  auto begin = std::chrono::steady_clock::now();
+  for (uint32_t i = 0; i < nIterations; ++i) {
+    decode(original->Copy());
+  }
+  std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - begin;
+  return elapsed.count() / nIterations;
+}
+
+template<class T>
+void
+report(const std::string& label, std::shared_ptr<const T> packet, uint32_t nIterations)
+{
+  Ptr<Packet> original = ndn::Convert::ToPacket(*packet);
+
+  double stream = measure<T>(original, &streamFromPacket<T>, nIterations);
+  double header = measure<T>(original, &headerFromPacket<T>, nIterations);
+  double bulk = measure<T>(original, &ndn::Convert::FromPacket<T>, nIterations);
+
+  std::cout << std::left << std::setw(10) << label << std::right
+            << std::setw(10) << original->GetSize()
+            << std::setw(14) << std::fixed << std::setprecision(1) << stream
+            << std::setw(14) << header
+            << std::setw(14) << bulk
+            << std::setw(10) << std::setprecision(2) << stream / bulk << "x\n";
+}
+
+int
+main(int argc, char* argv[])
+{
+  uint32_t nIterations = 100000;
+  uint32_t payloadSize = 1024;
+
+  CommandLine cmd;
+  cmd.AddValue("iterations", "Number of decoded packets of each type", nIterations);
+  cmd.AddValue("payload", "Size of the Data payload", payloadSize);
+  cmd.Parse(argc, argv);
+
+  auto interest = std::make_shared<ndn::Interest>("/prefix/component/%FE%01");
+  interest->setNonce(42);
+  interest->setInterestLifetime(ndn::time::seconds(2));
+
+  auto data = std::make_shared<ndn::Data>("/prefix/component/%FE%01");
+  data->setFreshnessPeriod(ndn::time::seconds(1));
+  data->setContent(std::make_shared< ::ndn::Buffer>(payloadSize));
+  ndn::StackHelper::getKeyChain().sign(*data);
+
+  std::cout << std::left << std::setw(10) << "Packet" << std::right
+            << std::setw(10) << "Size"
+            << std::setw(14) << "Stream(ns)"
+            << std::setw(14) << "Header(ns)"
+            << std::setw(14) << "Bulk(ns)"
+            << std::setw(11) << "Speedup\n";
+
+  report<ndn::Interest>("Interest", interest, nIterations);
+  report<ndn::Data>("Data", data, nIterations);
+
+  return 0;
+}
+
+} // namespace ns3
+
+int
+main(int argc, char* argv[])
+{
+  return ns3::main(argc, argv);
+}
@@ -0,0 +1,71 @@
+## -*- Mode: python; py-indent-offset: 4; indent-tabs-mode: nil; coding: utf-8; -*-
+#
+# Copyright (c) 2011-2015  Regents of the University of California.
+#
+# This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+# contributors.
+#
+# ndnSIM is free software: you can redistribute it and/or modify it under the terms
+# of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+#
+# ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# ndn-import-time.py
+#
+# Benchmark of the import time of ndnSIM Python bindings.  Each statement is timed in a fresh
+# interpreter, after importing ns.core (as virtually all scenarios do) unless --no-core is given:
+#
+#     ./waf --pyrun="src/ndnSIM/tests/other/ndn-import-time.py --runs=20"
+
+import argparse
+import subprocess
+import sys
+
+STATEMENTS = [
+    ("import", "import ns.ndnSIM"),
+    ("star-import", "from ns.ndnSIM import *"),
+    ("name", "from ns.ndnSIM import ndn; ndn.Name('/prefix')"),
+    ("helpers", "from ns.ndnSIM import ndn; ndn.StackHelper()"),
+    ("nfd", "from ns.ndnSIM import ndn; ndn.nfd.Fib"),
+    ("all", "from ns.ndnSIM import ndn; ndn.loadAll()"),
+]
+
+CHILD = """
+import sys, time
+%s
+start = time.time()
+%s
+sys.stdout.write("%%.6f" %% (time.time() - start))
+"""
+
+
+def measure(statement, preload):
+    output = subprocess.check_output([sys.executable, "-c", CHILD % (preload, statement)])
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of ndnSIM Python bindings")
+    parser.add_argument("--runs", type=int, default=10, help="number of runs per statement")
+    parser.add_argument("--no-core", action="store_true",
+                        help="do not import ns.core before the timed statement")
+    args = parser.parse_args()
+
+    preload = "" if args.no_core else "import ns.core"
+
+    print("%-12s %10s %10s %10s" % ("Statement", "Min(ms)", "Median(ms)", "Max(ms)"))
+    for label, statement in STATEMENTS:
+        times = sorted(measure(statement, preload) for run in range(args.runs))
+        print("%-12s %10.2f %10.2f %10.2f" % (label, times[0] * 1000,
+                                              times[len(times) // 2] * 1000, times[-1] * 1000))
+
+
+if __name__ == "__main__":
+    main()
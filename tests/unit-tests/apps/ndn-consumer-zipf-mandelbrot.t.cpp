@@ -0,0 +1,71 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+#include "apps/ndn-consumer-zipf-mandelbrot.hpp"
+
+#include <algorithm>
+
+#include "../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+BOOST_FIXTURE_TEST_SUITE(AppsNdnConsumerZipfMandelbrot, CleanupFixture)
+
+BOOST_AUTO_TEST_CASE(SharedTables)
+{
+  auto table = ConsumerZipfMandelbrot::GetCumulativeProbabilities(100, 0.7, 0.7);
+  BOOST_REQUIRE_EQUAL(table->size(), 101U);
+  BOOST_CHECK_EQUAL(table->front(), 0.0);
+  BOOST_CHECK_EQUAL(table->back(), 1.0);
+  BOOST_CHECK(std::is_sorted(table->begin(), table->end()));
+
+  BOOST_CHECK(ConsumerZipfMandelbrot::GetCumulativeProbabilities(100, 0.7, 0.7) == table);
+  BOOST_CHECK(ConsumerZipfMandelbrot::GetCumulativeProbabilities(100, 0.7, 0.8) != table);
+  BOOST_CHECK(ConsumerZipfMandelbrot::GetCumulativeProbabilities(100, 0.8, 0.7) != table);
+  BOOST_CHECK(ConsumerZipfMandelbrot::GetCumulativeProbabilities(200, 0.7, 0.7) != table);
+}
+
+BOOST_AUTO_TEST_CASE(GetNextSeq)
+{
+  Ptr<ConsumerZipfMandelbrot> consumer = CreateObject<ConsumerZipfMandelbrot>();
+  consumer->SetAttribute("NumberOfContents", StringValue("10"));
+  consumer->SetAttribute("q", StringValue("0"));
+  consumer->SetAttribute("s", StringValue("1"));
+
+  auto table = ConsumerZipfMandelbrot::GetCumulativeProbabilities(10, 0, 1);
+
+  const uint32_t nSamples = 10000;
+  std::vector<uint32_t> counts(11);
+  for (uint32_t i = 0; i < nSamples; ++i) {
+    uint32_t seq = consumer->GetNextSeq();
+    BOOST_REQUIRE(seq >= 1 && seq <= 10);
+    counts[seq]++;
+  }
+
+  for (uint32_t i = 1; i <= 10; ++i) {
+    double expected = (*table)[i] - (*table)[i - 1];
+    BOOST_CHECK_SMALL(static_cast<double>(counts[i]) / nSamples - expected, 0.02);
+  }
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,129 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+#include "apps/ndn-producer.hpp"
+#include "helper/ndn-stack-helper.hpp"
+#include "helper/ndn-app-helper.hpp"
+#include "utils/ndn-virtual-payload-tag.hpp"
+
+#include "../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class ProducerFixture : public CleanupFixture
+{
+public:
+  Ptr<Producer>
+  installProducer(std::initializer_list<std::pair<std::string, std::string>> attributes)
+  {
+    Ptr<Node> node = CreateObject<Node>();
+    StackHelper().Install(node);
+
+    AppHelper producerHelper("ns3::ndn::Producer");
+    producerHelper.SetPrefix("/prefix");
+    producerHelper.SetAttribute("Freshness", StringValue("2s"));
+    producerHelper.SetAttribute("KeyLocator", StringValue("/key"));
+    for (const auto& attribute : attributes) {
+      producerHelper.SetAttribute(attribute.first, StringValue(attribute.second));
+    }
+    Ptr<Producer> producer = DynamicCast<Producer>(producerHelper.Install(node).Get(0));
+    producer->TraceConnectWithoutContext("TransmittedDatas",
+                                         MakeCallback(&ProducerFixture::onData, this));
+
+    Simulator::Stop(Seconds(0.1));
+    Simulator::Run();
+    return producer;
+  }
+
+  void
+  onData(shared_ptr<const Data> data, Ptr<App>, shared_ptr<Face>)
+  {
+    datas.push_back(data);
+  }
+
+  static Data
+  makeExpectedData(const Name& name, size_t payloadSize)
+  {
+    Data data(name);
+    data.setFreshnessPeriod(time::seconds(2));
+    data.setContent(make_shared< ::ndn::Buffer>(payloadSize));
+
+    SignatureInfo signatureInfo(static_cast< ::ndn::tlv::SignatureTypeValue>(255));
+    signatureInfo.setKeyLocator(Name("/key"));
+    Signature signature;
+    signature.setInfo(signatureInfo);
+    signature.setValue(::ndn::nonNegativeIntegerBlock(::ndn::tlv::SignatureValue, 0));
+    data.setSignature(signature);
+    return data;
+  }
+
+public:
+  std::vector<shared_ptr<const Data>> datas;
+};
+
+BOOST_FIXTURE_TEST_SUITE(AppsNdnProducer, ProducerFixture)
+
+BOOST_AUTO_TEST_CASE(DataTemplate)
+{
+  Ptr<Producer> producer = installProducer({{"PayloadSize", "100"}});
+
+  producer->OnInterest(make_shared<Interest>("/prefix/1"));
+  producer->OnInterest(make_shared<Interest>("/prefix/a/long/name/2"));
+
+  BOOST_REQUIRE_EQUAL(datas.size(), 2U);
+  BOOST_CHECK(datas[0]->wireEncode() == makeExpectedData("/prefix/1", 100).wireEncode());
+  BOOST_CHECK(datas[1]->wireEncode()
+              == makeExpectedData("/prefix/a/long/name/2", 100).wireEncode());
+  BOOST_CHECK_EQUAL(datas[1]->getName(), Name("/prefix/a/long/name/2"));
+  BOOST_CHECK_EQUAL(datas[1]->getContent().value_size(), 100U);
+}
+
+BOOST_AUTO_TEST_CASE(VirtualPayload)
+{
+  Ptr<Producer> producer = installProducer({{"PayloadSize", "8192"},
+                                            {"VirtualPayload", "true"}});
+
+  producer->OnInterest(make_shared<Interest>("/prefix/1"));
+
+  BOOST_REQUIRE_EQUAL(datas.size(), 1U);
+  BOOST_CHECK(datas[0]->wireEncode() == makeExpectedData("/prefix/1", 0).wireEncode());
+  BOOST_CHECK_EQUAL(getVirtualPayloadSize(*datas[0]), 8192U);
+}
+
+BOOST_AUTO_TEST_CASE(DataCache)
+{
+  Ptr<Producer> producer = installProducer({{"DataCacheSize", "2"}});
+
+  for (const char* name : {"/prefix/1", "/prefix/2", "/prefix/1", "/prefix/3", "/prefix/1",
+                           "/prefix/2"}) {
+    producer->OnInterest(make_shared<Interest>(name));
+  }
+
+  BOOST_REQUIRE_EQUAL(datas.size(), 6U);
+  BOOST_CHECK(datas[0] == datas[2]); // /prefix/1 is cached
+  BOOST_CHECK(datas[0] == datas[4]); // /prefix/1 is still cached, as it was recently used
+  BOOST_CHECK(datas[1] != datas[5]); // /prefix/2 was evicted by /prefix/3
+  BOOST_CHECK(datas[1]->wireEncode() == datas[5]->wireEncode());
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
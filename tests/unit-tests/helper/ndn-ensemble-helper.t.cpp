@@ -0,0 +1,75 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+#include "helper/ndn-ensemble-helper.hpp"
+
+#include <boost/filesystem.hpp>
+
+#include <fstream>
+#include <sstream>
+
+#include "../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+BOOST_FIXTURE_TEST_SUITE(HelperNdnEnsembleHelper, CleanupFixture)
+
+BOOST_AUTO_TEST_CASE(ReplicaFileName)
+{
+  BOOST_CHECK_EQUAL(EnsembleHelper::GetReplicaFileName("rate-trace.txt", 3), "rate-trace-3.txt");
+  BOOST_CHECK_EQUAL(EnsembleHelper::GetReplicaFileName("dir/rate-trace.txt.gz", 0),
+                    "dir/rate-trace-0.txt.gz");
+  BOOST_CHECK_EQUAL(EnsembleHelper::GetReplicaFileName("dir.d/trace", 1), "dir.d/trace-1");
+  BOOST_CHECK_EQUAL(EnsembleHelper::GetReplicaFileName("-", 1), "-");
+}
+
+BOOST_AUTO_TEST_CASE(MergeTraceFiles)
+{
+  boost::filesystem::create_directories(TEST_CONFIG_PATH);
+  std::string file = (boost::filesystem::path(TEST_CONFIG_PATH) / "trace.txt").string();
+
+  for (uint32_t replica = 0; replica < 2; replica++) {
+    std::ofstream os(EnsembleHelper::GetReplicaFileName(file, replica).c_str());
+    os << "Time\tValue\n"
+       << "1\t" << replica * 10 << "\n"
+       << "2\t" << replica * 10 + 1 << "\n";
+  }
+
+  BOOST_CHECK_EQUAL(EnsembleHelper::MergeTraceFiles(file, 3), 2U);
+
+  std::ifstream is(file.c_str());
+  std::stringstream merged;
+  merged << is.rdbuf();
+  BOOST_CHECK_EQUAL(merged.str(),
+                    "Replica\tTime\tValue\n"
+                    "0\t1\t0\n"
+                    "0\t2\t1\n"
+                    "1\t1\t10\n"
+                    "1\t2\t11\n");
+
+  boost::filesystem::remove(file);
+  for (uint32_t replica = 0; replica < 2; replica++) {
+    boost::filesystem::remove(EnsembleHelper::GetReplicaFileName(file, replica));
+  }
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
@@ -18,6 +18,8 @@
  **/
 
 #include "helper/ndn-fib-helper.hpp"
+#include "model/ndn-l3-protocol.hpp"
+#include "NFD/daemon/fw/forwarder.hpp"
 
 #include "../tests-common.hpp"
 
@@ -97,6 +99,38 @@ BOOST_AUTO_TEST_CASE(Helper4)
   FibHelper::AddRoute(getNode("1"), Name("/prefix"), getNode("2"), 10);
 }
 
+// static size_t
+// AddRoutes(const std::vector<RouteInfo>& routes);
+// static size_t
+// RemoveRoutes(const std::vector<RouteInfo>& routes);
+BOOST_AUTO_TEST_CASE(Bulk)
+{
+  uint32_t faceId = getFace("1", "2")->getId();
+  BOOST_CHECK_EQUAL(FibHelper::AddRoutes({
+        {getNode("1"), "/prefix", faceId, 1},
+        {getNode("1"), "/other-prefix", 10000, 1}, // non-existing face
+        {getNode("1"), "/removed-prefix", faceId, 5}
+      }), 2);
+
+  nfd::Fib& fib = getNode("1")->GetObject<L3Protocol>()->getForwarder()->getFib();
+
+  shared_ptr<nfd::fib::Entry> entry = fib.findExactMatch("/prefix");
+  BOOST_REQUIRE(entry != nullptr);
+  BOOST_REQUIRE_EQUAL(entry->getNextHops().size(), 1);
+  BOOST_CHECK_EQUAL(entry->getNextHops().front().getFace()->getId(), faceId);
+  BOOST_CHECK_EQUAL(entry->getNextHops().front().getCost(), 1);
+
+  BOOST_CHECK(fib.findExactMatch("/other-prefix") == nullptr);
+
+  // entries left without next hops are erased
+  BOOST_CHECK_EQUAL(FibHelper::RemoveRoutes({
+        {getNode("1"), "/removed-prefix", faceId, 0},
+        {getNode("1"), "/other-prefix", faceId, 0} // non-existing entry
+      }), 1);
+  BOOST_CHECK(fib.findExactMatch("/removed-prefix") == nullptr);
+  BOOST_CHECK(fib.findExactMatch("/prefix") != nullptr);
+}
+
 BOOST_AUTO_TEST_SUITE_END() // AddRoute
 
 BOOST_AUTO_TEST_SUITE_END() // HelperNdnFibHelper
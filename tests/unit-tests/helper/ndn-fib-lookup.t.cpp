@@ -0,0 +1,102 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+#include "helper/ndn-fib-lookup.hpp"
+
+#include "../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class FibLookupFixture : public ScenarioHelperWithCleanupFixture
+{
+public:
+  FibLookupFixture()
+  {
+    createTopology({
+        {"1", "2"},
+        {"1", "3"}
+      });
+
+    addRoutes({
+        {"1", "2", "/prefix", 10},
+        {"1", "3", "/prefix", 5},
+        {"1", "2", "/other", 1}
+      });
+  }
+};
+
+BOOST_FIXTURE_TEST_SUITE(HelperNdnFibLookup, FibLookupFixture)
+
+BOOST_AUTO_TEST_CASE(LongestPrefixMatch)
+{
+  FibLookup lookup(getNode("1"));
+
+  FibLookup::Result result = lookup.findLongestPrefixMatch("/prefix/a/b");
+  BOOST_CHECK_EQUAL(result.faceId, getFace("1", "3")->getId());
+  BOOST_CHECK_EQUAL(result.cost, 5U);
+  BOOST_CHECK_EQUAL(result.nNextHops, 2U);
+  BOOST_CHECK_EQUAL(result.prefixLength, 1);
+
+  result = lookup.findLongestPrefixMatch("/unknown");
+  BOOST_CHECK_EQUAL(result.faceId, -1);
+  BOOST_CHECK_EQUAL(result.nNextHops, 0U);
+  BOOST_CHECK_EQUAL(result.prefixLength, -1);
+}
+
+BOOST_AUTO_TEST_CASE(ExactMatch)
+{
+  FibLookup lookup(getNode("1"));
+
+  FibLookup::Result result = lookup.findExactMatch("/other");
+  BOOST_CHECK_EQUAL(result.faceId, getFace("1", "2")->getId());
+  BOOST_CHECK_EQUAL(result.cost, 1U);
+  BOOST_CHECK_EQUAL(result.nNextHops, 1U);
+  BOOST_CHECK_EQUAL(result.prefixLength, 1);
+
+  result = lookup.findExactMatch("/other/a");
+  BOOST_CHECK_EQUAL(result.faceId, -1);
+  BOOST_CHECK_EQUAL(result.prefixLength, -1);
+}
+
+BOOST_AUTO_TEST_CASE(Bulk)
+{
+  FibLookup lookup(getNode("1"));
+
+  BOOST_REQUIRE_EQUAL(lookup.lookupUris("/prefix/1\n/other/2\n/unknown/3"), 3U);
+  const std::vector<FibLookup::Result>& results = lookup.getResults();
+  BOOST_CHECK_EQUAL(results[0].faceId, getFace("1", "3")->getId());
+  BOOST_CHECK_EQUAL(results[1].faceId, getFace("1", "2")->getId());
+  BOOST_CHECK_EQUAL(results[1].cost, 1U);
+  BOOST_CHECK_EQUAL(results[2].faceId, -1);
+
+  BOOST_REQUIRE_EQUAL(lookup.lookupUris("/prefix/1\n/prefix", true), 2U);
+  BOOST_CHECK_EQUAL(lookup.getResults()[0].prefixLength, -1);
+  BOOST_CHECK_EQUAL(lookup.getResults()[1].prefixLength, 1);
+
+  std::vector<Name> names{"/prefix/1", "/other"};
+  BOOST_REQUIRE_EQUAL(lookup.lookup(names).size(), 2U);
+  BOOST_CHECK_EQUAL(lookup.getResults()[0].nNextHops, 2U);
+  BOOST_CHECK_EQUAL(lookup.getResults()[1].nNextHops, 1U);
+  BOOST_CHECK_EQUAL(lookup.getNResults(), 2U);
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
@@ -18,6 +18,7 @@
  **/
 
 #include "helper/ndn-global-routing-helper.hpp"
+#include "helper/ndn-link-control-helper.hpp"
 
 #include "model/ndn-global-router.hpp"
 #include "model/ndn-l3-protocol.hpp"
@@ -54,39 +55,162 @@ public:
   {
     boost::filesystem::remove(TEST_TOPO_TXT);
   }
+
+  /**
+   * \brief Create triangle topology A<id>-B<id>-C<id> and announce @p prefix from C<id>
+   *
+   * By default, the path via B<id> is cheaper than the direct link between A<id> and C<id>.
+   */
+  void
+  setupTriangleTopology(const std::string& id, const std::string& directMetric = "500",
+                        const std::string& prefix = "/prefix")
+  {
+    setupTopology("router\n\n"
+                  "#node city  y x mpi-partition\n" +
+                  triangleNodes(id) + "\n"
+                  "link\n\n"
+                  "# from  to  capacity  metric  delay queue\n" +
+                  triangleLinks(id, directMetric),
+                  "C" + id, prefix);
+  }
+
+  /**
+   * \brief Create triangle topology A3-B3-C3 with node D3 attached to C3, and announce /prefix
+   *        from D3
+   */
+  void
+  setupTriangleWithStubTopology()
+  {
+    setupTopology("router\n\n"
+                  "#node city  y x mpi-partition\n" +
+                  triangleNodes("3") +
+                  "D3  NA  120  0  1\n\n"
+                  "link\n\n"
+                  "# from  to  capacity  metric  delay queue\n" +
+                  triangleLinks("3", "500") +
+                  "C3      D3  10Mbps    1 1ms 100\n",
+                  "D3");
+  }
+
+  /**
+   * \brief Create diamond topology A8-{B8,C8}-D8 with an expensive direct link between A8 and
+   *        D8, and announce /prefix from D8
+   */
+  void
+  setupDiamondTopology()
+  {
+    setupTopology("router\n\n"
+                  "#node city  y x mpi-partition\n"
+                  "A8  NA  1 1 1\n"
+                  "B8  NA  80  -40 1\n"
+                  "C8  NA  80  40  1\n"
+                  "D8  NA  120  0  1\n\n"
+                  "link\n\n"
+                  "# from  to  capacity  metric  delay queue\n"
+                  "A8      B8  10Mbps    1 1ms 100\n"
+                  "A8      C8  10Mbps    1 1ms 100\n"
+                  "A8      D8  10Mbps    10 1ms 100\n"
+                  "B8      D8  10Mbps    1 1ms 100\n"
+                  "C8      D8  10Mbps    1 1ms 100\n",
+                  "D8");
+  }
+
+  /**
+   * \brief Create line topology A9-B9-C9-D9 and announce /prefix from both A9 and D9
+   */
+  void
+  setupLineTopology()
+  {
+    setupTopology("router\n\n"
+                  "#node city  y x mpi-partition\n"
+                  "A9  NA  1 1 1\n"
+                  "B9  NA  1 40 1\n"
+                  "C9  NA  1 80 1\n"
+                  "D9  NA  1 120 1\n\n"
+                  "link\n\n"
+                  "# from  to  capacity  metric  delay queue\n"
+                  "A9      B9  10Mbps    1 1ms 100\n"
+                  "B9      C9  10Mbps    1 1ms 100\n"
+                  "C9      D9  10Mbps    1 1ms 100\n",
+                  "A9");
+
+    ndn::GlobalRoutingHelper ndnGlobalRoutingHelper;
+    ndnGlobalRoutingHelper.AddOrigins("/prefix", Names::Find<Node>("D9"));
+  }
+
+  /**
+   * \brief Get next hops of the node for /prefix, as a map from neighbor name to cost
+   */
+  std::map<std::string, uint64_t>
+  getNextHops(const std::string& nodeName)
+  {
+    std::map<std::string, uint64_t> nextHops;
+
+    Ptr<Node> node = Names::Find<Node>(nodeName);
+    auto entry = node->GetObject<ndn::L3Protocol>()->getForwarder()->getFib().findExactMatch("/prefix");
+    BOOST_REQUIRE(entry != nullptr);
+
+    for (const auto& nextHop : entry->getNextHops()) {
+      auto face = dynamic_pointer_cast<ndn::NetDeviceFace>(nextHop.getFace());
+      BOOST_REQUIRE(face != nullptr);
+
+      Ptr<Channel> channel = face->GetNetDevice()->GetChannel();
+      Ptr<Node> otherNode = channel->GetDevice(0)->GetNode() == node ? channel->GetDevice(1)->GetNode()
+                                                                     : channel->GetDevice(0)->GetNode();
+      nextHops[Names::FindName(otherNode)] = nextHop.getCost();
+    }
+    return nextHops;
+  }
+
+private:
+  static std::string
+  triangleNodes(const std::string& id)
+  {
+    return "A" + id + "  NA  1 1 1\n" +
+           "B" + id + "  NA  80  -40 1\n" +
+           "C" + id + "  NA  80  40  1\n";
+  }
+
+  static std::string
+  triangleLinks(const std::string& id, const std::string& directMetric)
+  {
+    std::string a = "A" + id;
+    std::string b = "B" + id;
+    std::string c = "C" + id;
+    return a + "      " + b + "  10Mbps    100 1ms 100\n" +
+           a + "      " + c + "  10Mbps    " + directMetric + "  1ms 100\n" +
+           b + "      " + c + "  10Mbps    1 1ms 100\n";
+  }
+
+  void
+  setupTopology(const std::string& topology, const std::string& origin,
+                const std::string& prefix = "/prefix")
+  {
+    ofstream file1(TEST_TOPO_TXT.string().c_str());
+    file1 << topology;
+    file1.close();
+
+    AnnotatedTopologyReader topologyReader("");
+    topologyReader.SetFileName(TEST_TOPO_TXT.string().c_str());
+    topologyReader.Read();
+
+    ndn::StackHelper ndnHelper;
+    ndnHelper.InstallAll();
+
+    topologyReader.ApplyOspfMetric();
+
+    ndn::GlobalRoutingHelper ndnGlobalRoutingHelper;
+    ndnGlobalRoutingHelper.InstallAll();
+
+    ndnGlobalRoutingHelper.AddOrigins(prefix, Names::Find<Node>(origin));
+  }
 };
 
 BOOST_FIXTURE_TEST_SUITE(HelperGlobalRoutingHelper, GlobalRoutingHelperFixture)
 
 BOOST_AUTO_TEST_CASE(CalculateRouteCase1)
 {
-  ofstream file1(TEST_TOPO_TXT.string().c_str());
-  file1 << "router\n\n"
-        << "#node city  y x mpi-partition\n"
-        << "A1  NA  1 1 1\n"
-        << "B1  NA  80  -40 1\n"
-        << "C1  NA  80  40  1\n\n"
-        << "link\n\n"
-        << "# from  to  capacity  metric  delay queue\n"
-        << "A1      B1  10Mbps    100 1ms 100\n"
-        << "A1      C1  10Mbps    50  1ms 100\n"
-        << "B1      C1  10Mbps    1 1ms 100\n";
-  file1.close();
-
-  AnnotatedTopologyReader topologyReader("");
-  topologyReader.SetFileName(TEST_TOPO_TXT.string().c_str());
-  topologyReader.Read();
-
-  // Install NDN stack on all nodes
-  ndn::StackHelper ndnHelper;
-  ndnHelper.InstallAll();
-
-  topologyReader.ApplyOspfMetric();
-
-  ndn::GlobalRoutingHelper ndnGlobalRoutingHelper;
-  BOOST_CHECK_NO_THROW(ndnGlobalRoutingHelper.InstallAll());
-
-  ndnGlobalRoutingHelper.AddOrigins("/test/prefix", Names::Find<Node>("C1"));
+  setupTriangleTopology("1", "50", "/test/prefix");
   BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateRoutes());
 
   auto ndn = Names::Find<Node>("A1")->GetObject<ndn::L3Protocol>();
@@ -104,33 +228,7 @@ BOOST_AUTO_TEST_CASE(CalculateRouteCase1)
 
 BOOST_AUTO_TEST_CASE(CalculateRouteCase2)
 {
-  ofstream file1(TEST_TOPO_TXT.string().c_str());
-  file1 << "router\n\n"
-        << "#node city  y x mpi-partition\n"
-        << "A2  NA  1 1 1\n"
-        << "B2  NA  80  -40 1\n"
-        << "C2  NA  80  40  1\n\n"
-        << "link\n\n"
-        << "# from  to  capacity  metric  delay queue\n"
-        << "A2      B2  10Mbps    100 1ms 100\n"
-        << "A2      C2  10Mbps    500  1ms 100\n"
-        << "B2      C2  10Mbps    1 1ms 100\n";
-  file1.close();
-
-  AnnotatedTopologyReader topologyReader("");
-  topologyReader.SetFileName(TEST_TOPO_TXT.string().c_str());
-  topologyReader.Read();
-
-  // Install NDN stack on all nodes
-  ndn::StackHelper ndnHelper;
-  ndnHelper.InstallAll();
-
-  topologyReader.ApplyOspfMetric();
-
-  ndn::GlobalRoutingHelper ndnGlobalRoutingHelper;
-  ndnGlobalRoutingHelper.InstallAll();
-
-  ndnGlobalRoutingHelper.AddOrigins("/prefix", Names::Find<Node>("C2"));
+  setupTriangleTopology("2");
   ndn::GlobalRoutingHelper::CalculateRoutes();
 
   auto ndn = Names::Find<Node>("A2")->GetObject<ndn::L3Protocol>();
@@ -146,6 +244,149 @@ BOOST_AUTO_TEST_CASE(CalculateRouteCase2)
   }
 }
 
+BOOST_AUTO_TEST_CASE(CalculateRoutesParallel)
+{
+  setupTriangleWithStubTopology();
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateRoutesParallel(4));
+
+  auto ndn = Names::Find<Node>("A3")->GetObject<ndn::L3Protocol>();
+  auto entry = ndn->getForwarder()->getFib().findExactMatch("/prefix");
+  BOOST_REQUIRE(entry != nullptr);
+  BOOST_REQUIRE_EQUAL(entry->getNextHops().size(), 1);
+
+  auto face = dynamic_pointer_cast<ndn::NetDeviceFace>(entry->getNextHops().front().getFace());
+  BOOST_REQUIRE(face != nullptr);
+  BOOST_CHECK_EQUAL(Names::FindName(face->GetNetDevice()->GetChannel()->GetDevice(1)->GetNode()), "B3");
+  BOOST_CHECK_EQUAL(entry->getNextHops().front().getCost(), 102);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateRoutesWithCache)
+{
+  setupTriangleTopology("7");
+
+  boost::filesystem::path cacheFile = boost::filesystem::path(TEST_CONFIG_PATH) / "routes.cache";
+  boost::filesystem::remove(cacheFile);
+
+  BOOST_CHECK_EQUAL(ndn::GlobalRoutingHelper::CalculateRoutesWithCache(cacheFile.string()), false);
+  BOOST_CHECK(boost::filesystem::exists(cacheFile));
+
+  auto& fib = Names::Find<Node>("A7")->GetObject<ndn::L3Protocol>()->getForwarder()->getFib();
+  auto entry = fib.findExactMatch("/prefix");
+  BOOST_REQUIRE(entry != nullptr);
+  BOOST_REQUIRE_EQUAL(entry->getNextHops().size(), 1);
+  BOOST_CHECK_EQUAL(entry->getNextHops().front().getCost(), 101);
+  nfd::FaceId faceId = entry->getNextHops().front().getFace()->getId();
+
+  fib.erase(*entry);
+  BOOST_CHECK_EQUAL(ndn::GlobalRoutingHelper::CalculateRoutesWithCache(cacheFile.string()), true);
+
+  entry = fib.findExactMatch("/prefix");
+  BOOST_REQUIRE(entry != nullptr);
+  BOOST_REQUIRE_EQUAL(entry->getNextHops().size(), 1);
+  BOOST_CHECK_EQUAL(entry->getNextHops().front().getCost(), 101);
+  BOOST_CHECK_EQUAL(entry->getNextHops().front().getFace()->getId(), faceId);
+
+  // different origins do not match the cached routes
+  ndn::GlobalRoutingHelper ndnGlobalRoutingHelper;
+  ndnGlobalRoutingHelper.AddOrigins("/other", Names::Find<Node>("B7"));
+  BOOST_CHECK_EQUAL(ndn::GlobalRoutingHelper::CalculateRoutesWithCache(cacheFile.string()), false);
+  BOOST_CHECK(fib.findExactMatch("/other") != nullptr);
+
+  boost::filesystem::remove(cacheFile);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateAllPossibleRoutes)
+{
+  setupTriangleTopology("6");
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateAllPossibleRoutes());
+
+  // cost of reaching C6 from a node via each of the neighbors
+  std::map<std::string, uint64_t> expectedA = {{"B6", 101}, {"C6", 500}};
+  std::map<std::string, uint64_t> expectedB = {{"C6", 1}, {"A6", 600}};
+  BOOST_CHECK(getNextHops("A6") == expectedA);
+  BOOST_CHECK(getNextHops("B6") == expectedB);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateAllPossibleRoutesReverseSpf)
+{
+  setupTriangleTopology("4");
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateAllPossibleRoutesReverseSpf());
+
+  // cost of reaching C4 from a node via each of the neighbors
+  std::map<std::string, uint64_t> expectedA = {{"B4", 101}, {"C4", 500}};
+  std::map<std::string, uint64_t> expectedB = {{"C4", 1}, {"A4", 600}};
+  BOOST_CHECK(getNextHops("A4") == expectedA);
+  BOOST_CHECK(getNextHops("B4") == expectedB);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateMultipathRoutesEcmp)
+{
+  setupDiamondTopology();
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateMultipathRoutes());
+
+  // both equal-cost paths, but not the direct link
+  std::map<std::string, uint64_t> expectedA = {{"B8", 2}, {"C8", 2}};
+  std::map<std::string, uint64_t> expectedB = {{"D8", 1}};
+  BOOST_CHECK(getNextHops("A8") == expectedA);
+  BOOST_CHECK(getNextHops("B8") == expectedB);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateMultipathRoutesLoopFree)
+{
+  setupDiamondTopology();
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateMultipathRoutes(3));
+
+  // the direct link is a loop-free alternate, while A8 is not closer to D8 than B8
+  std::map<std::string, uint64_t> expectedA = {{"B8", 2}, {"C8", 2}, {"D8", 10}};
+  std::map<std::string, uint64_t> expectedB = {{"D8", 1}};
+  BOOST_CHECK(getNextHops("A8") == expectedA);
+  BOOST_CHECK(getNextHops("B8") == expectedB);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateMultipathRoutesLimited)
+{
+  setupDiamondTopology();
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateMultipathRoutes(2));
+
+  // only the two cheapest loop-free next hops
+  std::map<std::string, uint64_t> expectedA = {{"B8", 2}, {"C8", 2}};
+  BOOST_CHECK(getNextHops("A8") == expectedA);
+}
+
+BOOST_AUTO_TEST_CASE(CalculateMultipathRoutesMultipleOrigins)
+{
+  setupLineTopology();
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::CalculateMultipathRoutes(3));
+
+  // B9 is closer to A9 and C9 is closer to D9, so they must not forward to each other
+  std::map<std::string, uint64_t> expectedB = {{"A9", 1}};
+  std::map<std::string, uint64_t> expectedC = {{"D9", 1}};
+  BOOST_CHECK(getNextHops("B9") == expectedB);
+  BOOST_CHECK(getNextHops("C9") == expectedC);
+}
+
+BOOST_AUTO_TEST_CASE(IncrementalRouting)
+{
+  setupTriangleTopology("5");
+  BOOST_CHECK_NO_THROW(ndn::GlobalRoutingHelper::EnableIncrementalRouting());
+
+  typedef std::map<std::string, uint64_t> NextHops;
+  BOOST_CHECK(getNextHops("A5") == NextHops({{"B5", 101}}));
+  BOOST_CHECK(getNextHops("B5") == NextHops({{"C5", 1}}));
+
+  LinkControlHelper::FailLinkByName("B5", "C5");
+  BOOST_CHECK(getNextHops("A5") == NextHops({{"C5", 500}}));
+  BOOST_CHECK(getNextHops("B5") == NextHops({{"A5", 600}}));
+
+  LinkControlHelper::UpLinkByName("B5", "C5");
+  BOOST_CHECK(getNextHops("A5") == NextHops({{"B5", 101}}));
+  BOOST_CHECK(getNextHops("B5") == NextHops({{"C5", 1}}));
+
+  ndn::GlobalRoutingHelper::DisableIncrementalRouting();
+  LinkControlHelper::FailLinkByName("B5", "C5");
+  BOOST_CHECK(getNextHops("A5") == NextHops({{"B5", 101}}));
+}
+
 BOOST_AUTO_TEST_SUITE_END()
 
 } // namespace ndn
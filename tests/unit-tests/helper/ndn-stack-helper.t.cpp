@@ -0,0 +1,123 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+#include "helper/ndn-stack-helper.hpp"
+#include "helper/ndn-fib-helper.hpp"
+#include "helper/ndn-strategy-choice-helper.hpp"
+#include "helper/ndn-app-helper.hpp"
+#include "model/ndn-l3-protocol.hpp"
+#include "NFD/daemon/fw/forwarder.hpp"
+
+#include "ns3/point-to-point-module.h"
+
+#include "../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class LeanStackFixture : public CleanupFixture
+{
+public:
+  LeanStackFixture()
+  {
+    nodes.Create(2);
+
+    PointToPointHelper p2p;
+    p2p.Install(nodes.Get(0), nodes.Get(1));
+
+    StackHelper ndnHelper;
+    ndnHelper.SetLeanStack(true);
+    ndnHelper.setCsSize(42);
+    ndnHelper.Install(nodes);
+  }
+
+  nfd::Forwarder&
+  getForwarder(uint32_t index)
+  {
+    return *nodes.Get(index)->GetObject<L3Protocol>()->getForwarder();
+  }
+
+  shared_ptr<Face>
+  getFace(uint32_t index)
+  {
+    Ptr<Node> node = nodes.Get(index);
+    return node->GetObject<L3Protocol>()->getFaceByNetDevice(node->GetDevice(0));
+  }
+
+public:
+  NodeContainer nodes;
+};
+
+BOOST_FIXTURE_TEST_SUITE(HelperNdnStackHelper, LeanStackFixture)
+
+BOOST_AUTO_TEST_CASE(LeanStack)
+{
+  Ptr<L3Protocol> l3 = nodes.Get(0)->GetObject<L3Protocol>();
+  BOOST_REQUIRE(l3 != nullptr);
+  BOOST_CHECK(l3->getFibManager() == nullptr);
+  BOOST_CHECK(l3->getStrategyChoiceManager() == nullptr);
+
+  nfd::Forwarder& forwarder = getForwarder(0);
+  BOOST_CHECK(forwarder.getFace(nfd::FACEID_INTERNAL_FACE) == nullptr);
+  BOOST_CHECK(forwarder.getFib().findExactMatch("/localhost/nfd") == nullptr);
+  BOOST_CHECK_EQUAL(forwarder.getFib().size(), 0U);
+
+  // tables section of the config is still applied
+  BOOST_CHECK_EQUAL(forwarder.getCs().getLimit(), 42U);
+  nfd::StrategyChoice& strategyChoice = forwarder.getStrategyChoice();
+  BOOST_CHECK(Name("/localhost/nfd/strategy/best-route")
+                .isPrefixOf(strategyChoice.findEffectiveStrategy("/prefix").getName()));
+  BOOST_CHECK(Name("/localhost/nfd/strategy/broadcast")
+                .isPrefixOf(strategyChoice.findEffectiveStrategy("/ndn/broadcast").getName()));
+}
+
+BOOST_AUTO_TEST_CASE(RoutesAndStrategies)
+{
+  FibHelper::AddRoute(nodes.Get(0), "/prefix", getFace(0), 10);
+  BOOST_REQUIRE(getForwarder(0).getFib().findExactMatch("/prefix") != nullptr);
+  BOOST_CHECK_EQUAL(getForwarder(0).getFib().findExactMatch("/prefix")->getNextHops().size(), 1U);
+
+  StrategyChoiceHelper::Install(nodes.Get(0), "/prefix", "/localhost/nfd/strategy/broadcast");
+  BOOST_CHECK(Name("/localhost/nfd/strategy/broadcast")
+                .isPrefixOf(getForwarder(0).getStrategyChoice().findEffectiveStrategy("/prefix")
+                              .getName()));
+
+  AppHelper consumerHelper("ns3::ndn::ConsumerCbr");
+  consumerHelper.SetPrefix("/prefix");
+  consumerHelper.SetAttribute("Frequency", StringValue("1"));
+  consumerHelper.Install(nodes.Get(0)).Stop(Seconds(9.99));
+
+  AppHelper producerHelper("ns3::ndn::Producer");
+  producerHelper.SetPrefix("/prefix");
+  producerHelper.Install(nodes.Get(1));
+
+  Simulator::Stop(Seconds(20.001));
+  Simulator::Run();
+
+  BOOST_CHECK_EQUAL(getFace(0)->getFaceStatus().getNOutInterests(), 10);
+  BOOST_CHECK_EQUAL(getFace(0)->getFaceStatus().getNInDatas(), 10);
+
+  FibHelper::RemoveRoute(nodes.Get(0), "/prefix", getFace(0));
+  BOOST_CHECK(getForwarder(0).getFib().findExactMatch("/prefix") == nullptr);
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,138 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+#include "helper/ndn-tables-snapshot.hpp"
+#include "model/ndn-l3-protocol.hpp"
+#include "NFD/daemon/fw/forwarder.hpp"
+
+#include "ns3/node-list.h"
+
+#include <numeric>
+#include <set>
+
+#include "../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+BOOST_AUTO_TEST_SUITE(HelperNdnTablesSnapshot)
+
+class TablesSnapshotFixture : public ScenarioHelperWithCleanupFixture
+{
+public:
+  TablesSnapshotFixture()
+  {
+    createTopology({
+        {"1", "2"}
+      });
+
+    addRoutes({
+        {"1", "2", "/prefix", 10}
+      });
+
+    addApps({
+        {"1", "ns3::ndn::ConsumerCbr",
+            {{"Prefix", "/prefix"}, {"Frequency", "10"}},
+            "0s", "1s"},
+        {"2", "ns3::ndn::Producer",
+            {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+            "0s", "100s"}
+      });
+
+    Simulator::Stop(Seconds(2));
+    Simulator::Run();
+  }
+
+  size_t
+  countFibRecords(const TablesSnapshot& snapshot, uint32_t node, const std::string& prefix)
+  {
+    size_t count = 0;
+    for (const TablesSnapshot::FibRecord& record : snapshot.getFib()) {
+      if (record.node == node && snapshot.getStrings().at(record.prefix) == prefix) {
+        count++;
+      }
+    }
+    return count;
+  }
+};
+
+BOOST_FIXTURE_TEST_SUITE(TablesSnapshotTests, TablesSnapshotFixture)
+
+BOOST_AUTO_TEST_CASE(AllNodes)
+{
+  TablesSnapshot snapshot;
+
+  BOOST_REQUIRE_EQUAL(snapshot.getSizes().size(), 2U);
+  BOOST_CHECK_EQUAL(countFibRecords(snapshot, getNode("1")->GetId(), "/prefix"), 1U);
+  BOOST_CHECK_EQUAL(countFibRecords(snapshot, getNode("2")->GetId(), "/prefix"), 0U);
+
+  for (const TablesSnapshot::FibRecord& record : snapshot.getFib()) {
+    if (snapshot.getStrings().at(record.prefix) == "/prefix") {
+      BOOST_CHECK_EQUAL(record.faceId, getFace("1", "2")->getId());
+      BOOST_CHECK_EQUAL(record.cost, 10U);
+    }
+  }
+
+  for (const TablesSnapshot::SizesRecord& sizes : snapshot.getSizes()) {
+    shared_ptr<nfd::Forwarder> forwarder =
+      NodeList::GetNode(sizes.node)->GetObject<L3Protocol>()->getForwarder();
+    BOOST_CHECK_EQUAL(sizes.nFibEntries, forwarder->getFib().size());
+    BOOST_CHECK_EQUAL(sizes.nPitEntries, forwarder->getPit().size());
+    BOOST_CHECK_EQUAL(sizes.nCsEntries, forwarder->getCs().size());
+  }
+
+  // Data packets are cached on both nodes
+  BOOST_CHECK_GT(snapshot.getSizes()[0].nCsEntries, 0U);
+  BOOST_CHECK_GT(snapshot.getSizes()[1].nCsEntries, 0U);
+  BOOST_CHECK_EQUAL(snapshot.getCs().size(), snapshot.getSizes()[0].nCsEntries +
+                                             snapshot.getSizes()[1].nCsEntries);
+  BOOST_CHECK_EQUAL(snapshot.getPit().size(), snapshot.getSizes()[0].nPitEntries +
+                                              snapshot.getSizes()[1].nPitEntries);
+
+  // strings are interned
+  std::set<std::string> strings(snapshot.getStrings().begin(), snapshot.getStrings().end());
+  BOOST_CHECK_EQUAL(strings.size(), snapshot.getStrings().size());
+  BOOST_CHECK_EQUAL(snapshot.getStringDataSize(),
+                    std::accumulate(snapshot.getStrings().begin(), snapshot.getStrings().end(),
+                                    size_t(0), [] (size_t size, const std::string& str) {
+                                      return size + str.size() + 1;
+                                    }));
+}
+
+BOOST_AUTO_TEST_CASE(SelectedNodes)
+{
+  TablesSnapshot snapshot(NodeContainer(getNode("2")), false);
+
+  BOOST_REQUIRE_EQUAL(snapshot.getSizes().size(), 1U);
+  BOOST_CHECK_EQUAL(snapshot.getSizes()[0].node, getNode("2")->GetId());
+  BOOST_CHECK_GT(snapshot.getSizes()[0].nCsEntries, 0U);
+  BOOST_CHECK_EQUAL(snapshot.getPit().size(), 0U);
+  BOOST_CHECK_EQUAL(snapshot.getCs().size(), 0U);
+
+  for (const TablesSnapshot::FibRecord& record : snapshot.getFib()) {
+    BOOST_CHECK_EQUAL(record.node, getNode("2")->GetId());
+  }
+}
+
+BOOST_AUTO_TEST_SUITE_END() // TablesSnapshotTests
+
+BOOST_AUTO_TEST_SUITE_END() // HelperNdnTablesSnapshot
+
+} // namespace ndn
+} // namespace ns3
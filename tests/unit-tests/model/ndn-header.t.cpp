@@ -47,6 +47,39 @@ BOOST_AUTO_TEST_CASE(TypeId)
  BOOST_CHECK_EQUAL(dataPktHeader.GetSerializedSize(), 1354); // 328 + 1024
 }
 
+BOOST_AUTO_TEST_CASE(Deserialize)
+{
+  auto data = make_shared<ndn::Data>("/prefix");
+  data->setContent(std::make_shared< ::ndn::Buffer>(1024));
+  ndn::StackHelper::getKeyChain().sign(*data);
+
+  Ptr<Packet> packet = Create<Packet>(16);
+  packet->AddHeader(PacketHeader<Data>(*data));
+
+  PacketHeader<Data> header;
+  BOOST_CHECK_EQUAL(packet->RemoveHeader(header), data->wireEncode().size());
+  BOOST_CHECK(header.getPacket()->wireEncode() == data->wireEncode());
+  BOOST_CHECK_EQUAL(packet->GetSize(), 16U);
+}
+
+BOOST_AUTO_TEST_CASE(DeserializeFrom)
+{
+  auto data = make_shared<ndn::Data>("/prefix");
+  data->setContent(std::make_shared< ::ndn::Buffer>(1024));
+  ndn::StackHelper::getKeyChain().sign(*data);
+
+  Ptr<Packet> packet = Create<Packet>(16);
+  packet->AddHeader(PacketHeader<Data>(*data));
+
+  PacketHeader<Data> header;
+  BOOST_CHECK_EQUAL(header.DeserializeFrom(packet), data->wireEncode().size());
+  BOOST_CHECK(header.getPacket()->wireEncode() == data->wireEncode());
+  BOOST_CHECK_EQUAL(packet->GetSize(), data->wireEncode().size() + 16);
+
+  Ptr<Packet> truncated = packet->CreateFragment(0, 100);
+  BOOST_CHECK_THROW(header.DeserializeFrom(truncated), ::ndn::tlv::Error);
+}
+
 BOOST_AUTO_TEST_SUITE_END()
 
 } // namespace ndn
@@ -19,6 +19,12 @@
 
 
 #include "model/ndn-net-device-face.hpp"
+#include "model/ndn-l3-protocol.hpp"
+#include "helper/ndn-strategy-choice-helper.hpp"
+#include "apps/ndn-app.hpp"
+
+#include <algorithm>
+#include <set>
 
 #include "../tests-common.hpp"
 
@@ -60,6 +66,213 @@ BOOST_AUTO_TEST_CASE(Basic)
   BOOST_CHECK_EQUAL(getFace("2", "1")->getFaceStatus().getNOutDatas(), 100);
 }
 
+static void
+recordHopCount(std::vector<int32_t>* hopCounts, Ptr<App> app, uint32_t seqNo, Time delay,
+               uint32_t retxCount, int32_t hopCount)
+{
+  hopCounts->push_back(hopCount);
+}
+
+BOOST_AUTO_TEST_CASE(SendToMultipleFaces)
+{
+  Config::SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("10Mbps"));
+  Config::SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"));
+  Config::SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"));
+
+  createTopology({
+      {"1", "2"},
+      {"2", "3"},
+      {"2", "4"},
+    });
+
+  addRoutes({
+      {"1", "2", "/prefix", 1},
+      {"2", "3", "/prefix", 1},
+      {"2", "4", "/prefix", 1},
+    });
+
+  StrategyChoiceHelper::Install(getNode("2"), "/prefix", "/localhost/nfd/strategy/broadcast");
+
+  addApps({
+      {"1", "ns3::ndn::ConsumerCbr",
+          {{"Prefix", "/prefix"}, {"Frequency", "10"}},
+          "0s", "9.99s"},
+      {"3", "ns3::ndn::Producer",
+          {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+          "0s", "100s"},
+      {"4", "ns3::ndn::Producer",
+          {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+          "0s", "100s"}
+    });
+
+  std::vector<int32_t> hopCounts;
+  getNode("1")->GetApplication(0)->TraceConnectWithoutContext("FirstInterestDataDelay",
+                                                              MakeBoundCallback(&recordHopCount,
+                                                                                &hopCounts));
+
+  Simulator::Stop(Seconds(20.001));
+  Simulator::Run();
+
+  BOOST_CHECK_EQUAL(getFace("2", "3")->getFaceStatus().getNOutInterests(), 100);
+  BOOST_CHECK_EQUAL(getFace("2", "4")->getFaceStatus().getNOutInterests(), 100);
+  BOOST_CHECK_EQUAL(getFace("3", "2")->getFaceStatus().getNInInterests(), 100);
+  BOOST_CHECK_EQUAL(getFace("4", "2")->getFaceStatus().getNInInterests(), 100);
+
+  BOOST_CHECK_EQUAL(getFace("1", "2")->getFaceStatus().getNInDatas(), 100);
+  BOOST_REQUIRE_EQUAL(hopCounts.size(), 100U);
+  for (int32_t hopCount : hopCounts) {
+    BOOST_CHECK_EQUAL(hopCount, 2);
+  }
+}
+
+static void
+recordUid(std::set<uint64_t>* uids, Ptr<const Packet> packet)
+{
+  uids->insert(packet->GetUid());
+}
+
+BOOST_AUTO_TEST_CASE(SerializeOncePerDecision)
+{
+  Config::SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("10Mbps"));
+  Config::SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"));
+  Config::SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"));
+
+  createTopology({
+      {"1", "2"},
+      {"1", "3"},
+    });
+
+  addRoutes({
+      {"1", "2", "/prefix", 1},
+      {"1", "3", "/prefix", 1},
+    });
+
+  StrategyChoiceHelper::Install(getNode("1"), "/prefix", "/localhost/nfd/strategy/broadcast");
+
+  addApps({
+      {"1", "ns3::ndn::ConsumerCbr",
+          {{"Prefix", "/prefix"}, {"Frequency", "10"}},
+          "0s", "9.99s"},
+      {"2", "ns3::ndn::Producer",
+          {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+          "0s", "100s"},
+      {"3", "ns3::ndn::Producer",
+          {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+          "0s", "100s"}
+    });
+
+  std::set<uint64_t> uids2;
+  std::set<uint64_t> uids3;
+  getNode("1")->GetDevice(0)->TraceConnectWithoutContext("MacTx",
+                                                         MakeBoundCallback(&recordUid, &uids2));
+  getNode("1")->GetDevice(1)->TraceConnectWithoutContext("MacTx",
+                                                         MakeBoundCallback(&recordUid, &uids3));
+
+  Simulator::Stop(Seconds(20.001));
+  Simulator::Run();
+
+  BOOST_CHECK_EQUAL(getFace("1", "2")->getFaceStatus().getNOutInterests(), 100);
+  BOOST_CHECK_EQUAL(getFace("1", "3")->getFaceStatus().getNOutInterests(), 100);
+
+  // Interests of the consumer do not carry an ns-3 packet, so each Convert::ToPacket call
+  // creates a packet with a new UID, while copies of the prepared packet keep its UID
+  BOOST_CHECK_EQUAL(uids2.size(), 100U);
+  BOOST_CHECK(uids2 == uids3);
+}
+
+static void
+setNonceAndSend(shared_ptr<Face> face, shared_ptr<Interest> interest, uint32_t nonce)
+{
+  interest->setNonce(nonce);
+  face->sendInterest(*interest);
+}
+
+static void
+copyWithNonceAndSend(shared_ptr<Face> face, shared_ptr<Interest> interest, uint32_t nonce)
+{
+  setNonceAndSend(face, make_shared<Interest>(*interest), nonce);
+}
+
+static void
+recordNonce(std::vector<uint32_t>* nonces, const Interest& interest, const Face& face)
+{
+  nonces->push_back(interest.getNonce());
+}
+
+BOOST_AUTO_TEST_CASE(NonceChangedInPlace)
+{
+  createTopology({
+      {"1", "2"},
+    });
+
+  auto interest = make_shared<Interest>("/prefix");
+  interest->setNonce(1);
+  interest->wireEncode(); // further Nonces are written into the existing wire encoding
+
+  shared_ptr<Face> face = getFace("1", "2");
+  Simulator::Schedule(Seconds(1), &setNonceAndSend, face, interest, 1);
+  Simulator::Schedule(Seconds(2), &setNonceAndSend, face, interest, 2);
+  Simulator::Schedule(Seconds(3), &copyWithNonceAndSend, face, interest, 3);
+  Simulator::Schedule(Seconds(4), &setNonceAndSend, face, interest, 4);
+
+  std::vector<uint32_t> nonces;
+  getNode("2")->GetObject<L3Protocol>()->TraceConnectWithoutContext("InInterests",
+                                                                    MakeBoundCallback(&recordNonce,
+                                                                                      &nonces));
+
+  Simulator::Stop(Seconds(5));
+  Simulator::Run();
+
+  BOOST_CHECK(nonces == std::vector<uint32_t>({1, 2, 3, 4}));
+}
+
+static void
+recordPacketSize(std::vector<uint32_t>* sizes, Ptr<const Packet> packet)
+{
+  sizes->push_back(packet->GetSize());
+}
+
+BOOST_AUTO_TEST_CASE(VirtualPayload)
+{
+  Config::SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("100Mbps"));
+  Config::SetDefault("ns3::PointToPointNetDevice::Mtu", StringValue("9000"));
+  Config::SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"));
+  Config::SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"));
+
+  createTopology({
+      {"1", "2"},
+      {"2", "3"},
+    });
+
+  addRoutes({
+      {"1", "2", "/prefix", 1},
+      {"2", "3", "/prefix", 1},
+    });
+
+  addApps({
+      {"1", "ns3::ndn::ConsumerCbr",
+          {{"Prefix", "/prefix"}, {"Frequency", "10"}},
+          "0s", "9.99s"},
+      {"3", "ns3::ndn::Producer",
+          {{"Prefix", "/prefix"}, {"PayloadSize", "8192"}, {"VirtualPayload", "true"}},
+          "0s", "100s"}
+    });
+
+  std::vector<uint32_t> sizes;
+  getNode("2")->GetDevice(0)->TraceConnectWithoutContext("MacTx",
+                                                         MakeBoundCallback(&recordPacketSize,
+                                                                           &sizes));
+
+  Simulator::Stop(Seconds(20.001));
+  Simulator::Run();
+
+  BOOST_CHECK_EQUAL(getFace("1", "2")->getFaceStatus().getNInDatas(), 100);
+
+  // Data packets forwarded by the node "2" still carry the full payload
+  BOOST_CHECK_EQUAL(std::count_if(sizes.begin(), sizes.end(),
+                                  [] (uint32_t size) { return size > 8192; }), 100);
+}
+
 BOOST_AUTO_TEST_SUITE_END()
 
 } // namespace ndn
@@ -21,6 +21,7 @@
 #include "helper/ndn-stack-helper.hpp"
 #include "model/ndn-header.hpp"
 #include "utils/ndn-ns3-packet-tag.hpp"
+#include "utils/ndn-virtual-payload-tag.hpp"
 
 #include <ndn-cxx/encoding/block.hpp>
 #include <ndn-cxx/interest.hpp>
@@ -54,6 +55,59 @@ BOOST_AUTO_TEST_CASE(ToPacket)
   BOOST_CHECK_EQUAL(type2, ::ndn::tlv::Data);
 }
 
+BOOST_AUTO_TEST_CASE(FromPacket)
+{
+  auto interest = make_shared<ndn::Interest>("/prefix");
+  interest->setNonce(42);
+  Ptr<Packet> interestPacket = Convert::ToPacket(*interest);
+
+  shared_ptr<const Interest> decodedInterest = Convert::FromPacket<Interest>(interestPacket);
+  BOOST_CHECK_EQUAL(decodedInterest->getName(), interest->getName());
+  BOOST_CHECK_EQUAL(decodedInterest->getNonce(), 42U);
+  BOOST_CHECK_EQUAL(interestPacket->GetSize(), 0U);
+
+  auto data = std::make_shared<ndn::Data>(interest->getName());
+  data->setContent(std::make_shared< ::ndn::Buffer>(1024));
+  ndn::StackHelper::getKeyChain().sign(*data);
+  Ptr<Packet> dataPacket = Convert::ToPacket(*data);
+  // trailing bytes (e.g., padding of Ethernet frames) are not a virtual payload
+  dataPacket->AddAtEnd(Create<Packet>(10));
+
+  shared_ptr<const Data> decodedData = Convert::FromPacket<Data>(dataPacket);
+  BOOST_CHECK(decodedData->wireEncode() == data->wireEncode());
+  BOOST_CHECK_EQUAL(getVirtualPayloadSize(*decodedData), 0U);
+  BOOST_CHECK_EQUAL(dataPacket->GetSize(), 0U);
+
+  Ptr<Packet> truncatedPacket = Create<Packet>(data->wireEncode().wire(), 100);
+  BOOST_CHECK_THROW(Convert::FromPacket<Data>(truncatedPacket), ::ndn::tlv::Error);
+}
+
+BOOST_AUTO_TEST_CASE(VirtualPayload)
+{
+  auto data = std::make_shared<ndn::Data>("/prefix");
+  ndn::StackHelper::getKeyChain().sign(*data);
+  data->setTag(make_shared<VirtualPayloadTag>(8192));
+
+  Ptr<Packet> packet = Convert::ToPacket(*data);
+  size_t packetSize = data->wireEncode().size() + 8192;
+  BOOST_CHECK_EQUAL(packet->GetSize(), packetSize);
+  packet->AddAtEnd(Create<Packet>(10)); // padding
+
+  shared_ptr<const Data> decodedData = Convert::FromPacket<Data>(packet);
+  BOOST_CHECK(decodedData->wireEncode() == data->wireEncode());
+  BOOST_CHECK_EQUAL(decodedData->getContent().value_size(), 0U);
+  BOOST_CHECK_EQUAL(getVirtualPayloadSize(*decodedData), 8192U);
+  BOOST_CHECK_EQUAL(decodedData->getTag<Ns3PacketTag>()->getPacket()->GetSize(), 0U);
+
+  // forwarding the decoded packet preserves the virtual payload
+  BOOST_CHECK_EQUAL(Convert::ToPacket(*decodedData)->GetSize(), packetSize);
+
+  shared_ptr<Data> materialized = materializeVirtualPayload(*decodedData);
+  BOOST_CHECK_EQUAL(materialized->getContent().value_size(), 8192U);
+  BOOST_CHECK_EQUAL(getVirtualPayloadSize(*materialized), 0U);
+  BOOST_CHECK_EQUAL(getVirtualPayloadSize(*decodedData), 8192U);
+}
+
 BOOST_AUTO_TEST_SUITE_END()
 
 } // namespace ndn
@@ -22,6 +22,9 @@
 #include <boost/filesystem.hpp>
 #include <boost/test/output_test_stream.hpp>
 
+#include <cstring>
+#include <iterator>
+
 #include "../../tests-common.hpp"
 
 namespace ns3 {
@@ -97,6 +100,67 @@ BOOST_AUTO_TEST_CASE(InstallAll)
     "3.02087	2	258	1	FullDelay	0.0208712	20871.2	1	1\n");
 }
 
+BOOST_AUTO_TEST_CASE(InstallAllBinary)
+{
+  AppDelayTracer::InstallAll(TEST_TRACE.string(), TraceFormat::BINARY);
+
+  Simulator::Stop(Seconds(4));
+  Simulator::Run();
+
+  AppDelayTracer::Destroy(); // to force log to be written
+
+  std::ifstream t(TEST_TRACE.string().c_str(), std::ios_base::binary);
+  std::string buffer((std::istreambuf_iterator<char>(t)), std::istreambuf_iterator<char>());
+
+  BOOST_REQUIRE_GT(buffer.size(), 48U);
+  BOOST_CHECK_EQUAL(buffer.substr(0, 8), "NDNTRACE");
+  BOOST_CHECK_EQUAL(buffer.substr(buffer.size() - 8), "NDNTRACE");
+
+  uint32_t headerSize = 0;
+  uint32_t recordSize = 0;
+  std::memcpy(&headerSize, buffer.data() + 12, sizeof(headerSize));
+  std::memcpy(&recordSize, buffer.data() + 16, sizeof(recordSize));
+
+  uint64_t stringTableOffset = 0;
+  uint64_t nRecords = 0;
+  std::memcpy(&stringTableOffset, buffer.data() + buffer.size() - 24, sizeof(stringTableOffset));
+  std::memcpy(&nRecords, buffer.data() + buffer.size() - 16, sizeof(nRecords));
+
+  BOOST_CHECK_EQUAL(nRecords, 6U);
+  BOOST_CHECK_EQUAL(headerSize % 8, 0U);
+  BOOST_CHECK_EQUAL(headerSize + nRecords * recordSize, stringTableOffset);
+  BOOST_CHECK_NE(buffer.find("LastDelay", stringTableOffset), std::string::npos);
+  BOOST_CHECK_NE(buffer.find("FullDelay", stringTableOffset), std::string::npos);
+
+  double time = 0;
+  uint32_t appId = 0;
+  std::memcpy(&time, buffer.data() + headerSize, sizeof(time));
+  std::memcpy(&appId, buffer.data() + headerSize + 12, sizeof(appId)); // Time, Node, AppId
+  BOOST_CHECK_CLOSE(time, 0.0417424, 0.001);
+  BOOST_CHECK_EQUAL(appId, 257U);
+}
+
+BOOST_AUTO_TEST_CASE(InstallAllAggregated)
+{
+  AppDelayTracer::InstallAll(TEST_TRACE.string(), Seconds(1.5));
+
+  Simulator::Stop(Seconds(4));
+  Simulator::Run();
+
+  AppDelayTracer::Destroy(); // to force log to be written
+
+  std::ifstream t(TEST_TRACE.string().c_str());
+  std::stringstream buffer;
+  buffer << t.rdbuf();
+
+  BOOST_CHECK_EQUAL(buffer.str(),
+    "Time	Node	AppId	Type	Samples	MeanUS	MinUS	P50US	P95US	P99US	MaxUS	RetxCount	HopCount\n"
+    "1.5	1	257	LastDelay	1	41742.4	41742.4	41742.4	41742.4	41742.4	41742.4	1	2\n"
+    "1.5	1	257	FullDelay	1	41742.4	41742.4	41742.4	41742.4	41742.4	41742.4	1	2\n"
+    "3	2	258	LastDelay	1	0	0	0	0	0	0	1	0\n"
+    "3	2	258	FullDelay	1	0	0	0	0	0	0	1	0\n");
+}
+
 BOOST_AUTO_TEST_CASE(InstallNodeContainer)
 {
   NodeContainer nodes;
@@ -0,0 +1,92 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "utils/tracers/ndn-delay-histogram.hpp"
+
+#include "../../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+BOOST_AUTO_TEST_SUITE(UtilsTracersNdnDelayHistogram)
+
+BOOST_AUTO_TEST_CASE(Empty)
+{
+  DelayHistogram histogram;
+
+  BOOST_CHECK_EQUAL(histogram.getCount(), 0U);
+  BOOST_CHECK_EQUAL(histogram.getMin(), Time(0));
+  BOOST_CHECK_EQUAL(histogram.getMax(), Time(0));
+  BOOST_CHECK_EQUAL(histogram.getQuantile(0.5), Time(0));
+}
+
+BOOST_AUTO_TEST_CASE(SmallValuesAreExact)
+{
+  DelayHistogram histogram;
+  for (int i = 1; i <= 20; ++i) {
+    histogram.add(NanoSeconds(i));
+  }
+
+  BOOST_CHECK_EQUAL(histogram.getCount(), 20U);
+  BOOST_CHECK_EQUAL(histogram.getMin(), NanoSeconds(1));
+  BOOST_CHECK_EQUAL(histogram.getMax(), NanoSeconds(20));
+  BOOST_CHECK_EQUAL(histogram.getQuantile(0.5), NanoSeconds(10));
+  BOOST_CHECK_EQUAL(histogram.getQuantile(0.95), NanoSeconds(19));
+  BOOST_CHECK_EQUAL(histogram.getMean().GetNanoSeconds(), 10);
+}
+
+BOOST_AUTO_TEST_CASE(Quantiles)
+{
+  DelayHistogram histogram;
+  for (int i = 1; i <= 1000; ++i) {
+    histogram.add(MilliSeconds(i));
+  }
+
+  BOOST_CHECK_EQUAL(histogram.getMin(), MilliSeconds(1));
+  BOOST_CHECK_EQUAL(histogram.getMax(), MilliSeconds(1000));
+  BOOST_CHECK_CLOSE(histogram.getQuantile(0.50).ToDouble(Time::MS), 500, 3.5);
+  BOOST_CHECK_CLOSE(histogram.getQuantile(0.95).ToDouble(Time::MS), 950, 3.5);
+  BOOST_CHECK_CLOSE(histogram.getQuantile(0.99).ToDouble(Time::MS), 990, 3.5);
+  BOOST_CHECK_CLOSE(histogram.getMean().ToDouble(Time::MS), 500.5, 0.001);
+}
+
+BOOST_AUTO_TEST_CASE(MergeAndReset)
+{
+  DelayHistogram odd;
+  DelayHistogram even;
+  for (int i = 1; i <= 1000; ++i) {
+    (i % 2 == 0 ? even : odd).add(MilliSeconds(i));
+  }
+
+  odd.merge(even);
+  BOOST_CHECK_EQUAL(odd.getCount(), 1000U);
+  BOOST_CHECK_EQUAL(odd.getMin(), MilliSeconds(1));
+  BOOST_CHECK_EQUAL(odd.getMax(), MilliSeconds(1000));
+  BOOST_CHECK_CLOSE(odd.getQuantile(0.99).ToDouble(Time::MS), 990, 3.5);
+
+  odd.reset();
+  BOOST_CHECK_EQUAL(odd.getCount(), 0U);
+  BOOST_CHECK_EQUAL(odd.getQuantile(0.99), Time(0));
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
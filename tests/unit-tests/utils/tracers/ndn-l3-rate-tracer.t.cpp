@@ -0,0 +1,202 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "utils/tracers/ndn-l3-rate-tracer.hpp"
+#include "model/ndn-l3-protocol.hpp"
+
+#include <boost/algorithm/string/predicate.hpp>
+
+#include <set>
+#include <sstream>
+
+#include "../../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class L3RateTracerFixture : public ScenarioHelperWithCleanupFixture
+{
+public:
+  L3RateTracerFixture()
+  {
+    Config::SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("10Mbps"));
+    Config::SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"));
+    Config::SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"));
+
+    createTopology({
+        {"1", "2"},
+        {"2", "3"}
+      });
+
+    addRoutes({
+        {"1", "2", "/prefix", 1},
+        {"2", "3", "/prefix", 1}
+      });
+
+    addApps({
+        {"1", "ns3::ndn::ConsumerCbr",
+            {{"Prefix", "/prefix"}, {"Frequency", "100"}},
+            "0s", "100s"},
+        {"3", "ns3::ndn::Producer",
+            {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+            "0s", "100s"}
+      });
+  }
+
+  std::set<std::string>
+  getLines(const std::string& trace)
+  {
+    std::set<std::string> lines;
+    std::istringstream is(trace);
+    std::string line;
+    while (std::getline(is, line)) {
+      lines.insert(line);
+    }
+    return lines;
+  }
+
+  /**
+   * @brief Check that FACE_COUNTERS mode reports the same rows as PACKET_HOOKS mode
+   */
+  void
+  checkFaceCounters()
+  {
+    auto hooksOutput = make_shared<std::stringstream>();
+    auto countersOutput = make_shared<std::stringstream>();
+
+    Ptr<L3RateTracer> hooksTracer = L3RateTracer::Install(getNode("2"), hooksOutput, Seconds(1));
+    Ptr<L3RateTracer> countersTracer = L3RateTracer::Install(getNode("2"), countersOutput,
+                                                             Seconds(1),
+                                                             L3RateTracer::FACE_COUNTERS);
+
+    Simulator::Stop(Seconds(5.5));
+    Simulator::Run();
+
+    hooksTracer = nullptr;
+    countersTracer = nullptr;
+
+    std::set<std::string> counterLines = getLines(countersOutput->str());
+    size_t nChecked = 0;
+    for (const std::string& line : getLines(hooksOutput->str())) {
+      // per-face satisfied and timed out rows are only available from packet hooks
+      if (boost::contains(line, "SatisfiedInterests\t") && !boost::contains(line, "\tSatisfied")) {
+        continue;
+      }
+      if (boost::contains(line, "TimedOutInterests\t") && !boost::contains(line, "\tTimedOut")) {
+        continue;
+      }
+      if (boost::starts_with(line, "Time\t")) {
+        continue;
+      }
+      BOOST_CHECK_MESSAGE(counterLines.count(line) == 1, "Missing: " << line);
+      ++nChecked;
+    }
+    BOOST_CHECK_GT(nChecked, 0);
+  }
+};
+
+BOOST_FIXTURE_TEST_SUITE(UtilsTracersNdnL3RateTracer, L3RateTracerFixture)
+
+BOOST_AUTO_TEST_CASE(FaceCounters)
+{
+  checkFaceCounters();
+}
+
+BOOST_AUTO_TEST_CASE(FaceCountersWithVirtualPayload)
+{
+  Config::Set("/NodeList/*/ApplicationList/*/$ns3::ndn::Producer/VirtualPayload",
+              BooleanValue(true));
+
+  checkFaceCounters();
+
+  // the payload is counted, although it is not part of the wire encoding of Data
+  shared_ptr<Face> face = getFace("2", "1");
+  L3Protocol::ByteCounters counters =
+    getNode("2")->GetObject<L3Protocol>()->getByteCounters(face->getId());
+  BOOST_CHECK_GT(counters.nOutDataBytes,
+                 static_cast<uint64_t>(face->getCounters().getNOutDatas()) * 1024);
+}
+
+BOOST_AUTO_TEST_CASE(Filter)
+{
+  auto output = make_shared<std::stringstream>();
+  Ptr<L3RateTracer> tracer = L3RateTracer::Install(getNode("2"), output, Seconds(1),
+                                                   L3RateTracer::PACKET_HOOKS,
+                                                   TraceFilter()
+                                                     .SetStartTime(Seconds(3))
+                                                     .SetSampling(2));
+
+  Simulator::Stop(Seconds(5.5));
+  Simulator::Run();
+
+  tracer = nullptr;
+
+  std::set<std::string> times;
+  for (const std::string& line : getLines(output->str())) {
+    times.insert(line.substr(0, line.find('\t')));
+  }
+  BOOST_CHECK(times == std::set<std::string>({"3", "5"}));
+}
+
+BOOST_AUTO_TEST_CASE(SampledAverages)
+{
+  auto fullOutput = make_shared<std::stringstream>();
+  auto sampledOutput = make_shared<std::stringstream>();
+  Ptr<L3RateTracer> fullTracer = L3RateTracer::Install(getNode("2"), fullOutput, Seconds(1));
+  Ptr<L3RateTracer> sampledTracer = L3RateTracer::Install(getNode("2"), sampledOutput, Seconds(1),
+                                                          L3RateTracer::PACKET_HOOKS,
+                                                          TraceFilter()
+                                                            .SetStartTime(Seconds(3))
+                                                            .SetSampling(2));
+
+  Simulator::Stop(Seconds(5.5));
+  Simulator::Run();
+
+  fullTracer = nullptr;
+  sampledTracer = nullptr;
+
+  // sampled rows, including moving averages, are the same as rows of the unsampled trace
+  std::set<std::string> fullLines = getLines(fullOutput->str());
+  std::set<std::string> sampledLines = getLines(sampledOutput->str());
+  BOOST_CHECK_GT(sampledLines.size(), 0);
+  for (const std::string& line : sampledLines) {
+    BOOST_CHECK_MESSAGE(fullLines.count(line) == 1, "Missing: " << line);
+  }
+}
+
+BOOST_AUTO_TEST_CASE(FilterByPrefix)
+{
+  auto output = make_shared<std::stringstream>();
+  Ptr<L3RateTracer> tracer = L3RateTracer::Install(getNode("2"), output, Seconds(1),
+                                                   L3RateTracer::PACKET_HOOKS,
+                                                   TraceFilter().AddPrefix("/other"));
+
+  Simulator::Stop(Seconds(2.5));
+  Simulator::Run();
+
+  tracer = nullptr;
+
+  BOOST_CHECK_EQUAL(output->str(), ""); // no packets under /other
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,156 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "utils/tracers/ndn-prefix-rate-tracer.hpp"
+
+#include <boost/algorithm/string.hpp>
+
+#include <sstream>
+
+#include "../../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class PrefixRateTracerFixture : public ScenarioHelperWithCleanupFixture
+{
+public:
+  PrefixRateTracerFixture()
+  {
+    Config::SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("10Mbps"));
+    Config::SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"));
+    Config::SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"));
+
+    createTopology({
+        {"1", "2"},
+        {"2", "3"}
+      });
+
+    addRoutes({
+        {"1", "2", "/prefix", 1},
+        {"2", "3", "/prefix", 1}
+      });
+
+    addApps({
+        {"1", "ns3::ndn::ConsumerCbr",
+            {{"Prefix", "/prefix/a"}, {"Frequency", "10"}},
+            "0s", "100s"},
+        {"1", "ns3::ndn::ConsumerCbr",
+            {{"Prefix", "/prefix/b"}, {"Frequency", "20"}},
+            "0s", "100s"},
+        {"3", "ns3::ndn::Producer",
+            {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+            "0s", "100s"}
+      });
+  }
+
+  std::string
+  run(size_t prefixDepth)
+  {
+    auto output = make_shared<std::stringstream>();
+    Ptr<PrefixRateTracer> tracer = PrefixRateTracer::Install(getNode("2"), output, Seconds(1),
+                                                             prefixDepth);
+    Simulator::Stop(Seconds(2.5));
+    Simulator::Run();
+
+    return output->str();
+  }
+
+  size_t
+  countLines(const std::string& trace, const std::string& pattern)
+  {
+    std::istringstream is(trace);
+    std::string line;
+    size_t count = 0;
+    while (std::getline(is, line)) {
+      if (boost::contains(line, pattern)) {
+        ++count;
+      }
+    }
+    return count;
+  }
+};
+
+BOOST_FIXTURE_TEST_SUITE(UtilsTracersNdnPrefixRateTracer, PrefixRateTracerFixture)
+
+BOOST_AUTO_TEST_CASE(DepthOne)
+{
+  std::string trace = run(1);
+
+  // two periods
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix\tInInterests\t"), 2U);
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix\tOutData\t"), 2U);
+  BOOST_CHECK_EQUAL(countLines(trace, "/prefix/"), 0U);
+  BOOST_CHECK_EQUAL(countLines(trace, "2\t2\t/prefix\tInInterests\t"), 1U);
+}
+
+BOOST_AUTO_TEST_CASE(DepthTwo)
+{
+  std::string trace = run(2);
+
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix/a\tInInterests\t"), 2U);
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix/a\tOutData\t"), 2U);
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix/b\tInInterests\t"), 2U);
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix/b\tOutData\t"), 2U);
+  BOOST_CHECK_EQUAL(countLines(trace, "\t/prefix\t"), 0U);
+
+  // second period is fully covered by both consumers: 10 and 20 Interests per second
+  std::istringstream is(trace);
+  std::string line;
+  while (std::getline(is, line)) {
+    std::vector<std::string> fields;
+    boost::split(fields, line, boost::is_any_of("\t"));
+    BOOST_REQUIRE_EQUAL(fields.size(), 8U);
+    if (fields[0] == "2" && fields[3] == "InInterests") {
+      BOOST_CHECK_EQUAL(fields[6], fields[2] == "/prefix/a" ? "10" : "20"); // PacketRaw
+    }
+  }
+}
+
+BOOST_AUTO_TEST_CASE(SampledAverages)
+{
+  auto fullOutput = make_shared<std::stringstream>();
+  auto sampledOutput = make_shared<std::stringstream>();
+  Ptr<PrefixRateTracer> fullTracer = PrefixRateTracer::Install(getNode("2"), fullOutput,
+                                                               Seconds(1));
+  Ptr<PrefixRateTracer> sampledTracer = PrefixRateTracer::Install(getNode("2"), sampledOutput,
+                                                                  Seconds(1), 1,
+                                                                  TraceFilter()
+                                                                    .SetStartTime(Seconds(3))
+                                                                    .SetSampling(2));
+  Simulator::Stop(Seconds(5.5));
+  Simulator::Run();
+
+  // sampled rows, including moving averages, are the same as rows of the unsampled trace
+  std::string full = fullOutput->str();
+  std::istringstream is(sampledOutput->str());
+  std::string line;
+  size_t nChecked = 0;
+  while (std::getline(is, line)) {
+    BOOST_CHECK_MESSAGE(countLines(full, line) == 1, "Missing: " << line);
+    ++nChecked;
+  }
+  BOOST_CHECK_EQUAL(nChecked, 4U); // InInterests and OutData at 3 and 5 seconds
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
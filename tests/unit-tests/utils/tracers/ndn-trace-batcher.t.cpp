@@ -0,0 +1,180 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+#include "utils/tracers/ndn-trace-batcher.hpp"
+
+#include <cmath>
+
+#include "../../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class TraceBatcherFixture : public ScenarioHelperWithCleanupFixture
+{
+public:
+  TraceBatcherFixture()
+  {
+    Config::SetDefault("ns3::PointToPointNetDevice::DataRate", StringValue("10Mbps"));
+    Config::SetDefault("ns3::PointToPointChannel::Delay", StringValue("10ms"));
+    Config::SetDefault("ns3::DropTailQueue::MaxPackets", StringValue("20"));
+
+    createTopology({
+        {"1", "2"},
+        {"2", "3"}
+      });
+
+    addRoutes({
+        {"1", "2", "/prefix", 1},
+        {"2", "3", "/prefix", 1}
+      });
+
+    addApps({
+        {"1", "ns3::ndn::ConsumerCbr",
+            {{"Prefix", "/prefix"}, {"Frequency", "10"}},
+            "0s", "100s"},
+        {"3", "ns3::ndn::Producer",
+            {{"Prefix", "/prefix"}, {"PayloadSize", "1024"}},
+            "0s", "100s"}
+      });
+
+    Simulator::Stop(Seconds(2.5));
+  }
+
+  void
+  addBatch(const TraceBatcher::Record* records, size_t nRecords)
+  {
+    batches.push_back(std::vector<TraceBatcher::Record>(records, records + nRecords));
+  }
+
+  size_t
+  count(uint32_t type, const std::string& node, int64_t faceId = -1)
+  {
+    size_t count = 0;
+    for (const auto& batch : batches) {
+      for (const TraceBatcher::Record& record : batch) {
+        if (record.type == type && record.node == getNode(node)->GetId()
+            && (faceId == -1 || record.faceId == faceId)) {
+          count++;
+        }
+      }
+    }
+    return count;
+  }
+
+public:
+  std::vector<std::vector<TraceBatcher::Record>> batches;
+};
+
+BOOST_FIXTURE_TEST_SUITE(UtilsTracersNdnTraceBatcher, TraceBatcherFixture)
+
+BOOST_AUTO_TEST_CASE(Callback)
+{
+  TraceBatcher batcher(7);
+  batcher.SetNameDepth(1);
+  batcher.SetBatchCallback([this] (const TraceBatcher::Record* records, size_t nRecords) {
+      addBatch(records, nRecords);
+    });
+  Simulator::Run();
+  batcher.Flush();
+
+  BOOST_REQUIRE_GT(batches.size(), 1U);
+  for (size_t i = 0; i + 1 < batches.size(); i++) {
+    BOOST_CHECK_EQUAL(batches[i].size(), 7U);
+  }
+  BOOST_CHECK_LE(batches.back().size(), 7U);
+  BOOST_CHECK_EQUAL(batcher.GetNBatches(), 0U);
+
+  size_t nData = getFace("1", "2")->getFaceStatus().getNInDatas();
+  BOOST_CHECK_GT(nData, 20U);
+  BOOST_CHECK_EQUAL(count(TraceBatcher::IN_INTERESTS, "3", getFace("3", "2")->getId()),
+                    getFace("3", "2")->getFaceStatus().getNInInterests());
+  BOOST_CHECK_EQUAL(count(TraceBatcher::OUT_DATA, "2", getFace("2", "1")->getId()),
+                    getFace("2", "1")->getFaceStatus().getNOutDatas());
+  BOOST_CHECK_EQUAL(count(TraceBatcher::FIRST_INTEREST_DATA_DELAY, "1"), nData);
+  BOOST_CHECK_EQUAL(count(TraceBatcher::TIMED_OUT_INTERESTS, "2"), 0U);
+
+  double time = 0;
+  for (const auto& batch : batches) {
+    for (const TraceBatcher::Record& record : batch) {
+      BOOST_CHECK_LE(time, record.time);
+      time = record.time;
+
+      if (record.type == TraceBatcher::FIRST_INTEREST_DATA_DELAY) {
+        BOOST_CHECK_EQUAL(record.name, TraceBatcher::NO_NAME);
+        BOOST_CHECK_GT(record.delay, 0.04);
+      }
+      else {
+        BOOST_CHECK_EQUAL(record.name, 0U);
+      }
+    }
+  }
+  BOOST_REQUIRE_EQUAL(batcher.GetNames().size(), 1U);
+  BOOST_CHECK_EQUAL(batcher.GetNames()[0], "/prefix");
+}
+
+BOOST_AUTO_TEST_CASE(PullWithPause)
+{
+  TraceBatcher batcher(10, Seconds(0.5), TraceBatcher::APP_SOURCES);
+  batcher.SetPauseOnBatch(true);
+
+  size_t nPauses = 0;
+  while (batcher.RunUntilBatch()) {
+    nPauses++;
+    BOOST_REQUIRE_EQUAL(batcher.GetNBatches(), 1U);
+    BOOST_CHECK_LE(batcher.GetBatchSize(), 10U);
+
+    const auto& batch = batcher.GetBatch();
+    batches.push_back(batch);
+    // batch is completed either when it is full, or at the end of the interval
+    BOOST_CHECK(batch.size() == 10U || std::fmod(Simulator::Now().GetSeconds(), 0.5) == 0);
+    batcher.PopBatch();
+  }
+  BOOST_CHECK_EQUAL(Simulator::Now(), Seconds(2.5));
+  BOOST_CHECK_EQUAL(nPauses, batches.size());
+  BOOST_CHECK_GE(nPauses, 4U);
+
+  batcher.Flush();
+  while (batcher.GetNBatches() > 0) {
+    batches.push_back(batcher.GetBatch());
+    batcher.PopBatch();
+  }
+
+  BOOST_CHECK_EQUAL(count(TraceBatcher::IN_INTERESTS, "3"), 0U);
+  BOOST_CHECK_EQUAL(count(TraceBatcher::FIRST_INTEREST_DATA_DELAY, "1"),
+                    getFace("1", "2")->getFaceStatus().getNInDatas());
+  BOOST_CHECK(batcher.GetNames().empty());
+}
+
+BOOST_AUTO_TEST_CASE(Filter)
+{
+  TraceBatcher batcher(NodeContainer(getNode("2")), 1000, Time(0), TraceBatcher::L3_SOURCES,
+                       TraceFilter().AddPrefix("/other"));
+  batcher.SetBatchCallback([this] (const TraceBatcher::Record* records, size_t nRecords) {
+      addBatch(records, nRecords);
+    });
+  Simulator::Run();
+  batcher.Flush();
+
+  BOOST_CHECK(batches.empty());
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
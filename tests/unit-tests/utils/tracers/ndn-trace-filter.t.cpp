@@ -0,0 +1,104 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "utils/tracers/ndn-trace-filter.hpp"
+
+#include "../../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+BOOST_FIXTURE_TEST_SUITE(UtilsTracersNdnTraceFilter, CleanupFixture)
+
+BOOST_AUTO_TEST_CASE(Default)
+{
+  TraceFilter filter;
+
+  BOOST_CHECK(filter.IsNodeAccepted(CreateObject<Node>()));
+  BOOST_CHECK(filter.IsNameAccepted("/any/name"));
+  BOOST_CHECK(!filter.HasNameFilter());
+  BOOST_CHECK(filter.IsSampled());
+  BOOST_CHECK(filter.IsSampled());
+}
+
+BOOST_AUTO_TEST_CASE(NodesAndNames)
+{
+  Ptr<Node> node1 = CreateObject<Node>();
+  Ptr<Node> node2 = CreateObject<Node>();
+
+  TraceFilter filter;
+  filter
+    .SetNodePredicate([node1] (Ptr<Node> node) { return node == node1; })
+    .AddPrefix("/a")
+    .AddPrefix("/b/c");
+
+  BOOST_CHECK(filter.IsNodeAccepted(node1));
+  BOOST_CHECK(!filter.IsNodeAccepted(node2));
+
+  BOOST_CHECK(filter.HasNameFilter());
+  BOOST_CHECK(filter.IsNameAccepted("/a"));
+  BOOST_CHECK(filter.IsNameAccepted("/a/1"));
+  BOOST_CHECK(filter.IsNameAccepted("/b/c/1"));
+  BOOST_CHECK(!filter.IsNameAccepted("/b/d"));
+  BOOST_CHECK(!filter.IsNameAccepted("/"));
+}
+
+BOOST_AUTO_TEST_CASE(OneInN)
+{
+  TraceFilter filter;
+  filter.SetSampling(3);
+
+  std::vector<bool> sampled;
+  for (int i = 0; i < 7; ++i) {
+    sampled.push_back(filter.IsSampled());
+  }
+  BOOST_CHECK(sampled == std::vector<bool>({true, false, false, true, false, false, true}));
+}
+
+static void
+checkSampled(TraceFilter* filter, std::vector<int>* sampled, int i)
+{
+  if (filter->IsSampled()) {
+    sampled->push_back(i);
+  }
+}
+
+BOOST_AUTO_TEST_CASE(TimeRestrictions)
+{
+  TraceFilter filter;
+  filter
+    .SetStartTime(Seconds(1))
+    .SetStopTime(Seconds(9))
+    .SetSamplingWindow(Seconds(1), Seconds(4));
+
+  std::vector<int> sampled;
+  for (int i = 0; i < 10; ++i) {
+    Simulator::Schedule(Seconds(i) + MilliSeconds(500), &checkSampled, &filter, &sampled, i);
+  }
+  Simulator::Run();
+
+  // windows [1s, 2s), [5s, 6s), and stop at 9s
+  BOOST_CHECK(sampled == std::vector<int>({1, 5}));
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,115 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "utils/tracers/ndn-trace-stream.hpp"
+
+#include <boost/filesystem.hpp>
+
+#include <fstream>
+#include <iterator>
+#include <sstream>
+
+#include "../../tests-common.hpp"
+
+namespace ns3 {
+namespace ndn {
+
+class TraceStreamFixture
+{
+public:
+  TraceStreamFixture()
+    : traceFile((boost::filesystem::path(TEST_CONFIG_PATH) / "trace.txt").string())
+  {
+    boost::filesystem::create_directories(TEST_CONFIG_PATH);
+  }
+
+  ~TraceStreamFixture()
+  {
+    boost::filesystem::remove(traceFile);
+    boost::filesystem::remove(traceFile + ".gz");
+  }
+
+  std::string
+  readFile(const std::string& file)
+  {
+    std::ifstream is(file.c_str(), std::ios_base::binary);
+    return std::string((std::istreambuf_iterator<char>(is)), std::istreambuf_iterator<char>());
+  }
+
+public:
+  std::string traceFile;
+};
+
+BOOST_FIXTURE_TEST_SUITE(UtilsTracersNdnTraceStream, TraceStreamFixture)
+
+BOOST_AUTO_TEST_CASE(AsyncWrite)
+{
+  std::ostringstream expected;
+  {
+    shared_ptr<std::ostream> os = OpenTraceStream(traceFile, TraceFormat::TEXT);
+    BOOST_REQUIRE(os != nullptr);
+
+    // enough data to fill all queued chunks several times
+    size_t nLines = 4 * AsyncTraceBuffer::CHUNK_SIZE * AsyncTraceBuffer::MAX_QUEUED_CHUNKS / 32;
+    for (size_t i = 0; i < nLines; ++i) {
+      *os << i << "\t" << i / 2.0 << "\tInInterests\n";
+      expected << i << "\t" << i / 2.0 << "\tInInterests\n";
+
+      if (i % 1000 == 0) {
+        os->flush();
+      }
+    }
+  } // stream is closed, all data is written
+
+  BOOST_CHECK(readFile(traceFile) == expected.str());
+}
+
+BOOST_AUTO_TEST_CASE(Compressed)
+{
+  {
+    shared_ptr<std::ostream> os = OpenTraceStream(traceFile + ".gz", TraceFormat::TEXT);
+    BOOST_REQUIRE(os != nullptr);
+    for (int i = 0; i < 10000; ++i) {
+      *os << "Time\tNode\tFaceId\tFaceDescr\tType\tPackets\tKilobytes\n";
+    }
+  }
+
+  std::string content = readFile(traceFile + ".gz");
+  if (AsyncTraceBuffer::isCompressionSupported()) {
+    BOOST_REQUIRE_GT(content.size(), 2U);
+    BOOST_CHECK_EQUAL(static_cast<uint8_t>(content[0]), 0x1f); // gzip magic
+    BOOST_CHECK_EQUAL(static_cast<uint8_t>(content[1]), 0x8b);
+    BOOST_CHECK_LT(content.size(), 10000U);
+  }
+  else {
+    BOOST_CHECK_EQUAL(content.size(), 10000U * 50);
+  }
+}
+
+BOOST_AUTO_TEST_CASE(CannotOpen)
+{
+  BOOST_CHECK(OpenTraceStream(TEST_CONFIG_PATH "/no-such-dir/trace.txt",
+                              TraceFormat::TEXT) == nullptr);
+}
+
+BOOST_AUTO_TEST_SUITE_END()
+
+} // namespace ndn
+} // namespace ns3
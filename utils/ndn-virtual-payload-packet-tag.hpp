@@ -0,0 +1,98 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_VIRTUAL_PAYLOAD_PACKET_TAG_HPP
+#define NDN_VIRTUAL_PAYLOAD_PACKET_TAG_HPP
+
+#include "ns3/tag.h"
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @brief ns-3 packet tag marking that the NDN packet is followed by its virtual payload
+ *
+ * Only the bytes marked by this tag are restored as the virtual payload on the receiving side,
+ * while any other bytes following the NDN packet (e.g., padding of Ethernet frames) are dropped.
+ *
+ * @see VirtualPayloadTag
+ */
+class VirtualPayloadPacketTag : public Tag {
+public:
+  static TypeId
+  GetTypeId(void);
+
+  /**
+   * @brief Default constructor
+   */
+  VirtualPayloadPacketTag()
+    : m_size(0)
+  {
+  }
+
+  /**
+   * @brief Constructor
+   * @param size size of the virtual payload
+   */
+  explicit
+  VirtualPayloadPacketTag(uint32_t size)
+    : m_size(size)
+  {
+  }
+
+  /**
+   * @brief Get size of the virtual payload
+   */
+  uint32_t
+  Get() const
+  {
+    return m_size;
+  }
+
+  ////////////////////////////////////////////////////////
+  // from ObjectBase
+  ////////////////////////////////////////////////////////
+  virtual TypeId
+  GetInstanceTypeId() const;
+
+  ////////////////////////////////////////////////////////
+  // from Tag
+  ////////////////////////////////////////////////////////
+
+  virtual uint32_t
+  GetSerializedSize() const;
+
+  virtual void
+  Serialize(TagBuffer i) const;
+
+  virtual void
+  Deserialize(TagBuffer i);
+
+  virtual void
+  Print(std::ostream& os) const;
+
+private:
+  uint32_t m_size;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_VIRTUAL_PAYLOAD_PACKET_TAG_HPP
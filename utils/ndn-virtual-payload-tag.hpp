@@ -0,0 +1,98 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_VIRTUAL_PAYLOAD_TAG_HPP
+#define NDN_VIRTUAL_PAYLOAD_TAG_HPP
+
+#include <ndn-cxx/tag.hpp>
+#include <ndn-cxx/data.hpp>
+#include <ndn-cxx/encoding/buffer.hpp>
+
+#include <memory>
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @brief Tag representing payload of NDN packet only by its size
+ *
+ * The payload is not part of the wire encoding of the packet.  When the packet is sent out of
+ * NetDeviceFace, the payload is appended to the ns-3 packet as zero-filled bytes that are not
+ * allocated in memory, so link-level accounting observes the full size of the packet.  These
+ * bytes are marked with VirtualPayloadPacketTag, from which the receiving side restores the tag.
+ */
+class VirtualPayloadTag : public ::ndn::Tag {
+public:
+  static size_t
+  getTypeId()
+  {
+    return 0x6cf9bd9a; // md5("VirtualPayloadTag")[0:8]
+  }
+
+  explicit
+  VirtualPayloadTag(size_t size)
+    : m_size(size)
+  {
+  }
+
+  size_t
+  getSize() const
+  {
+    return m_size;
+  }
+
+private:
+  size_t m_size;
+};
+
+/**
+ * @brief Get size of the virtual payload associated with Interest or Data (0 if none)
+ */
+template<class T>
+size_t
+getVirtualPayloadSize(const T& pkt)
+{
+  auto tag = pkt.template getTag<VirtualPayloadTag>();
+  return tag != nullptr ? tag->getSize() : 0;
+}
+
+/**
+ * @brief Create copy of Data, in which the virtual payload is replaced with actual
+ *        zero-filled content
+ *
+ * The signature of the copy is preserved as is and does not cover the materialized content.
+ */
+inline std::shared_ptr< ::ndn::Data>
+materializeVirtualPayload(const ::ndn::Data& data)
+{
+  auto copy = std::make_shared< ::ndn::Data>(data);
+  size_t size = getVirtualPayloadSize(data);
+  if (size > 0) {
+    copy->removeTag<VirtualPayloadTag>();
+    copy->setContent(std::make_shared< ::ndn::Buffer>(size));
+    copy->wireEncode();
+  }
+  return copy;
+}
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_VIRTUAL_PAYLOAD_TAG_HPP
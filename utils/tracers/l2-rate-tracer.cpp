@@ -29,6 +29,7 @@
 #include "ns3/log.h"
 
 #include <boost/lexical_cast.hpp>
+#include <cstddef>
 #include <fstream>
 
 NS_LOG_COMPONENT_DEFINE("L2RateTracer");
@@ -38,6 +39,42 @@ namespace ns3 {
 static std::list<std::tuple<std::shared_ptr<std::ostream>, std::list<Ptr<L2RateTracer>>>>
   g_tracers;
 
+namespace {
+
+struct Record
+{
+  double time;
+  uint32_t node;
+  uint32_t interface;
+  uint32_t type;
+  uint64_t packets;
+  uint64_t kilobytes;
+  uint64_t packetsRaw;
+  double kilobytesRaw;
+};
+
+std::shared_ptr<ndn::BinaryTraceWriter>
+makeBinaryWriter(std::shared_ptr<std::ostream> os, ndn::TraceFormat format)
+{
+  if (format != ndn::TraceFormat::BINARY) {
+    return nullptr;
+  }
+
+  std::vector<ndn::BinaryTraceWriter::Column> columns{
+    {"Time", "f8", offsetof(Record, time)},
+    {"Node", "str", offsetof(Record, node)},
+    {"Interface", "str", offsetof(Record, interface)},
+    {"Type", "str", offsetof(Record, type)},
+    {"Packets", "u8", offsetof(Record, packets)},
+    {"Kilobytes", "u8", offsetof(Record, kilobytes)},
+    {"PacketsRaw", "u8", offsetof(Record, packetsRaw)},
+    {"KilobytesRaw", "f8", offsetof(Record, kilobytesRaw)}};
+
+  return std::make_shared<ndn::BinaryTraceWriter>(os, sizeof(Record), columns);
+}
+
+} // namespace
+
 void
 L2RateTracer::Destroy()
 {
@@ -45,34 +82,32 @@ L2RateTracer::Destroy()
 }
 
 void
-L2RateTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/)
+L2RateTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/,
+                         ndn::TraceFormat format /* = ndn::TraceFormat::TEXT*/,
+                         const ndn::TraceFilter& filter /* = ndn::TraceFilter()*/)
 {
   std::list<Ptr<L2RateTracer>> tracers;
-  std::shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    std::shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = std::shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  std::shared_ptr<std::ostream> outputStream = ndn::OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  std::shared_ptr<ndn::BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
   for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
     NS_LOG_DEBUG("Node: " << boost::lexical_cast<std::string>((*node)->GetId()));
 
     Ptr<L2RateTracer> trace = Create<L2RateTracer>(outputStream, *node);
     trace->SetAveragingPeriod(averagingPeriod);
+    trace->m_filter = filter;
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -104,7 +139,11 @@ L2RateTracer::SetAveragingPeriod(const Time& period)
 void
 L2RateTracer::PeriodicPrinter()
 {
-  Print(*m_os);
+  // averages include every period, not only the sampled ones
+  UpdateAverages();
+  if (m_filter.IsSampled()) {
+    Print(*m_os);
+  }
   Reset();
 
   m_printEvent = Simulator::Schedule(m_period, &L2RateTracer::PeriodicPrinter, this);
@@ -144,15 +183,28 @@ const double alpha = 0.8;
 #define STATS(INDEX) std::get<INDEX>(m_stats)
 #define RATE(INDEX, fieldName) STATS(INDEX).fieldName / m_period.ToDouble(Time::S)
 
-#define PRINTER(printName, fieldName, interface)                                                   \
+#define AVERAGE(fieldName)                                                                         \
   STATS(2).fieldName =                                                                             \
     /*new value*/ alpha * RATE(0, fieldName) + /*old value*/ (1 - alpha) * STATS(2).fieldName;     \
   STATS(3).fieldName = /*new value*/ alpha * RATE(1, fieldName) / 1024.0                           \
-                       + /*old value*/ (1 - alpha) * STATS(3).fieldName;                           \
-                                                                                                   \
-  os << time.ToDouble(Time::S) << "\t" << m_node << "\t" << interface << "\t" << printName << "\t" \
-     << STATS(2).fieldName << "\t" << STATS(3).fieldName << "\t" << STATS(0).fieldName << "\t"     \
-     << STATS(1).fieldName / 1024.0 << "\n";
+                       + /*old value*/ (1 - alpha) * STATS(3).fieldName;
+
+#define PRINTER(printName, fieldName, interface)                                                   \
+  if (m_writer != nullptr) {                                                                       \
+    WriteRecord(time, interface, printName, STATS(2).fieldName, STATS(3).fieldName,                \
+                STATS(0).fieldName, STATS(1).fieldName / 1024.0);                                  \
+  }                                                                                                \
+  else {                                                                                           \
+    os << time.ToDouble(Time::S) << "\t" << m_node << "\t" << interface << "\t" << printName       \
+       << "\t" << STATS(2).fieldName << "\t" << STATS(3).fieldName << "\t" << STATS(0).fieldName   \
+       << "\t" << STATS(1).fieldName / 1024.0 << "\n";                                             \
+  }
+
+void
+L2RateTracer::UpdateAverages()
+{
+  AVERAGE(m_drop);
+}
 
 void
 L2RateTracer::Print(std::ostream& os) const
@@ -162,6 +214,24 @@ L2RateTracer::Print(std::ostream& os) const
   PRINTER("Drop", m_drop, "combined");
 }
 
+void
+L2RateTracer::WriteRecord(const Time& time, const char* interface, const char* type,
+                          uint64_t packets, uint64_t kilobytes, uint64_t packetsRaw,
+                          double kilobytesRaw) const
+{
+  Record record = Record(); // zero-initialize padding as well
+  record.time = time.ToDouble(Time::S);
+  record.node = m_writer->intern(m_node);
+  record.interface = m_writer->intern(interface);
+  record.type = m_writer->intern(type);
+  record.packets = packets;
+  record.kilobytes = kilobytes;
+  record.packetsRaw = packetsRaw;
+  record.kilobytesRaw = kilobytesRaw;
+
+  m_writer->write(record);
+}
+
 void
 L2RateTracer::Drop(Ptr<const Packet> packet)
 {
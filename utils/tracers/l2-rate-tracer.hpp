@@ -21,6 +21,8 @@
 #define L2_RATE_TRACER_H
 
 #include "l2-tracer.hpp"
+#include "ndn-binary-trace-writer.hpp"
+#include "ndn-trace-filter.hpp"
 
 #include "ns3/nstime.h"
 #include "ns3/event-id.h"
@@ -51,6 +53,8 @@ public:
    * @param averagingPeriod Defines averaging period for the rate calculation,
    *        as well as how often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
    *
    * @returns a tuple of reference to output stream and list of tracers. !!! Attention !!! This
    *tuple needs to be preserved
@@ -58,7 +62,9 @@ public:
    *
    */
   static void
-  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5));
+  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5),
+             ndn::TraceFormat format = ndn::TraceFormat::TEXT,
+             const ndn::TraceFilter& filter = ndn::TraceFilter());
 
   /**
    * @brief Explicit request to remove all statically created tracers
@@ -88,8 +94,20 @@ private:
   void
   Reset();
 
+  /**
+   * @brief Fold statistics of the last averaging period into the moving averages
+   */
+  void
+  UpdateAverages();
+
+  void
+  WriteRecord(const Time& time, const char* interface, const char* type, uint64_t packets,
+              uint64_t kilobytes, uint64_t packetsRaw, double kilobytesRaw) const;
+
 private:
   std::shared_ptr<std::ostream> m_os;
+  std::shared_ptr<ndn::BinaryTraceWriter> m_writer; ///< @brief if set, records are binary
+  ndn::TraceFilter m_filter;
   Time m_period;
   EventId m_printEvent;
 
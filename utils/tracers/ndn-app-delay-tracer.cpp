@@ -32,6 +32,7 @@
 #include <boost/lexical_cast.hpp>
 #include <boost/make_shared.hpp>
 
+#include <cstddef>
 #include <fstream>
 
 NS_LOG_COMPONENT_DEFINE("ndn.AppDelayTracer");
@@ -42,6 +43,81 @@ namespace ndn {
 static std::list<std::tuple<shared_ptr<std::ostream>, std::list<Ptr<AppDelayTracer>>>>
   g_tracers;
 
+namespace {
+
+struct Record
+{
+  double time;
+  uint32_t node;
+  uint32_t appId;
+  uint32_t seqNo;
+  uint32_t type;
+  double delayS;
+  double delayUS;
+  uint32_t retxCount;
+  int32_t hopCount;
+};
+
+struct AggregateRecord
+{
+  double time;
+  uint32_t node;
+  uint32_t appId;
+  uint32_t type;
+  uint32_t padding;
+  uint64_t samples;
+  double meanUS;
+  double minUS;
+  double p50US;
+  double p95US;
+  double p99US;
+  double maxUS;
+  double retxCount;
+  double hopCount;
+};
+
+shared_ptr<BinaryTraceWriter>
+makeBinaryWriter(shared_ptr<std::ostream> os, TraceFormat format, const Time& aggregationPeriod)
+{
+  if (format != TraceFormat::BINARY) {
+    return nullptr;
+  }
+
+  if (!aggregationPeriod.IsZero()) {
+    std::vector<BinaryTraceWriter::Column> columns{
+      {"Time", "f8", offsetof(AggregateRecord, time)},
+      {"Node", "str", offsetof(AggregateRecord, node)},
+      {"AppId", "u4", offsetof(AggregateRecord, appId)},
+      {"Type", "str", offsetof(AggregateRecord, type)},
+      {"Samples", "u8", offsetof(AggregateRecord, samples)},
+      {"MeanUS", "f8", offsetof(AggregateRecord, meanUS)},
+      {"MinUS", "f8", offsetof(AggregateRecord, minUS)},
+      {"P50US", "f8", offsetof(AggregateRecord, p50US)},
+      {"P95US", "f8", offsetof(AggregateRecord, p95US)},
+      {"P99US", "f8", offsetof(AggregateRecord, p99US)},
+      {"MaxUS", "f8", offsetof(AggregateRecord, maxUS)},
+      {"RetxCount", "f8", offsetof(AggregateRecord, retxCount)},
+      {"HopCount", "f8", offsetof(AggregateRecord, hopCount)}};
+
+    return make_shared<BinaryTraceWriter>(os, sizeof(AggregateRecord), columns);
+  }
+
+  std::vector<BinaryTraceWriter::Column> columns{
+    {"Time", "f8", offsetof(Record, time)},
+    {"Node", "str", offsetof(Record, node)},
+    {"AppId", "u4", offsetof(Record, appId)},
+    {"SeqNo", "u4", offsetof(Record, seqNo)},
+    {"Type", "str", offsetof(Record, type)},
+    {"DelayS", "f8", offsetof(Record, delayS)},
+    {"DelayUS", "f8", offsetof(Record, delayUS)},
+    {"RetxCount", "u4", offsetof(Record, retxCount)},
+    {"HopCount", "i4", offsetof(Record, hopCount)}};
+
+  return make_shared<BinaryTraceWriter>(os, sizeof(Record), columns);
+}
+
+} // namespace
+
 void
 AppDelayTracer::Destroy()
 {
@@ -49,34 +125,51 @@ AppDelayTracer::Destroy()
 }
 
 void
-AppDelayTracer::InstallAll(const std::string& file)
+AppDelayTracer::InstallAll(const std::string& file, TraceFormat format /* = TraceFormat::TEXT*/,
+                           const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
+  InstallAll(file, Time(0), format, filter);
+}
 
-  std::list<Ptr<AppDelayTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
+void
+AppDelayTracer::Install(const NodeContainer& nodes, const std::string& file,
+                        TraceFormat format /* = TraceFormat::TEXT*/,
+                        const TraceFilter& filter /* = TraceFilter()*/)
+{
+  Install(nodes, file, Time(0), format, filter);
+}
 
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+void
+AppDelayTracer::Install(Ptr<Node> node, const std::string& file,
+                        TraceFormat format /* = TraceFormat::TEXT*/,
+                        const TraceFilter& filter /* = TraceFilter()*/)
+{
+  Install(node, file, Time(0), format, filter);
+}
+
+void
+AppDelayTracer::InstallAll(const std::string& file, Time aggregationPeriod,
+                           TraceFormat format /* = TraceFormat::TEXT*/,
+                           const TraceFilter& filter /* = TraceFilter()*/)
+{
+  std::list<Ptr<AppDelayTracer>> tracers;
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format, aggregationPeriod);
 
   for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
-    Ptr<AppDelayTracer> trace = Install(*node, outputStream);
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<AppDelayTracer> trace = Install(*node, outputStream, aggregationPeriod, filter);
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -86,34 +179,28 @@ AppDelayTracer::InstallAll(const std::string& file)
 }
 
 void
-AppDelayTracer::Install(const NodeContainer& nodes, const std::string& file)
+AppDelayTracer::Install(const NodeContainer& nodes, const std::string& file,
+                        Time aggregationPeriod, TraceFormat format /* = TraceFormat::TEXT*/,
+                        const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<AppDelayTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format, aggregationPeriod);
 
   for (NodeContainer::Iterator node = nodes.Begin(); node != nodes.End(); node++) {
-    Ptr<AppDelayTracer> trace = Install(*node, outputStream);
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<AppDelayTracer> trace = Install(*node, outputStream, aggregationPeriod, filter);
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -123,32 +210,22 @@ AppDelayTracer::Install(const NodeContainer& nodes, const std::string& file)
 }
 
 void
-AppDelayTracer::Install(Ptr<Node> node, const std::string& file)
+AppDelayTracer::Install(Ptr<Node> node, const std::string& file, Time aggregationPeriod,
+                        TraceFormat format /* = TraceFormat::TEXT*/,
+                        const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<AppDelayTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format, aggregationPeriod);
 
-  Ptr<AppDelayTracer> trace = Install(node, outputStream);
+  Ptr<AppDelayTracer> trace = Install(node, outputStream, aggregationPeriod, filter);
+  trace->m_writer = writer;
   tracers.push_back(trace);
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -167,6 +244,17 @@ AppDelayTracer::Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream)
   return trace;
 }
 
+Ptr<AppDelayTracer>
+AppDelayTracer::Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
+                        Time aggregationPeriod, const TraceFilter& filter /* = TraceFilter()*/)
+{
+  Ptr<AppDelayTracer> trace = Install(node, outputStream);
+  trace->m_filter = filter;
+  trace->SetAggregationPeriod(aggregationPeriod);
+
+  return trace;
+}
+
 //////////////////////////////////////////////////////////////////////////////
 //////////////////////////////////////////////////////////////////////////////
 //////////////////////////////////////////////////////////////////////////////
@@ -192,7 +280,10 @@ AppDelayTracer::AppDelayTracer(shared_ptr<std::ostream> os, const std::string& n
   Connect();
 }
 
-AppDelayTracer::~AppDelayTracer(){};
+AppDelayTracer::~AppDelayTracer()
+{
+  m_printEvent.Cancel();
+}
 
 void
 AppDelayTracer::Connect()
@@ -206,9 +297,120 @@ AppDelayTracer::Connect()
                                 MakeCallback(&AppDelayTracer::FirstInterestDataDelay, this));
 }
 
+void
+AppDelayTracer::SetAggregationPeriod(const Time& period)
+{
+  m_period = period;
+  m_printEvent.Cancel();
+  if (!m_period.IsZero()) {
+    m_printEvent = Simulator::Schedule(m_period, &AppDelayTracer::PeriodicPrinter, this);
+  }
+}
+
+void
+AppDelayTracer::PeriodicPrinter()
+{
+  if (m_filter.IsSampled()) {
+    Print(*m_os);
+  }
+  Reset();
+
+  m_printEvent = Simulator::Schedule(m_period, &AppDelayTracer::PeriodicPrinter, this);
+}
+
+void
+AppDelayTracer::Reset()
+{
+  for (auto& stats : m_stats) {
+    std::get<0>(stats.second).Reset();
+    std::get<1>(stats.second).Reset();
+  }
+}
+
+void
+AppDelayTracer::Print(std::ostream& os) const
+{
+  for (auto& stats : m_stats) {
+    PrintStats(os, stats.first, "LastDelay", std::get<0>(stats.second));
+    PrintStats(os, stats.first, "FullDelay", std::get<1>(stats.second));
+  }
+}
+
+void
+AppDelayTracer::PrintStats(std::ostream& os, uint32_t appId, const char* type,
+                           const DelayStats& stats) const
+{
+  uint64_t samples = stats.m_delay.getCount();
+  if (samples == 0) {
+    return;
+  }
+
+  double retxCount = static_cast<double>(stats.m_retxCount) / samples;
+  double hopCount = static_cast<double>(stats.m_hopCount) / samples;
+
+  if (m_writer != nullptr) {
+    AggregateRecord record = AggregateRecord();
+    record.time = Simulator::Now().ToDouble(Time::S);
+    record.node = m_writer->intern(m_node);
+    record.appId = appId;
+    record.type = m_writer->intern(type);
+    record.samples = samples;
+    record.meanUS = stats.m_delay.getMean().ToDouble(Time::US);
+    record.minUS = stats.m_delay.getMin().ToDouble(Time::US);
+    record.p50US = stats.m_delay.getQuantile(0.50).ToDouble(Time::US);
+    record.p95US = stats.m_delay.getQuantile(0.95).ToDouble(Time::US);
+    record.p99US = stats.m_delay.getQuantile(0.99).ToDouble(Time::US);
+    record.maxUS = stats.m_delay.getMax().ToDouble(Time::US);
+    record.retxCount = retxCount;
+    record.hopCount = hopCount;
+
+    m_writer->write(record);
+    return;
+  }
+
+  os << Simulator::Now().ToDouble(Time::S) << "\t" << m_node << "\t" << appId << "\t" << type
+     << "\t" << samples << "\t" << stats.m_delay.getMean().ToDouble(Time::US) << "\t"
+     << stats.m_delay.getMin().ToDouble(Time::US) << "\t"
+     << stats.m_delay.getQuantile(0.50).ToDouble(Time::US) << "\t"
+     << stats.m_delay.getQuantile(0.95).ToDouble(Time::US) << "\t"
+     << stats.m_delay.getQuantile(0.99).ToDouble(Time::US) << "\t"
+     << stats.m_delay.getMax().ToDouble(Time::US) << "\t" << retxCount << "\t" << hopCount
+     << "\n";
+}
+
 void
 AppDelayTracer::PrintHeader(std::ostream& os) const
 {
+  if (!m_period.IsZero()) {
+    os << "Time"
+       << "\t"
+       << "Node"
+       << "\t"
+       << "AppId"
+       << "\t"
+       << "Type"
+       << "\t"
+       << "Samples"
+       << "\t"
+       << "MeanUS"
+       << "\t"
+       << "MinUS"
+       << "\t"
+       << "P50US"
+       << "\t"
+       << "P95US"
+       << "\t"
+       << "P99US"
+       << "\t"
+       << "MaxUS"
+       << "\t"
+       << "RetxCount"
+       << "\t"
+       << "HopCount"
+       << "";
+    return;
+  }
+
   os << "Time"
      << "\t"
      << "Node"
@@ -234,6 +436,23 @@ void
 AppDelayTracer::LastRetransmittedInterestDataDelay(Ptr<App> app, uint32_t seqno, Time delay,
                                                    int32_t hopCount)
 {
+  if (!m_period.IsZero()) {
+    DelayStats& stats = std::get<0>(m_stats[app->GetId()]);
+    stats.m_delay.add(delay);
+    stats.m_retxCount += 1;
+    stats.m_hopCount += hopCount;
+    return;
+  }
+
+  if (!IsSampled(app, seqno)) {
+    return;
+  }
+
+  if (m_writer != nullptr) {
+    WriteRecord(app, seqno, "LastDelay", delay, 1, hopCount);
+    return;
+  }
+
   *m_os << Simulator::Now().ToDouble(Time::S) << "\t" << m_node << "\t" << app->GetId() << "\t"
         << seqno << "\t"
         << "LastDelay"
@@ -245,6 +464,23 @@ void
 AppDelayTracer::FirstInterestDataDelay(Ptr<App> app, uint32_t seqno, Time delay, uint32_t retxCount,
                                        int32_t hopCount)
 {
+  if (!m_period.IsZero()) {
+    DelayStats& stats = std::get<1>(m_stats[app->GetId()]);
+    stats.m_delay.add(delay);
+    stats.m_retxCount += retxCount;
+    stats.m_hopCount += hopCount;
+    return;
+  }
+
+  if (!IsSampled(app, seqno)) {
+    return;
+  }
+
+  if (m_writer != nullptr) {
+    WriteRecord(app, seqno, "FullDelay", delay, retxCount, hopCount);
+    return;
+  }
+
   *m_os << Simulator::Now().ToDouble(Time::S) << "\t" << m_node << "\t" << app->GetId() << "\t"
         << seqno << "\t"
         << "FullDelay"
@@ -252,5 +488,33 @@ AppDelayTracer::FirstInterestDataDelay(Ptr<App> app, uint32_t seqno, Time delay,
         << "\t" << hopCount << "\n";
 }
 
+bool
+AppDelayTracer::IsSampled(Ptr<App> app, uint32_t seqno)
+{
+  // LastDelay and FullDelay of the same Data packet are either both traced or both skipped
+  if (std::get<0>(m_lastSample) != app || std::get<1>(m_lastSample) != seqno) {
+    m_lastSample = std::make_tuple(app, seqno, m_filter.IsSampled());
+  }
+  return std::get<2>(m_lastSample);
+}
+
+void
+AppDelayTracer::WriteRecord(Ptr<App> app, uint32_t seqno, const char* type, Time delay,
+                            uint32_t retxCount, int32_t hopCount)
+{
+  Record record;
+  record.time = Simulator::Now().ToDouble(Time::S);
+  record.node = m_writer->intern(m_node);
+  record.appId = app->GetId();
+  record.seqNo = seqno;
+  record.type = m_writer->intern(type);
+  record.delayS = delay.ToDouble(Time::S);
+  record.delayUS = delay.ToDouble(Time::US);
+  record.retxCount = retxCount;
+  record.hopCount = hopCount;
+
+  m_writer->write(record);
+}
+
 } // namespace ndn
 } // namespace ns3
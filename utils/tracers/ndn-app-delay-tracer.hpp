@@ -21,6 +21,9 @@
 #define CCNX_APP_DELAY_TRACER_H
 
 #include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-binary-trace-writer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-delay-histogram.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-filter.hpp"
 
 #include "ns3/ptr.h"
 #include "ns3/simple-ref-count.h"
@@ -30,6 +33,7 @@
 
 #include <tuple>
 #include <list>
+#include <map>
 
 namespace ns3 {
 
@@ -50,20 +54,26 @@ public:
    * @brief Helper method to install tracers on all simulation nodes
    *
    * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
    *
    */
   static void
-  InstallAll(const std::string& file);
+  InstallAll(const std::string& file, TraceFormat format = TraceFormat::TEXT,
+             const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on the selected simulation nodes
    *
    * @param nodes Nodes on which to install tracer
    * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
    *
    */
   static void
-  Install(const NodeContainer& nodes, const std::string& file);
+  Install(const NodeContainer& nodes, const std::string& file,
+          TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on a specific simulation node
@@ -72,9 +82,75 @@ public:
    * @param file File to which traces will be written.  If filename is -, then std::out is used
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *        second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
    */
   static void
-  Install(Ptr<Node> node, const std::string& file);
+  Install(Ptr<Node> node, const std::string& file, TraceFormat format = TraceFormat::TEXT,
+          const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install aggregating tracers on all simulation nodes
+   *
+   * Instead of a record for each retrieved Data packet, once per @p aggregationPeriod the
+   * tracers write, for each application and delay type, the number of samples, mean, minimum,
+   * 50th, 95th and 99th percentiles, and maximum of the delay, as well as mean retransmission
+   * and hop counts.  Percentiles are estimated using DelayHistogram.
+   *
+   * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param aggregationPeriod How often aggregated delays will be written into the trace file.
+   *        Zero period disables aggregation.
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
+   */
+  static void
+  InstallAll(const std::string& file, Time aggregationPeriod,
+             TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install aggregating tracers on the selected simulation nodes
+   *
+   * @param nodes Nodes on which to install tracer
+   * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param aggregationPeriod How often aggregated delays will be written into the trace file.
+   *        Zero period disables aggregation.
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
+   */
+  static void
+  Install(const NodeContainer& nodes, const std::string& file, Time aggregationPeriod,
+          TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install aggregating tracer on a specific simulation node
+   *
+   * @param nodes Nodes on which to install tracer
+   * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param aggregationPeriod How often aggregated delays will be written into the trace file.
+   *        Zero period disables aggregation.
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes and time (default, everything)
+   */
+  static void
+  Install(Ptr<Node> node, const std::string& file, Time aggregationPeriod,
+          TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install aggregating tracer on a specific simulation node
+   *
+   * @param nodes Nodes on which to install tracer
+   * @param outputStream Smart pointer to a stream
+   * @param aggregationPeriod How often aggregated delays will be written into the stream.
+   *        Zero period disables aggregation.
+   * @param filter Selection of traced time (default, everything)
+   *
+   * @returns a tuple of reference to output stream and list of tracers.
+   *          !!! Attention !!! This tuple needs to be preserved for the lifetime of simulation,
+   *          otherwise SEGFAULTs are inevitable
+   */
+  static Ptr<AppDelayTracer>
+  Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream, Time aggregationPeriod,
+          const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on a specific simulation node
@@ -128,9 +204,36 @@ public:
   PrintHeader(std::ostream& os) const;
 
 private:
+  struct DelayStats
+  {
+    void
+    Reset()
+    {
+      m_delay.reset();
+      m_retxCount = 0;
+      m_hopCount = 0;
+    }
+
+    DelayHistogram m_delay;
+    uint64_t m_retxCount = 0;
+    int64_t m_hopCount = 0;
+  };
+
   void
   Connect();
 
+  void
+  SetAggregationPeriod(const Time& period);
+
+  void
+  PeriodicPrinter();
+
+  void
+  Print(std::ostream& os) const;
+
+  void
+  Reset();
+
   void
   LastRetransmittedInterestDataDelay(Ptr<App> app, uint32_t seqno, Time delay, int32_t hopCount);
 
@@ -138,11 +241,28 @@ private:
   FirstInterestDataDelay(Ptr<App> app, uint32_t seqno, Time delay, uint32_t rextCount,
                          int32_t hopCount);
 
+  void
+  WriteRecord(Ptr<App> app, uint32_t seqno, const char* type, Time delay, uint32_t retxCount,
+              int32_t hopCount);
+
+  bool
+  IsSampled(Ptr<App> app, uint32_t seqno);
+
+  void
+  PrintStats(std::ostream& os, uint32_t appId, const char* type, const DelayStats& stats) const;
+
 private:
   std::string m_node;
   Ptr<Node> m_nodePtr;
 
   shared_ptr<std::ostream> m_os;
+  shared_ptr<BinaryTraceWriter> m_writer; ///< @brief if set, records are written in binary format
+  TraceFilter m_filter;
+  std::tuple<Ptr<App>, uint32_t, bool> m_lastSample; ///< @brief app, seqno, and whether sampled
+
+  Time m_period; ///< @brief if not zero, delays are aggregated over this period
+  EventId m_printEvent;
+  std::map<uint32_t, std::tuple<DelayStats, DelayStats>> m_stats; ///< @brief LastDelay, FullDelay
 };
 
 } // namespace ndn
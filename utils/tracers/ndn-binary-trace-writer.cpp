@@ -0,0 +1,117 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-binary-trace-writer.hpp"
+
+#include <cstring>
+
+namespace ns3 {
+namespace ndn {
+
+static const char MAGIC[8] = {'N', 'D', 'N', 'T', 'R', 'A', 'C', 'E'};
+static const uint32_t VERSION = 1;
+static const size_t TYPE_CODE_SIZE = 4;
+
+BinaryTraceWriter::BinaryTraceWriter(shared_ptr<std::ostream> os, size_t recordSize,
+                                     const std::vector<Column>& columns)
+  : m_os(os)
+  , m_recordSize(recordSize)
+  , m_nRecords(0)
+  , m_offset(0)
+{
+  uint32_t headerSize = sizeof(MAGIC) + 4 * sizeof(uint32_t);
+  for (const auto& column : columns) {
+    headerSize += sizeof(uint32_t) + TYPE_CODE_SIZE + sizeof(uint32_t) + column.name.size();
+  }
+  headerSize = (headerSize + 7) / 8 * 8;
+
+  writeBytes(MAGIC, sizeof(MAGIC));
+
+  uint32_t fields[] = {VERSION, headerSize, static_cast<uint32_t>(recordSize),
+                       static_cast<uint32_t>(columns.size())};
+  writeBytes(fields, sizeof(fields));
+
+  for (const auto& column : columns) {
+    NS_ASSERT_MSG(column.type.size() < TYPE_CODE_SIZE, "Invalid column type " << column.type);
+    NS_ASSERT_MSG(column.offset < recordSize, "Column " << column.name << " is out of record");
+
+    char type[TYPE_CODE_SIZE] = {0};
+    std::memcpy(type, column.type.data(), column.type.size());
+    uint32_t nameSize = column.name.size();
+
+    writeBytes(&column.offset, sizeof(column.offset));
+    writeBytes(type, sizeof(type));
+    writeBytes(&nameSize, sizeof(nameSize));
+    writeBytes(column.name.data(), nameSize);
+  }
+
+  static const char padding[8] = {0};
+  writeBytes(padding, headerSize - m_offset);
+}
+
+BinaryTraceWriter::~BinaryTraceWriter()
+{
+  uint64_t stringTableOffset = m_offset;
+
+  uint32_t nStrings = m_strings.size();
+  writeBytes(&nStrings, sizeof(nStrings));
+  for (const auto& str : m_strings) {
+    uint32_t size = str.size();
+    writeBytes(&size, sizeof(size));
+    writeBytes(str.data(), size);
+  }
+
+  writeBytes(&stringTableOffset, sizeof(stringTableOffset));
+  writeBytes(&m_nRecords, sizeof(m_nRecords));
+  writeBytes(MAGIC, sizeof(MAGIC));
+
+  m_os->flush();
+}
+
+uint32_t
+BinaryTraceWriter::intern(const std::string& str)
+{
+  auto it = m_stringIds.find(str);
+  if (it != m_stringIds.end()) {
+    return it->second;
+  }
+
+  uint32_t id = m_strings.size();
+  m_strings.push_back(str);
+  m_stringIds.insert(std::make_pair(str, id));
+  return id;
+}
+
+void
+BinaryTraceWriter::writeRecord(const void* record)
+{
+  writeBytes(record, m_recordSize);
+  ++m_nRecords;
+}
+
+void
+BinaryTraceWriter::writeBytes(const void* buf, size_t size)
+{
+  m_os->write(reinterpret_cast<const char*>(buf), size);
+  m_offset += size;
+}
+
+} // namespace ndn
+} // namespace ns3
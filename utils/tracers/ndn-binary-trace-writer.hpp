@@ -0,0 +1,125 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_BINARY_TRACE_WRITER_HPP
+#define NDN_BINARY_TRACE_WRITER_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-stream.hpp"
+
+#include "ns3/assert.h"
+
+#include <boost/noncopyable.hpp>
+
+#include <iostream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Writer of the trace records in binary columnar format
+ *
+ * The trace file consists of:
+ *
+ * - header: magic "NDNTRACE", uint32 version, uint32 header size, uint32 record size,
+ *   uint32 number of columns, and for each column its uint32 offset within the record,
+ *   4-byte NUL-padded type code ("f8", "i4", "u4", "u8", or "str"), uint32 length of the
+ *   column name and the name itself.  The header is zero-padded to 8-byte boundary;
+ * - records: fixed-width records (host byte order), one after another;
+ * - trailer: string table (uint32 number of strings, then uint32 length and bytes of each
+ *   string), followed by uint64 offset of the string table, uint64 number of records, and
+ *   "NDNTRACE" magic.  Values of "str" columns are uint32 indexes in the string table.
+ *
+ * The trailer is written when the writer is destroyed, so nothing ever needs to be
+ * re-written and the file can be produced into a non-seekable stream.
+ */
+class BinaryTraceWriter : boost::noncopyable {
+public:
+  /**
+   * @brief Description of a column of the fixed-width record
+   */
+  struct Column
+  {
+    std::string name;
+    std::string type;
+    uint32_t offset;
+  };
+
+  /**
+   * @param os         output stream, which should be opened in binary mode
+   * @param recordSize size of the fixed-width record
+   * @param columns    description of the record columns
+   */
+  BinaryTraceWriter(shared_ptr<std::ostream> os, size_t recordSize,
+                    const std::vector<Column>& columns);
+
+  /**
+   * @brief Write the string table and the trailer
+   */
+  ~BinaryTraceWriter();
+
+  /**
+   * @brief Get index of @p str in the string table, adding it if necessary
+   */
+  uint32_t
+  intern(const std::string& str);
+
+  /**
+   * @brief Write one fixed-width record
+   */
+  template<class Record>
+  void
+  write(const Record& record)
+  {
+    NS_ASSERT(sizeof(Record) == m_recordSize);
+    writeRecord(&record);
+  }
+
+  uint64_t
+  getNRecords() const
+  {
+    return m_nRecords;
+  }
+
+private:
+  void
+  writeRecord(const void* record);
+
+  void
+  writeBytes(const void* buf, size_t size);
+
+private:
+  shared_ptr<std::ostream> m_os;
+  size_t m_recordSize;
+  uint64_t m_nRecords;
+  uint64_t m_offset;
+
+  std::unordered_map<std::string, uint32_t> m_stringIds;
+  std::vector<std::string> m_strings;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_BINARY_TRACE_WRITER_HPP
@@ -32,6 +32,7 @@
 
 #include <boost/lexical_cast.hpp>
 
+#include <cstddef>
 #include <fstream>
 
 NS_LOG_COMPONENT_DEFINE("ndn.CsTracer");
@@ -41,6 +42,34 @@ namespace ndn {
 
 static std::list<std::tuple<shared_ptr<std::ostream>, std::list<Ptr<CsTracer>>>> g_tracers;
 
+namespace {
+
+struct Record
+{
+  double time;
+  uint32_t node;
+  uint32_t type;
+  double packets;
+};
+
+shared_ptr<BinaryTraceWriter>
+makeBinaryWriter(shared_ptr<std::ostream> os, TraceFormat format)
+{
+  if (format != TraceFormat::BINARY) {
+    return nullptr;
+  }
+
+  std::vector<BinaryTraceWriter::Column> columns{
+    {"Time", "f8", offsetof(Record, time)},
+    {"Node", "str", offsetof(Record, node)},
+    {"Type", "str", offsetof(Record, type)},
+    {"Packets", "f8", offsetof(Record, packets)}};
+
+  return make_shared<BinaryTraceWriter>(os, sizeof(Record), columns);
+}
+
+} // namespace
+
 void
 CsTracer::Destroy()
 {
@@ -48,34 +77,28 @@ CsTracer::Destroy()
 }
 
 void
-CsTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/)
+CsTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/,
+                     TraceFormat format /* = TraceFormat::TEXT*/,
+                     const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<CsTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
   for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
-    Ptr<CsTracer> trace = Install(*node, outputStream, averagingPeriod);
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<CsTracer> trace = Install(*node, outputStream, averagingPeriod, filter);
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -86,34 +109,28 @@ CsTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds
 
 void
 CsTracer::Install(const NodeContainer& nodes, const std::string& file,
-                  Time averagingPeriod /* = Seconds (0.5)*/)
+                  Time averagingPeriod /* = Seconds (0.5)*/,
+                  TraceFormat format /* = TraceFormat::TEXT*/,
+                  const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<CsTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
   for (NodeContainer::Iterator node = nodes.Begin(); node != nodes.End(); node++) {
-    Ptr<CsTracer> trace = Install(*node, outputStream, averagingPeriod);
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<CsTracer> trace = Install(*node, outputStream, averagingPeriod, filter);
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -124,32 +141,22 @@ CsTracer::Install(const NodeContainer& nodes, const std::string& file,
 
 void
 CsTracer::Install(Ptr<Node> node, const std::string& file,
-                  Time averagingPeriod /* = Seconds (0.5)*/)
+                  Time averagingPeriod /* = Seconds (0.5)*/,
+                  TraceFormat format /* = TraceFormat::TEXT*/,
+                  const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<CsTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
-  Ptr<CsTracer> trace = Install(node, outputStream, averagingPeriod);
+  Ptr<CsTracer> trace = Install(node, outputStream, averagingPeriod, filter);
+  trace->m_writer = writer;
   tracers.push_back(trace);
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -160,11 +167,13 @@ CsTracer::Install(Ptr<Node> node, const std::string& file,
 
 Ptr<CsTracer>
 CsTracer::Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
-                  Time averagingPeriod /* = Seconds (0.5)*/)
+                  Time averagingPeriod /* = Seconds (0.5)*/,
+                  const TraceFilter& filter /* = TraceFilter()*/)
 {
   NS_LOG_DEBUG("Node: " << node->GetId());
 
   Ptr<CsTracer> trace = Create<CsTracer>(outputStream, node);
+  trace->m_filter = filter;
   trace->SetAveragingPeriod(averagingPeriod);
 
   return trace;
@@ -218,7 +227,9 @@ CsTracer::SetAveragingPeriod(const Time& period)
 void
 CsTracer::PeriodicPrinter()
 {
-  Print(*m_os);
+  if (m_filter.IsSampled()) {
+    Print(*m_os);
+  }
   Reset();
 
   m_printEvent = Simulator::Schedule(m_period, &CsTracer::PeriodicPrinter, this);
@@ -246,8 +257,13 @@ CsTracer::Reset()
 }
 
 #define PRINTER(printName, fieldName)                                                              \
-  os << time.ToDouble(Time::S) << "\t" << m_node << "\t" << printName << "\t" << m_stats.fieldName \
-     << "\n";
+  if (m_writer != nullptr) {                                                                       \
+    WriteRecord(time, printName, m_stats.fieldName);                                               \
+  }                                                                                                \
+  else {                                                                                           \
+    os << time.ToDouble(Time::S) << "\t" << m_node << "\t" << printName << "\t"                    \
+       << m_stats.fieldName << "\n";                                                               \
+  }
 
 void
 CsTracer::Print(std::ostream& os) const
@@ -259,14 +275,34 @@ CsTracer::Print(std::ostream& os) const
 }
 
 void
-CsTracer::CacheHits(shared_ptr<const Interest>, shared_ptr<const Data>)
+CsTracer::WriteRecord(const Time& time, const char* type, double packets) const
 {
+  Record record;
+  record.time = time.ToDouble(Time::S);
+  record.node = m_writer->intern(m_node);
+  record.type = m_writer->intern(type);
+  record.packets = packets;
+
+  m_writer->write(record);
+}
+
+void
+CsTracer::CacheHits(shared_ptr<const Interest> interest, shared_ptr<const Data>)
+{
+  if (!m_filter.IsNameAccepted(interest->getName())) {
+    return;
+  }
+
   m_stats.m_cacheHits++;
 }
 
 void
-CsTracer::CacheMisses(shared_ptr<const Interest>)
+CsTracer::CacheMisses(shared_ptr<const Interest> interest)
 {
+  if (!m_filter.IsNameAccepted(interest->getName())) {
+    return;
+  }
+
   m_stats.m_cacheMisses++;
 }
 
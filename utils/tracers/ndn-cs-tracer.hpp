@@ -21,6 +21,8 @@
 #define CCNX_CS_TRACER_H
 
 #include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-binary-trace-writer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-filter.hpp"
 
 #include "ns3/ptr.h"
 #include "ns3/simple-ref-count.h"
@@ -67,6 +69,8 @@ public:
    * @param file File to which traces will be written.  If filename is -, then std::out is used
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes, names, and time (default, everything)
    *
    * @returns a tuple of reference to output stream and list of tracers. !!! Attention !!! This
    *tuple needs to be preserved
@@ -74,7 +78,8 @@ public:
    *
    */
   static void
-  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5));
+  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5),
+             TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on the selected simulation nodes
@@ -83,6 +88,8 @@ public:
    * @param file File to which traces will be written.  If filename is -, then std::out is used
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes, names, and time (default, everything)
    *
    * @returns a tuple of reference to output stream and list of tracers. !!! Attention !!! This
    *tuple needs to be preserved
@@ -90,7 +97,8 @@ public:
    *
    */
   static void
-  Install(const NodeContainer& nodes, const std::string& file, Time averagingPeriod = Seconds(0.5));
+  Install(const NodeContainer& nodes, const std::string& file, Time averagingPeriod = Seconds(0.5),
+          TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on a specific simulation node
@@ -99,6 +107,8 @@ public:
    * @param file File to which traces will be written.  If filename is -, then std::out is used
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes, names, and time (default, everything)
    *
    * @returns a tuple of reference to output stream and list of tracers. !!! Attention !!! This
    *tuple needs to be preserved
@@ -106,7 +116,8 @@ public:
    *
    */
   static void
-  Install(Ptr<Node> node, const std::string& file, Time averagingPeriod = Seconds(0.5));
+  Install(Ptr<Node> node, const std::string& file, Time averagingPeriod = Seconds(0.5),
+          TraceFormat format = TraceFormat::TEXT, const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on a specific simulation node
@@ -115,6 +126,7 @@ public:
    * @param outputStream Smart pointer to a stream
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param filter Selection of traced names and time (default, everything)
    *
    * @returns a tuple of reference to output stream and list of tracers. !!! Attention !!! This
    *tuple needs to be preserved
@@ -122,7 +134,7 @@ public:
    */
   static Ptr<CsTracer>
   Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
-          Time averagingPeriod = Seconds(0.5));
+          Time averagingPeriod = Seconds(0.5), const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Explicit request to remove all statically created tracers
@@ -188,11 +200,16 @@ private:
   void
   PeriodicPrinter();
 
+  void
+  WriteRecord(const Time& time, const char* type, double packets) const;
+
 private:
   std::string m_node;
   Ptr<Node> m_nodePtr;
 
   shared_ptr<std::ostream> m_os;
+  shared_ptr<BinaryTraceWriter> m_writer; ///< @brief if set, records are written in binary format
+  TraceFilter m_filter;
 
   Time m_period;
   EventId m_printEvent;
@@ -0,0 +1,152 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-delay-histogram.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+namespace ns3 {
+namespace ndn {
+
+static const uint64_t SUB_BUCKET_COUNT = 1 << DelayHistogram::SUB_BUCKET_BITS;
+
+DelayHistogram::DelayHistogram()
+  : m_count(0)
+  , m_min(std::numeric_limits<uint64_t>::max())
+  , m_max(0)
+  , m_sum(0)
+{
+}
+
+size_t
+DelayHistogram::getBucket(uint64_t value)
+{
+  if (value < SUB_BUCKET_COUNT) {
+    return value;
+  }
+
+  int exponent = 63 - __builtin_clzll(value); // >= SUB_BUCKET_BITS
+  int shift = exponent - SUB_BUCKET_BITS;
+  return (shift + 1) * SUB_BUCKET_COUNT + ((value >> shift) & (SUB_BUCKET_COUNT - 1));
+}
+
+uint64_t
+DelayHistogram::getBucketMiddle(size_t bucket)
+{
+  if (bucket < SUB_BUCKET_COUNT) {
+    return bucket;
+  }
+
+  int shift = bucket / SUB_BUCKET_COUNT - 1;
+  uint64_t low = (SUB_BUCKET_COUNT + bucket % SUB_BUCKET_COUNT) << shift;
+  return low + ((uint64_t(1) << shift) >> 1);
+}
+
+void
+DelayHistogram::add(const Time& delay)
+{
+  uint64_t value = static_cast<uint64_t>(std::max<int64_t>(delay.GetNanoSeconds(), 0));
+
+  size_t bucket = getBucket(value);
+  if (bucket >= m_buckets.size()) {
+    m_buckets.resize(bucket + 1, 0);
+  }
+  ++m_buckets[bucket];
+
+  ++m_count;
+  m_min = std::min(m_min, value);
+  m_max = std::max(m_max, value);
+  m_sum += value;
+}
+
+void
+DelayHistogram::merge(const DelayHistogram& other)
+{
+  if (other.m_buckets.size() > m_buckets.size()) {
+    m_buckets.resize(other.m_buckets.size(), 0);
+  }
+  for (size_t i = 0; i < other.m_buckets.size(); ++i) {
+    m_buckets[i] += other.m_buckets[i];
+  }
+
+  m_count += other.m_count;
+  m_min = std::min(m_min, other.m_min);
+  m_max = std::max(m_max, other.m_max);
+  m_sum += other.m_sum;
+}
+
+void
+DelayHistogram::reset()
+{
+  std::fill(m_buckets.begin(), m_buckets.end(), 0);
+  m_count = 0;
+  m_min = std::numeric_limits<uint64_t>::max();
+  m_max = 0;
+  m_sum = 0;
+}
+
+Time
+DelayHistogram::getMin() const
+{
+  return m_count > 0 ? NanoSeconds(m_min) : Time(0);
+}
+
+Time
+DelayHistogram::getMax() const
+{
+  return NanoSeconds(m_max);
+}
+
+Time
+DelayHistogram::getMean() const
+{
+  return m_count > 0 ? NanoSeconds(static_cast<uint64_t>(m_sum / m_count)) : Time(0);
+}
+
+Time
+DelayHistogram::getQuantile(double q) const
+{
+  if (m_count == 0) {
+    return Time(0);
+  }
+
+  uint64_t rank = static_cast<uint64_t>(std::ceil(std::min(std::max(q, 0.0), 1.0) * m_count));
+  if (rank <= 1) {
+    return NanoSeconds(m_min);
+  }
+  if (rank >= m_count) {
+    return NanoSeconds(m_max);
+  }
+
+  uint64_t seen = 0;
+  for (size_t bucket = 0; bucket < m_buckets.size(); ++bucket) {
+    seen += m_buckets[bucket];
+    if (seen >= rank) {
+      uint64_t value = std::min(std::max(getBucketMiddle(bucket), m_min), m_max);
+      return NanoSeconds(value);
+    }
+  }
+  return NanoSeconds(m_max);
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,109 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_DELAY_HISTOGRAM_HPP
+#define NDN_DELAY_HISTOGRAM_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+
+#include "ns3/nstime.h"
+
+#include <vector>
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Log-bucketed histogram of delays, providing approximate quantiles
+ *
+ * Delays are counted in buckets whose width grows with the value: values below
+ * 2^SUB_BUCKET_BITS nanoseconds are counted exactly, and every following power-of-two range
+ * is split into 2^SUB_BUCKET_BITS equal buckets.  The relative error of the reported
+ * quantiles is therefore bounded by 2^-SUB_BUCKET_BITS (about 3%), the memory footprint does
+ * not depend on the number of samples, and histograms can be merged by adding bucket counts.
+ */
+class DelayHistogram {
+public:
+  static const int SUB_BUCKET_BITS = 5;
+
+  DelayHistogram();
+
+  /**
+   * @brief Count one delay sample
+   */
+  void
+  add(const Time& delay);
+
+  /**
+   * @brief Add all samples counted in @p other
+   */
+  void
+  merge(const DelayHistogram& other);
+
+  /**
+   * @brief Forget all samples, keeping the allocated buckets
+   */
+  void
+  reset();
+
+  uint64_t
+  getCount() const
+  {
+    return m_count;
+  }
+
+  Time
+  getMin() const;
+
+  Time
+  getMax() const;
+
+  Time
+  getMean() const;
+
+  /**
+   * @brief Get approximate @p q-quantile of the counted delays
+   * @param q quantile, in [0, 1] range (e.g., 0.99 for 99th percentile)
+   *
+   * Returns zero time if no samples were counted.
+   */
+  Time
+  getQuantile(double q) const;
+
+private:
+  static size_t
+  getBucket(uint64_t value);
+
+  static uint64_t
+  getBucketMiddle(size_t bucket);
+
+private:
+  std::vector<uint64_t> m_buckets;
+  uint64_t m_count;
+  uint64_t m_min;
+  uint64_t m_max;
+  double m_sum;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_DELAY_HISTOGRAM_HPP
@@ -26,9 +26,14 @@
 #include "ns3/log.h"
 #include "ns3/node-list.h"
 
+#include "ns3/ndnSIM/model/ndn-l3-protocol.hpp"
+#include "ns3/ndnSIM/utils/ndn-virtual-payload-tag.hpp"
+
+#include "daemon/fw/forwarder.hpp"
 #include "daemon/table/pit-entry.hpp"
 
 #include <fstream>
+#include <cstddef>
 #include <boost/lexical_cast.hpp>
 
 NS_LOG_COMPONENT_DEFINE("ndn.L3RateTracer");
@@ -39,6 +44,51 @@ namespace ndn {
 static std::list<std::tuple<shared_ptr<std::ostream>, std::list<Ptr<L3RateTracer>>>>
   g_tracers;
 
+namespace {
+
+struct Record
+{
+  double time;
+  uint32_t node;
+  int32_t faceId;
+  uint32_t faceDescr;
+  uint32_t type;
+  double packets;
+  double kilobytes;
+  double packetsRaw;
+  double kilobytesRaw;
+};
+
+void
+pullCounter(double& value, double& lastCounter, uint64_t counter)
+{
+  value = counter - lastCounter;
+  lastCounter = counter;
+}
+
+shared_ptr<BinaryTraceWriter>
+makeBinaryWriter(shared_ptr<std::ostream> os, TraceFormat format)
+{
+  if (format != TraceFormat::BINARY) {
+    return nullptr;
+  }
+
+  std::vector<BinaryTraceWriter::Column> columns{
+    {"Time", "f8", offsetof(Record, time)},
+    {"Node", "str", offsetof(Record, node)},
+    {"FaceId", "i4", offsetof(Record, faceId)},
+    {"FaceDescr", "str", offsetof(Record, faceDescr)},
+    {"Type", "str", offsetof(Record, type)},
+    {"Packets", "f8", offsetof(Record, packets)},
+    {"Kilobytes", "f8", offsetof(Record, kilobytes)},
+    {"PacketRaw", "f8", offsetof(Record, packetsRaw)},
+    {"KilobytesRaw", "f8", offsetof(Record, kilobytesRaw)}};
+
+  return make_shared<BinaryTraceWriter>(os, sizeof(Record), columns);
+}
+
+} // namespace
+
 void
 L3RateTracer::Destroy()
 {
@@ -46,31 +96,29 @@ L3RateTracer::Destroy()
 }
 
 void
-L3RateTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/)
+L3RateTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/,
+                         TraceFormat format /* = TraceFormat::TEXT*/,
+                         StatsSource source /* = PACKET_HOOKS*/,
+                         const TraceFilter& filter /* = TraceFilter()*/)
 {
   std::list<Ptr<L3RateTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
   for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
-    Ptr<L3RateTracer> trace = Install(*node, outputStream, averagingPeriod);
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<L3RateTracer> trace = Install(*node, outputStream, averagingPeriod, source, filter);
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -81,34 +129,29 @@ L3RateTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seco
 
 void
 L3RateTracer::Install(const NodeContainer& nodes, const std::string& file,
-                      Time averagingPeriod /* = Seconds (0.5)*/)
+                      Time averagingPeriod /* = Seconds (0.5)*/,
+                      TraceFormat format /* = TraceFormat::TEXT*/,
+                      StatsSource source /* = PACKET_HOOKS*/,
+                      const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<L3RateTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
   for (NodeContainer::Iterator node = nodes.Begin(); node != nodes.End(); node++) {
-    Ptr<L3RateTracer> trace = Install(*node, outputStream, averagingPeriod);
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<L3RateTracer> trace = Install(*node, outputStream, averagingPeriod, source, filter);
+    trace->m_writer = writer;
     tracers.push_back(trace);
   }
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -119,32 +162,23 @@ L3RateTracer::Install(const NodeContainer& nodes, const std::string& file,
 
 void
 L3RateTracer::Install(Ptr<Node> node, const std::string& file,
-                      Time averagingPeriod /* = Seconds (0.5)*/)
+                      Time averagingPeriod /* = Seconds (0.5)*/,
+                      TraceFormat format /* = TraceFormat::TEXT*/,
+                      StatsSource source /* = PACKET_HOOKS*/,
+                      const TraceFilter& filter /* = TraceFilter()*/)
 {
-  using namespace boost;
-  using namespace std;
-
   std::list<Ptr<L3RateTracer>> tracers;
-  shared_ptr<std::ostream> outputStream;
-  if (file != "-") {
-    shared_ptr<std::ofstream> os(new std::ofstream());
-    os->open(file.c_str(), std::ios_base::out | std::ios_base::trunc);
-
-    if (!os->is_open()) {
-      NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
-      return;
-    }
-
-    outputStream = os;
-  }
-  else {
-    outputStream = shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
   }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
 
-  Ptr<L3RateTracer> trace = Install(node, outputStream, averagingPeriod);
+  Ptr<L3RateTracer> trace = Install(node, outputStream, averagingPeriod, source, filter);
+  trace->m_writer = writer;
   tracers.push_back(trace);
 
-  if (tracers.size() > 0) {
+  if (tracers.size() > 0 && writer == nullptr) {
     // *m_l3RateTrace << "# "; // not necessary for R's read.table
     tracers.front()->PrintHeader(*outputStream);
     *outputStream << "\n";
@@ -155,12 +189,16 @@ L3RateTracer::Install(Ptr<Node> node, const std::string& file,
 
 Ptr<L3RateTracer>
 L3RateTracer::Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
-                      Time averagingPeriod /* = Seconds (0.5)*/)
+                      Time averagingPeriod /* = Seconds (0.5)*/,
+                      StatsSource source /* = PACKET_HOOKS*/,
+                      const TraceFilter& filter /* = TraceFilter()*/)
 {
   NS_LOG_DEBUG("Node: " << node->GetId());
 
   Ptr<L3RateTracer> trace = Create<L3RateTracer>(outputStream, node);
+  trace->m_filter = filter;
   trace->SetAveragingPeriod(averagingPeriod);
+  trace->SetStatsSource(source);
 
   return trace;
 }
@@ -168,6 +206,7 @@ L3RateTracer::Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
 L3RateTracer::L3RateTracer(shared_ptr<std::ostream> os, Ptr<Node> node)
   : L3Tracer(node)
   , m_os(os)
+  , m_source(PACKET_HOOKS)
 {
   SetAveragingPeriod(Seconds(1.0));
 }
@@ -175,6 +214,7 @@ L3RateTracer::L3RateTracer(shared_ptr<std::ostream> os, Ptr<Node> node)
 L3RateTracer::L3RateTracer(shared_ptr<std::ostream> os, const std::string& node)
   : L3Tracer(node)
   , m_os(os)
+  , m_source(PACKET_HOOKS)
 {
   SetAveragingPeriod(Seconds(1.0));
 }
@@ -192,10 +232,40 @@ L3RateTracer::SetAveragingPeriod(const Time& period)
   m_printEvent = Simulator::Schedule(m_period, &L3RateTracer::PeriodicPrinter, this);
 }
 
+void
+L3RateTracer::SetStatsSource(StatsSource source)
+{
+  if (source == m_source) {
+    return;
+  }
+
+  m_source = source;
+  if (m_source == FACE_COUNTERS) {
+    if (m_filter.HasNameFilter()) {
+      NS_LOG_WARN("Name prefixes of the filter are ignored when face counters are traced");
+    }
+    Disconnect();
+    m_nodePtr->GetObject<L3Protocol>()->enableByteCounters();
+    PullCounters(); // initial values of the counters
+    Reset();
+  }
+  else {
+    Connect();
+  }
+}
+
 void
 L3RateTracer::PeriodicPrinter()
 {
-  Print(*m_os);
+  if (m_source == FACE_COUNTERS) {
+    PullCounters();
+  }
+
+  // averages include every period, not only the sampled ones
+  UpdateAverages();
+  if (m_filter.IsSampled()) {
+    Print(*m_os);
+  }
   Reset();
 
   m_printEvent = Simulator::Schedule(m_period, &L3RateTracer::PeriodicPrinter, this);
@@ -239,21 +309,43 @@ const double alpha = 0.8;
 #define STATS(INDEX) std::get<INDEX>(stats.second)
 #define RATE(INDEX, fieldName) STATS(INDEX).fieldName / m_period.ToDouble(Time::S)
 
-#define PRINTER(printName, fieldName)                                                              \
+#define AVERAGE(fieldName)                                                                         \
   STATS(2).fieldName =                                                                             \
     /*new value*/ alpha * RATE(0, fieldName) + /*old value*/ (1 - alpha) * STATS(2).fieldName;     \
   STATS(3).fieldName = /*new value*/ alpha * RATE(1, fieldName) / 1024.0                           \
-                       + /*old value*/ (1 - alpha) * STATS(3).fieldName;                           \
-                                                                                                   \
-  os << time.ToDouble(Time::S) << "\t" << m_node << "\t";                                          \
-  if (stats.first != nullptr) {                                                                    \
-    os << stats.first->getId() << "\t" << stats.first->getLocalUri() << "\t";                      \
+                       + /*old value*/ (1 - alpha) * STATS(3).fieldName;
+
+#define PRINTER(printName, fieldName)                                                              \
+  if (m_writer != nullptr) {                                                                       \
+    WriteRecord(time, stats.first, printName, STATS(2).fieldName, STATS(3).fieldName,              \
+                STATS(0).fieldName, STATS(1).fieldName / 1024.0);                                  \
   }                                                                                                \
   else {                                                                                           \
-    os << "-1\tall\t";                                                                             \
-  }                                                                                                \
-  os << printName << "\t" << STATS(2).fieldName << "\t" << STATS(3).fieldName << "\t"              \
-     << STATS(0).fieldName << "\t" << STATS(1).fieldName / 1024.0 << "\n";
+    os << time.ToDouble(Time::S) << "\t" << m_node << "\t";                                        \
+    if (stats.first != nullptr) {                                                                  \
+      os << stats.first->getId() << "\t" << stats.first->getLocalUri() << "\t";                    \
+    }                                                                                              \
+    else {                                                                                         \
+      os << "-1\tall\t";                                                                           \
+    }                                                                                              \
+    os << printName << "\t" << STATS(2).fieldName << "\t" << STATS(3).fieldName << "\t"            \
+       << STATS(0).fieldName << "\t" << STATS(1).fieldName / 1024.0 << "\n";                       \
+  }
+
+void
+L3RateTracer::UpdateAverages()
+{
+  for (auto& stats : m_stats) {
+    AVERAGE(m_inInterests);
+    AVERAGE(m_outInterests);
+    AVERAGE(m_inData);
+    AVERAGE(m_outData);
+    AVERAGE(m_satisfiedInterests);
+    AVERAGE(m_timedOutInterests);
+    AVERAGE(m_outSatisfiedInterests);
+    AVERAGE(m_outTimedOutInterests);
+  }
+}
 
 void
 L3RateTracer::Print(std::ostream& os) const
@@ -261,7 +353,7 @@ L3RateTracer::Print(std::ostream& os) const
   Time time = Simulator::Now();
 
   for (auto& stats : m_stats) {
-    if (stats.first == nullptr)
+    if (stats.first == nullptr || !m_filter.IsFaceAccepted(*stats.first))
       continue;
 
     PRINTER("InInterests", m_inInterests);
@@ -270,6 +362,10 @@ L3RateTracer::Print(std::ostream& os) const
     PRINTER("InData", m_inData);
     PRINTER("OutData", m_outData);
 
+    if (m_source == FACE_COUNTERS) {
+      continue; // per-face satisfied and timed out Interests are not counted by NFD
+    }
+
     PRINTER("InSatisfiedInterests", m_satisfiedInterests);
     PRINTER("InTimedOutInterests", m_timedOutInterests);
 
@@ -287,49 +383,139 @@ L3RateTracer::Print(std::ostream& os) const
   }
 }
 
+void
+L3RateTracer::PullCounters()
+{
+  Ptr<L3Protocol> l3 = m_nodePtr->GetObject<L3Protocol>();
+
+  for (const shared_ptr<Face>& face : l3->getForwarder()->getFaceTable()) {
+    const nfd::FaceCounters& counters = face->getCounters();
+    auto& stats = m_stats[face];
+    auto& last = m_lastCounters[face];
+
+    pullCounter(std::get<0>(stats).m_inInterests, std::get<0>(last).m_inInterests,
+                counters.getNInInterests());
+    pullCounter(std::get<0>(stats).m_outInterests, std::get<0>(last).m_outInterests,
+                counters.getNOutInterests());
+    pullCounter(std::get<0>(stats).m_inData, std::get<0>(last).m_inData,
+                counters.getNInDatas());
+    pullCounter(std::get<0>(stats).m_outData, std::get<0>(last).m_outData,
+                counters.getNOutDatas());
+
+    L3Protocol::ByteCounters byteCounters = l3->getByteCounters(face->getId());
+    pullCounter(std::get<1>(stats).m_inInterests, std::get<1>(last).m_inInterests,
+                byteCounters.nInInterestBytes);
+    pullCounter(std::get<1>(stats).m_outInterests, std::get<1>(last).m_outInterests,
+                byteCounters.nOutInterestBytes);
+    pullCounter(std::get<1>(stats).m_inData, std::get<1>(last).m_inData,
+                byteCounters.nInDataBytes);
+    pullCounter(std::get<1>(stats).m_outData, std::get<1>(last).m_outData,
+                byteCounters.nOutDataBytes);
+  }
+
+  const nfd::ForwarderCounters& counters = l3->getForwarder()->getCounters();
+  auto& stats = m_stats[nullptr];
+  auto& last = m_lastCounters[nullptr];
+
+  pullCounter(std::get<0>(stats).m_satisfiedInterests, std::get<0>(last).m_satisfiedInterests,
+              counters.getNSatisfiedInterests());
+  pullCounter(std::get<0>(stats).m_timedOutInterests, std::get<0>(last).m_timedOutInterests,
+              counters.getNUnsatisfiedInterests());
+}
+
+void
+L3RateTracer::WriteRecord(const Time& time, const shared_ptr<const Face>& face, const char* type,
+                          double packets, double kilobytes, double packetsRaw,
+                          double kilobytesRaw) const
+{
+  Record record;
+  record.time = time.ToDouble(Time::S);
+  record.node = m_writer->intern(m_node);
+  if (face != nullptr) {
+    record.faceId = face->getId();
+    auto descr = m_faceDescrs.find(face);
+    if (descr == m_faceDescrs.end()) {
+      uint32_t id = m_writer->intern(face->getLocalUri().toString());
+      descr = m_faceDescrs.insert(std::make_pair(face, id)).first;
+    }
+    record.faceDescr = descr->second;
+  }
+  else {
+    record.faceId = -1;
+    record.faceDescr = m_writer->intern("all");
+  }
+  record.type = m_writer->intern(type);
+  record.packets = packets;
+  record.kilobytes = kilobytes;
+  record.packetsRaw = packetsRaw;
+  record.kilobytesRaw = kilobytesRaw;
+
+  m_writer->write(record);
+}
+
 void
 L3RateTracer::OutInterests(const Interest& interest, const Face& face)
 {
+  if (!m_filter.IsNameAccepted(interest.getName())) {
+    return;
+  }
+
   std::get<0>(m_stats[face.shared_from_this()]).m_outInterests++;
   if (interest.hasWire()) {
     std::get<1>(m_stats[face.shared_from_this()]).m_outInterests +=
-      interest.wireEncode().size();
+      interest.wireEncode().size() + getVirtualPayloadSize(interest);
   }
 }
 
 void
 L3RateTracer::InInterests(const Interest& interest, const Face& face)
 {
+  if (!m_filter.IsNameAccepted(interest.getName())) {
+    return;
+  }
+
   std::get<0>(m_stats[face.shared_from_this()]).m_inInterests++;
   if (interest.hasWire()) {
     std::get<1>(m_stats[face.shared_from_this()]).m_inInterests +=
-      interest.wireEncode().size();
+      interest.wireEncode().size() + getVirtualPayloadSize(interest);
   }
 }
 
 void
 L3RateTracer::OutData(const Data& data, const Face& face)
 {
+  if (!m_filter.IsNameAccepted(data.getName())) {
+    return;
+  }
+
   std::get<0>(m_stats[face.shared_from_this()]).m_outData++;
   if (data.hasWire()) {
     std::get<1>(m_stats[face.shared_from_this()]).m_outData +=
-      data.wireEncode().size();
+      data.wireEncode().size() + getVirtualPayloadSize(data);
   }
 }
 
 void
 L3RateTracer::InData(const Data& data, const Face& face)
 {
+  if (!m_filter.IsNameAccepted(data.getName())) {
+    return;
+  }
+
   std::get<0>(m_stats[face.shared_from_this()]).m_inData++;
   if (data.hasWire()) {
     std::get<1>(m_stats[face.shared_from_this()]).m_inData +=
-      data.wireEncode().size();
+      data.wireEncode().size() + getVirtualPayloadSize(data);
   }
 }
 
 void
 L3RateTracer::SatisfiedInterests(const nfd::pit::Entry& entry, const Face&, const Data&)
 {
+  if (!m_filter.IsNameAccepted(entry.getName())) {
+    return;
+  }
+
   std::get<0>(m_stats[nullptr]).m_satisfiedInterests++;
   // no "size" stats
 
@@ -345,6 +531,10 @@ L3RateTracer::SatisfiedInterests(const nfd::pit::Entry& entry, const Face&, cons
 void
 L3RateTracer::TimedOutInterests(const nfd::pit::Entry& entry)
 {
+  if (!m_filter.IsNameAccepted(entry.getName())) {
+    return;
+  }
+
   std::get<0>(m_stats[nullptr]).m_timedOutInterests++;
   // no "size" stats
 
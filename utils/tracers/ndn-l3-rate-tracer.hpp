@@ -23,6 +23,8 @@
 #include "ns3/ndnSIM/model/ndn-common.hpp"
 
 #include "ndn-l3-tracer.hpp"
+#include "ndn-binary-trace-writer.hpp"
+#include "ndn-trace-filter.hpp"
 
 #include "ns3/nstime.h"
 #include "ns3/event-id.h"
@@ -41,6 +43,25 @@ namespace ndn {
  */
 class L3RateTracer : public L3Tracer {
 public:
+  /**
+   * @brief Source of the traced statistics
+   */
+  enum StatsSource {
+    /**
+     * @brief Per-packet trace sources of L3Protocol
+     */
+    PACKET_HOOKS,
+
+    /**
+     * @brief Counters of NFD faces and forwarder, read once per averaging period
+     *
+     * The tracer does no per-packet processing; byte counters of the faces are enabled with
+     * L3Protocol::enableByteCounters when the tracer is installed.  Per-face statistics of satisfied and timed out Interests
+     * are not available in this mode.
+     */
+    FACE_COUNTERS
+  };
+
   /**
    * @brief Helper method to install tracers on all simulation nodes
    *
@@ -48,9 +69,15 @@ public:
    * @param averagingPeriod Defines averaging period for the rate calculation,
    *        as well as how often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param source Source of the traced statistics (default, per-packet trace sources)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything).
+   *        Name prefixes can be used only with per-packet trace sources.
    */
   static void
-  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5));
+  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5),
+             TraceFormat format = TraceFormat::TEXT, StatsSource source = PACKET_HOOKS,
+             const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on the selected simulation nodes
@@ -59,9 +86,15 @@ public:
    * @param file File to which traces will be written.  If filename is -, then std::out is used
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param source Source of the traced statistics (default, per-packet trace sources)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything).
+   *        Name prefixes can be used only with per-packet trace sources.
    */
   static void
-  Install(const NodeContainer& nodes, const std::string& file, Time averagingPeriod = Seconds(0.5));
+  Install(const NodeContainer& nodes, const std::string& file, Time averagingPeriod = Seconds(0.5),
+          TraceFormat format = TraceFormat::TEXT, StatsSource source = PACKET_HOOKS,
+          const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Helper method to install tracers on a specific simulation node
@@ -70,9 +103,15 @@ public:
    * @param file File to which traces will be written.  If filename is -, then std::out is used
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param source Source of the traced statistics (default, per-packet trace sources)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything).
+   *        Name prefixes can be used only with per-packet trace sources.
    */
   static void
-  Install(Ptr<Node> node, const std::string& file, Time averagingPeriod = Seconds(0.5));
+  Install(Ptr<Node> node, const std::string& file, Time averagingPeriod = Seconds(0.5),
+          TraceFormat format = TraceFormat::TEXT, StatsSource source = PACKET_HOOKS,
+          const TraceFilter& filter = TraceFilter());
 
   /**
    * @brief Explicit request to remove all statically created tracers
@@ -109,6 +148,9 @@ public:
    * @param outputStream Smart pointer to a stream
    * @param averagingPeriod How often data will be written into the trace file (default, every half
    *second)
+   * @param source Source of the traced statistics (default, per-packet trace sources)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything).
+   *        Name prefixes can be used only with per-packet trace sources.
    *
    * @returns a tuple of reference to output stream and list of tracers. !!! Attention !!! This
    *tuple needs to be preserved
@@ -116,7 +158,8 @@ public:
    */
   static Ptr<L3RateTracer>
   Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
-          Time averagingPeriod = Seconds(0.5));
+          Time averagingPeriod = Seconds(0.5), StatsSource source = PACKET_HOOKS,
+          const TraceFilter& filter = TraceFilter());
 
   // from L3Tracer
   virtual void
@@ -155,12 +198,38 @@ private:
   void
   Reset();
 
+  /**
+   * @brief Fold statistics of the last averaging period into the moving averages
+   */
+  void
+  UpdateAverages();
+
+  void
+  SetStatsSource(StatsSource source);
+
+  /**
+   * @brief Update statistics of the last averaging period from NFD counters
+   */
+  void
+  PullCounters();
+
+  void
+  WriteRecord(const Time& time, const shared_ptr<const Face>& face, const char* type,
+              double packets, double kilobytes, double packetsRaw, double kilobytesRaw) const;
+
 private:
   shared_ptr<std::ostream> m_os;
+  shared_ptr<BinaryTraceWriter> m_writer; ///< @brief if set, records are written in binary format
+  TraceFilter m_filter;
   Time m_period;
   EventId m_printEvent;
 
   mutable std::map<shared_ptr<const Face>, std::tuple<Stats, Stats, Stats, Stats>> m_stats;
+  mutable std::map<shared_ptr<const Face>, uint32_t> m_faceDescrs; ///< @brief interned FaceDescr
+
+  StatsSource m_source;
+  /// @brief values of packet and byte counters at the end of the last averaging period
+  std::map<shared_ptr<const Face>, std::tuple<Stats, Stats>> m_lastCounters;
 };
 
 } // namespace ndn
@@ -70,5 +70,22 @@ L3Tracer::Connect()
                                  MakeCallback(&L3Tracer::TimedOutInterests, this));
 }
 
+void
+L3Tracer::Disconnect()
+{
+  Ptr<L3Protocol> l3 = m_nodePtr->GetObject<L3Protocol>();
+
+  l3->TraceDisconnectWithoutContext("OutInterests", MakeCallback(&L3Tracer::OutInterests, this));
+  l3->TraceDisconnectWithoutContext("InInterests", MakeCallback(&L3Tracer::InInterests, this));
+  l3->TraceDisconnectWithoutContext("OutData", MakeCallback(&L3Tracer::OutData, this));
+  l3->TraceDisconnectWithoutContext("InData", MakeCallback(&L3Tracer::InData, this));
+
+  l3->TraceDisconnectWithoutContext("SatisfiedInterests",
+                                    MakeCallback(&L3Tracer::SatisfiedInterests, this));
+
+  l3->TraceDisconnectWithoutContext("TimedOutInterests",
+                                    MakeCallback(&L3Tracer::TimedOutInterests, this));
+}
+
 } // namespace ndn
 } // namespace ns3
@@ -82,6 +82,12 @@ protected:
   void
   Connect();
 
+  /**
+   * @brief Disconnect from the trace sources connected in Connect()
+   */
+  void
+  Disconnect();
+
   virtual void
   OutInterests(const Interest&, const Face&) = 0;
 
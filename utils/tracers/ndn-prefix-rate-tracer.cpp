@@ -0,0 +1,394 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-prefix-rate-tracer.hpp"
+#include "ns3/node.h"
+#include "ns3/names.h"
+#include "ns3/callback.h"
+
+#include "model/ndn-l3-protocol.hpp"
+#include "utils/ndn-virtual-payload-tag.hpp"
+#include "ns3/simulator.h"
+#include "ns3/node-list.h"
+#include "ns3/log.h"
+
+#include <boost/lexical_cast.hpp>
+
+#include <cstddef>
+
+NS_LOG_COMPONENT_DEFINE("ndn.PrefixRateTracer");
+
+namespace ns3 {
+namespace ndn {
+
+static std::list<std::tuple<shared_ptr<std::ostream>, std::list<Ptr<PrefixRateTracer>>>>
+  g_tracers;
+
+namespace {
+
+struct Record
+{
+  double time;
+  uint32_t node;
+  uint32_t prefix;
+  uint32_t type;
+  uint32_t padding;
+  double packets;
+  double kilobytes;
+  double packetsRaw;
+  double kilobytesRaw;
+};
+
+shared_ptr<BinaryTraceWriter>
+makeBinaryWriter(shared_ptr<std::ostream> os, TraceFormat format)
+{
+  if (format != TraceFormat::BINARY) {
+    return nullptr;
+  }
+
+  std::vector<BinaryTraceWriter::Column> columns{
+    {"Time", "f8", offsetof(Record, time)},
+    {"Node", "str", offsetof(Record, node)},
+    {"Prefix", "str", offsetof(Record, prefix)},
+    {"Type", "str", offsetof(Record, type)},
+    {"Packets", "f8", offsetof(Record, packets)},
+    {"Kilobytes", "f8", offsetof(Record, kilobytes)},
+    {"PacketRaw", "f8", offsetof(Record, packetsRaw)},
+    {"KilobytesRaw", "f8", offsetof(Record, kilobytesRaw)}};
+
+  return make_shared<BinaryTraceWriter>(os, sizeof(Record), columns);
+}
+
+} // namespace
+
+void
+PrefixRateTracer::Destroy()
+{
+  g_tracers.clear();
+}
+
+void
+PrefixRateTracer::InstallAll(const std::string& file, Time averagingPeriod /* = Seconds (0.5)*/,
+                             size_t prefixDepth /* = 1*/,
+                             TraceFormat format /* = TraceFormat::TEXT*/,
+                             const TraceFilter& filter /* = TraceFilter()*/)
+{
+  std::list<Ptr<PrefixRateTracer>> tracers;
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
+  }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
+
+  for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<PrefixRateTracer> trace =
+      Install(*node, outputStream, averagingPeriod, prefixDepth, filter);
+    trace->m_writer = writer;
+    tracers.push_back(trace);
+  }
+
+  if (tracers.size() > 0 && writer == nullptr) {
+    tracers.front()->PrintHeader(*outputStream);
+    *outputStream << "\n";
+  }
+
+  g_tracers.push_back(std::make_tuple(outputStream, tracers));
+}
+
+void
+PrefixRateTracer::Install(const NodeContainer& nodes, const std::string& file,
+                          Time averagingPeriod /* = Seconds (0.5)*/, size_t prefixDepth /* = 1*/,
+                          TraceFormat format /* = TraceFormat::TEXT*/,
+                          const TraceFilter& filter /* = TraceFilter()*/)
+{
+  std::list<Ptr<PrefixRateTracer>> tracers;
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
+  }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
+
+  for (NodeContainer::Iterator node = nodes.Begin(); node != nodes.End(); node++) {
+    if (!filter.IsNodeAccepted(*node)) {
+      continue;
+    }
+
+    Ptr<PrefixRateTracer> trace =
+      Install(*node, outputStream, averagingPeriod, prefixDepth, filter);
+    trace->m_writer = writer;
+    tracers.push_back(trace);
+  }
+
+  if (tracers.size() > 0 && writer == nullptr) {
+    tracers.front()->PrintHeader(*outputStream);
+    *outputStream << "\n";
+  }
+
+  g_tracers.push_back(std::make_tuple(outputStream, tracers));
+}
+
+void
+PrefixRateTracer::Install(Ptr<Node> node, const std::string& file,
+                          Time averagingPeriod /* = Seconds (0.5)*/, size_t prefixDepth /* = 1*/,
+                          TraceFormat format /* = TraceFormat::TEXT*/,
+                          const TraceFilter& filter /* = TraceFilter()*/)
+{
+  std::list<Ptr<PrefixRateTracer>> tracers;
+  shared_ptr<std::ostream> outputStream = OpenTraceStream(file, format);
+  if (outputStream == nullptr) {
+    return;
+  }
+  shared_ptr<BinaryTraceWriter> writer = makeBinaryWriter(outputStream, format);
+
+  Ptr<PrefixRateTracer> trace = Install(node, outputStream, averagingPeriod, prefixDepth, filter);
+  trace->m_writer = writer;
+  tracers.push_back(trace);
+
+  if (tracers.size() > 0 && writer == nullptr) {
+    tracers.front()->PrintHeader(*outputStream);
+    *outputStream << "\n";
+  }
+
+  g_tracers.push_back(std::make_tuple(outputStream, tracers));
+}
+
+Ptr<PrefixRateTracer>
+PrefixRateTracer::Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
+                          Time averagingPeriod /* = Seconds (0.5)*/, size_t prefixDepth /* = 1*/,
+                          const TraceFilter& filter /* = TraceFilter()*/)
+{
+  NS_LOG_DEBUG("Node: " << node->GetId());
+
+  Ptr<PrefixRateTracer> trace = Create<PrefixRateTracer>(outputStream, node, prefixDepth);
+  trace->m_filter = filter;
+  trace->SetAveragingPeriod(averagingPeriod);
+
+  return trace;
+}
+
+//////////////////////////////////////////////////////////////////////////////
+//////////////////////////////////////////////////////////////////////////////
+//////////////////////////////////////////////////////////////////////////////
+
+PrefixRateTracer::PrefixStats::PrefixStats(const Name& prefix)
+  : m_prefix(prefix.toUri())
+{
+  std::get<0>(m_stats).Reset();
+  std::get<1>(m_stats).Reset();
+  std::get<2>(m_stats).Reset();
+  std::get<3>(m_stats).Reset();
+}
+
+PrefixRateTracer::PrefixRateTracer(shared_ptr<std::ostream> os, Ptr<Node> node,
+                                   size_t prefixDepth /* = 1*/)
+  : m_nodePtr(node)
+  , m_prefixDepth(prefixDepth)
+  , m_os(os)
+{
+  m_node = boost::lexical_cast<std::string>(m_nodePtr->GetId());
+
+  Connect();
+
+  std::string name = Names::FindName(node);
+  if (!name.empty()) {
+    m_node = name;
+  }
+}
+
+PrefixRateTracer::~PrefixRateTracer()
+{
+  m_printEvent.Cancel();
+}
+
+void
+PrefixRateTracer::Connect()
+{
+  Ptr<L3Protocol> l3 = m_nodePtr->GetObject<L3Protocol>();
+
+  l3->TraceConnectWithoutContext("InInterests",
+                                 MakeCallback(&PrefixRateTracer::InInterests, this));
+  l3->TraceConnectWithoutContext("OutData", MakeCallback(&PrefixRateTracer::OutData, this));
+}
+
+void
+PrefixRateTracer::SetAveragingPeriod(const Time& period)
+{
+  m_period = period;
+  m_printEvent.Cancel();
+  m_printEvent = Simulator::Schedule(m_period, &PrefixRateTracer::PeriodicPrinter, this);
+}
+
+void
+PrefixRateTracer::PeriodicPrinter()
+{
+  // averages include every period, not only the sampled ones
+  UpdateAverages();
+  if (m_filter.IsSampled()) {
+    Print(*m_os);
+  }
+  Reset();
+
+  m_printEvent = Simulator::Schedule(m_period, &PrefixRateTracer::PeriodicPrinter, this);
+}
+
+void
+PrefixRateTracer::PrintHeader(std::ostream& os) const
+{
+  os << "Time"
+     << "\t"
+
+     << "Node"
+     << "\t"
+     << "Prefix"
+     << "\t"
+
+     << "Type"
+     << "\t"
+     << "Packets"
+     << "\t"
+     << "Kilobytes"
+     << "\t"
+     << "PacketRaw"
+     << "\t"
+     << "KilobytesRaw";
+}
+
+void
+PrefixRateTracer::Reset()
+{
+  for (auto& stats : m_prefixList) {
+    std::get<0>(stats->m_stats).Reset();
+    std::get<1>(stats->m_stats).Reset();
+  }
+}
+
+const double alpha = 0.8;
+
+#define STATS(INDEX) std::get<INDEX>(stats->m_stats)
+#define RATE(INDEX, fieldName) STATS(INDEX).fieldName / m_period.ToDouble(Time::S)
+
+#define AVERAGE(fieldName)                                                                         \
+  STATS(2).fieldName =                                                                             \
+    /*new value*/ alpha * RATE(0, fieldName) + /*old value*/ (1 - alpha) * STATS(2).fieldName;     \
+  STATS(3).fieldName = /*new value*/ alpha * RATE(1, fieldName) / 1024.0                           \
+                       + /*old value*/ (1 - alpha) * STATS(3).fieldName;
+
+#define PRINTER(printName, fieldName)                                                              \
+  if (STATS(0).fieldName == 0 && STATS(2).fieldName == 0) {                                        \
+    /* no traffic of this type for the prefix so far */                                            \
+  }                                                                                                \
+  else if (m_writer != nullptr) {                                                                  \
+    WriteRecord(time, stats->m_prefix, printName, STATS(2).fieldName, STATS(3).fieldName,          \
+                STATS(0).fieldName, STATS(1).fieldName / 1024.0);                                  \
+  }                                                                                                \
+  else {                                                                                           \
+    os << time.ToDouble(Time::S) << "\t" << m_node << "\t" << stats->m_prefix << "\t"              \
+       << printName << "\t" << STATS(2).fieldName << "\t" << STATS(3).fieldName << "\t"            \
+       << STATS(0).fieldName << "\t" << STATS(1).fieldName / 1024.0 << "\n";                       \
+  }
+
+void
+PrefixRateTracer::UpdateAverages()
+{
+  for (auto& stats : m_prefixList) {
+    AVERAGE(m_inInterests);
+    AVERAGE(m_outData);
+  }
+}
+
+void
+PrefixRateTracer::Print(std::ostream& os) const
+{
+  Time time = Simulator::Now();
+
+  for (auto& stats : m_prefixList) {
+    PRINTER("InInterests", m_inInterests);
+    PRINTER("OutData", m_outData);
+  }
+}
+
+void
+PrefixRateTracer::WriteRecord(const Time& time, const std::string& prefix, const char* type,
+                              double packets, double kilobytes, double packetsRaw,
+                              double kilobytesRaw) const
+{
+  Record record = Record();
+  record.time = time.ToDouble(Time::S);
+  record.node = m_writer->intern(m_node);
+  record.prefix = m_writer->intern(prefix);
+  record.type = m_writer->intern(type);
+  record.packets = packets;
+  record.kilobytes = kilobytes;
+  record.packetsRaw = packetsRaw;
+  record.kilobytesRaw = kilobytesRaw;
+
+  m_writer->write(record);
+}
+
+PrefixRateTracer::PrefixStats&
+PrefixRateTracer::GetStats(const Name& name)
+{
+  // lookup walks at most m_prefixDepth levels of the trie
+  Name prefix = name.size() > m_prefixDepth ? name.getPrefix(m_prefixDepth) : name;
+
+  PrefixTrie::iterator item = m_prefixes.find_exact(prefix);
+  if (item == m_prefixes.end()) {
+    Ptr<PrefixStats> stats = Create<PrefixStats>(prefix);
+    item = m_prefixes.insert(prefix, stats).first;
+    m_prefixList.push_back(stats);
+  }
+  return *item->payload();
+}
+
+void
+PrefixRateTracer::InInterests(const Interest& interest, const Face& face)
+{
+  if (!m_filter.IsFaceAccepted(face) || !m_filter.IsNameAccepted(interest.getName())) {
+    return;
+  }
+
+  PrefixStats& stats = GetStats(interest.getName());
+  std::get<0>(stats.m_stats).m_inInterests++;
+  if (interest.hasWire()) {
+    std::get<1>(stats.m_stats).m_inInterests +=
+      interest.wireEncode().size() + getVirtualPayloadSize(interest);
+  }
+}
+
+void
+PrefixRateTracer::OutData(const Data& data, const Face& face)
+{
+  if (!m_filter.IsFaceAccepted(face) || !m_filter.IsNameAccepted(data.getName())) {
+    return;
+  }
+
+  PrefixStats& stats = GetStats(data.getName());
+  std::get<0>(stats.m_stats).m_outData++;
+  if (data.hasWire()) {
+    std::get<1>(stats.m_stats).m_outData += data.wireEncode().size() + getVirtualPayloadSize(data);
+  }
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,252 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_PREFIX_RATE_TRACER_H
+#define NDN_PREFIX_RATE_TRACER_H
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/model/ndn-face.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-binary-trace-writer.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-filter.hpp"
+#include "ns3/ndnSIM/utils/trie/trie-with-policy.hpp"
+#include "ns3/ndnSIM/utils/trie/empty-policy.hpp"
+
+#include "ns3/ptr.h"
+#include "ns3/simple-ref-count.h"
+#include <ns3/nstime.h>
+#include <ns3/event-id.h>
+#include <ns3/node-container.h>
+
+#include <list>
+#include <tuple>
+#include <vector>
+
+namespace ns3 {
+
+class Node;
+
+namespace ndn {
+
+/**
+ * @ingroup ndn-tracers
+ * @brief NDN network-layer rate tracer, aggregating incoming Interests and outgoing Data per
+ *        name prefix
+ *
+ * Each Interest received and Data sent by the node is counted towards the first
+ * @p prefixDepth components of its name.  The counters are kept in a name prefix trie, so the
+ * per-packet cost is proportional to the prefix depth and does not depend on the number of
+ * traced prefixes.
+ */
+class PrefixRateTracer : public SimpleRefCount<PrefixRateTracer> {
+public:
+  /**
+   * @brief Helper method to install tracers on all simulation nodes
+   *
+   * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param averagingPeriod How often data will be written into the trace file (default, every half
+   *        second)
+   * @param prefixDepth Number of name components by which packets are aggregated
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything)
+   */
+  static void
+  InstallAll(const std::string& file, Time averagingPeriod = Seconds(0.5),
+             size_t prefixDepth = 1, TraceFormat format = TraceFormat::TEXT,
+             const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install tracers on the selected simulation nodes
+   *
+   * @param nodes Nodes on which to install tracer
+   * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param averagingPeriod How often data will be written into the trace file (default, every half
+   *        second)
+   * @param prefixDepth Number of name components by which packets are aggregated
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything)
+   */
+  static void
+  Install(const NodeContainer& nodes, const std::string& file, Time averagingPeriod = Seconds(0.5),
+          size_t prefixDepth = 1, TraceFormat format = TraceFormat::TEXT,
+          const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install tracers on a specific simulation node
+   *
+   * @param node Node on which to install tracer
+   * @param file File to which traces will be written.  If filename is -, then std::out is used
+   * @param averagingPeriod How often data will be written into the trace file (default, every half
+   *        second)
+   * @param prefixDepth Number of name components by which packets are aggregated
+   * @param format Format of the trace file (default, tab-separated text)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything)
+   */
+  static void
+  Install(Ptr<Node> node, const std::string& file, Time averagingPeriod = Seconds(0.5),
+          size_t prefixDepth = 1, TraceFormat format = TraceFormat::TEXT,
+          const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Helper method to install tracers on a specific simulation node
+   *
+   * @param node Node on which to install tracer
+   * @param outputStream Smart pointer to a stream
+   * @param averagingPeriod How often data will be written into the trace file (default, every half
+   *        second)
+   * @param prefixDepth Number of name components by which packets are aggregated
+   * @param filter Selection of traced faces, names, and time (default, everything)
+   *
+   * @returns a tuple of reference to output stream and list of tracers.
+   *          !!! Attention !!! This tuple needs to be preserved for the lifetime of simulation,
+   *          otherwise SEGFAULTs are inevitable
+   */
+  static Ptr<PrefixRateTracer>
+  Install(Ptr<Node> node, shared_ptr<std::ostream> outputStream,
+          Time averagingPeriod = Seconds(0.5), size_t prefixDepth = 1,
+          const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Explicit request to remove all statically created tracers
+   *
+   * This method can be helpful if simulation scenario contains several independent run,
+   * or if it is desired to do a postprocessing of the resulting data
+   */
+  static void
+  Destroy();
+
+  /**
+   * @brief Trace constructor that attaches to the node using node pointer
+   * @param os          reference to the output stream
+   * @param node        pointer to the node
+   * @param prefixDepth number of name components by which packets are aggregated
+   */
+  PrefixRateTracer(shared_ptr<std::ostream> os, Ptr<Node> node, size_t prefixDepth = 1);
+
+  /**
+   * @brief Destructor
+   */
+  ~PrefixRateTracer();
+
+  /**
+   * @brief Print head of the trace (e.g., for post-processing)
+   *
+   * @param os reference to output stream
+   */
+  void
+  PrintHeader(std::ostream& os) const;
+
+  /**
+   * @brief Print current trace data
+   *
+   * @param os reference to output stream
+   */
+  void
+  Print(std::ostream& os) const;
+
+private:
+  void
+  Connect();
+
+  void
+  InInterests(const Interest& interest, const Face& face);
+
+  void
+  OutData(const Data& data, const Face& face);
+
+  void
+  SetAveragingPeriod(const Time& period);
+
+  void
+  PeriodicPrinter();
+
+  void
+  Reset();
+
+  /**
+   * @brief Fold statistics of the last averaging period into the moving averages
+   */
+  void
+  UpdateAverages();
+
+  struct Stats {
+    inline void
+    Reset()
+    {
+      m_inInterests = 0;
+      m_outData = 0;
+    }
+
+    double m_inInterests;
+    double m_outData;
+  };
+
+  /**
+   * @brief Statistics of a traced prefix: packets and bytes within the current period, and
+   *        their exponentially weighted moving averages
+   */
+  struct PrefixStats : public SimpleRefCount<PrefixStats> {
+    explicit PrefixStats(const Name& prefix);
+
+    std::string m_prefix;
+    std::tuple<Stats, Stats, Stats, Stats> m_stats;
+  };
+
+  PrefixStats&
+  GetStats(const Name& name);
+
+  void
+  WriteRecord(const Time& time, const std::string& prefix, const char* type, double packets,
+              double kilobytes, double packetsRaw, double kilobytesRaw) const;
+
+private:
+  std::string m_node;
+  Ptr<Node> m_nodePtr;
+  size_t m_prefixDepth;
+
+  shared_ptr<std::ostream> m_os;
+  shared_ptr<BinaryTraceWriter> m_writer; ///< @brief if set, records are written in binary format
+  TraceFilter m_filter;
+
+  Time m_period;
+  EventId m_printEvent;
+
+  typedef ndnSIM::trie_with_policy<Name, ndnSIM::smart_pointer_payload_traits<PrefixStats>,
+                                   ndnSIM::empty_policy_traits> PrefixTrie;
+  PrefixTrie m_prefixes;
+  std::vector<Ptr<PrefixStats>> m_prefixList; ///< @brief traced prefixes in order of appearance
+};
+
+/**
+ * @brief Helper to dump the trace to an output stream
+ */
+inline std::ostream&
+operator<<(std::ostream& os, const PrefixRateTracer& tracer)
+{
+  os << "# ";
+  tracer.PrintHeader(os);
+  os << "\n";
+  tracer.Print(os);
+  return os;
+}
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_PREFIX_RATE_TRACER_H
@@ -0,0 +1,362 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-trace-batcher.hpp"
+
+#include "ns3/node.h"
+#include "ns3/node-list.h"
+#include "ns3/application.h"
+#include "ns3/callback.h"
+#include "ns3/simulator.h"
+#include "ns3/log.h"
+
+#include "apps/ndn-app.hpp"
+#include "model/ndn-l3-protocol.hpp"
+#include "daemon/table/pit-entry.hpp"
+
+NS_LOG_COMPONENT_DEFINE("ndn.TraceBatcher");
+
+namespace ns3 {
+namespace ndn {
+
+// the records are exported to Python as packed structures
+static_assert(sizeof(TraceBatcher::Record) == 56, "unexpected Record layout");
+
+const uint32_t TraceBatcher::NO_NAME;
+
+/**
+ * @brief Connection of the batcher to trace sources of one node
+ */
+class TraceBatcher::NodeSink {
+public:
+  NodeSink(TraceBatcher& batcher, Ptr<Node> node)
+    : m_batcher(batcher)
+    , m_nodeId(node->GetId())
+    , m_l3(node->GetObject<L3Protocol>())
+  {
+    if ((m_batcher.m_sources & L3_SOURCES) != 0 && m_l3 != 0) {
+      m_l3->TraceConnectWithoutContext("InInterests", MakeCallback(&NodeSink::InInterests, this));
+      m_l3->TraceConnectWithoutContext("OutData", MakeCallback(&NodeSink::OutData, this));
+      m_l3->TraceConnectWithoutContext("SatisfiedInterests",
+                                       MakeCallback(&NodeSink::SatisfiedInterests, this));
+      m_l3->TraceConnectWithoutContext("TimedOutInterests",
+                                       MakeCallback(&NodeSink::TimedOutInterests, this));
+    }
+
+    if ((m_batcher.m_sources & APP_SOURCES) != 0) {
+      for (uint32_t i = 0; i < node->GetNApplications(); i++) {
+        Ptr<Application> app = node->GetApplication(i);
+        if (app->TraceConnectWithoutContext("FirstInterestDataDelay",
+                                            MakeCallback(&NodeSink::FirstInterestDataDelay,
+                                                         this))) {
+          m_apps.push_back(app);
+        }
+      }
+    }
+  }
+
+  ~NodeSink()
+  {
+    if ((m_batcher.m_sources & L3_SOURCES) != 0 && m_l3 != 0) {
+      m_l3->TraceDisconnectWithoutContext("InInterests",
+                                          MakeCallback(&NodeSink::InInterests, this));
+      m_l3->TraceDisconnectWithoutContext("OutData", MakeCallback(&NodeSink::OutData, this));
+      m_l3->TraceDisconnectWithoutContext("SatisfiedInterests",
+                                          MakeCallback(&NodeSink::SatisfiedInterests, this));
+      m_l3->TraceDisconnectWithoutContext("TimedOutInterests",
+                                          MakeCallback(&NodeSink::TimedOutInterests, this));
+    }
+
+    for (Ptr<Application> app : m_apps) {
+      app->TraceDisconnectWithoutContext("FirstInterestDataDelay",
+                                         MakeCallback(&NodeSink::FirstInterestDataDelay, this));
+    }
+  }
+
+private:
+  void
+  InInterests(const Interest& interest, const Face& face)
+  {
+    if (m_batcher.IsAccepted(IN_INTERESTS, &face, &interest.getName())) {
+      m_batcher.Add(m_nodeId, IN_INTERESTS, face.getId(), &interest.getName());
+    }
+  }
+
+  void
+  OutData(const Data& data, const Face& face)
+  {
+    if (m_batcher.IsAccepted(OUT_DATA, &face, &data.getName())) {
+      m_batcher.Add(m_nodeId, OUT_DATA, face.getId(), &data.getName());
+    }
+  }
+
+  void
+  SatisfiedInterests(const nfd::pit::Entry& entry, const Face& inFace, const Data&)
+  {
+    if (m_batcher.IsAccepted(SATISFIED_INTERESTS, &inFace, &entry.getName())) {
+      m_batcher.Add(m_nodeId, SATISFIED_INTERESTS, inFace.getId(), &entry.getName());
+    }
+  }
+
+  void
+  TimedOutInterests(const nfd::pit::Entry& entry)
+  {
+    if (m_batcher.IsAccepted(TIMED_OUT_INTERESTS, nullptr, &entry.getName())) {
+      m_batcher.Add(m_nodeId, TIMED_OUT_INTERESTS, -1, &entry.getName());
+    }
+  }
+
+  void
+  FirstInterestDataDelay(Ptr<App> app, uint32_t seqNo, Time delay, uint32_t retxCount,
+                         int32_t hopCount)
+  {
+    if (m_batcher.IsAccepted(FIRST_INTEREST_DATA_DELAY, nullptr, nullptr)) {
+      m_batcher.AddDelay(m_nodeId, app, seqNo, delay, retxCount, hopCount);
+    }
+  }
+
+private:
+  TraceBatcher& m_batcher;
+  uint32_t m_nodeId;
+  Ptr<L3Protocol> m_l3;
+  std::vector<Ptr<Application>> m_apps;
+};
+
+TraceBatcher::TraceBatcher(size_t batchSize/* = 4096*/, Time interval/* = Time(0)*/,
+                           uint32_t sources/* = ALL_SOURCES*/,
+                           const TraceFilter& filter/* = TraceFilter()*/)
+  : m_batchSize(std::max<size_t>(batchSize, 1))
+  , m_interval(interval)
+  , m_sources(sources)
+  , m_filter(filter)
+  , m_nameDepth(std::numeric_limits<size_t>::max())
+  , m_shouldPause(false)
+  , m_isPaused(false)
+{
+  for (NodeList::Iterator node = NodeList::Begin(); node != NodeList::End(); node++) {
+    Connect(*node);
+  }
+
+  if (m_interval.IsStrictlyPositive()) {
+    m_flushEvent = Simulator::Schedule(m_interval, &TraceBatcher::PeriodicFlush, this);
+  }
+}
+
+TraceBatcher::TraceBatcher(const NodeContainer& nodes, size_t batchSize/* = 4096*/,
+                           Time interval/* = Time(0)*/, uint32_t sources/* = ALL_SOURCES*/,
+                           const TraceFilter& filter/* = TraceFilter()*/)
+  : m_batchSize(std::max<size_t>(batchSize, 1))
+  , m_interval(interval)
+  , m_sources(sources)
+  , m_filter(filter)
+  , m_nameDepth(std::numeric_limits<size_t>::max())
+  , m_shouldPause(false)
+  , m_isPaused(false)
+{
+  for (NodeContainer::Iterator node = nodes.Begin(); node != nodes.End(); node++) {
+    Connect(*node);
+  }
+
+  if (m_interval.IsStrictlyPositive()) {
+    m_flushEvent = Simulator::Schedule(m_interval, &TraceBatcher::PeriodicFlush, this);
+  }
+}
+
+TraceBatcher::~TraceBatcher()
+{
+  m_flushEvent.Cancel();
+}
+
+void
+TraceBatcher::Connect(Ptr<Node> node)
+{
+  if (!m_filter.IsNodeAccepted(node)) {
+    return;
+  }
+
+  m_sinks.push_back(std::unique_ptr<NodeSink>(new NodeSink(*this, node)));
+}
+
+void
+TraceBatcher::SetNameDepth(size_t depth)
+{
+  m_nameDepth = depth;
+}
+
+void
+TraceBatcher::SetBatchCallback(const BatchCallback& callback)
+{
+  m_callback = callback;
+}
+
+void
+TraceBatcher::SetPauseOnBatch(bool shouldPause)
+{
+  m_shouldPause = shouldPause;
+}
+
+bool
+TraceBatcher::IsAccepted(EventType type, const Face* face, const Name* name)
+{
+  if ((m_sources & (1 << type)) == 0) {
+    return false;
+  }
+  if (face != nullptr && !m_filter.IsFaceAccepted(*face)) {
+    return false;
+  }
+  if (m_filter.HasNameFilter() && (name == nullptr || !m_filter.IsNameAccepted(*name))) {
+    return false;
+  }
+  return m_filter.IsSampled();
+}
+
+void
+TraceBatcher::Add(uint32_t node, EventType type, int64_t faceId, const Name* name)
+{
+  Record record = Record();
+  record.time = Simulator::Now().ToDouble(Time::S);
+  record.node = node;
+  record.type = type;
+  record.faceId = faceId;
+  record.name = name != nullptr ? Intern(*name) : NO_NAME;
+  record.hopCount = -1;
+
+  m_current.push_back(record);
+  if (m_current.size() >= m_batchSize) {
+    Complete();
+  }
+}
+
+void
+TraceBatcher::AddDelay(uint32_t node, Ptr<App> app, uint32_t seqNo, Time delay,
+                       uint32_t retxCount, int32_t hopCount)
+{
+  Record record = Record();
+  record.time = Simulator::Now().ToDouble(Time::S);
+  record.node = node;
+  record.type = FIRST_INTEREST_DATA_DELAY;
+  record.faceId = -1;
+  record.name = NO_NAME;
+  record.appId = app->GetId();
+  record.seqNo = seqNo;
+  record.retxCount = retxCount;
+  record.delay = delay.ToDouble(Time::S);
+  record.hopCount = hopCount;
+
+  m_current.push_back(record);
+  if (m_current.size() >= m_batchSize) {
+    Complete();
+  }
+}
+
+uint32_t
+TraceBatcher::Intern(const Name& name)
+{
+  std::string uri = name.size() > m_nameDepth ? name.getPrefix(m_nameDepth).toUri() : name.toUri();
+
+  auto item = m_nameIds.find(uri);
+  if (item != m_nameIds.end()) {
+    return item->second;
+  }
+
+  uint32_t id = m_names.size();
+  m_nameData.append(uri);
+  m_nameData.push_back('\0');
+  m_names.push_back(std::move(uri));
+  m_nameIds.insert(std::make_pair(m_names.back(), id));
+  return id;
+}
+
+void
+TraceBatcher::Complete()
+{
+  if (m_current.empty()) {
+    return;
+  }
+
+  if (m_callback != nullptr) {
+    m_callback(m_current.data(), m_current.size());
+    m_current.clear();
+  }
+  else {
+    m_batches.push_back(std::vector<Record>());
+    m_batches.back().swap(m_current);
+    m_current.reserve(m_batchSize);
+  }
+
+  if (m_shouldPause) {
+    m_isPaused = true;
+    Simulator::Stop();
+  }
+}
+
+void
+TraceBatcher::Flush()
+{
+  Complete();
+}
+
+void
+TraceBatcher::PeriodicFlush()
+{
+  Complete();
+  m_flushEvent = Simulator::Schedule(m_interval, &TraceBatcher::PeriodicFlush, this);
+}
+
+bool
+TraceBatcher::RunUntilBatch()
+{
+  m_isPaused = false;
+  Simulator::Run();
+
+  bool isPaused = m_isPaused;
+  m_isPaused = false;
+  return isPaused;
+}
+
+const std::vector<TraceBatcher::Record>&
+TraceBatcher::GetBatch() const
+{
+  NS_ASSERT_MSG(!m_batches.empty(), "No completed batches");
+  return m_batches.front();
+}
+
+void
+TraceBatcher::PopBatch()
+{
+  if (!m_batches.empty()) {
+    m_batches.pop_front();
+  }
+}
+
+uint64_t
+TraceBatcher::GetBatchAddress() const
+{
+  return reinterpret_cast<uint64_t>(GetBatch().data());
+}
+
+uint64_t
+TraceBatcher::GetNameDataAddress() const
+{
+  return reinterpret_cast<uint64_t>(m_nameData.data());
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,285 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_TRACE_BATCHER_HPP
+#define NDN_TRACE_BATCHER_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/model/ndn-face.hpp"
+#include "ns3/ndnSIM/utils/tracers/ndn-trace-filter.hpp"
+
+#include "ns3/ptr.h"
+#include "ns3/nstime.h"
+#include "ns3/event-id.h"
+#include "ns3/node-container.h"
+
+#include <boost/noncopyable.hpp>
+
+#include <deque>
+#include <functional>
+#include <limits>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+namespace ns3 {
+
+class Node;
+
+namespace ndn {
+
+class App;
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Collector of NDN trace source events into batches of fixed-width records
+ *
+ * The batcher connects to `InInterests`, `OutData`, `SatisfiedInterests`, and
+ * `TimedOutInterests` trace sources of L3Protocol and `FirstInterestDataDelay` trace source of
+ * the applications (apps need to be installed before the batcher is created).  Each event is
+ * stored as a Record in the current batch, which is completed when it contains @p batchSize
+ * records, or (if @p interval is not zero) every @p interval of simulation time.
+ *
+ * Completed batches are either passed to the batch callback, or queued to be pulled using
+ * GetNBatches(), GetBatch(), and PopBatch().  With SetPauseOnBatch(true), the simulation is
+ * paused (Simulator::Stop()) after each completed batch, which allows RunUntilBatch() caller
+ * (e.g., `ns.ndnSIM_events` Python module) to process batches while the simulation runs.
+ *
+ * Node, face, and name restrictions of the filter, as well as time restrictions and 1-in-N
+ * sampling, are applied to individual events.
+ */
+class TraceBatcher : boost::noncopyable {
+public:
+  enum EventType : uint32_t {
+    IN_INTERESTS = 0,
+    OUT_DATA = 1,
+    SATISFIED_INTERESTS = 2,
+    TIMED_OUT_INTERESTS = 3,
+    FIRST_INTEREST_DATA_DELAY = 4
+  };
+
+  /**
+   * @brief Bit masks of the event types, for the @p sources parameter
+   */
+  enum : uint32_t {
+    ALL_SOURCES = (1 << 5) - 1,
+    L3_SOURCES = (1 << IN_INTERESTS) | (1 << OUT_DATA) | (1 << SATISFIED_INTERESTS)
+                 | (1 << TIMED_OUT_INTERESTS),
+    APP_SOURCES = (1 << FIRST_INTEREST_DATA_DELAY)
+  };
+
+  /**
+   * @brief Name index of the records without name (FirstInterestDataDelay events)
+   */
+  static const uint32_t NO_NAME = std::numeric_limits<uint32_t>::max();
+
+  /**
+   * @brief Trace source event
+   *
+   * faceId is -1 for TimedOutInterests and FirstInterestDataDelay events.  appId, seqNo,
+   * retxCount, delay, and hopCount are set only for FirstInterestDataDelay events.
+   */
+  struct Record
+  {
+    double time;
+    uint32_t node;
+    uint32_t type;
+    int64_t faceId;
+    uint32_t name;
+    uint32_t appId;
+    uint32_t seqNo;
+    uint32_t retxCount;
+    double delay;
+    int32_t hopCount;
+    uint32_t padding;
+  };
+
+  typedef std::function<void(const Record* records, size_t nRecords)> BatchCallback;
+
+public:
+  /**
+   * @brief Collect events of all simulation nodes
+   *
+   * @param batchSize Maximum number of records in a batch
+   * @param interval How often the current batch is completed (zero to complete only full
+   *        batches)
+   * @param sources Bit mask of the collected event types (e.g., ALL_SOURCES)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything)
+   */
+  explicit
+  TraceBatcher(size_t batchSize = 4096, Time interval = Time(0), uint32_t sources = ALL_SOURCES,
+               const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Collect events of the selected simulation nodes
+   *
+   * @param nodes Nodes which events are collected
+   * @param batchSize Maximum number of records in a batch
+   * @param interval How often the current batch is completed (zero to complete only full
+   *        batches)
+   * @param sources Bit mask of the collected event types (e.g., ALL_SOURCES)
+   * @param filter Selection of traced nodes, faces, names, and time (default, everything)
+   */
+  TraceBatcher(const NodeContainer& nodes, size_t batchSize = 4096, Time interval = Time(0),
+               uint32_t sources = ALL_SOURCES, const TraceFilter& filter = TraceFilter());
+
+  /**
+   * @brief Disconnect from all trace sources
+   */
+  ~TraceBatcher();
+
+  /**
+   * @brief Record only the first @p depth components of the names (default, full names)
+   */
+  void
+  SetNameDepth(size_t depth);
+
+  /**
+   * @brief Pass completed batches to @p callback instead of queueing them
+   */
+  void
+  SetBatchCallback(const BatchCallback& callback);
+
+  /**
+   * @brief Pause the simulation (Simulator::Stop()) after each completed batch
+   */
+  void
+  SetPauseOnBatch(bool shouldPause);
+
+  /**
+   * @brief Complete the current batch, even if it is not full
+   */
+  void
+  Flush();
+
+  /**
+   * @brief Run the simulation until it is paused by a completed batch, or until it ends
+   * @return true if the simulation was paused and can be resumed by another call
+   */
+  bool
+  RunUntilBatch();
+
+  /**
+   * @brief Get number of queued completed batches
+   */
+  size_t
+  GetNBatches() const
+  {
+    return m_batches.size();
+  }
+
+  /**
+   * @brief Get the oldest queued batch
+   */
+  const std::vector<Record>&
+  GetBatch() const;
+
+  /**
+   * @brief Remove the oldest queued batch
+   */
+  void
+  PopBatch();
+
+  /**
+   * @brief Get names, indexed by Record::name
+   */
+  const std::vector<std::string>&
+  GetNames() const
+  {
+    return m_names;
+  }
+
+public: // raw access to the records (for the Python bindings)
+  uint64_t
+  GetBatchAddress() const;
+
+  size_t
+  GetBatchSize() const
+  {
+    return GetBatch().size();
+  }
+
+  /**
+   * @brief Get all names, each terminated by NUL character
+   *
+   * Names are only appended, so new names can be read starting from the size of the
+   * previously read data.
+   */
+  uint64_t
+  GetNameDataAddress() const;
+
+  size_t
+  GetNameDataSize() const
+  {
+    return m_nameData.size();
+  }
+
+private:
+  class NodeSink;
+
+  void
+  Connect(Ptr<Node> node);
+
+  void
+  Add(uint32_t node, EventType type, int64_t faceId, const Name* name);
+
+  void
+  AddDelay(uint32_t node, Ptr<App> app, uint32_t seqNo, Time delay, uint32_t retxCount,
+           int32_t hopCount);
+
+  bool
+  IsAccepted(EventType type, const Face* face, const Name* name);
+
+  uint32_t
+  Intern(const Name& name);
+
+  void
+  Complete();
+
+  void
+  PeriodicFlush();
+
+private:
+  size_t m_batchSize;
+  Time m_interval;
+  uint32_t m_sources;
+  TraceFilter m_filter;
+  size_t m_nameDepth;
+
+  std::vector<std::unique_ptr<NodeSink>> m_sinks;
+
+  std::vector<Record> m_current;
+  std::deque<std::vector<Record>> m_batches;
+  BatchCallback m_callback;
+
+  bool m_shouldPause;
+  bool m_isPaused;
+  EventId m_flushEvent;
+
+  std::unordered_map<std::string, uint32_t> m_nameIds;
+  std::vector<std::string> m_names;
+  std::string m_nameData;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_TRACE_BATCHER_HPP
@@ -0,0 +1,124 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-trace-filter.hpp"
+
+#include "ns3/node.h"
+#include "ns3/simulator.h"
+
+#include <algorithm>
+
+namespace ns3 {
+namespace ndn {
+
+TraceFilter::TraceFilter()
+  : m_sampling(1)
+  , m_nCandidates(0)
+  , m_startTime(0)
+  , m_stopTime(Time::Max())
+{
+}
+
+TraceFilter&
+TraceFilter::SetNodePredicate(const NodePredicate& predicate)
+{
+  m_nodePredicate = predicate;
+  return *this;
+}
+
+TraceFilter&
+TraceFilter::SetFacePredicate(const FacePredicate& predicate)
+{
+  m_facePredicate = predicate;
+  return *this;
+}
+
+TraceFilter&
+TraceFilter::AddPrefix(const Name& prefix)
+{
+  m_prefixes.push_back(prefix);
+  return *this;
+}
+
+TraceFilter&
+TraceFilter::SetSampling(uint32_t n)
+{
+  m_sampling = std::max<uint32_t>(n, 1);
+  return *this;
+}
+
+TraceFilter&
+TraceFilter::SetSamplingWindow(const Time& window, const Time& period)
+{
+  m_window = window;
+  m_windowPeriod = period;
+  return *this;
+}
+
+TraceFilter&
+TraceFilter::SetStartTime(const Time& time)
+{
+  m_startTime = time;
+  return *this;
+}
+
+TraceFilter&
+TraceFilter::SetStopTime(const Time& time)
+{
+  m_stopTime = time;
+  return *this;
+}
+
+bool
+TraceFilter::IsNodeAccepted(Ptr<Node> node) const
+{
+  return m_nodePredicate == nullptr || m_nodePredicate(node);
+}
+
+bool
+TraceFilter::IsUnderPrefix(const Name& name) const
+{
+  for (const Name& prefix : m_prefixes) {
+    if (prefix.isPrefixOf(name)) {
+      return true;
+    }
+  }
+  return false;
+}
+
+bool
+TraceFilter::IsSampled()
+{
+  Time now = Simulator::Now();
+  if (now < m_startTime || now >= m_stopTime) {
+    return false;
+  }
+
+  if (m_windowPeriod.IsStrictlyPositive()
+      && (now - m_startTime).GetTimeStep() % m_windowPeriod.GetTimeStep()
+           >= m_window.GetTimeStep()) {
+    return false;
+  }
+
+  return m_sampling == 1 || m_nCandidates++ % m_sampling == 0;
+}
+
+} // namespace ndn
+} // namespace ns3
@@ -0,0 +1,164 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_TRACE_FILTER_HPP
+#define NDN_TRACE_FILTER_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+#include "ns3/ndnSIM/model/ndn-face.hpp"
+
+#include "ns3/ptr.h"
+#include "ns3/nstime.h"
+
+#include <functional>
+#include <vector>
+
+namespace ns3 {
+
+class Node;
+
+namespace ndn {
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Selection of nodes, faces, names, and time instants that should be traced
+ *
+ * The filter is accepted by installers of all tracers.  By default, everything is traced.
+ * Restrictions are added using chained setters, e.g.:
+ *
+ *     L3RateTracer::InstallAll("rate-trace.txt", Seconds(1.0), TraceFormat::TEXT,
+ *                              L3RateTracer::PACKET_HOOKS,
+ *                              TraceFilter()
+ *                                .SetNodePredicate([] (Ptr<Node> node) {
+ *                                    return node->GetId() < 10;
+ *                                  })
+ *                                .AddPrefix("/prefix")
+ *                                .SetStartTime(Seconds(100)));
+ *
+ * - node predicate is checked once, when tracers are installed by `InstallAll` or
+ *   `Install(NodeContainer, ...)`;
+ * - face predicate and name prefixes are checked for each packet or output row, by tracers
+ *   that know the face or the name;
+ * - start/stop time, time window, and 1-in-N sampling are checked before each record (or,
+ *   for the tracers that write periodically, before each period) is formatted.
+ *
+ * Each tracer keeps its own copy of the filter, including the 1-in-N sampling counter.
+ */
+class TraceFilter {
+public:
+  typedef std::function<bool(Ptr<Node>)> NodePredicate;
+  typedef std::function<bool(const Face&)> FacePredicate;
+
+  TraceFilter();
+
+  /**
+   * @brief Trace only nodes for which @p predicate returns true
+   */
+  TraceFilter&
+  SetNodePredicate(const NodePredicate& predicate);
+
+  /**
+   * @brief Trace only faces for which @p predicate returns true
+   */
+  TraceFilter&
+  SetFacePredicate(const FacePredicate& predicate);
+
+  /**
+   * @brief Trace only packets with names under @p prefix (or under any of the added prefixes)
+   */
+  TraceFilter&
+  AddPrefix(const Name& prefix);
+
+  /**
+   * @brief Trace only one of every @p n records (or periods)
+   */
+  TraceFilter&
+  SetSampling(uint32_t n);
+
+  /**
+   * @brief Trace only during the first @p window of every @p period (counted from start time)
+   */
+  TraceFilter&
+  SetSamplingWindow(const Time& window, const Time& period);
+
+  /**
+   * @brief Do not trace before @p time
+   */
+  TraceFilter&
+  SetStartTime(const Time& time);
+
+  /**
+   * @brief Do not trace at and after @p time
+   */
+  TraceFilter&
+  SetStopTime(const Time& time);
+
+  bool
+  IsNodeAccepted(Ptr<Node> node) const;
+
+  bool
+  IsFaceAccepted(const Face& face) const
+  {
+    return m_facePredicate == nullptr || m_facePredicate(face);
+  }
+
+  bool
+  IsNameAccepted(const Name& name) const
+  {
+    return m_prefixes.empty() || IsUnderPrefix(name);
+  }
+
+  bool
+  HasNameFilter() const
+  {
+    return !m_prefixes.empty();
+  }
+
+  /**
+   * @brief Check time restrictions and 1-in-N sampling for the current simulation time
+   *
+   * Should be called exactly once before formatting each record (or period), as each call
+   * advances the sampling counter.
+   */
+  bool
+  IsSampled();
+
+private:
+  bool
+  IsUnderPrefix(const Name& name) const;
+
+private:
+  NodePredicate m_nodePredicate;
+  FacePredicate m_facePredicate;
+  std::vector<Name> m_prefixes;
+
+  uint32_t m_sampling;
+  uint64_t m_nCandidates;
+
+  Time m_window;
+  Time m_windowPeriod;
+  Time m_startTime;
+  Time m_stopTime;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_TRACE_FILTER_HPP
@@ -0,0 +1,349 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#include "ndn-trace-stream.hpp"
+
+#include "ns3/assert.h"
+#include "ns3/log.h"
+
+#include <condition_variable>
+#include <deque>
+#include <functional>
+#include <mutex>
+#include <thread>
+
+#ifdef NDNSIM_HAVE_ZLIB
+#include <zlib.h>
+#endif // NDNSIM_HAVE_ZLIB
+
+NS_LOG_COMPONENT_DEFINE("ndn.TraceStream");
+
+namespace ns3 {
+namespace ndn {
+
+const size_t AsyncTraceBuffer::CHUNK_SIZE;
+const size_t AsyncTraceBuffer::MAX_QUEUED_CHUNKS;
+
+shared_ptr<std::ostream>
+OpenTraceStream(const std::string& file, TraceFormat format)
+{
+  if (file == "-") {
+    return shared_ptr<std::ostream>(&std::cout, std::bind([]{}));
+  }
+
+  static const std::string GZIP_SUFFIX = ".gz";
+  bool compress = file.size() > GZIP_SUFFIX.size() &&
+                  file.compare(file.size() - GZIP_SUFFIX.size(), GZIP_SUFFIX.size(),
+                               GZIP_SUFFIX) == 0;
+
+  // both formats are written byte-to-byte by AsyncTraceBuffer
+  shared_ptr<AsyncTraceStream> os = make_shared<AsyncTraceStream>(file, compress);
+  if (!os->isOpen()) {
+    NS_LOG_ERROR("File " << file << " cannot be opened for writing. Tracing disabled");
+    return nullptr;
+  }
+
+  return os;
+}
+
+namespace detail {
+
+/**
+ * @brief Background thread that writes chunks of all open trace files
+ */
+class TraceWriterThread : boost::noncopyable {
+public:
+  /**
+   * @brief Get the thread shared by all open trace files, starting it if necessary
+   */
+  static shared_ptr<TraceWriterThread>
+  get()
+  {
+    std::lock_guard<std::mutex> lock(getInstanceMutex());
+    shared_ptr<TraceWriterThread> thread = getInstance().lock();
+    if (thread == nullptr) {
+      thread = make_shared<TraceWriterThread>();
+      getInstance() = thread;
+    }
+    return thread;
+  }
+
+  /**
+   * @brief Check whether the thread is running, i.e., whether any trace file is open
+   */
+  static bool
+  isRunning()
+  {
+    std::lock_guard<std::mutex> lock(getInstanceMutex());
+    return !getInstance().expired();
+  }
+
+  TraceWriterThread()
+    : m_isStopped(false)
+    , m_isBusy(false)
+    , m_thread(&TraceWriterThread::run, this)
+  {
+  }
+
+  ~TraceWriterThread()
+  {
+    {
+      std::lock_guard<std::mutex> lock(m_mutex);
+      m_isStopped = true;
+    }
+    m_hasChunks.notify_one();
+    m_thread.join();
+  }
+
+  /**
+   * @brief Queue the chunk for writing, waiting if too many chunks are already queued
+   */
+  void
+  submit(AsyncTraceBuffer* buffer, std::vector<char>&& chunk, bool isLast)
+  {
+    std::unique_lock<std::mutex> lock(m_mutex);
+    m_hasSpace.wait(lock, [this] { return m_queue.size() < AsyncTraceBuffer::MAX_QUEUED_CHUNKS; });
+
+    m_queue.push_back(Item{buffer, std::move(chunk), isLast});
+    m_hasChunks.notify_one();
+  }
+
+  /**
+   * @brief Wait until all queued chunks are written
+   */
+  void
+  drain()
+  {
+    std::unique_lock<std::mutex> lock(m_mutex);
+    m_isIdle.wait(lock, [this] { return m_queue.empty() && !m_isBusy; });
+  }
+
+private:
+  static std::mutex&
+  getInstanceMutex()
+  {
+    static std::mutex mutex;
+    return mutex;
+  }
+
+  static std::weak_ptr<TraceWriterThread>&
+  getInstance()
+  {
+    static std::weak_ptr<TraceWriterThread> instance;
+    return instance;
+  }
+
+  void
+  run()
+  {
+    std::unique_lock<std::mutex> lock(m_mutex);
+    while (true) {
+      m_hasChunks.wait(lock, [this] { return m_isStopped || !m_queue.empty(); });
+      if (m_queue.empty()) {
+        break; // stopped
+      }
+
+      Item item = std::move(m_queue.front());
+      m_queue.pop_front();
+      m_isBusy = true;
+      m_hasSpace.notify_one();
+
+      lock.unlock();
+      item.buffer->writeChunk(item.chunk, item.isLast);
+      lock.lock();
+
+      m_isBusy = false;
+      if (m_queue.empty()) {
+        m_isIdle.notify_all();
+      }
+    }
+  }
+
+private:
+  struct Item
+  {
+    AsyncTraceBuffer* buffer;
+    std::vector<char> chunk;
+    bool isLast;
+  };
+
+  std::mutex m_mutex;
+  std::condition_variable m_hasChunks;
+  std::condition_variable m_hasSpace;
+  std::condition_variable m_isIdle;
+  std::deque<Item> m_queue;
+  bool m_isStopped;
+  bool m_isBusy;
+
+  std::thread m_thread; // must be the last member, as it starts running in the constructor
+};
+
+} // namespace detail
+
+struct AsyncTraceBuffer::Compressor
+{
+#ifdef NDNSIM_HAVE_ZLIB
+  z_stream stream;
+  std::vector<char> output;
+#endif // NDNSIM_HAVE_ZLIB
+};
+
+AsyncTraceBuffer::AsyncTraceBuffer(const std::string& file, bool compress)
+  : m_file(std::fopen(file.c_str(), "wb"))
+  , m_hasError(false)
+{
+  if (m_file == nullptr) {
+    return;
+  }
+
+  if (compress) {
+#ifdef NDNSIM_HAVE_ZLIB
+    m_compressor.reset(new Compressor);
+    m_compressor->stream = z_stream();
+    m_compressor->output.resize(CHUNK_SIZE);
+    // 16 is added to the window size to produce gzip header and trailer
+    int ret = deflateInit2(&m_compressor->stream, Z_DEFAULT_COMPRESSION, Z_DEFLATED, 15 + 16, 8,
+                           Z_DEFAULT_STRATEGY);
+    NS_ASSERT_MSG(ret == Z_OK, "Cannot initialize zlib: " << ret);
+#else
+    NS_LOG_WARN("ndnSIM is compiled without zlib, " << file << " will not be compressed");
+#endif // NDNSIM_HAVE_ZLIB
+  }
+
+  m_thread = detail::TraceWriterThread::get();
+
+  m_chunk.resize(CHUNK_SIZE);
+  setp(m_chunk.data(), m_chunk.data() + m_chunk.size());
+}
+
+AsyncTraceBuffer::~AsyncTraceBuffer()
+{
+  if (m_file == nullptr) {
+    return;
+  }
+
+  submitChunk();
+  m_thread->submit(this, std::vector<char>(), true);
+  m_thread->drain();
+
+#ifdef NDNSIM_HAVE_ZLIB
+  if (m_compressor != nullptr) {
+    deflateEnd(&m_compressor->stream);
+  }
+#endif // NDNSIM_HAVE_ZLIB
+
+  if (std::fclose(m_file) != 0) {
+    m_hasError = true;
+  }
+
+  if (m_hasError) {
+    NS_LOG_ERROR("Error while writing trace file, trace is incomplete");
+  }
+}
+
+bool
+AsyncTraceBuffer::isCompressionSupported()
+{
+#ifdef NDNSIM_HAVE_ZLIB
+  return true;
+#else
+  return false;
+#endif // NDNSIM_HAVE_ZLIB
+}
+
+bool
+AsyncTraceBuffer::isWriterThreadRunning()
+{
+  return detail::TraceWriterThread::isRunning();
+}
+
+AsyncTraceBuffer::int_type
+AsyncTraceBuffer::overflow(int_type ch)
+{
+  submitChunk();
+
+  if (traits_type::eq_int_type(ch, traits_type::eof())) {
+    return traits_type::not_eof(ch);
+  }
+  return sputc(traits_type::to_char_type(ch));
+}
+
+int
+AsyncTraceBuffer::sync()
+{
+  // data is handed over to the background thread, without waiting for the disk
+  submitChunk();
+  return 0;
+}
+
+void
+AsyncTraceBuffer::submitChunk()
+{
+  size_t size = pptr() - pbase();
+  if (size == 0) {
+    return;
+  }
+
+  m_chunk.resize(size);
+  m_thread->submit(this, std::move(m_chunk), false);
+
+  m_chunk = std::vector<char>(CHUNK_SIZE);
+  setp(m_chunk.data(), m_chunk.data() + m_chunk.size());
+}
+
+void
+AsyncTraceBuffer::writeChunk(const std::vector<char>& chunk, bool isLast)
+{
+#ifdef NDNSIM_HAVE_ZLIB
+  if (m_compressor != nullptr) {
+    z_stream& stream = m_compressor->stream;
+    stream.next_in = reinterpret_cast<Bytef*>(const_cast<char*>(chunk.data()));
+    stream.avail_in = chunk.size();
+
+    do {
+      stream.next_out = reinterpret_cast<Bytef*>(m_compressor->output.data());
+      stream.avail_out = m_compressor->output.size();
+      deflate(&stream, isLast ? Z_FINISH : Z_NO_FLUSH);
+      writeBytes(m_compressor->output.data(), m_compressor->output.size() - stream.avail_out);
+    } while (stream.avail_out == 0);
+    return;
+  }
+#endif // NDNSIM_HAVE_ZLIB
+
+  writeBytes(chunk.data(), chunk.size());
+}
+
+void
+AsyncTraceBuffer::writeBytes(const char* buf, size_t size)
+{
+  if (size > 0 && std::fwrite(buf, 1, size, m_file) != size) {
+    m_hasError = true;
+  }
+}
+
+AsyncTraceStream::AsyncTraceStream(const std::string& file, bool compress)
+  : std::ostream(nullptr)
+  , m_buffer(file, compress)
+{
+  rdbuf(&m_buffer);
+}
+
+} // namespace ndn
+} // namespace ns3
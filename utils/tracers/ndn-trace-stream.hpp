@@ -0,0 +1,173 @@
+/* -*- Mode:C++; c-file-style:"gnu"; indent-tabs-mode:nil; -*- */
+/**
+ * Copyright (c) 2011-2015  Regents of the University of California.
+ *
+ * This file is part of ndnSIM. See AUTHORS for complete list of ndnSIM authors and
+ * contributors.
+ *
+ * ndnSIM is free software: you can redistribute it and/or modify it under the terms
+ * of the GNU General Public License as published by the Free Software Foundation,
+ * either version 3 of the License, or (at your option) any later version.
+ *
+ * ndnSIM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+ * without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+ * PURPOSE.  See the GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License along with
+ * ndnSIM, e.g., in COPYING.md file.  If not, see <http://www.gnu.org/licenses/>.
+ **/
+
+
+#ifndef NDN_TRACE_STREAM_HPP
+#define NDN_TRACE_STREAM_HPP
+
+#include "ns3/ndnSIM/model/ndn-common.hpp"
+
+#include <boost/noncopyable.hpp>
+
+#include <cstdio>
+#include <iostream>
+#include <string>
+#include <vector>
+
+namespace ns3 {
+namespace ndn {
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Output format of the trace helpers
+ */
+enum class TraceFormat {
+  TEXT,  ///< tab-separated values, first row specifies names of the columns
+  BINARY ///< fixed-width binary records, see BinaryTraceWriter
+};
+
+/**
+ * @brief Open output stream for the trace helpers
+ *
+ * Trace files are written asynchronously using AsyncTraceBuffer.  If the file name ends with
+ * ".gz", the trace is gzip-compressed (if ndnSIM is compiled with zlib support).
+ *
+ * @param file   File to which traces will be written.  If filename is -, then std::cout is used
+ * @param format Format of the trace
+ * @returns the stream or nullptr if the file cannot be opened for writing
+ */
+shared_ptr<std::ostream>
+OpenTraceStream(const std::string& file, TraceFormat format);
+
+/// @cond include_hidden
+namespace detail {
+class TraceWriterThread;
+} // namespace detail
+/// @endcond
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Stream buffer that writes trace files from a background thread
+ *
+ * The simulation thread only copies the data into fixed-size chunks.  Filled chunks (and the
+ * partially filled one on flush) are passed to the background thread, which is shared by all
+ * trace files, and which optionally compresses and writes them to the file.
+ *
+ * The total size of the chunks queued for writing is bounded: when the limit is reached, the
+ * simulation thread waits until the background thread catches up.
+ */
+class AsyncTraceBuffer : public std::streambuf, boost::noncopyable {
+public:
+  /**
+   * @brief Size of a chunk passed to the background thread
+   */
+  static const size_t CHUNK_SIZE = 64 * 1024;
+
+  /**
+   * @brief Maximum number of chunks (of all trace files) queued for writing
+   */
+  static const size_t MAX_QUEUED_CHUNKS = 64;
+
+  /**
+   * @param file     name of the file to write
+   * @param compress whether to gzip-compress the file
+   */
+  AsyncTraceBuffer(const std::string& file, bool compress);
+
+  /**
+   * @brief Write all buffered data and close the file
+   */
+  ~AsyncTraceBuffer();
+
+  bool
+  isOpen() const
+  {
+    return m_file != nullptr;
+  }
+
+  /**
+   * @brief Check whether ndnSIM is compiled with support of compressed traces
+   */
+  static bool
+  isCompressionSupported();
+
+  /**
+   * @brief Check whether the background thread is running, i.e., whether any trace file is open
+   *
+   * The thread does not survive fork(), so trace files should not be open when the simulation
+   * process is forked (see EnsembleHelper).
+   */
+  static bool
+  isWriterThreadRunning();
+
+protected:
+  virtual int_type
+  overflow(int_type ch);
+
+  virtual int
+  sync();
+
+private:
+  void
+  submitChunk();
+
+  /**
+   * @brief Write the chunk to the file (called from the background thread)
+   */
+  void
+  writeChunk(const std::vector<char>& chunk, bool isLast);
+
+  void
+  writeBytes(const char* buf, size_t size);
+
+private:
+  shared_ptr<detail::TraceWriterThread> m_thread;
+  std::FILE* m_file;
+  bool m_hasError;
+
+  struct Compressor;
+  std::unique_ptr<Compressor> m_compressor;
+
+  std::vector<char> m_chunk;
+
+  friend class detail::TraceWriterThread;
+};
+
+/**
+ * @ingroup ndn-tracers
+ * @brief Output stream for trace files written by AsyncTraceBuffer
+ */
+class AsyncTraceStream : public std::ostream {
+public:
+  AsyncTraceStream(const std::string& file, bool compress);
+
+  bool
+  isOpen() const
+  {
+    return m_buffer.isOpen();
+  }
+
+private:
+  AsyncTraceBuffer m_buffer;
+};
+
+} // namespace ndn
+} // namespace ns3
+
+#endif // NDN_TRACE_STREAM_HPP